@@ -2,14 +2,23 @@
 
 The client uses simple GET requests with exponential backoff. Secrets are not
 required. Live mode is disabled in tests to avoid network calls.
+
+With ``cache_dir`` set, pages are stored on disk and revalidated with
+``If-None-Match``/``If-Modified-Since``. A :class:`RetryBudget` shared between
+clients or threads caps the total number of backoff retries.
 """
 
 from __future__ import annotations
 
+from pathlib import Path
+import threading
 import time
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from earCrawler.core.rate_limit import RetryBudget
+from earCrawler.utils.http_cache import HTTPCache
 from earCrawler.utils.log_json import JsonLogger
 from api_clients.upstream_status import (
     UpstreamResult,
@@ -47,10 +56,40 @@ class ORIClient:
         "/case_findings",
     )
 
-    def __init__(self, *, session: requests.Session | None = None) -> None:
-        self.session = session or requests.Session()
-        self._owns_session = session is None
+    def __init__(
+        self,
+        *,
+        session: requests.Session | None = None,
+        cache_dir: Path | None = None,
+        retry_budget: RetryBudget | None = None,
+        pool_maxsize: int = 10,
+    ) -> None:
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_maxsize=max(1, int(pool_maxsize)))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._owns_session = True
+        else:
+            self._owns_session = False
+        self.session = session
+        self.cache = (
+            HTTPCache(cache_dir, content_types=("text/html",))
+            if cache_dir is not None
+            else None
+        )
+        self.retry_budget = retry_budget
         self._status = UpstreamStatusTracker("ori")
+        self._local = threading.local()
+
+    @property
+    def _current_url(self) -> str | None:
+        # Per thread, so concurrent case fetches log their own URL.
+        return getattr(self._local, "url", None)
+
+    @_current_url.setter
+    def _current_url(self, url: str | None) -> None:
+        self._local.url = url
 
     def _record_status(
         self,
@@ -91,12 +130,20 @@ class ORIClient:
         """Return the latest status payload for each tracked operation."""
         return self._status.snapshot()
 
+    def _can_retry(self, attempt: int, attempts: int) -> bool:
+        if attempt >= attempts - 1:
+            return False
+        return self.retry_budget is None or self.retry_budget.try_acquire()
+
     def _get(self, url: str, *, operation: str) -> str:
         attempts = 3
         self._current_url = url
         for attempt in range(attempts):
             try:
-                resp = self.session.get(url, timeout=10)
+                if self.cache is not None:
+                    resp = self.cache.get(self.session, url, {})
+                else:
+                    resp = self.session.get(url, timeout=10)
                 resp.raise_for_status()
                 body = resp.text or ""
                 if not body.strip():
@@ -115,7 +162,7 @@ class ORIClient:
                 return body
             except requests.HTTPError as exc:
                 status = getattr(exc.response, "status_code", 0)
-                if 500 <= status < 600 and attempt < attempts - 1:
+                if 500 <= status < 600 and self._can_retry(attempt, attempts):
                     self._record_status(
                         operation,
                         "upstream_unavailable",
@@ -141,7 +188,7 @@ class ORIClient:
                     status_code=status,
                 ) from exc
             except requests.RequestException as exc:
-                if attempt < attempts - 1:
+                if self._can_retry(attempt, attempts):
                     self._record_status(
                         operation,
                         "upstream_unavailable",
@@ -158,6 +158,50 @@ def build_kg_expansion(manifest: Path, corpus: Path, out: Path) -> None:
     click.echo(f"Wrote {out} ({len(mapping)} sections)")
 
 
+@eval_group.command(name="build-kg-expansion-artifact")
+@click.option(
+    "--kg",
+    "sources",
+    type=click.Path(path_type=Path, exists=True, dir_okay=False),
+    multiple=True,
+    default=(Path("kg") / "ear.ttl",),
+    show_default=True,
+    help="Exported KG file(s) (TTL, N-Triples, TriG or N-Quads); repeatable.",
+)
+@click.option(
+    "--out",
+    type=click.Path(path_type=Path),
+    default=Path("dist") / "kg_expansion.kgx",
+    show_default=True,
+    help="Pointer path for the expansion artifact (the data file is written next to it).",
+)
+@click.option("--max-hops", type=click.IntRange(min=1), default=2, show_default=True)
+@click.option(
+    "--max-paths-per-section", type=click.IntRange(min=1), default=4, show_default=True
+)
+def build_kg_expansion_artifact(
+    sources: tuple[Path, ...], out: Path, max_hops: int, max_paths_per_section: int
+) -> None:
+    """Precompute KG expansion for every section into a runtime artifact."""
+
+    try:
+        from earCrawler.rag.kg_expansion_artifact import (
+            build_kg_expansion_artifact as build_artifact,
+        )
+    except Exception as exc:  # pragma: no cover - import failures
+        raise click.ClickException(str(exc))
+    header = build_artifact(
+        list(sources),
+        out,
+        max_hops=max_hops,
+        max_paths_per_section=max_paths_per_section,
+    )
+    click.echo(
+        f"Wrote {out} -> {header['file']} ({header['section_count']} sections, "
+        f"kg_digest={header['kg_digest'][:12]})"
+    )
+
+
 @eval_group.command(name="run-rag")
 @click.option(
     "--manifest",
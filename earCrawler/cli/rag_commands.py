@@ -12,6 +12,8 @@ from api_clients.federalregister_client import FederalRegisterClient
 from api_clients.llm_client import LLMProviderError
 from earCrawler.cli import rag_workflows
 from earCrawler.rag.ecfr_api_fetch import fetch_ecfr_snapshot
+from earCrawler.rag.embedding_pipeline import DEFAULT_EMBED_BATCH_SIZE
+from earCrawler.rag.faiss_profiles import FAISS_INDEX_PROFILES
 from earCrawler.rag.pipeline import answer_with_rag
 from earCrawler.rag.retriever import RetrieverError
 from earCrawler.rag.snapshot_index import build_snapshot_index_bundle
@@ -267,28 +269,125 @@ def rag_index() -> None:
     default=None,
     help="Destination metadata path (defaults to <index-path>.meta.json).",
 )
+@click.option(
+    "--index-profile",
+    type=click.Choice(list(FAISS_INDEX_PROFILES)),
+    default="flat",
+    show_default=True,
+    help="FAISS index type: exact flat scan or approximate IVF-Flat, IVF-PQ, HNSW.",
+)
+@click.option("--nlist", type=int, default=None, help="IVF cell count (ivf_* profiles).")
+@click.option("--nprobe", type=int, default=None, help="IVF cells probed per query (ivf_* profiles).")
+@click.option("--pq-m", type=int, default=None, help="PQ sub-quantizers; must divide the embedding dim.")
+@click.option("--hnsw-m", type=int, default=None, help="HNSW graph degree (hnsw profile).")
+@click.option("--ef-search", type=int, default=None, help="HNSW efSearch at query time (hnsw profile).")
+@click.option(
+    "--recall-queries",
+    "recall_queries_path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=None,
+    help="Eval JSONL whose questions gate approximate profiles (defaults to eval/golden_phase2.v1.jsonl).",
+)
+@click.option("--recall-k", type=int, default=10, show_default=True, help="k for the recall@k gate.")
+@click.option(
+    "--min-recall",
+    type=float,
+    default=None,
+    help="Fail the build when recall@k against the flat index is below this value.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_EMBED_BATCH_SIZE,
+    show_default=True,
+    help="Documents encoded per batch; bounds peak memory during the build.",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Encoder processes; each loads its own copy of the model.",
+)
 def rag_index_build(
     input_path: Path,
     index_path: Path,
     model_name: str,
     reset: bool,
     meta_path: Path | None,
+    index_profile: str,
+    nlist: int | None,
+    nprobe: int | None,
+    pq_m: int | None,
+    hnsw_m: int | None,
+    ef_search: int | None,
+    recall_queries_path: Path | None,
+    recall_k: int,
+    min_recall: float | None,
+    batch_size: int,
+    workers: int,
 ) -> None:
     """Build a FAISS index + metadata sidecar from a validated retrieval corpus."""
 
     try:
-        count, out_index, out_meta = rag_workflows.build_index_from_corpus(
+        count, out_index, out_meta, stats = rag_workflows.build_index_from_corpus(
             input_path=input_path,
             index_path=index_path,
             model_name=model_name,
             reset=reset,
             meta_path=meta_path,
+            index_profile=index_profile,
+            profile_overrides={
+                "nlist": nlist,
+                "nprobe": nprobe,
+                "pq_m": pq_m,
+                "hnsw_m": hnsw_m,
+                "ef_search": ef_search,
+            },
+            recall_queries_path=recall_queries_path,
+            recall_k=recall_k,
+            min_recall=min_recall,
+            batch_size=batch_size,
+            workers=workers,
         )
     except ValueError as exc:
         raise click.ClickException(str(exc)) from exc
     except Exception as exc:
         raise click.ClickException(str(exc)) from exc
     click.echo(f"Indexed {count} documents -> {out_index} (meta {out_meta})")
+    peak = stats.get("peak_rss_mb")
+    click.echo(
+        f"Throughput {stats.get('docs_per_s', 0.0)} docs/s "
+        f"({stats.get('workers', workers)} workers, batch {stats.get('batch_size', batch_size)}); "
+        f"peak RSS {peak if peak is not None else 'n/a'} MiB"
+    )
+
+
+@rag_index.command(name="prepare-shared")
+@click.option(
+    "--index-path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=Path("data") / "faiss" / "index.faiss",
+    show_default=True,
+    help="FAISS index whose artifacts API workers should share.",
+)
+@click.option(
+    "--meta-path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=None,
+    help="Index metadata path (defaults to <index-path>.meta.json).",
+)
+def rag_index_prepare_shared(index_path: Path, meta_path: Path | None) -> None:
+    """Write memory-mappable artifacts for EARCRAWLER_RETRIEVER_SHARED_ARTIFACTS=1 workers."""
+
+    try:
+        out_dir, manifest = rag_workflows.prepare_shared_index(
+            index_path=index_path,
+            meta_path=meta_path,
+        )
+    except ValueError as exc:
+        raise click.ClickException(str(exc)) from exc
+    click.echo(f"Prepared shared artifacts for {manifest['doc_count']} rows -> {out_dir}")
 
 
 @rag_index.command(name="build-corpus")
@@ -1,14 +1,36 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Mapping
 
+from earCrawler.rag.bm25_index import bm25_index_path
 from earCrawler.rag.build_corpus import build_retrieval_corpus, write_corpus_jsonl
-from earCrawler.rag.index_builder import build_faiss_index_from_corpus
+from earCrawler.rag.embedding_sidecar import embedding_sidecar_path
+from earCrawler.rag.embedding_pipeline import DEFAULT_EMBED_BATCH_SIZE
+from earCrawler.rag.index_builder import build_faiss_index_from_corpus_file
+from earCrawler.rag.metadata_table import metadata_table_path
 from earCrawler.rag.offline_snapshot_manifest import validate_offline_snapshot
+from earCrawler.rag.shared_artifacts import prepare_shared_artifacts, shared_artifacts_dir
 from earCrawler.rag.snapshot_corpus import build_snapshot_corpus_bundle
 
 
+DEFAULT_RECALL_QUERIES_PATH = Path("eval") / "golden_phase2.v1.jsonl"
+
+
+def load_recall_queries(path: Path) -> list[str]:
+    """Return the ``question`` fields of an eval JSONL file."""
+
+    questions: list[str] = []
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        question = str(json.loads(line).get("question") or "").strip()
+        if question:
+            questions.append(question)
+    return questions
+
+
 def build_index_from_corpus(
     *,
     input_path: Path,
@@ -16,25 +38,73 @@ def build_index_from_corpus(
     model_name: str,
     reset: bool,
     meta_path: Path | None,
-) -> tuple[int, Path, Path]:
+    index_profile: str = "flat",
+    profile_overrides: Mapping[str, int | None] | None = None,
+    recall_queries_path: Path | None = None,
+    recall_k: int = 10,
+    min_recall: float | None = None,
+    batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    workers: int = 1,
+) -> tuple[int, Path, Path, dict[str, object]]:
+    """Stream-build an index from ``input_path``; returns count, paths and build stats."""
+
     resolved_meta = meta_path or index_path.with_suffix(".meta.json")
     if reset:
         index_path.parent.mkdir(parents=True, exist_ok=True)
-        for path in (index_path, index_path.with_suffix(".pkl"), resolved_meta):
+        for path in (
+            index_path,
+            index_path.with_suffix(".pkl"),
+            resolved_meta,
+            embedding_sidecar_path(index_path, resolved_meta),
+            bm25_index_path(index_path, resolved_meta),
+            metadata_table_path(index_path, resolved_meta),
+        ):
             if path.exists():
                 path.unlink()
 
-    from earCrawler.rag.corpus_contract import load_corpus_jsonl, require_valid_corpus
-
-    docs = load_corpus_jsonl(input_path)
-    require_valid_corpus(docs)
-    build_faiss_index_from_corpus(
-        docs,
+    recall_queries: list[str] | None = None
+    if index_profile != "flat":
+        queries_path = recall_queries_path
+        if queries_path is None and DEFAULT_RECALL_QUERIES_PATH.exists():
+            queries_path = DEFAULT_RECALL_QUERIES_PATH
+        if queries_path is not None:
+            recall_queries = load_recall_queries(queries_path)
+    header = build_faiss_index_from_corpus_file(
+        input_path,
         index_path=index_path,
         meta_path=resolved_meta,
         embedding_model=model_name,
+        index_profile=index_profile,
+        profile_overrides=profile_overrides,
+        recall_queries=recall_queries,
+        recall_k=recall_k,
+        min_recall=min_recall,
+        batch_size=batch_size,
+        workers=workers,
+    )
+    build_stats = header.get("build_stats")
+    return (
+        int(header.get("doc_count") or 0),
+        index_path,
+        resolved_meta,
+        dict(build_stats) if isinstance(build_stats, Mapping) else {},
     )
-    return len(docs), index_path, resolved_meta
+
+
+def prepare_shared_index(
+    *,
+    index_path: Path,
+    meta_path: Path | None,
+) -> tuple[Path, dict[str, object]]:
+    """Write the read-only shared artifact set that API workers attach to."""
+
+    import numpy as np
+
+    resolved_meta = meta_path or index_path.with_suffix(".meta.json")
+    if not resolved_meta.exists():
+        raise ValueError(f"Index metadata not found: {resolved_meta}")
+    manifest = prepare_shared_artifacts(index_path, np_mod=np, meta_path=resolved_meta)
+    return shared_artifacts_dir(index_path, resolved_meta), manifest
 
 
 def build_corpus_from_snapshot(
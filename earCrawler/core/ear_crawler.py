@@ -3,15 +3,19 @@
 The EARCrawler class encapsulates the logic required to incrementally download Export Administration Regulations (EAR) text
 from the Federal Register API, normalise paragraphs, compute a cryptographic hash of each paragraph for change detection, and index
 embedded Federal Register citations.  It is designed to operate incrementally by persisting hashes of previously observed paragraphs
-between runs, thereby producing new records only when the text changes.
+between runs (in a SQLite index, see :mod:`earCrawler.core.paragraph_index`), thereby producing new records only when the text changes.
 
 The crawler relies on the api_clients.federalregister_client.FederalRegisterClient to perform the underlying API calls.  Documents are
 fetched via the search_documents method using a free‑text query.  For each returned document the crawler attempts to resolve the
-html_url or body_html_url field and download the full HTML.  Paragraphs are extracted with BeautifulSoup, normalised to strip extraneous whitespace,
-hashed with SHA-256 and returned as ParagraphRecord objects.
+html_url or body_html_url field and download the full HTML.  Paragraphs are extracted with lxml (BeautifulSoup when lxml is unavailable), normalised to
+strip extraneous whitespace, hashed with SHA-256 and returned as ParagraphRecord objects.  A document whose HTML hashes the same as on the last crawl is
+not parsed again.
 
 Federal Register citations embedded in the paragraph text (e.g. "85 FR 12345") are extracted via regular expressions to support later link analysis.
 
+Document detail and HTML fetches run on a bounded thread pool, paced per host by a token bucket. Results are consumed in search order,
+so the output and the hash-index de-duplication are the same as a sequential crawl.
+
 """
 
 from __future__ import annotations
@@ -20,14 +24,19 @@ import hashlib
 import json
 import logging
 import re
-import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+from earCrawler.core.html_paragraphs import iter_paragraph_texts
+from earCrawler.core.paragraph_index import ParagraphHashIndex, PositionVersions
+from earCrawler.core.rate_limit import HostRateLimiter
 
 try:
     from api_clients.federalregister_client import FederalRegisterClient, FederalRegisterError  # type: ignore
@@ -48,6 +57,15 @@ except Exception:
 
 ParagraphCitation = str
 
+DEFAULT_MAX_WORKERS = 4
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+_HTML_URL_KEYS = (
+    "body_html_url",
+    "html_url",
+    "html_url_publication",
+    "html_url_download",
+)
+
 
 @dataclass
 class ParagraphRecord:
@@ -69,6 +87,10 @@ class EARCrawler:
         storage_dir: Path,
         citation_regex: Optional[re.Pattern[str]] = None,
         session: Optional[requests.Session] = None,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        skip_unchanged_html: bool = True,
     ) -> None:
         self.client = federal_client
         self.storage_dir = storage_dir
@@ -76,38 +98,40 @@ class EARCrawler:
         self.citation_regex = citation_regex or re.compile(
             r"\b\d{1,3}\s+FR\s+\d{1,6}\b", re.IGNORECASE
         )
-        self.session = session or requests.Session()
+        self.max_workers = max(1, int(max_workers))
+        self.requests_per_second = requests_per_second
+        self.skip_unchanged_html = skip_unchanged_html
+        self.session = session or self._pooled_session(self.max_workers)
         self.logger = logging.getLogger(self.__class__.__name__)
         self.paragraphs_path = self.storage_dir / "ear_paragraphs.jsonl"
-        self.index_path = self.storage_dir / "hash_index.json"
-        self.hash_index: Dict[str, ParagraphRecord] = {}
-        self._position_versions: Dict[tuple[str, int], int] = {}
+        self.index_path = self.storage_dir / "hash_index.sqlite3"
+        self.legacy_index_path = self.storage_dir / "hash_index.json"
         self._load_index()
 
+    @staticmethod
+    def _pooled_session(pool_size: int) -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max(10, pool_size))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
     def _load_index(self) -> None:
-        if self.index_path.exists():
-            try:
-                data = json.loads(self.index_path.read_text(encoding="utf-8"))
-                for sha, rec in data.items():
-                    self.hash_index[sha] = ParagraphRecord(**rec)
-            except Exception as exc:
-                self.logger.warning("Failed to load hash index: %s", exc)
-        self._rebuild_position_versions()
-
-    def _rebuild_position_versions(self) -> None:
-        self._position_versions = {}
-        for record in self.hash_index.values():
-            key = (record.document_number, int(record.paragraph_index))
-            current = self._position_versions.get(key, 0)
-            if int(record.version) > current:
-                self._position_versions[key] = int(record.version)
-
-    def _save_index(self) -> None:
-        serialisable = {sha: asdict(rec) for sha, rec in self.hash_index.items()}
-        self.index_path.write_text(
-            json.dumps(serialisable, ensure_ascii=False, indent=2), encoding="utf-8"
+        # Opening the SQLite index reads nothing up front; an old
+        # ``hash_index.json`` is imported once on first use.
+        self._index_store = ParagraphHashIndex(
+            self.index_path, legacy_json=self.legacy_index_path
+        )
+        self.hash_index: ParagraphHashIndex | Dict[str, ParagraphRecord] = (
+            self._index_store
+        )
+        self._position_versions: PositionVersions | Dict[Tuple[str, int], int] = (
+            PositionVersions(self._index_store)
         )
 
+    def _save_index(self, records: List[ParagraphRecord]) -> None:
+        self._index_store.add_many(records)
+
     def _normalise_text(self, text: str) -> str:
         return " ".join(text.strip().split())
 
@@ -124,57 +148,121 @@ class EARCrawler:
             return None
 
     def _parse_paragraphs(self, html: str) -> Iterator[str]:
-        soup = BeautifulSoup(html, "html.parser")
-        for p in soup.find_all("p"):
-            text = p.get_text(separator=" ", strip=True)
+        for text in iter_paragraph_texts(html):
             if text:
-                yield self._normalise_text(text)
+                yield text
+
+    def _fetch_paragraphs(
+        self, doc_number: str, limiter: HostRateLimiter
+    ) -> Optional[Tuple[str, Optional[List[str]]]]:
+        """Fetch one document's detail and HTML; runs on a worker thread.
+
+        Returns ``(html_sha256, paragraphs)``; ``paragraphs`` is ``None`` when
+        the HTML is unchanged since the last crawl and was not parsed.
+        """
+
+        limiter.acquire(getattr(self.client, "BASE_URL", "api.federalregister.gov"))
+        try:
+            detail = self.client.get_document(doc_number)
+        except Exception as exc:
+            self.logger.warning("Failed to fetch document %s: %s", doc_number, exc)
+            return None
+        html_url: Optional[str] = None
+        for key in _HTML_URL_KEYS:
+            val = detail.get(key)
+            if isinstance(val, str) and val:
+                html_url = val
+                break
+        if not html_url:
+            self.logger.warning("No HTML URL found for document %s", doc_number)
+            return None
+        limiter.acquire(html_url)
+        html = self._download_html(html_url)
+        if not html:
+            return None
+        html_sha = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        if (
+            self.skip_unchanged_html
+            and self._index_store.document_hash(doc_number) == html_sha
+        ):
+            return html_sha, None
+        return html_sha, list(self._parse_paragraphs(html))
+
+    def _iter_fetched(
+        self, documents: Iterable[Dict], limiter: HostRateLimiter, max_workers: int
+    ) -> Iterator[Tuple[str, Optional[Tuple[str, Optional[List[str]]]]]]:
+        """Yield ``(doc_number, fetch_result)`` in search order.
+
+        At most ``2 * max_workers`` documents are in flight, so the lazily
+        paginated search results are never drained ahead of the fetches.
+        """
+
+        window = max_workers * 2
+        pending: Deque[Tuple[str, Future]] = deque()
+        with ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="ear-crawler"
+        ) as pool:
+            for doc in documents:
+                doc_number = str(doc.get("document_number") or doc.get("id") or "")
+                if not doc_number:
+                    self.logger.warning(
+                        "Skipping document missing 'document_number': %s", doc
+                    )
+                    continue
+                pending.append(
+                    (doc_number, pool.submit(self._fetch_paragraphs, doc_number, limiter))
+                )
+                if len(pending) >= window:
+                    number, future = pending.popleft()
+                    yield number, future.result()
+            while pending:
+                number, future = pending.popleft()
+                yield number, future.result()
 
     def run(
-        self, query: str, per_page: int = 100, delay: float = 1.0
+        self,
+        query: str,
+        per_page: int = 100,
+        delay: Optional[float] = None,
+        *,
+        max_workers: Optional[int] = None,
     ) -> List[ParagraphRecord]:
+        """Crawl ``query`` and return paragraphs not seen in earlier runs.
+
+        ``delay`` is the minimum spacing in seconds between requests to one
+        host (``0`` disables pacing); by default the crawler's
+        ``requests_per_second`` applies.
+        """
+
         new_records: List[ParagraphRecord] = []
+        document_hashes: Dict[str, str] = {}
+        unchanged = 0
         try:
             documents_iter = self.client.search_documents(query, per_page=per_page)
         except Exception as exc:
             self.logger.warning("Document search failed for query '%s': %s", query, exc)
             return []
 
-        for doc in documents_iter:
-            doc_number = str(doc.get("document_number") or doc.get("id") or "")
-            if not doc_number:
-                self.logger.warning(
-                    "Skipping document missing 'document_number': %s", doc
-                )
-                continue
-            try:
-                detail = self.client.get_document(doc_number)
-            except Exception as exc:
-                self.logger.warning("Failed to fetch document %s: %s", doc_number, exc)
-                continue
-            html_url: Optional[str] = None
-            for key in (
-                "body_html_url",
-                "html_url",
-                "html_url_publication",
-                "html_url_download",
-            ):
-                val = detail.get(key)
-                if isinstance(val, str) and val:
-                    html_url = val
-                    break
-            if not html_url:
-                self.logger.warning("No HTML URL found for document %s", doc_number)
+        if delay is None:
+            rate = self.requests_per_second
+        else:
+            rate = 1.0 / delay if delay > 0 else None
+        limiter = HostRateLimiter(rate)
+        workers = max(1, int(max_workers or self.max_workers))
+
+        for doc_number, fetched in self._iter_fetched(documents_iter, limiter, workers):
+            if fetched is None:
                 continue
-            html = self._download_html(html_url)
-            if not html:
+            html_sha, paragraphs = fetched
+            document_hashes[doc_number] = html_sha
+            if paragraphs is None:
+                unchanged += 1
                 continue
-            paragraphs = list(self._parse_paragraphs(html))
             for idx, text in enumerate(paragraphs):
                 sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
-                citations = self._extract_citations(text)
                 if sha in self.hash_index:
                     continue
+                citations = self._extract_citations(text)
                 key = (doc_number, idx)
                 version = self._position_versions.get(key, 0) + 1
                 record = ParagraphRecord(
@@ -191,11 +279,15 @@ class EARCrawler:
                 new_records.append(record)
                 self.hash_index[sha] = record
                 self._position_versions[key] = version
-            if delay > 0:
-                time.sleep(delay)
+        self.logger.debug("Rate limiter waits per host: %s", limiter.snapshot())
+        self.logger.debug(
+            "Skipped %d unchanged of %d fetched documents", unchanged, len(document_hashes)
+        )
         if new_records:
             with self.paragraphs_path.open("a", encoding="utf-8") as f:
                 for rec in new_records:
                     f.write(json.dumps(asdict(rec), ensure_ascii=False) + "\n")
-            self._save_index()
+            self._save_index(new_records)
+        # Only after the records are saved, so an interrupted run re-parses.
+        self._index_store.record_document_hashes(document_hashes)
         return new_records
@@ -7,10 +7,10 @@ from pathlib import Path
 from typing import Dict, Iterator, Iterable
 
 import json
-from bs4 import BeautifulSoup
 
 from api_clients.federalregister_client import FederalRegisterClient
 from .corpus_loader import CorpusLoader
+from .html_paragraphs import iter_paragraph_texts
 
 
 class EARLoader(CorpusLoader):
@@ -31,9 +31,7 @@ class EARLoader(CorpusLoader):
         self, doc_number: str, html: str
     ) -> Iterable[Dict[str, object]]:
         """Yield paragraph dictionaries from a document's HTML."""
-        soup = BeautifulSoup(html, "html.parser")
-        for idx, p in enumerate(soup.find_all("p")):
-            text = " ".join(p.get_text(" ").split())
+        for idx, text in enumerate(iter_paragraph_texts(html)):
             if not text:
                 continue
             yield {
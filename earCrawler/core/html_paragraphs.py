@@ -0,0 +1,92 @@
+"""Extract ``<p>`` paragraph text from Federal Register HTML.
+
+The default fast path streams the document through lxml's HTML parser and
+releases each paragraph once read. When lxml is not installed, or cannot
+parse the input, BeautifulSoup with ``html.parser`` is used instead. Both
+paths yield the same whitespace-normalised text for well-formed documents;
+they differ only on unclosed ``<p>`` tags, which libxml2 closes implicitly.
+"""
+
+from __future__ import annotations
+
+import io
+from typing import Iterator, Literal
+
+from bs4 import BeautifulSoup
+
+try:  # pragma: no cover - exercised via LXML_AVAILABLE
+    from lxml import etree as _etree
+except ImportError:  # pragma: no cover - lxml is optional
+    _etree = None
+
+LXML_AVAILABLE = _etree is not None
+
+ParserName = Literal["auto", "lxml", "bs4"]
+
+_SKIPPED_TAGS = frozenset({"script", "style"})
+
+
+def _normalise(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _element_text(element) -> str:
+    parts: list[str] = []
+
+    def _walk(node) -> None:
+        if node.text and isinstance(node.tag, str) and node.tag not in _SKIPPED_TAGS:
+            parts.append(node.text)
+        for child in node:
+            if isinstance(child.tag, str):  # comments and PIs contribute only their tail
+                _walk(child)
+            if child.tail:
+                parts.append(child.tail)
+
+    _walk(element)
+    return _normalise(" ".join(parts))
+
+
+def _iter_lxml(html: str) -> Iterator[str]:
+    if not html.lstrip().startswith("<"):
+        # libxml2 wraps leading bare text in an implied <p>; html.parser does not.
+        html = "<body>" + html
+    source = io.BytesIO(html.encode("utf-8"))
+    for _event, element in _etree.iterparse(
+        source, events=("end",), tag="p", html=True, encoding="utf-8"
+    ):
+        yield _element_text(element)
+        element.clear(keep_tail=True)
+
+
+def _iter_bs4(html: str) -> Iterator[str]:
+    soup = BeautifulSoup(html, "html.parser")
+    for p in soup.find_all("p"):
+        yield _normalise(p.get_text(" "))
+
+
+def iter_paragraph_texts(html: str, *, parser: ParserName = "auto") -> Iterator[str]:
+    """Yield the normalised text of every ``<p>`` in ``html``, in document order.
+
+    Empty paragraphs are yielded as ``""`` so callers can keep positional
+    indices stable.
+    """
+
+    if not html or not html.strip():
+        return
+    if parser == "bs4" or (parser == "auto" and not LXML_AVAILABLE):
+        yield from _iter_bs4(html)
+        return
+    if not LXML_AVAILABLE:
+        raise RuntimeError("lxml is not installed")
+    # Parse fully before yielding so a late parser error cannot leave the
+    # caller with a partial document followed by a bs4 re-parse.
+    try:
+        texts = list(_iter_lxml(html))
+    except _etree.LxmlError:
+        if parser == "lxml":
+            raise
+        texts = list(_iter_bs4(html))
+    yield from texts
+
+
+__all__ = ["LXML_AVAILABLE", "iter_paragraph_texts"]
@@ -1,16 +1,47 @@
-"""NSF/ORI case parser with deterministic entity extraction."""
+"""NSF/ORI case parser with deterministic entity extraction.
+
+Live runs fetch case pages on a bounded thread pool, paced per host and
+sharing one retry budget, and parse them on a process pool as they arrive.
+Cases are returned in listing order, as with a sequential crawl.
+"""
 
 from __future__ import annotations
 
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
 import hashlib
+import multiprocessing
 import re
 from pathlib import Path
-from typing import Dict, List
+from typing import Deque, Dict, List, Optional
 from urllib.parse import urljoin
 
 from bs4 import BeautifulSoup
 
 from api_clients.ori_client import ORIClient
+from earCrawler.core.rate_limit import HostRateLimiter, RetryBudget
+
+DEFAULT_FETCH_WORKERS = 4
+DEFAULT_PARSE_WORKERS = 2
+DEFAULT_REQUESTS_PER_SECOND = 4.0
+DEFAULT_RETRY_BUDGET = 16
+DEFAULT_ORI_CACHE_DIR = Path(".cache/api/ori")
+# Below this many cases, starting worker processes costs more than parsing.
+_MIN_CASES_FOR_PROCESS_POOL = 8
+
+
+def _parse_case_html(html: str, url: str) -> Dict[str, object]:
+    """Process-pool entry point; module level so it pickles under spawn."""
+
+    return NSFCaseParser().parse_from_html(html, url)
+
+
+class _InlineFuture:
+    def __init__(self, value: Dict[str, object]) -> None:
+        self._value = value
+
+    def result(self) -> Dict[str, object]:
+        return self._value
 
 
 class NSFCaseParser:
@@ -26,7 +57,20 @@ class NSFCaseParser:
     PERSON_RE = re.compile(r"\b[A-Z][a-z]+(?:\s+[A-Z][a-z]+)+")
     _LIVE_CASE_LINK_RE = re.compile(r"case-summary-|/case/", re.IGNORECASE)
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_FETCH_WORKERS,
+        parse_workers: int = DEFAULT_PARSE_WORKERS,
+        requests_per_second: Optional[float] = DEFAULT_REQUESTS_PER_SECOND,
+        retry_budget: int = DEFAULT_RETRY_BUDGET,
+        cache_dir: Optional[Path] = DEFAULT_ORI_CACHE_DIR,
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.parse_workers = max(0, int(parse_workers))
+        self.requests_per_second = requests_per_second
+        self.retry_budget = retry_budget
+        self.cache_dir = cache_dir
         self.last_upstream_status: dict[str, dict[str, object]] = {}
 
     @staticmethod
@@ -91,7 +135,11 @@ class NSFCaseParser:
         cases: List[Dict[str, object]] = []
         self.last_upstream_status = {}
         if live:
-            client = ORIClient()
+            client = ORIClient(
+                cache_dir=self.cache_dir,
+                retry_budget=RetryBudget(self.retry_budget),
+                pool_maxsize=max(10, self.max_workers),
+            )
             try:
                 listing_result_getter = getattr(client, "get_listing_html_result", None)
                 if callable(listing_result_getter):
@@ -105,20 +153,8 @@ class NSFCaseParser:
                 else:
                     listing_html = client.get_listing_html()
                 links = self._extract_live_case_links(listing_html, client.BASE_URL)
-                for link in links:
-                    url = urljoin(client.BASE_URL, link)
-                    case_result_getter = getattr(client, "get_case_html_result", None)
-                    if callable(case_result_getter):
-                        case_result = case_result_getter(url)
-                        case_html = str(getattr(case_result, "data", "") or "")
-                        case_state = str(
-                            getattr(getattr(case_result, "status", None), "state", "")
-                        )
-                        if case_state not in {"ok", "no_results"} or not case_html.strip():
-                            continue
-                    else:
-                        case_html = client.get_case_html(url)
-                    cases.append(self.parse_from_html(case_html, url))
+                urls = [urljoin(client.BASE_URL, link) for link in links]
+                cases = self._fetch_and_parse(client, urls)
             finally:
                 self.last_upstream_status = client.get_status_snapshot()
         else:
@@ -134,6 +170,63 @@ class NSFCaseParser:
                 cases.append(self.parse_from_html(case_html, case_path.as_posix()))
         return cases
 
+    @staticmethod
+    def _fetch_case(
+        client: ORIClient, url: str, limiter: HostRateLimiter
+    ) -> Optional[str]:
+        """Return case HTML, or ``None`` when the upstream is degraded."""
+
+        limiter.acquire(url)
+        case_result_getter = getattr(client, "get_case_html_result", None)
+        if callable(case_result_getter):
+            case_result = case_result_getter(url)
+            case_html = str(getattr(case_result, "data", "") or "")
+            case_state = str(getattr(getattr(case_result, "status", None), "state", ""))
+            if case_state not in {"ok", "no_results"} or not case_html.strip():
+                return None
+            return case_html
+        return client.get_case_html(url)
+
+    def _fetch_and_parse(
+        self, client: ORIClient, urls: List[str]
+    ) -> List[Dict[str, object]]:
+        """Fetch ``urls`` concurrently and parse each page as it arrives.
+
+        Fetches are consumed in listing order; each page is handed to the
+        parse pool straight away, so parsing overlaps the remaining fetches.
+        Worker processes are spawned (not forked) since fetch threads are
+        already running.
+        """
+
+        limiter = HostRateLimiter(self.requests_per_second)
+        parse_pool: Optional[Executor] = None
+        if self.parse_workers > 1 and len(urls) >= _MIN_CASES_FOR_PROCESS_POOL:
+            parse_pool = ProcessPoolExecutor(
+                max_workers=self.parse_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        parsed: Deque[Future | _InlineFuture] = deque()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="ori-fetch"
+            ) as fetch_pool:
+                fetches = [
+                    (url, fetch_pool.submit(self._fetch_case, client, url, limiter))
+                    for url in urls
+                ]
+                for url, fetch in fetches:
+                    case_html = fetch.result()
+                    if case_html is None:
+                        continue
+                    if parse_pool is None:
+                        parsed.append(_InlineFuture(self.parse_from_html(case_html, url)))
+                    else:
+                        parsed.append(parse_pool.submit(_parse_case_html, case_html, url))
+            return [future.result() for future in parsed]
+        finally:
+            if parse_pool is not None:
+                parse_pool.shutdown(cancel_futures=True)
+
     @classmethod
     def _extract_live_case_links(cls, listing_html: str, base_url: str) -> List[str]:
         listing = BeautifulSoup(listing_html, "html.parser")
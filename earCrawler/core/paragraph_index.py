@@ -0,0 +1,243 @@
+"""SQLite-backed hash index of crawled EAR paragraphs.
+
+Replaces the single ``hash_index.json`` file the crawler used to read in full
+on start-up and rewrite in full after every run. Records are keyed by
+SHA-256 with a secondary index on ``(document_number, paragraph_index)`` for
+version lookups, so opening the index costs nothing and a run only inserts
+the paragraphs it discovered. The SHA-256 of each document's HTML is kept
+alongside, so an unchanged document can be skipped without parsing it.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from earCrawler.core.ear_crawler import ParagraphRecord
+
+logger = logging.getLogger(__name__)
+
+Position = Tuple[str, int]
+
+
+def _record_from_json(payload: str) -> "ParagraphRecord":
+    from earCrawler.core.ear_crawler import ParagraphRecord
+
+    return ParagraphRecord(**json.loads(payload))
+
+
+class ParagraphHashIndex:
+    """Mapping-like ``sha256 -> ParagraphRecord`` store persisted in SQLite (WAL).
+
+    Assignments are staged in memory until :meth:`add_many` or :meth:`flush`
+    writes them in one transaction. Lookups see staged records too. When the
+    database is empty and ``legacy_json`` exists, the old JSON index is
+    imported once and renamed to ``<name>.migrated``. Document HTML hashes are
+    read from crawler worker threads, so connection use is serialised.
+    """
+
+    def __init__(self, path: Path | str, *, legacy_json: Path | str | None = None) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._staged: Dict[str, "ParagraphRecord"] = {}
+        self._staged_versions: Dict[Position, int] = {}
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS paragraphs ("
+            " sha256 TEXT PRIMARY KEY,"
+            " document_number TEXT NOT NULL,"
+            " paragraph_index INTEGER NOT NULL,"
+            " version INTEGER NOT NULL,"
+            " record TEXT NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS paragraphs_position"
+            " ON paragraphs(document_number, paragraph_index, version)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            " document_number TEXT PRIMARY KEY,"
+            " html_sha256 TEXT NOT NULL)"
+        )
+        if legacy_json is not None:
+            self._migrate_legacy(Path(legacy_json))
+
+    def _migrate_legacy(self, legacy_json: Path) -> None:
+        if not legacy_json.exists():
+            return
+        if self._fetchone("SELECT 1 FROM paragraphs LIMIT 1"):
+            return
+        from earCrawler.core.ear_crawler import ParagraphRecord
+
+        try:
+            data = json.loads(legacy_json.read_text(encoding="utf-8"))
+            records = [ParagraphRecord(**rec) for rec in data.values()]
+        except Exception as exc:
+            logger.warning("Failed to migrate hash index %s: %s", legacy_json, exc)
+            return
+        written = self.add_many(records)
+        legacy_json.replace(legacy_json.with_name(legacy_json.name + ".migrated"))
+        logger.info("Migrated %d records from %s to %s", written, legacy_json, self.path)
+
+    def _fetchone(self, sql: str, params: tuple = ()) -> Optional[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _is_stored(self, sha: object) -> bool:
+        return self._fetchone("SELECT 1 FROM paragraphs WHERE sha256 = ?", (sha,)) is not None
+
+    def __contains__(self, sha: object) -> bool:
+        return sha in self._staged or self._is_stored(sha)
+
+    def get(self, sha: str, default: Optional["ParagraphRecord"] = None):
+        staged = self._staged.get(sha)
+        if staged is not None:
+            return staged
+        row = self._fetchone("SELECT record FROM paragraphs WHERE sha256 = ?", (sha,))
+        return _record_from_json(row[0]) if row else default
+
+    def __getitem__(self, sha: str) -> "ParagraphRecord":
+        record = self.get(sha)
+        if record is None:
+            raise KeyError(sha)
+        return record
+
+    def __setitem__(self, sha: str, record: "ParagraphRecord") -> None:
+        self._staged[sha] = record
+        key = (record.document_number, int(record.paragraph_index))
+        self._staged_versions[key] = max(
+            int(record.version), self._staged_versions.get(key, 0)
+        )
+
+    def __len__(self) -> int:
+        (count,) = self._fetchone("SELECT COUNT(*) FROM paragraphs")
+        return int(count) + sum(1 for sha in self._staged if not self._is_stored(sha))
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            stored = [
+                sha
+                for (sha,) in self._conn.execute(
+                    "SELECT sha256 FROM paragraphs ORDER BY rowid"
+                )
+            ]
+        yield from stored
+        for sha in list(self._staged):
+            if not self._is_stored(sha):
+                yield sha
+
+    def values(self) -> Iterator["ParagraphRecord"]:
+        """Iterate every record; a full scan, for exports and tooling only."""
+
+        for sha in self:
+            yield self[sha]
+
+    def latest_version(self, document_number: str, paragraph_index: int) -> int:
+        """Highest version seen at a paragraph position, ``0`` when unseen."""
+
+        (stored,) = self._fetchone(
+            "SELECT MAX(version) FROM paragraphs"
+            " WHERE document_number = ? AND paragraph_index = ?",
+            (document_number, int(paragraph_index)),
+        )
+        key = (document_number, int(paragraph_index))
+        return max(int(stored or 0), self._staged_versions.get(key, 0))
+
+    def add_many(self, records: Iterable["ParagraphRecord"]) -> int:
+        """Insert ``records`` in one transaction and drop them from the stage."""
+
+        rows = [
+            (
+                rec.sha256,
+                rec.document_number,
+                int(rec.paragraph_index),
+                int(rec.version),
+                json.dumps(asdict(rec), ensure_ascii=False),
+            )
+            for rec in records
+        ]
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO paragraphs"
+                " (sha256, document_number, paragraph_index, version, record)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+        for row in rows:
+            self._staged.pop(row[0], None)
+        self._staged_versions = {}
+        for record in self._staged.values():
+            self[record.sha256] = record
+        return len(rows)
+
+    def flush(self) -> int:
+        """Write every staged record."""
+
+        return self.add_many(list(self._staged.values()))
+
+    def document_hash(self, document_number: str) -> Optional[str]:
+        """HTML SHA-256 recorded for ``document_number`` by the last crawl."""
+
+        row = self._fetchone(
+            "SELECT html_sha256 FROM documents WHERE document_number = ?",
+            (document_number,),
+        )
+        return row[0] if row else None
+
+    def record_document_hashes(self, hashes: Mapping[str, str]) -> None:
+        """Remember each document's HTML SHA-256 for the next crawl."""
+
+        if not hashes:
+            return
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO documents (document_number, html_sha256)"
+                " VALUES (?, ?)",
+                sorted(hashes.items()),
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class PositionVersions:
+    """``(document_number, paragraph_index) -> latest version`` view of an index."""
+
+    def __init__(self, index: ParagraphHashIndex) -> None:
+        self._index = index
+        self._assigned: Dict[Position, int] = {}
+
+    def get(self, key: Position, default: int = 0) -> int:
+        latest = max(self._assigned.get(key, 0), self._index.latest_version(*key))
+        return latest or default
+
+    def __getitem__(self, key: Position) -> int:
+        latest = self.get(key, 0)
+        if not latest:
+            raise KeyError(key)
+        return latest
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, tuple) and self.get(key, 0) > 0  # type: ignore[arg-type]
+
+    def __setitem__(self, key: Position, version: int) -> None:
+        self._assigned[key] = max(int(version), self._assigned.get(key, 0))
+
+
+__all__ = ["ParagraphHashIndex", "PositionVersions"]
@@ -0,0 +1,131 @@
+"""Blocking token-bucket rate limiting and retry budgets for outbound crawler requests."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``burst``.
+
+    :meth:`acquire` blocks until a token is available. Waiting callers reserve
+    their slot before sleeping, so concurrent callers are spaced ``1 / rate``
+    seconds apart rather than waking together.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self.waited_seconds = 0.0
+
+    def acquire(self) -> float:
+        """Take one token, sleeping if needed; return the time waited."""
+
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1.0
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            self.waited_seconds += wait
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+
+class HostRateLimiter:
+    """One :class:`TokenBucket` per host, created on first use.
+
+    A ``rate`` of ``None`` or ``<= 0`` disables limiting.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float],
+        burst: int = 1,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = float(rate) if rate and rate > 0 else None
+        self.burst = max(1, int(burst))
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def host_for(url_or_host: str) -> str:
+        parts = urlsplit(url_or_host)
+        return (parts.hostname or url_or_host).lower()
+
+    def acquire(self, url_or_host: str) -> float:
+        if self.rate is None:
+            return 0.0
+        host = self.host_for(url_or_host)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(
+                    self.rate, self.burst, clock=self._clock, sleep=self._sleep
+                )
+                self._buckets[host] = bucket
+        return bucket.acquire()
+
+    def snapshot(self) -> Dict[str, float]:
+        """Seconds spent waiting per host."""
+
+        with self._lock:
+            return {
+                host: round(bucket.waited_seconds, 6)
+                for host, bucket in sorted(self._buckets.items())
+            }
+
+
+class RetryBudget:
+    """Thread-safe cap on retries shared by every worker of one crawl.
+
+    A flaky upstream then costs at most ``max_retries`` backoff sleeps in
+    total instead of a full retry ladder per request.
+    """
+
+    def __init__(self, max_retries: int) -> None:
+        self.max_retries = max(0, int(max_retries))
+        self._lock = threading.Lock()
+        self.used = 0
+
+    def try_acquire(self) -> bool:
+        """Claim one retry; ``False`` once the budget is spent."""
+
+        with self._lock:
+            if self.used >= self.max_retries:
+                return False
+            self.used += 1
+            return True
+
+    @property
+    def remaining(self) -> int:
+        with self._lock:
+            return self.max_retries - self.used
+
+
+__all__ = ["HostRateLimiter", "RetryBudget", "TokenBucket"]
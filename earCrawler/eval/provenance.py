@@ -209,6 +209,8 @@ def _kg_expansion_snapshot(
     failure_policy: str | None = None,
 ) -> dict[str, object]:
     configured_provider = str(provider or env.get("EARCRAWLER_KG_EXPANSION_PROVIDER") or "").strip()
+    if not configured_provider and str(env.get("EARCRAWLER_KG_EXPANSION_ARTIFACT") or "").strip():
+        configured_provider = "artifact"
     if not configured_provider and str(env.get("EARCRAWLER_KG_EXPANSION_PATH") or "").strip():
         configured_provider = "json_stub"
     if not configured_provider:
@@ -5,7 +5,7 @@ from __future__ import annotations
 import os
 from typing import Any, Dict
 
-from .sparql import SPARQLClient
+from .sparql import DEFAULT_POOL_MAXSIZE, SPARQLClient, SPARQLHTTPError
 
 DEFAULT_DATASET_URL = "http://localhost:3030/ear"
 
@@ -21,7 +21,13 @@ def _resolve_dataset_url(dataset_url: str | None) -> str:
 class JenaClient:
     """High level helper providing select/update ergonomics for Fuseki."""
 
-    def __init__(self, dataset_url: str | None = None, *, timeout: int = 15) -> None:
+    def __init__(
+        self,
+        dataset_url: str | None = None,
+        *,
+        timeout: int = 15,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ) -> None:
         self.dataset_url = _resolve_dataset_url(dataset_url)
         query_endpoint = (
             f"{self.dataset_url}/sparql"
@@ -39,6 +45,7 @@ class JenaClient:
             endpoint=query_endpoint,
             update_endpoint=update_endpoint,
             timeout=timeout,
+            pool_maxsize=pool_maxsize,
         )
 
     def select(self, query: str) -> Dict[str, Any]:
@@ -61,5 +68,24 @@ class JenaClient:
 
         self._client.update(query)
 
+    def load_ntriples(self, data: str, *, graph: str | None = None) -> None:
+        """Append N-Triples through the Graph Store Protocol ``/data`` endpoint."""
+
+        params = {"graph": graph} if graph else {"default": ""}
+        resp = self._client.session.post(
+            f"{self.dataset_url}/data",
+            params=params,
+            data=data.encode("utf-8"),
+            headers={"Content-Type": "application/n-triples"},
+            timeout=self._client.timeout,
+        )
+        if resp.status_code not in (200, 201, 204):
+            raise SPARQLHTTPError("GSP POST", resp.status_code)
+
+    def close(self) -> None:
+        """Release pooled connections."""
+
+        self._client.close()
+
 
 __all__ = ["DEFAULT_DATASET_URL", "JenaClient"]
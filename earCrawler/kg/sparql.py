@@ -1,15 +1,159 @@
 from __future__ import annotations
 
-"""Minimal SPARQL HTTP client for local Fuseki use."""
+"""Shared SPARQL HTTP client layer for Fuseki, with sync and async facades.
 
-from typing import Any, Dict, Optional
+Both facades keep connections alive in a bounded pool, accept gzip-encoded
+responses, switch from ``GET`` to ``POST`` once the URL-encoded query would
+exceed ``max_get_length`` characters, and can stream ``SELECT`` bindings
+without holding the whole result document in memory.
+"""
+
+from contextlib import closing
+from dataclasses import dataclass
+import json
+import re
+from typing import Any, AsyncIterable, AsyncIterator, Dict, Iterable, Iterator, Optional
 from urllib.parse import urlencode
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+
+SPARQL_RESULTS_JSON = "application/sparql-results+json"
+N_TRIPLES = "application/n-triples"
+DEFAULT_POOL_CONNECTIONS = 4
+DEFAULT_POOL_MAXSIZE = 16
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+DEFAULT_MAX_GET_LENGTH = 2048
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_BASE_HEADERS = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+
+
+class SPARQLHTTPError(RuntimeError):
+    """Raised when the SPARQL endpoint answers with an unexpected status."""
+
+    def __init__(self, operation: str, status_code: int) -> None:
+        super().__init__(f"SPARQL {operation} failed: {status_code}")
+        self.status_code = status_code
+
+
+@dataclass(frozen=True, slots=True)
+class _QueryRequest:
+    method: str
+    params: Optional[Dict[str, str]]
+    body: Optional[bytes]
+    headers: Dict[str, str]
+
+
+def _query_request(query: str, accept: str, max_get_length: int) -> _QueryRequest:
+    if len(urlencode({"query": query})) <= max_get_length:
+        return _QueryRequest("GET", {"query": query}, None, {"Accept": accept})
+    return _QueryRequest(
+        "POST",
+        None,
+        query.encode("utf-8"),
+        {"Accept": accept, "Content-Type": "application/sparql-query"},
+    )
+
+
+def _update_body(statement: str) -> tuple[str, Dict[str, str]]:
+    return (
+        urlencode({"update": statement}),
+        {"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+
+def _derive_update_endpoint(endpoint: str) -> str:
+    if endpoint.endswith("/sparql"):
+        return endpoint[: -len("/sparql")] + "/update"
+    return endpoint + "/update"
+
+
+class _BindingStreamDecoder:
+    """Incrementally pull binding objects out of a SPARQL JSON results document."""
+
+    _BINDINGS_KEY = re.compile(r'"bindings"\s*:\s*\[')
+    _SEPARATORS = re.compile(r"[\s,]*")
+
+    def __init__(self) -> None:
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._in_bindings = False
+        self._done = False
+
+    def feed(self, text: str) -> list[Dict[str, Any]]:
+        if self._done or not text:
+            return []
+        self._buffer += text
+        if not self._in_bindings:
+            match = self._BINDINGS_KEY.search(self._buffer)
+            if match is None:
+                # Keep a tail in case the key straddles two chunks.
+                self._buffer = self._buffer[-64:]
+                return []
+            self._buffer = self._buffer[match.end() :]
+            self._in_bindings = True
+
+        rows: list[Dict[str, Any]] = []
+        pos = 0
+        buffer = self._buffer
+        while True:
+            pos = self._SEPARATORS.match(buffer, pos).end()
+            if pos >= len(buffer):
+                break
+            if buffer[pos] == "]":
+                self._done = True
+                break
+            try:
+                row, pos_after = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                break  # incomplete object; wait for more input
+            rows.append(row)
+            pos = pos_after
+        self._buffer = "" if self._done else buffer[pos:]
+        return rows
+
+    def close(self) -> None:
+        if not self._done:
+            raise RuntimeError("Truncated or invalid SPARQL JSON results")
+
+
+def iter_sparql_bindings(chunks: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield raw binding objects from text chunks of a SPARQL JSON response."""
+
+    decoder = _BindingStreamDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    decoder.close()
+
+
+async def aiter_sparql_bindings(
+    chunks: AsyncIterable[str],
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of :func:`iter_sparql_bindings`."""
+
+    decoder = _BindingStreamDecoder()
+    async for chunk in chunks:
+        for row in decoder.feed(chunk):
+            yield row
+    decoder.close()
+
+
+def _pooled_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=max(1, int(pool_connections)),
+        pool_maxsize=max(1, int(pool_maxsize)),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(_BASE_HEADERS)
+    return session
 
 
 class SPARQLClient:
-    """Tiny wrapper around ``requests`` for talking to Fuseki."""
+    """Synchronous client backed by a pooled ``requests`` session."""
 
     def __init__(
         self,
@@ -17,33 +161,60 @@ class SPARQLClient:
         *,
         update_endpoint: Optional[str] = None,
         timeout: int = 15,
+        pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        max_get_length: int = DEFAULT_MAX_GET_LENGTH,
+        session: Optional[requests.Session] = None,
     ) -> None:
         self.endpoint = endpoint
-        self.update_endpoint = update_endpoint or self._derive_update_endpoint(endpoint)
-        self.session = requests.Session()
+        self.update_endpoint = update_endpoint or _derive_update_endpoint(endpoint)
+        self.session = session or _pooled_session(pool_connections, pool_maxsize)
         self.timeout = timeout
+        self.max_get_length = max_get_length
 
-    def _get(self, query: str, accept: str) -> requests.Response:
-        resp = self.session.get(
+    def _query(self, query: str, accept: str, *, stream: bool = False) -> requests.Response:
+        request = _query_request(query, accept, self.max_get_length)
+        extra = {"stream": True} if stream else {}
+        if request.method == "GET":
+            return self.session.get(
+                self.endpoint,
+                params=request.params,
+                headers=request.headers,
+                timeout=self.timeout,
+                **extra,
+            )
+        return self.session.post(
             self.endpoint,
-            params={"query": query},
-            headers={"Accept": accept},
+            data=request.body,
+            headers=request.headers,
             timeout=self.timeout,
+            **extra,
         )
-        return resp
 
     def select(self, query: str) -> Dict[str, Any]:
         """Execute a ``SELECT`` query and return parsed JSON."""
 
-        resp = self._get(query, "application/sparql-results+json")
+        resp = self._query(query, SPARQL_RESULTS_JSON)
         if resp.status_code != 200:
-            raise RuntimeError(f"SPARQL SELECT failed: {resp.status_code}")
+            raise SPARQLHTTPError("SELECT", resp.status_code)
         try:
             data = resp.json()
         except ValueError as exc:  # pragma: no cover - invalid server response
             raise RuntimeError("Invalid JSON from SPARQL endpoint") from exc
         return data
 
+    def select_stream(self, query: str) -> Iterator[Dict[str, Any]]:
+        """Execute a ``SELECT`` query and yield raw bindings as they arrive."""
+
+        resp = self._query(query, SPARQL_RESULTS_JSON, stream=True)
+        with closing(resp):
+            if resp.status_code != 200:
+                raise SPARQLHTTPError("SELECT", resp.status_code)
+            resp.encoding = resp.encoding or "utf-8"
+            yield from iter_sparql_bindings(
+                resp.iter_content(chunk_size=STREAM_CHUNK_SIZE, decode_unicode=True)
+            )
+
     def ask(self, query: str) -> bool:
         """Execute an ``ASK`` query and return the boolean result."""
 
@@ -56,9 +227,9 @@ class SPARQLClient:
     def construct(self, query: str) -> str:
         """Execute a ``CONSTRUCT`` query returning N-Triples."""
 
-        resp = self._get(query, "application/n-triples")
+        resp = self._query(query, N_TRIPLES)
         if resp.status_code != 200:
-            raise RuntimeError(f"SPARQL CONSTRUCT failed: {resp.status_code}")
+            raise SPARQLHTTPError("CONSTRUCT", resp.status_code)
         return resp.text
 
     def update(self, query: str) -> None:
@@ -66,14 +237,15 @@ class SPARQLClient:
 
         if not self.update_endpoint:
             raise RuntimeError("No update endpoint configured for SPARQL client")
+        body, headers = _update_body(query)
         resp = self.session.post(
             self.update_endpoint,
-            headers={"Content-Type": "application/x-www-form-urlencoded"},
-            data=urlencode({"update": query}),
+            headers=headers,
+            data=body,
             timeout=self.timeout,
         )
         if resp.status_code not in (200, 204):
-            raise RuntimeError(f"SPARQL UPDATE failed: {resp.status_code}")
+            raise SPARQLHTTPError("UPDATE", resp.status_code)
 
     def close(self) -> None:
         try:
@@ -81,8 +253,119 @@ class SPARQLClient:
         except Exception:
             pass
 
-    @staticmethod
-    def _derive_update_endpoint(endpoint: str) -> str:
-        if endpoint.endswith("/sparql"):
-            return endpoint[: -len("/sparql")] + "/update"
-        return endpoint + "/update"
+
+class AsyncSPARQLClient:
+    """Asynchronous client backed by a pooled ``httpx.AsyncClient``.
+
+    The underlying client is created on first use so it binds to the event
+    loop that actually issues the queries.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = "http://localhost:3030/ear/sparql",
+        *,
+        update_endpoint: Optional[str] = None,
+        timeout: float = 15.0,
+        max_connections: int = DEFAULT_POOL_MAXSIZE,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: float = DEFAULT_KEEPALIVE_EXPIRY_SECONDS,
+        max_get_length: int = DEFAULT_MAX_GET_LENGTH,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> None:
+        self.endpoint = endpoint
+        self.update_endpoint = update_endpoint or _derive_update_endpoint(endpoint)
+        self.timeout = timeout
+        self.max_get_length = max_get_length
+        self.limits = httpx.Limits(
+            max_connections=max(1, int(max_connections)),
+            max_keepalive_connections=max(
+                1, int(max_keepalive_connections or max_connections)
+            ),
+            keepalive_expiry=keepalive_expiry,
+        )
+        self._client = client
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout, limits=self.limits, headers=_BASE_HEADERS
+            )
+        return self._client
+
+    def _build_request(self, query: str, accept: str) -> httpx.Request:
+        request = _query_request(query, accept, self.max_get_length)
+        return self._ensure_client().build_request(
+            request.method,
+            self.endpoint,
+            params=request.params,
+            content=request.body,
+            headers=request.headers,
+        )
+
+    async def select(self, query: str) -> Dict[str, Any]:
+        """Execute a ``SELECT`` (or ``ASK``) query and return parsed JSON."""
+
+        resp = await self._ensure_client().send(
+            self._build_request(query, SPARQL_RESULTS_JSON)
+        )
+        if resp.status_code != 200:
+            raise SPARQLHTTPError("SELECT", resp.status_code)
+        try:
+            return resp.json()
+        except ValueError as exc:  # pragma: no cover - invalid server response
+            raise RuntimeError("Invalid JSON from SPARQL endpoint") from exc
+
+    async def select_stream(self, query: str) -> AsyncIterator[Dict[str, Any]]:
+        """Execute a ``SELECT`` query and yield raw bindings as they arrive."""
+
+        resp = await self._ensure_client().send(
+            self._build_request(query, SPARQL_RESULTS_JSON), stream=True
+        )
+        try:
+            if resp.status_code != 200:
+                raise SPARQLHTTPError("SELECT", resp.status_code)
+            async for row in aiter_sparql_bindings(resp.aiter_text(STREAM_CHUNK_SIZE)):
+                yield row
+        finally:
+            await resp.aclose()
+
+    async def ask(self, query: str) -> bool:
+        data = await self.select(query)
+        try:
+            return bool(data["boolean"])
+        except KeyError as exc:  # pragma: no cover
+            raise RuntimeError("Missing boolean result") from exc
+
+    async def construct(self, query: str) -> str:
+        resp = await self._ensure_client().send(self._build_request(query, N_TRIPLES))
+        if resp.status_code != 200:
+            raise SPARQLHTTPError("CONSTRUCT", resp.status_code)
+        return resp.text
+
+    async def update(self, query: str) -> None:
+        body, headers = _update_body(query)
+        resp = await self._ensure_client().post(
+            self.update_endpoint, content=body.encode("utf-8"), headers=headers
+        )
+        if resp.status_code not in (200, 204):
+            raise SPARQLHTTPError("UPDATE", resp.status_code)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            finally:
+                self._client = None
+
+
+__all__ = [
+    "AsyncSPARQLClient",
+    "DEFAULT_MAX_GET_LENGTH",
+    "DEFAULT_POOL_CONNECTIONS",
+    "DEFAULT_POOL_MAXSIZE",
+    "SPARQLClient",
+    "SPARQLHTTPError",
+    "aiter_sparql_bindings",
+    "iter_sparql_bindings",
+]
@@ -8,8 +8,10 @@ from .ear_parts_loader import (  # noqa: F401
     upsert_part,
     upsert_part_anchor,
 )
+from .update_writer import BatchedUpdateWriter  # noqa: F401
 
 __all__ = [
+    "BatchedUpdateWriter",
     "link_entities_to_parts_by_name_contains",
     "link_entity_to_part",
     "load_csl_by_query",
@@ -14,13 +14,18 @@ from earCrawler.loaders.sparql_utils import (
     load_sparql_template,
     sanitize_curie_token,
 )
+from earCrawler.loaders.update_writer import (
+    DEFAULT_MAX_OPERATIONS,
+    BatchedUpdateWriter,
+    UpdateClient,
+)
 from earCrawler.transforms import CanonicalRegistry
 from earCrawler.transforms.csl_to_rdf import entity_iri, to_bindings
 
 ENTITY_TEMPLATE_NAME = "upsert_entity.sparql"
 
 
-def upsert_entity(jena: JenaClient, bindings: dict) -> None:
+def upsert_entity(jena: UpdateClient, bindings: dict) -> None:
     """Upsert a single entity into Fuseki using the SPARQL template."""
 
     template = load_sparql_template(ENTITY_TEMPLATE_NAME)
@@ -48,8 +53,12 @@ def load_csl_by_query(
     registry: CanonicalRegistry | None = None,
     provenance: ProvenanceRecorder | None = None,
     search_fn: Callable[..., Iterable[dict]] | None = None,
+    batch_size: int = DEFAULT_MAX_OPERATIONS,
 ) -> int:
-    """Fetch entities for ``query`` and load them into Fuseki."""
+    """Fetch entities for ``query`` and load them into Fuseki.
+
+    Updates are buffered and sent ``batch_size`` operations at a time.
+    """
 
     client = jena or JenaClient()
     registry = registry or CanonicalRegistry()
@@ -57,47 +66,48 @@ def load_csl_by_query(
     search_fn = search_fn or search_entities
     results = search_fn(query, size=limit, sources=list(sources) if sources else None)
     count = 0
-    for record in results:
-        canonical = registry.canonical_entity(record)
-        source_url = (
-            canonical.get("source_url")
-            or record.get("source_url")
-            or record.get("source_list_url")
-            or record.get("url")
-            or ""
-        )
-        retrieved_at = (
-            canonical.get("retrieved_at")
-            or record.get("retrieved_at")
-            or record.get("updated_at")
-            or record.get("date_updated")
-        )
-        request_url = (
-            canonical.get("request_url") or record.get("request_url") or source_url
-        )
-        bindings = to_bindings(canonical)
-        payload = {
-            "id": bindings["id"],
-            "name": bindings["name"],
-            "country": bindings["country"],
-            "programs": bindings["programs"],
-            "source": bindings["source"],
-        }
-        content_hash = hashlib.sha256(
-            json.dumps(payload, sort_keys=True).encode("utf-8")
-        ).hexdigest()
-        subject = registry.resolve_deprecated(entity_iri({"id": bindings["id"]}))
-        changed = prov.record(
-            subject,
-            source_url=source_url,
-            provider_domain="trade.gov",
-            content_hash=content_hash,
-            retrieved_at=retrieved_at,
-            request_url=request_url,
-        )
-        if changed:
-            upsert_entity(client, bindings)
-            count += 1
+    with BatchedUpdateWriter(client, max_operations=batch_size) as writer:
+        for record in results:
+            canonical = registry.canonical_entity(record)
+            source_url = (
+                canonical.get("source_url")
+                or record.get("source_url")
+                or record.get("source_list_url")
+                or record.get("url")
+                or ""
+            )
+            retrieved_at = (
+                canonical.get("retrieved_at")
+                or record.get("retrieved_at")
+                or record.get("updated_at")
+                or record.get("date_updated")
+            )
+            request_url = (
+                canonical.get("request_url") or record.get("request_url") or source_url
+            )
+            bindings = to_bindings(canonical)
+            payload = {
+                "id": bindings["id"],
+                "name": bindings["name"],
+                "country": bindings["country"],
+                "programs": bindings["programs"],
+                "source": bindings["source"],
+            }
+            content_hash = hashlib.sha256(
+                json.dumps(payload, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            subject = registry.resolve_deprecated(entity_iri({"id": bindings["id"]}))
+            changed = prov.record(
+                subject,
+                source_url=source_url,
+                provider_domain="trade.gov",
+                content_hash=content_hash,
+                retrieved_at=retrieved_at,
+                request_url=request_url,
+            )
+            if changed:
+                upsert_entity(writer, bindings)
+                count += 1
     prov.flush()
     return count
 
@@ -17,6 +17,11 @@ from earCrawler.loaders.sparql_utils import (
     load_sparql_template,
     sanitize_curie_token,
 )
+from earCrawler.loaders.update_writer import (
+    DEFAULT_MAX_OPERATIONS,
+    BatchedUpdateWriter,
+    UpdateClient,
+)
 from earCrawler.policy import HINTS_FILE, load_hints, hints_manifest
 from earCrawler.transforms import MentionExtractor
 from earCrawler.transforms.ear_fr_to_rdf import extract_parts_from_text, pick_parts
@@ -26,7 +31,7 @@ PART_ANCHOR_TEMPLATE_NAME = "upsert_part_anchor.sparql"
 POLICY_HINT_TEMPLATE_NAME = "upsert_policy_hint.sparql"
 
 
-def upsert_part(jena: JenaClient, part_no: str) -> None:
+def upsert_part(jena: UpdateClient, part_no: str) -> None:
     """Ensure the given part number exists as an EAR Part node."""
 
     template = load_sparql_template(PART_TEMPLATE_NAME)
@@ -40,7 +45,7 @@ def _anchor_identifier(part_no: str, anchor: Anchor) -> str:
     return hashlib.sha256(raw).hexdigest()[:16]
 
 
-def upsert_part_anchor(jena: JenaClient, part_no: str, anchor: Anchor) -> None:
+def upsert_part_anchor(jena: UpdateClient, part_no: str, anchor: Anchor) -> None:
     """Insert/update an anchor node linked to ``part_no``."""
 
     part_token = sanitize_curie_token(part_no, field_name="part_no")
@@ -61,7 +66,7 @@ def upsert_part_anchor(jena: JenaClient, part_no: str, anchor: Anchor) -> None:
 
 
 def link_entity_to_part(
-    jena: JenaClient,
+    jena: UpdateClient,
     entity_id: str,
     part_no: str,
     *,
@@ -124,8 +129,12 @@ def load_parts_from_fr(
     search_fn: Callable[..., dict] | None = None,
     entity_names: Mapping[str, str] | None = None,
     policy_path: Path | None = None,
+    batch_size: int = DEFAULT_MAX_OPERATIONS,
 ) -> Set[str]:
-    """Search the Federal Register for ``term`` and upsert referenced parts."""
+    """Search the Federal Register for ``term`` and upsert referenced parts.
+
+    Updates are buffered and sent ``batch_size`` operations at a time.
+    """
 
     client = jena or JenaClient()
     prov = provenance or ProvenanceRecorder()
@@ -172,52 +181,53 @@ def load_parts_from_fr(
                             part_entity_scores[part][entity_id] = strength
             discovered.update(parts)
 
-    for part, hits in part_hits.items():
-        sorted_hits = sorted(hits, key=lambda a: (a.document_id, a.title.lower()))
-        anchors.update_part(part, sorted_hits)
-        payload = [
-            {
-                "doc": a.document_id,
-                "url": a.source_url,
-                "snippet": a.snippet,
-                "pub": a.publication_date,
-            }
-            for a in sorted_hits
-        ]
-        content_hash = hashlib.sha256(
-            json.dumps(payload, sort_keys=True).encode("utf-8")
-        ).hexdigest()
-        first = sorted_hits[0] if sorted_hits else None
-        changed = prov.record(
-            f"https://ear.example.org/part/{part}",
-            source_url=(first.source_url if first else ""),
-            provider_domain="federalregister.gov",
-            content_hash=content_hash,
-            retrieved_at=first.publication_date if first else None,
-            request_url=first.source_url if first else None,
-        )
-        if changed:
-            upsert_part(client, part)
-            for anchor in sorted_hits:
-                upsert_part_anchor(client, part, anchor)
-
-    for part, entity_scores in part_entity_scores.items():
-        for entity_id, strength in entity_scores.items():
-            mention_subject = f"https://ear.example.org/mention/{entity_id}_{part}"
+    with BatchedUpdateWriter(client, max_operations=batch_size) as writer:
+        for part, hits in part_hits.items():
+            sorted_hits = sorted(hits, key=lambda a: (a.document_id, a.title.lower()))
+            anchors.update_part(part, sorted_hits)
+            payload = [
+                {
+                    "doc": a.document_id,
+                    "url": a.source_url,
+                    "snippet": a.snippet,
+                    "pub": a.publication_date,
+                }
+                for a in sorted_hits
+            ]
+            content_hash = hashlib.sha256(
+                json.dumps(payload, sort_keys=True).encode("utf-8")
+            ).hexdigest()
+            first = sorted_hits[0] if sorted_hits else None
             changed = prov.record(
-                mention_subject,
-                source_url=f"https://ear.example.org/mention/{entity_id}/{part}",
-                provider_domain="ear.ai",
-                content_hash=f"{strength:.3f}",
+                f"https://ear.example.org/part/{part}",
+                source_url=(first.source_url if first else ""),
+                provider_domain="federalregister.gov",
+                content_hash=content_hash,
+                retrieved_at=first.publication_date if first else None,
+                request_url=first.source_url if first else None,
             )
             if changed:
-                link_entity_to_part(client, entity_id, part, strength=strength)
-
-    _apply_policy_hints(
-        client,
-        prov,
-        policy_path,
-    )
+                upsert_part(writer, part)
+                for anchor in sorted_hits:
+                    upsert_part_anchor(writer, part, anchor)
+
+        for part, entity_scores in part_entity_scores.items():
+            for entity_id, strength in entity_scores.items():
+                mention_subject = f"https://ear.example.org/mention/{entity_id}_{part}"
+                changed = prov.record(
+                    mention_subject,
+                    source_url=f"https://ear.example.org/mention/{entity_id}/{part}",
+                    provider_domain="ear.ai",
+                    content_hash=f"{strength:.3f}",
+                )
+                if changed:
+                    link_entity_to_part(writer, entity_id, part, strength=strength)
+
+        _apply_policy_hints(
+            writer,
+            prov,
+            policy_path,
+        )
 
     anchors.flush()
     prov.flush()
@@ -225,7 +235,7 @@ def load_parts_from_fr(
 
 
 def _apply_policy_hints(
-    jena: JenaClient,
+    jena: UpdateClient,
     provenance: ProvenanceRecorder,
     policy_path: Path | None,
 ) -> None:
@@ -251,7 +261,7 @@ def _apply_policy_hints(
         upsert_policy_hint(jena, hint)
 
 
-def upsert_policy_hint(jena: JenaClient, hint) -> None:
+def upsert_policy_hint(jena: UpdateClient, hint) -> None:
     part_token = sanitize_curie_token(hint.part, field_name="part_no")
     hint_id = sanitize_curie_token(
         hashlib.sha256(f"{part_token}:{hint.program}".encode("utf-8")).hexdigest()[:16],
@@ -290,12 +300,13 @@ SELECT ?id ?name WHERE {{
     response = jena.select(select)
     rows = response.get("results", {}).get("bindings", [])
     link_count = 0
-    for row in rows:
-        value = row["id"]["value"]
-        curie = value.rsplit("/", 1)[-1]
-        for part in parts_list:
-            link_entity_to_part(jena, curie, part)
-            link_count += 1
+    with BatchedUpdateWriter(jena) as writer:
+        for row in rows:
+            value = row["id"]["value"]
+            curie = value.rsplit("/", 1)[-1]
+            for part in parts_list:
+                link_entity_to_part(writer, curie, part)
+                link_count += 1
     return link_count
 
 
@@ -0,0 +1,246 @@
+"""Buffered SPARQL UPDATE writer shared by the KG loaders."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import logging
+import re
+import time
+from typing import Protocol
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_OPERATIONS = 200
+DEFAULT_MAX_BYTES = 256 * 1024
+
+_PREFIX_RE = re.compile(r"^\s*PREFIX\s+([A-Za-z][\w.-]*)?:\s*<([^>]*)>\s*$", re.IGNORECASE)
+_INSERT_DATA_RE = re.compile(r"^INSERT\s+DATA\s*\{(?P<body>.*)\}\s*$", re.IGNORECASE | re.DOTALL)
+_GRAPH_RE = re.compile(r"\bGRAPH\b", re.IGNORECASE)
+
+
+class UpdateClient(Protocol):
+    def update(self, query: str) -> None: ...
+
+
+@dataclass(slots=True)
+class _Operation:
+    text: str
+    insert_data: bool
+    prefixes: dict[str, str]
+
+    def render(self) -> str:
+        prologue = "".join(
+            f"PREFIX {name}: <{iri}>\n" for name, iri in sorted(self.prefixes.items())
+        )
+        if self.insert_data:
+            return f"{prologue}INSERT DATA {{\n{self.text}\n}}"
+        return prologue + self.text
+
+
+@dataclass(slots=True)
+class UpdateWriterStats:
+    operations: int = 0
+    merged_inserts: int = 0
+    batches: int = 0
+    requests: int = 0
+    bytes_sent: int = 0
+    discarded_operations: int = 0
+    total_seconds: float = 0.0
+    max_batch_seconds: float = 0.0
+    batch_seconds: list[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, object]:
+        return {
+            "operations": self.operations,
+            "merged_inserts": self.merged_inserts,
+            "batches": self.batches,
+            "requests": self.requests,
+            "bytes_sent": self.bytes_sent,
+            "discarded_operations": self.discarded_operations,
+            "total_seconds": round(self.total_seconds, 6),
+            "max_batch_seconds": round(self.max_batch_seconds, 6),
+        }
+
+
+def _split_prologue(statement: str) -> tuple[dict[str, str], str]:
+    prefixes: dict[str, str] = {}
+    lines = statement.strip().splitlines()
+    index = 0
+    for index, line in enumerate(lines):
+        if not line.strip():
+            continue
+        match = _PREFIX_RE.match(line)
+        if match is None:
+            break
+        prefixes[match.group(1) or ""] = match.group(2)
+    else:
+        index = len(lines)
+    return prefixes, "\n".join(lines[index:]).strip()
+
+
+class BatchedUpdateWriter:
+    """Accumulate SPARQL updates and send them in bounded multi-operation requests.
+
+    Each buffered statement becomes one operation of a single SPARQL Update
+    request (operations joined with ``;``), so a batch costs one round trip and
+    one Fuseki transaction. Consecutive ``INSERT DATA`` operations are merged
+    into one block; every operation keeps its own ``PREFIX`` prologue, since
+    not every engine carries prefixes across ``;``. A batch is sent once it reaches ``max_operations`` operations or
+    ``max_bytes`` of operation text, and on :meth:`flush`. Used as a context
+    manager the writer flushes on a clean exit; when the body raises, the
+    operations still buffered are discarded (and logged) rather than sent, so
+    a failed load does not commit a half-built batch after the error.
+
+    With ``graph_store=True`` merged ``INSERT DATA`` runs are posted as
+    N-Triples through the client's ``load_ntriples`` (Graph Store Protocol)
+    instead of being parsed as SPARQL Update; operation order is preserved.
+    """
+
+    def __init__(
+        self,
+        client: UpdateClient,
+        *,
+        max_operations: int = DEFAULT_MAX_OPERATIONS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        graph_store: bool = False,
+    ) -> None:
+        if graph_store and not hasattr(client, "load_ntriples"):
+            raise ValueError("graph_store=True requires a client with load_ntriples()")
+        self.client = client
+        self.max_operations = max(1, int(max_operations))
+        self.max_bytes = max(1, int(max_bytes))
+        self.graph_store = graph_store
+        self.stats = UpdateWriterStats()
+        self._operations: list[_Operation] = []
+        self._pending_bytes = 0
+
+    def __enter__(self) -> "BatchedUpdateWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+
+    def discard(self) -> int:
+        """Drop everything buffered so far without sending it."""
+
+        dropped = len(self._operations)
+        self._operations = []
+        self._pending_bytes = 0
+        if dropped:
+            self.stats.discarded_operations += dropped
+            logger.warning(
+                "sparql update writer discarded %d buffered operations after an error",
+                dropped,
+            )
+        return dropped
+
+    def __getattr__(self, name: str):
+        # Reads (``select``/``ask``) go straight to the wrapped client.
+        if name == "client":
+            raise AttributeError(name)
+        return getattr(self.client, name)
+
+    def update(self, statement: str) -> None:
+        """Buffer ``statement``; sends a batch when a bound is reached."""
+
+        prefixes, body = _split_prologue(statement)
+        if not body:
+            return
+        self.stats.operations += 1
+
+        match = _INSERT_DATA_RE.match(body)
+        if match is not None and not _GRAPH_RE.search(match.group("body")):
+            triples = match.group("body").strip()
+            if not triples.endswith("."):
+                triples += " ."
+            last = self._operations[-1] if self._operations else None
+            if (
+                last is not None
+                and last.insert_data
+                and all(last.prefixes.get(name, iri) == iri for name, iri in prefixes.items())
+            ):
+                last.text += "\n" + triples
+                last.prefixes.update(prefixes)
+                self.stats.merged_inserts += 1
+            else:
+                self._operations.append(_Operation(triples, True, dict(prefixes)))
+            self._pending_bytes += len(triples)
+        else:
+            self._operations.append(_Operation(body, False, prefixes))
+            self._pending_bytes += len(body)
+
+        if (
+            len(self._operations) >= self.max_operations
+            or self._pending_bytes >= self.max_bytes
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Send everything buffered so far."""
+
+        if not self._operations:
+            return
+        operations, self._operations = self._operations, []
+        self._pending_bytes = 0
+
+        started = time.perf_counter()
+        requests_before = self.stats.requests
+        if self.graph_store:
+            run: list[_Operation] = []
+            for operation in operations:
+                if operation.insert_data:
+                    self._send_update(run)
+                    run = []
+                    self._send_ntriples(operation)
+                else:
+                    run.append(operation)
+            self._send_update(run)
+        else:
+            self._send_update(operations)
+        elapsed = time.perf_counter() - started
+
+        self.stats.batches += 1
+        self.stats.total_seconds += elapsed
+        self.stats.max_batch_seconds = max(self.stats.max_batch_seconds, elapsed)
+        self.stats.batch_seconds.append(elapsed)
+        logger.debug(
+            "sparql update batch: %d operations, %d requests, %.3fs",
+            len(operations),
+            self.stats.requests - requests_before,
+            elapsed,
+        )
+
+    def _send_update(self, operations: list[_Operation]) -> None:
+        if not operations:
+            return
+        request = " ;\n".join(operation.render() for operation in operations)
+        self.client.update(request)
+        self.stats.requests += 1
+        self.stats.bytes_sent += len(request.encode("utf-8"))
+
+    def _send_ntriples(self, operation: _Operation) -> None:
+        from rdflib import Graph
+
+        turtle = "".join(
+            f"@prefix {name}: <{iri}> .\n" for name, iri in operation.prefixes.items()
+        )
+        graph = Graph()
+        graph.parse(data=turtle + operation.text, format="turtle")
+        payload = graph.serialize(format="nt")
+        if isinstance(payload, bytes):  # rdflib < 6
+            payload = payload.decode("utf-8")
+        self.client.load_ntriples(payload)
+        self.stats.requests += 1
+        self.stats.bytes_sent += len(payload.encode("utf-8"))
+
+
+__all__ = [
+    "BatchedUpdateWriter",
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_MAX_OPERATIONS",
+    "UpdateClient",
+    "UpdateWriterStats",
+]
@@ -90,6 +90,7 @@ _FUSEKI_RESPONSES = {
         }
     ],
 }
+_FUSEKI_RESPONSES["lineage_by_ids"] = _FUSEKI_RESPONSES["lineage_by_id"]
 
 
 @dataclass(frozen=True)
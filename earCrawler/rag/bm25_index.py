@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+"""Numpy-backed inverted BM25 index for hybrid retrieval.
+
+Postings are stored as flat ``(doc, tf)`` arrays sliced by per-term offsets, so
+query scoring only touches the postings of the query terms. The index is built
+at index-build time and persisted next to ``index.meta.json``.
+"""
+
+import os
+from collections import Counter
+from math import log
+from pathlib import Path
+from typing import Mapping
+
+from earCrawler.rag.retriever_ranking import (
+    BM25_B,
+    BM25_K1,
+    document_text_for_bm25,
+    public_result_doc,
+    tokenize_for_bm25,
+)
+
+BM25_INDEX_VERSION = "bm25-index.v1"
+BM25_INDEX_SUFFIX = ".bm25.npz"
+
+
+def bm25_index_path(index_path: Path, meta_path: Path | None = None) -> Path:
+    """Return the BM25 sidecar path for ``index_path`` (next to the metadata)."""
+
+    index_path = Path(index_path)
+    parent = Path(meta_path).parent if meta_path is not None else index_path.parent
+    return parent / f"{index_path.stem}{BM25_INDEX_SUFFIX}"
+
+
+def _state_from_arrays(
+    np_mod,
+    *,
+    terms: list[str],
+    offsets,
+    docs,
+    tfs,
+    doc_lengths,
+) -> dict[str, object]:
+    doc_count = max(1, int(doc_lengths.shape[0]))
+    avg_doc_length = float(sum(doc_lengths.tolist())) / doc_count
+    idf = np_mod.asarray(
+        [
+            log(1.0 + ((doc_count - freq + 0.5) / (freq + 0.5)))
+            for freq in np_mod.diff(offsets).tolist()
+        ],
+        dtype="float64",
+    )
+    return {
+        "terms": {term: idx for idx, term in enumerate(terms)},
+        "offsets": offsets,
+        "docs": docs,
+        "tfs": tfs,
+        "doc_lengths": doc_lengths,
+        "avg_doc_length": avg_doc_length,
+        "idf": idf,
+    }
+
+
+def build_bm25_index(np_mod, metadata: list[dict]) -> dict[str, object]:
+    """Build the inverted index state for ``metadata`` rows."""
+
+    postings: dict[str, list[tuple[int, int]]] = {}
+    doc_lengths: list[int] = []
+    for doc_idx, row in enumerate(metadata):
+        terms = Counter(tokenize_for_bm25(document_text_for_bm25(row)))
+        doc_lengths.append(int(sum(terms.values())))
+        for term, tf in terms.items():
+            postings.setdefault(term, []).append((doc_idx, int(tf)))
+
+    vocab = sorted(postings)
+    offsets = np_mod.zeros(len(vocab) + 1, dtype="int64")
+    docs: list[int] = []
+    tfs: list[int] = []
+    for term_idx, term in enumerate(vocab):
+        entries = postings[term]
+        offsets[term_idx + 1] = offsets[term_idx] + len(entries)
+        docs.extend(doc for doc, _tf in entries)
+        tfs.extend(tf for _doc, tf in entries)
+    return _state_from_arrays(
+        np_mod,
+        terms=vocab,
+        offsets=offsets,
+        docs=np_mod.asarray(docs, dtype="int32"),
+        tfs=np_mod.asarray(tfs, dtype="int32"),
+        doc_lengths=np_mod.asarray(doc_lengths, dtype="int32"),
+    )
+
+
+def write_bm25_index(
+    path: Path,
+    state: Mapping[str, object],
+    *,
+    np_mod,
+    corpus_digest: str | None,
+) -> dict[str, object]:
+    """Persist ``state`` as an uncompressed ``.npz`` and return its descriptor."""
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    terms_map = state["terms"]
+    assert isinstance(terms_map, Mapping)
+    vocab = sorted(terms_map, key=terms_map.__getitem__)
+    # Tokens never contain newlines (see TOKEN_RE), so a joined blob is lossless.
+    terms_blob = np_mod.frombuffer("\n".join(vocab).encode("utf-8"), dtype="uint8")
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        np_mod.savez(
+            fh,
+            terms=terms_blob,
+            offsets=state["offsets"],
+            docs=state["docs"],
+            tfs=state["tfs"],
+            doc_lengths=state["doc_lengths"],
+        )
+    os.replace(tmp_path, path)
+    doc_lengths = state["doc_lengths"]
+    return {
+        "schema_version": BM25_INDEX_VERSION,
+        "file": path.name,
+        "corpus_digest": corpus_digest,
+        "doc_count": int(getattr(doc_lengths, "shape", [0])[0]),
+        "term_count": len(vocab),
+        "k1": BM25_K1,
+        "b": BM25_B,
+    }
+
+
+def load_bm25_index(
+    meta_path: Path,
+    descriptor: Mapping[str, object] | None,
+    *,
+    np_mod,
+    corpus_digest: str | None,
+    row_count: int,
+) -> dict[str, object] | None:
+    """Load the persisted index, or ``None`` when absent or stale."""
+
+    if not isinstance(descriptor, Mapping):
+        return None
+    if descriptor.get("schema_version") != BM25_INDEX_VERSION:
+        return None
+    if not corpus_digest or descriptor.get("corpus_digest") != corpus_digest:
+        return None
+    file_name = str(descriptor.get("file") or "").strip()
+    if not file_name or Path(file_name).name != file_name:
+        return None
+    path = Path(meta_path).parent / file_name
+    if not path.exists():
+        return None
+    try:
+        with np_mod.load(str(path), allow_pickle=False) as payload:
+            blob = payload["terms"].tobytes().decode("utf-8")
+            offsets = payload["offsets"].astype("int64")
+            docs = payload["docs"].astype("int32")
+            tfs = payload["tfs"].astype("int32")
+            doc_lengths = payload["doc_lengths"].astype("int32")
+    except Exception:
+        return None
+    terms = blob.split("\n") if blob else []
+    if int(doc_lengths.shape[0]) != int(row_count) or len(terms) + 1 != int(offsets.shape[0]):
+        return None
+    return _state_from_arrays(
+        np_mod,
+        terms=terms,
+        offsets=offsets,
+        docs=docs,
+        tfs=tfs,
+        doc_lengths=doc_lengths,
+    )
+
+
+def score_bm25_index(np_mod, prompt: str, state: Mapping[str, object]):
+    """Return ``(doc_indices, scores)`` for docs matching at least one term."""
+
+    terms_map = state["terms"]
+    assert isinstance(terms_map, Mapping)
+    query_terms = [
+        terms_map[term]
+        for term in Counter(tokenize_for_bm25(prompt))
+        if term in terms_map
+    ]
+    if not query_terms:
+        return np_mod.empty(0, dtype="int64"), np_mod.empty(0, dtype="float64")
+
+    offsets = state["offsets"]
+    docs = state["docs"]
+    tfs = state["tfs"]
+    doc_lengths = state["doc_lengths"]
+    idf = state["idf"]
+    avg_doc_length = float(state.get("avg_doc_length") or 0.0)
+    denom_floor = avg_doc_length if avg_doc_length > 0 else 1.0
+
+    touched = np_mod.unique(
+        np_mod.concatenate(
+            [docs[offsets[t] : offsets[t + 1]] for t in query_terms]
+        ).astype("int64")
+    )
+    scores = np_mod.zeros(touched.shape[0], dtype="float64")
+    norms = 1.0 - BM25_B + (
+        BM25_B * (doc_lengths[touched].astype("float64") / denom_floor)
+    )
+    # Accumulate per term in query order so sums match the scalar formula.
+    for term_idx in query_terms:
+        term_idf = float(idf[term_idx])
+        if term_idf <= 0.0:
+            continue
+        start, end = int(offsets[term_idx]), int(offsets[term_idx + 1])
+        positions = np_mod.searchsorted(touched, docs[start:end])
+        tf = tfs[start:end].astype("float64")
+        scores[positions] += term_idf * (
+            (tf * (BM25_K1 + 1.0)) / (tf + (BM25_K1 * norms[positions]))
+        )
+    keep = scores > 0.0
+    return touched[keep], scores[keep]
+
+
+def rank_bm25_index(
+    np_mod,
+    prompt: str,
+    metadata: list[dict],
+    *,
+    state: Mapping[str, object],
+    tie_ranks,
+    k: int,
+) -> list[dict]:
+    """Rank ``metadata`` rows for ``prompt`` using the inverted index."""
+
+    candidates, scores = score_bm25_index(np_mod, prompt, state)
+    if candidates.shape[0] == 0:
+        return []
+    limit = max(1, int(k))
+    if candidates.shape[0] > limit:
+        window = np_mod.argpartition(-scores, limit - 1)[:limit]
+        keep = scores >= scores[window].min()
+        candidates, scores = candidates[keep], scores[keep]
+    order = np_mod.lexsort((tie_ranks[candidates], -scores))
+
+    results: list[dict] = []
+    for pos in order[:limit].tolist():
+        idx = int(candidates[pos])
+        score = float(scores[pos])
+        doc = public_result_doc(metadata[idx])
+        doc["score"] = score
+        doc["bm25_score"] = score
+        results.append(doc)
+    return results
+
+
+__all__ = [
+    "BM25_INDEX_SUFFIX",
+    "BM25_INDEX_VERSION",
+    "bm25_index_path",
+    "build_bm25_index",
+    "load_bm25_index",
+    "rank_bm25_index",
+    "score_bm25_index",
+    "write_bm25_index",
+]
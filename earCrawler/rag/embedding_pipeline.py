@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+"""Streaming corpus encoding for FAISS index builds.
+
+A corpus JSONL file is validated in one pass that keeps only byte offsets and
+text-free copies of each record, then re-read in ``doc_id`` order one batch at
+a time. Batches are encoded in-process or across a CPU process pool (one model
+per worker), and results come back in input order so row ids stay
+deterministic regardless of worker count.
+
+Only the encoding step streams. The index builder still keeps one metadata
+row per document, including its text, for the corpus digest, BM25 postings
+and ``index.meta.json``.
+"""
+
+import json
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from earCrawler.rag.corpus_contract import require_valid_corpus
+
+DEFAULT_EMBED_BATCH_SIZE = 256
+
+_WORKER_MODEL: Any = None
+
+
+def _light_doc(obj: dict) -> dict:
+    # Validation only checks that text is a non-empty string; keep a stand-in
+    # so cross-document checks (duplicates, parents) run without the text.
+    text = obj.get("text")
+    light = dict(obj)
+    if isinstance(text, str) and text.strip():
+        light["text"] = "x"
+    return light
+
+
+def scan_corpus_jsonl(path: Path) -> list[int]:
+    """Validate a corpus JSONL file and return line offsets in ``doc_id`` order.
+
+    Raises ``ValueError`` with the same messages as ``load_corpus_jsonl`` and
+    ``require_valid_corpus``.
+    """
+
+    path = Path(path)
+    if not path.exists():
+        raise ValueError(f"Corpus not found: {path}")
+
+    light_docs: list[dict] = []
+    offsets: list[int] = []
+    offset = 0
+    with path.open("rb") as handle:
+        for lineno, raw in enumerate(handle, start=1):
+            start = offset
+            offset += len(raw)
+            stripped = raw.decode("utf-8").strip()
+            if not stripped:
+                continue
+            try:
+                obj = json.loads(stripped)
+            except Exception as exc:
+                raise ValueError(f"{path}:{lineno} invalid JSON: {exc}") from exc
+            if not isinstance(obj, dict):
+                raise ValueError(f"{path}:{lineno} expected object, got {type(obj).__name__}")
+            light_docs.append(_light_doc(obj))
+            offsets.append(start)
+    if not light_docs:
+        raise ValueError(f"No documents found in corpus: {path}")
+    require_valid_corpus(light_docs)
+    order = sorted(range(len(light_docs)), key=lambda i: str(light_docs[i].get("doc_id") or ""))
+    return [offsets[i] for i in order]
+
+
+def iter_corpus_batches(
+    path: Path, offsets: Sequence[int], batch_size: int
+) -> Iterator[list[dict]]:
+    """Yield documents at ``offsets`` in batches of ``batch_size``."""
+
+    batch_size = max(1, int(batch_size))
+    with Path(path).open("rb") as handle:
+        for start in range(0, len(offsets), batch_size):
+            batch: list[dict] = []
+            for offset in offsets[start : start + batch_size]:
+                handle.seek(offset)
+                batch.append(json.loads(handle.readline().decode("utf-8")))
+            yield batch
+
+
+def iter_doc_batches(docs: Sequence[dict], batch_size: int) -> Iterator[list[dict]]:
+    batch_size = max(1, int(batch_size))
+    for start in range(0, len(docs), batch_size):
+        yield list(docs[start : start + batch_size])
+
+
+def _doc_texts(docs: Sequence[dict]) -> list[str]:
+    return [str(doc.get("text") or "") for doc in docs]
+
+
+def _encode(model, texts: list[str]):
+    import numpy as np
+
+    return np.asarray(model.encode(texts, show_progress_bar=False)).astype("float32")
+
+
+def _init_worker(model_loader: Callable[[str], Any], model_name: str) -> None:
+    global _WORKER_MODEL
+    _WORKER_MODEL = model_loader(model_name)
+
+
+def _encode_in_worker(texts: list[str]):
+    return _encode(_WORKER_MODEL, texts)
+
+
+def encode_batches(
+    batches: Iterable[list[dict]],
+    *,
+    model_loader: Callable[[str], Any],
+    model_name: str,
+    workers: int = 1,
+    model: Any = None,
+) -> Iterator[tuple[list[dict], Any]]:
+    """Yield ``(docs, float32 vectors)`` for each batch, in input order.
+
+    With ``workers > 1`` batches are encoded by a process pool whose workers
+    each load the model once; at most ``2 * workers`` batches are in flight,
+    which bounds memory independently of corpus size.
+    """
+
+    workers = max(1, int(workers))
+    if workers == 1:
+        model = model if model is not None else model_loader(model_name)
+        for docs in batches:
+            yield docs, _encode(model, _doc_texts(docs))
+        return
+
+    pending: deque = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_loader, model_name),
+    ) as pool:
+        for docs in batches:
+            pending.append((docs, pool.submit(_encode_in_worker, _doc_texts(docs))))
+            if len(pending) >= workers * 2:
+                done_docs, future = pending.popleft()
+                yield done_docs, future.result()
+        while pending:
+            done_docs, future = pending.popleft()
+            yield done_docs, future.result()
+
+
+def _rss_mb(raw: float) -> float:
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    scale = 1024.0 * 1024.0 if sys.platform == "darwin" else 1024.0
+    return round(float(raw) / scale, 1)
+
+
+def peak_rss_mb() -> tuple[float | None, float | None]:
+    """Return ``(this process, largest finished child)`` peak RSS in MiB."""
+
+    try:
+        import resource
+    except ImportError:
+        resource = None  # type: ignore[assignment]
+    if resource is not None:
+        own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+        return _rss_mb(own), (_rss_mb(children) if children else None)
+    try:
+        import psutil  # type: ignore[import-not-found]
+    except ImportError:
+        return None, None
+    info = psutil.Process().memory_info()
+    peak = getattr(info, "peak_wset", None) or getattr(info, "rss", None)
+    return (round(peak / (1024.0 * 1024.0), 1) if peak else None), None
+
+
+@dataclass
+class EmbeddingBuildStats:
+    """Throughput and memory figures for one index build."""
+
+    docs: int = 0
+    batches: int = 0
+    batch_size: int = DEFAULT_EMBED_BATCH_SIZE
+    workers: int = 1
+    encode_seconds: float = 0.0
+    total_seconds: float = 0.0
+    peak_rss_mb: float | None = None
+    worker_peak_rss_mb: float | None = None
+
+    @property
+    def docs_per_s(self) -> float:
+        if self.encode_seconds <= 0:
+            return 0.0
+        return round(self.docs / self.encode_seconds, 2)
+
+    def finish(self, started: float) -> "EmbeddingBuildStats":
+        self.total_seconds = time.perf_counter() - started
+        self.peak_rss_mb, self.worker_peak_rss_mb = peak_rss_mb()
+        return self
+
+    def to_meta(self) -> dict[str, object]:
+        return {
+            "docs": self.docs,
+            "batches": self.batches,
+            "batch_size": self.batch_size,
+            "workers": self.workers,
+            "encode_seconds": round(self.encode_seconds, 3),
+            "total_seconds": round(self.total_seconds, 3),
+            "docs_per_s": self.docs_per_s,
+            "peak_rss_mb": self.peak_rss_mb,
+            "worker_peak_rss_mb": self.worker_peak_rss_mb,
+        }
+
+
+__all__ = [
+    "DEFAULT_EMBED_BATCH_SIZE",
+    "EmbeddingBuildStats",
+    "encode_batches",
+    "iter_corpus_batches",
+    "iter_doc_batches",
+    "peak_rss_mb",
+    "scan_corpus_jsonl",
+]
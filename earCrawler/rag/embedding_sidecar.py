@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+"""Versioned, memory-mappable embedding matrix sidecar for retrieval indexes."""
+
+import os
+from pathlib import Path
+from typing import Mapping
+
+EMBEDDING_SIDECAR_VERSION = "embedding-sidecar.v1"
+EMBEDDING_SIDECAR_SUFFIX = ".embeddings.npy"
+
+
+def embedding_sidecar_path(index_path: Path, meta_path: Path | None = None) -> Path:
+    """Return the sidecar path for ``index_path`` (placed next to the metadata)."""
+
+    index_path = Path(index_path)
+    parent = Path(meta_path).parent if meta_path is not None else index_path.parent
+    return parent / f"{index_path.stem}{EMBEDDING_SIDECAR_SUFFIX}"
+
+
+def normalize_embedding_rows(np_mod, matrix):
+    """Return ``matrix`` as float32 with unit-length rows (zero rows untouched)."""
+
+    matrix = np_mod.asarray(matrix).astype("float32")
+    norms = np_mod.linalg.norm(matrix, axis=1, keepdims=True)
+    zero_mask = norms == 0
+    if np_mod.any(zero_mask):
+        norms = norms.copy()
+        norms[zero_mask] = 1.0
+    return (matrix / norms).astype("float32")
+
+
+def write_embedding_sidecar(
+    path: Path,
+    matrix,
+    *,
+    np_mod,
+    corpus_digest: str | None,
+    embedding_model: str,
+) -> dict[str, object]:
+    """Persist a normalized float32 matrix and return its metadata descriptor.
+
+    The file is written to a temporary name and swapped into place so readers
+    that already mapped the previous sidecar keep a consistent view.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    normalized = normalize_embedding_rows(np_mod, matrix)
+    if normalized.ndim != 2:
+        raise ValueError("Embedding sidecar matrix must be two-dimensional.")
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        np_mod.save(fh, np_mod.ascontiguousarray(normalized), allow_pickle=False)
+    os.replace(tmp_path, path)
+    return _descriptor(path, normalized.shape, corpus_digest, embedding_model)
+
+
+def finalize_embedding_sidecar(
+    buffer_path: Path,
+    path: Path,
+    *,
+    np_mod,
+    corpus_digest: str | None,
+    embedding_model: str,
+    chunk_rows: int = 65536,
+) -> dict[str, object]:
+    """Normalize a raw float32 ``.npy`` buffer in place and move it to ``path``.
+
+    Streaming builds fill ``buffer_path`` batch by batch; rows are normalized
+    ``chunk_rows`` at a time so the whole matrix is never resident at once.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    matrix = np_mod.load(str(buffer_path), mmap_mode="r+", allow_pickle=False)
+    if matrix.ndim != 2 or str(matrix.dtype) != "float32":
+        raise ValueError("Embedding sidecar matrix must be two-dimensional float32.")
+    step = max(1, int(chunk_rows))
+    for start in range(0, int(matrix.shape[0]), step):
+        matrix[start : start + step] = normalize_embedding_rows(np_mod, matrix[start : start + step])
+    matrix.flush()
+    shape = matrix.shape
+    del matrix
+    os.replace(buffer_path, path)
+    return _descriptor(path, shape, corpus_digest, embedding_model)
+
+
+def _descriptor(path: Path, shape, corpus_digest: str | None, embedding_model: str) -> dict[str, object]:
+    return {
+        "schema_version": EMBEDDING_SIDECAR_VERSION,
+        "file": path.name,
+        "corpus_digest": corpus_digest,
+        "embedding_model": embedding_model,
+        "dtype": "float32",
+        "shape": [int(shape[0]), int(shape[1])],
+        "normalized": True,
+    }
+
+
+def load_embedding_sidecar(
+    meta_path: Path,
+    descriptor: Mapping[str, object] | None,
+    *,
+    np_mod,
+    corpus_digest: str | None,
+    embedding_model: str,
+    row_count: int,
+):
+    """Memory-map the sidecar described by ``descriptor`` read-only.
+
+    Returns ``None`` when the sidecar is absent or not bound to the given
+    corpus digest, model, and row count so callers can fall back to encoding.
+    """
+
+    if not isinstance(descriptor, Mapping):
+        return None
+    if descriptor.get("schema_version") != EMBEDDING_SIDECAR_VERSION:
+        return None
+    if not corpus_digest or descriptor.get("corpus_digest") != corpus_digest:
+        return None
+    if descriptor.get("embedding_model") != embedding_model:
+        return None
+    file_name = str(descriptor.get("file") or "").strip()
+    if not file_name or Path(file_name).name != file_name:
+        return None
+    path = Path(meta_path).parent / file_name
+    if not path.exists():
+        return None
+    try:
+        matrix = np_mod.load(str(path), mmap_mode="r", allow_pickle=False)
+    except Exception:
+        return None
+    if matrix.ndim != 2 or int(matrix.shape[0]) != int(row_count):
+        return None
+    if str(matrix.dtype) != "float32":
+        return None
+    expected_shape = descriptor.get("shape")
+    if isinstance(expected_shape, list) and [int(v) for v in matrix.shape] != [
+        int(v) for v in expected_shape
+    ]:
+        return None
+    return matrix
+
+
+__all__ = [
+    "EMBEDDING_SIDECAR_SUFFIX",
+    "EMBEDDING_SIDECAR_VERSION",
+    "embedding_sidecar_path",
+    "finalize_embedding_sidecar",
+    "load_embedding_sidecar",
+    "normalize_embedding_rows",
+    "write_embedding_sidecar",
+]
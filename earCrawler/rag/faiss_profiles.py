@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+"""FAISS index profiles (exact and approximate) plus recall measurement.
+
+``flat`` keeps the exact ``IndexIDMap(IndexFlatL2)`` scan. ``ivf_flat``,
+``ivf_pq`` and ``hnsw`` trade a measured amount of recall for lower query
+latency on large corpora. The resolved parameters are recorded in the index
+metadata so the retriever can apply the same search-time knobs.
+"""
+
+import math
+import os
+from dataclasses import asdict, dataclass, replace
+from typing import Mapping, Sequence
+
+FAISS_INDEX_PROFILES = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+FAISS_NPROBE_ENV = "EARCRAWLER_FAISS_NPROBE"
+FAISS_EF_SEARCH_ENV = "EARCRAWLER_FAISS_EF_SEARCH"
+FAISS_THREADS_ENV = "EARCRAWLER_FAISS_THREADS"
+_PQ_SUBQUANTIZER_CHOICES = (64, 48, 32, 24, 16, 12, 8, 4, 2, 1)
+
+
+@dataclass(frozen=True)
+class FaissIndexProfile:
+    name: str = "flat"
+    nlist: int | None = None
+    nprobe: int | None = None
+    pq_m: int | None = None
+    pq_nbits: int | None = None
+    hnsw_m: int | None = None
+    ef_construction: int | None = None
+    ef_search: int | None = None
+
+    @property
+    def approximate(self) -> bool:
+        return self.name != "flat"
+
+    def to_meta(self) -> dict[str, object]:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def resolve_index_profile(
+    name: str,
+    *,
+    doc_count: int,
+    dim: int,
+    overrides: Mapping[str, int | None] | None = None,
+) -> FaissIndexProfile:
+    """Fill in corpus-sized defaults for ``name``; explicit ``overrides`` win."""
+
+    profile_name = str(name or "flat").strip().lower()
+    if profile_name not in FAISS_INDEX_PROFILES:
+        raise ValueError(
+            f"Unsupported FAISS index profile '{name}' "
+            f"(expected one of: {', '.join(FAISS_INDEX_PROFILES)})"
+        )
+    doc_count = max(1, int(doc_count))
+    explicit = {k: int(v) for k, v in (overrides or {}).items() if v is not None}
+    profile = FaissIndexProfile(name=profile_name)
+
+    if profile_name in {"ivf_flat", "ivf_pq"}:
+        nlist = min(doc_count, explicit.get("nlist") or int(4 * math.sqrt(doc_count)))
+        nlist = max(1, nlist)
+        profile = replace(
+            profile,
+            nlist=nlist,
+            nprobe=explicit.get("nprobe") or max(1, nlist // 8),
+        )
+    if profile_name == "ivf_pq":
+        pq_m = explicit.get("pq_m") or next(
+            m for m in _PQ_SUBQUANTIZER_CHOICES if m <= dim and dim % m == 0
+        )
+        if dim % pq_m != 0:
+            raise ValueError(f"pq_m={pq_m} must divide the embedding dimension {dim}")
+        # PQ training needs at least 2**nbits points per sub-quantizer.
+        max_nbits = max(1, int(math.floor(math.log2(doc_count))))
+        profile = replace(
+            profile,
+            pq_m=pq_m,
+            pq_nbits=min(explicit.get("pq_nbits") or 8, max_nbits),
+        )
+    if profile_name == "hnsw":
+        profile = replace(
+            profile,
+            hnsw_m=explicit.get("hnsw_m") or 32,
+            ef_construction=explicit.get("ef_construction") or 200,
+            ef_search=explicit.get("ef_search") or 64,
+        )
+    return profile
+
+
+def build_profiled_index(
+    faiss_mod, profile: FaissIndexProfile, vectors, ids, *, add_batch_size: int | None = None
+):
+    """Create, train (when needed), and populate an ``IndexIDMap`` for ``profile``.
+
+    ``add_batch_size`` adds rows in slices, so a memory-mapped ``vectors``
+    buffer is paged in a batch at a time instead of all at once.
+    """
+
+    dim = int(vectors.shape[1])
+    if profile.name == "flat":
+        base = faiss_mod.IndexFlatL2(dim)
+    elif profile.name == "hnsw":
+        base = faiss_mod.IndexHNSWFlat(dim, int(profile.hnsw_m or 32))
+        base.hnsw.efConstruction = int(profile.ef_construction or 200)
+    else:
+        quantizer = faiss_mod.IndexFlatL2(dim)
+        if profile.name == "ivf_flat":
+            base = faiss_mod.IndexIVFFlat(quantizer, dim, int(profile.nlist or 1))
+        else:
+            base = faiss_mod.IndexIVFPQ(
+                quantizer,
+                dim,
+                int(profile.nlist or 1),
+                int(profile.pq_m or 1),
+                int(profile.pq_nbits or 8),
+            )
+        base.train(vectors)
+    index = faiss_mod.IndexIDMap(base)
+    total = int(vectors.shape[0])
+    step = int(add_batch_size or 0) or total
+    for start in range(0, total, max(1, step)):
+        index.add_with_ids(vectors[start : start + step], ids[start : start + step])
+    apply_search_params(faiss_mod, index, profile)
+    return index
+
+
+def search_params_from_meta(
+    header: Mapping[str, object] | None,
+) -> FaissIndexProfile | None:
+    """Return the recorded profile with env overrides for ``nprobe``/``efSearch``."""
+
+    raw = header.get("faiss_index") if isinstance(header, Mapping) else None
+    profile = FaissIndexProfile()
+    if isinstance(raw, Mapping):
+        fields = set(FaissIndexProfile.__dataclass_fields__)
+        profile = FaissIndexProfile(
+            **{key: raw[key] for key in fields if key in raw and raw[key] is not None}
+        )
+    env_nprobe = _env_positive_int(FAISS_NPROBE_ENV)
+    env_ef_search = _env_positive_int(FAISS_EF_SEARCH_ENV)
+    if env_nprobe is not None:
+        profile = replace(profile, nprobe=env_nprobe)
+    if env_ef_search is not None:
+        profile = replace(profile, ef_search=env_ef_search)
+    if profile.nprobe is None and profile.ef_search is None:
+        return None
+    return profile
+
+
+def apply_search_params(faiss_mod, index, profile: FaissIndexProfile | None) -> dict[str, int]:
+    """Set ``nprobe``/``efSearch`` on ``index`` (through any ``IndexIDMap``)."""
+
+    applied: dict[str, int] = {}
+    if profile is None:
+        return applied
+    space_cls = getattr(faiss_mod, "ParameterSpace", None)
+    if space_cls is None:
+        return applied
+    space = space_cls()
+    for param, value in (("nprobe", profile.nprobe), ("efSearch", profile.ef_search)):
+        if value is None:
+            continue
+        try:
+            space.set_index_parameter(index, param, int(value))
+        except Exception:
+            # Parameter does not apply to this index type (e.g. nprobe on HNSW).
+            continue
+        applied[param] = int(value)
+    return applied
+
+
+def recall_at_k(exact_ids: Sequence[Sequence[int]], approx_ids: Sequence[Sequence[int]], *, k: int) -> float:
+    """Mean fraction of each exact top-``k`` list recovered by the approximate one."""
+
+    total = 0.0
+    count = 0
+    for exact_row, approx_row in zip(exact_ids, approx_ids):
+        exact = {int(idx) for idx in list(exact_row)[:k] if int(idx) >= 0}
+        if not exact:
+            continue
+        approx = {int(idx) for idx in list(approx_row)[:k] if int(idx) >= 0}
+        total += len(exact & approx) / len(exact)
+        count += 1
+    return round(total / count, 6) if count else 1.0
+
+
+def measure_recall(faiss_mod, index, vectors, query_vectors, *, k: int) -> dict[str, object]:
+    """Compare ``index`` against an exact flat scan of ``vectors`` for ``query_vectors``."""
+
+    k = max(1, min(int(k), int(vectors.shape[0])))
+    exact = faiss_mod.IndexFlatL2(int(vectors.shape[1]))
+    exact.add(vectors)
+    _exact_d, exact_ids = exact.search(query_vectors, k)
+    _approx_d, approx_ids = index.search(query_vectors, k)
+    return {
+        "k": k,
+        "query_count": int(query_vectors.shape[0]),
+        "recall_at_k": recall_at_k(exact_ids.tolist(), approx_ids.tolist(), k=k),
+    }
+
+
+def faiss_thread_count() -> int:
+    """OpenMP threads for FAISS search; defaults to 1 for reproducible scores."""
+
+    return _env_positive_int(FAISS_THREADS_ENV) or 1
+
+
+def _env_positive_int(name: str) -> int | None:
+    raw = str(os.getenv(name) or "").strip()
+    if not raw:
+        return None
+    try:
+        value = int(raw)
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+__all__ = [
+    "FAISS_EF_SEARCH_ENV",
+    "FAISS_INDEX_PROFILES",
+    "FAISS_NPROBE_ENV",
+    "FAISS_THREADS_ENV",
+    "FaissIndexProfile",
+    "apply_search_params",
+    "build_profiled_index",
+    "faiss_thread_count",
+    "measure_recall",
+    "recall_at_k",
+    "resolve_index_profile",
+    "search_params_from_meta",
+]
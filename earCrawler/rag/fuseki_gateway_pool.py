@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+"""Process-wide Fuseki gateways with cached health probes and a circuit breaker."""
+
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Callable, Mapping
+
+import requests
+
+from earCrawler.kg.sparql import SPARQLHTTPError
+from earCrawler.rag.kg_expansion_fuseki import FusekiGatewayLike
+
+DEFAULT_PROBE_TTL_SECONDS = 30
+DEFAULT_BREAKER_THRESHOLD = 3
+DEFAULT_BREAKER_COOLDOWN_SECONDS = 30
+
+
+class FusekiCircuitOpenError(RuntimeError):
+    """Raised without contacting Fuseki while its circuit breaker is open."""
+
+
+@dataclass(frozen=True, slots=True)
+class GatewayConfig:
+    timeout: int
+    retries: int
+    retry_backoff_ms: int
+
+
+@dataclass(slots=True)
+class _Endpoint:
+    config: GatewayConfig
+    gateway: FusekiGatewayLike
+    threshold: int = DEFAULT_BREAKER_THRESHOLD
+    cooldown_seconds: float = DEFAULT_BREAKER_COOLDOWN_SECONDS
+    healthy_until: float = 0.0
+    failures: int = 0
+    open_until: float = 0.0
+    trial_in_flight: bool = False
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def is_endpoint_failure(exc: BaseException) -> bool:
+    """Return whether ``exc`` says the endpoint itself is unhealthy.
+
+    Transport errors, timeouts and 5xx replies count against the breaker.
+    Caller mistakes (bad parameters, unknown templates, 4xx replies) do not.
+    """
+
+    if isinstance(exc, SPARQLHTTPError):
+        return exc.status_code >= 500
+    return isinstance(exc, (requests.RequestException, OSError))
+
+
+def _close_gateway(gateway: FusekiGatewayLike) -> None:
+    close = getattr(gateway, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+class _BreakerGateway:
+    """Gateway wrapper that reports each query outcome to the breaker."""
+
+    def __init__(self, pool: "FusekiGatewayPool", endpoint: str, inner: FusekiGatewayLike) -> None:
+        self._pool = pool
+        self._endpoint = endpoint
+        self._inner = inner
+        self.supports_node_batches = bool(getattr(inner, "supports_node_batches", False))
+
+    def select(self, query_id: str, params: Mapping[str, object]) -> list[dict[str, object]]:
+        trial = self._pool.check_circuit(self._endpoint)
+        try:
+            rows = self._inner.select(query_id, params)
+        except Exception as exc:
+            if is_endpoint_failure(exc):
+                self._pool.record_failure(self._endpoint)
+            elif trial:
+                self._pool.release_trial(self._endpoint)
+            raise
+        self._pool.record_success(self._endpoint)
+        return rows
+
+
+class FusekiGatewayPool:
+    """Reuse one gateway (and HTTP session) per endpoint across expansions.
+
+    A successful health probe is trusted for ``probe_ttl_seconds``. After
+    ``failure_threshold`` consecutive probe or query failures the endpoint's
+    circuit opens and callers fail fast with :class:`FusekiCircuitOpenError`
+    for ``cooldown_seconds``. After that one caller is let through as a
+    trial that closes the circuit on success or re-opens it on failure;
+    everyone else keeps failing fast until the trial finishes. Only
+    :func:`is_endpoint_failure` errors count as query failures.
+    """
+
+    def __init__(self, *, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._endpoints: dict[str, _Endpoint] = {}
+        self._probe_count = 0
+        self._fast_failures = 0
+
+    def get(
+        self,
+        endpoint: str,
+        *,
+        config: GatewayConfig,
+        factory: Callable[[str, GatewayConfig], FusekiGatewayLike],
+        probe: Callable[[str, GatewayConfig], None] | None = None,
+        probe_ttl_seconds: float = DEFAULT_PROBE_TTL_SECONDS,
+        failure_threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        cooldown_seconds: float = DEFAULT_BREAKER_COOLDOWN_SECONDS,
+    ) -> FusekiGatewayLike:
+        replaced: _Endpoint | None = None
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None or entry.config != config:
+                replaced = entry
+                entry = _Endpoint(config=config, gateway=factory(endpoint, config))
+                self._endpoints[endpoint] = entry
+            entry.threshold = max(1, int(failure_threshold))
+            entry.cooldown_seconds = max(0.0, float(cooldown_seconds))
+        if replaced is not None:
+            _close_gateway(replaced.gateway)
+        self.check_circuit(endpoint, claim_trial=False)
+        if probe is not None:
+            with entry.lock:
+                if self._clock() >= entry.healthy_until:
+                    self._probe_count += 1
+                    try:
+                        probe(endpoint, config)
+                    except Exception:
+                        self.record_failure(endpoint)
+                        raise
+                    entry.healthy_until = self._clock() + max(0.0, float(probe_ttl_seconds))
+                    self.record_success(endpoint)
+        return _BreakerGateway(self, endpoint, entry.gateway)
+
+    def check_circuit(self, endpoint: str, *, claim_trial: bool = True) -> bool:
+        """Fail fast while the circuit is open.
+
+        Returns ``True`` when the caller holds the single half-open trial and
+        must report its outcome. With ``claim_trial=False`` the caller is
+        only checked against the cooldown and never becomes the trial.
+        """
+
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None or not entry.open_until:
+                return False
+            now = self._clock()
+            if now < entry.open_until:
+                self._fast_failures += 1
+                raise FusekiCircuitOpenError(
+                    f"Fuseki circuit open for {endpoint}; retrying in {entry.open_until - now:.1f}s"
+                )
+            if entry.trial_in_flight:
+                self._fast_failures += 1
+                raise FusekiCircuitOpenError(
+                    f"Fuseki circuit half-open for {endpoint}; trial query in progress"
+                )
+            if not claim_trial:
+                return False
+            entry.trial_in_flight = True
+            return True
+
+    def release_trial(self, endpoint: str) -> None:
+        """Give up the half-open trial without a verdict on the endpoint."""
+
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is not None:
+                entry.trial_in_flight = False
+
+    def record_success(self, endpoint: str) -> None:
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is not None:
+                entry.failures = 0
+                entry.open_until = 0.0
+                entry.trial_in_flight = False
+
+    def record_failure(self, endpoint: str) -> None:
+        with self._lock:
+            entry = self._endpoints.get(endpoint)
+            if entry is None:
+                return
+            entry.failures += 1
+            entry.healthy_until = 0.0
+            # A failed half-open trial re-opens the circuit at once.
+            if entry.failures >= entry.threshold or entry.open_until:
+                entry.open_until = self._clock() + entry.cooldown_seconds
+            entry.trial_in_flight = False
+
+    def reset(self) -> None:
+        with self._lock:
+            entries = list(self._endpoints.values())
+            self._endpoints.clear()
+            self._probe_count = 0
+            self._fast_failures = 0
+        for entry in entries:
+            _close_gateway(entry.gateway)
+
+    def snapshot(self) -> dict[str, object]:
+        now = self._clock()
+        with self._lock:
+            return {
+                "probe_count": self._probe_count,
+                "fast_failures": self._fast_failures,
+                "endpoints": {
+                    endpoint: {
+                        "circuit": (
+                            "closed"
+                            if not entry.open_until
+                            else "open" if entry.open_until > now else "half_open"
+                        ),
+                        "consecutive_failures": entry.failures,
+                        "probe_fresh": entry.healthy_until > now,
+                    }
+                    for endpoint, entry in sorted(self._endpoints.items())
+                },
+            }
+
+
+__all__ = [
+    "DEFAULT_BREAKER_COOLDOWN_SECONDS",
+    "DEFAULT_BREAKER_THRESHOLD",
+    "DEFAULT_PROBE_TTL_SECONDS",
+    "FusekiCircuitOpenError",
+    "FusekiGatewayPool",
+    "GatewayConfig",
+    "is_endpoint_failure",
+]
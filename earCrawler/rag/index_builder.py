@@ -3,12 +3,36 @@ from __future__ import annotations
 """Deterministic FAISS index builder for the retrieval corpus."""
 
 import json
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Dict, Any
+from typing import Iterable, List, Dict, Any, Mapping, Sequence
 
+from earCrawler.rag.bm25_index import (
+    bm25_index_path,
+    build_bm25_index,
+    write_bm25_index,
+)
 from earCrawler.rag.build_corpus import compute_corpus_digest
 from earCrawler.rag.corpus_contract import SCHEMA_VERSION, require_valid_corpus
+from earCrawler.rag.embedding_pipeline import (
+    DEFAULT_EMBED_BATCH_SIZE,
+    EmbeddingBuildStats,
+    encode_batches,
+    iter_corpus_batches,
+    iter_doc_batches,
+    scan_corpus_jsonl,
+)
+from earCrawler.rag.embedding_sidecar import (
+    embedding_sidecar_path,
+    finalize_embedding_sidecar,
+)
+from earCrawler.rag.faiss_profiles import (
+    build_profiled_index,
+    measure_recall,
+    resolve_index_profile,
+)
+from earCrawler.rag.metadata_table import metadata_table_path, write_metadata_table
 from earCrawler.utils.import_guard import import_optional
 
 INDEX_META_VERSION = "faiss-index-meta.v1"
@@ -35,67 +59,269 @@ def build_faiss_index_from_corpus(
     index_path: Path,
     meta_path: Path,
     embedding_model: str,
-) -> None:
-    """Build a FAISS index + metadata sidecar from validated corpus docs."""
+    index_profile: str = "flat",
+    profile_overrides: Mapping[str, int | None] | None = None,
+    recall_queries: Sequence[str] | None = None,
+    recall_k: int = 10,
+    min_recall: float | None = None,
+    batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    workers: int = 1,
+) -> Dict[str, Any]:
+    """Build a FAISS index + metadata sidecar from validated corpus docs.
+
+    The normalized embedding matrix is also written as a memory-mappable
+    ``<index>.embeddings.npy`` sidecar bound to the corpus digest so the
+    bruteforce backend can skip re-encoding the corpus at start-up, and the
+    inverted BM25 index used by hybrid mode is persisted as ``<index>.bm25.npz``.
+
+    ``index_profile`` selects ``flat`` (exact) or an approximate ``ivf_flat``,
+    ``ivf_pq`` or ``hnsw`` index. For approximate profiles, ``recall_queries``
+    are searched against both the new index and an exact flat scan; the build
+    fails with ``ValueError`` when recall@``recall_k`` is below ``min_recall``.
+    Docs are encoded ``batch_size`` at a time, across ``workers`` processes
+    when greater than one. Returns the ``faiss_index`` descriptor recorded in
+    the metadata.
+    """
 
     docs = sorted(corpus_docs, key=lambda d: str(d.get("doc_id") or ""))
     require_valid_corpus(docs)
+    header = _build_index_from_batches(
+        iter_doc_batches(docs, batch_size),
+        doc_count=len(docs),
+        index_path=index_path,
+        meta_path=meta_path,
+        embedding_model=embedding_model,
+        index_profile=index_profile,
+        profile_overrides=profile_overrides,
+        recall_queries=recall_queries,
+        recall_k=recall_k,
+        min_recall=min_recall,
+        batch_size=batch_size,
+        workers=workers,
+    )
+    return header["faiss_index"]
 
-    model = _load_sentence_transformer(embedding_model)
-    vectors = model.encode([str(doc.get("text") or "") for doc in docs], show_progress_bar=False)
 
-    np_mod = import_optional("numpy", ["numpy"])
-    vectors_np = np_mod.asarray(vectors).astype("float32")
-    if vectors_np.ndim != 2 or vectors_np.shape[0] != len(docs):
-        raise ValueError("Embedding model returned unexpected shape.")
-    dim = int(vectors_np.shape[1])
+def build_faiss_index_from_corpus_file(
+    corpus_path: Path,
+    *,
+    index_path: Path,
+    meta_path: Path,
+    embedding_model: str,
+    index_profile: str = "flat",
+    profile_overrides: Mapping[str, int | None] | None = None,
+    recall_queries: Sequence[str] | None = None,
+    recall_k: int = 10,
+    min_recall: float | None = None,
+    batch_size: int = DEFAULT_EMBED_BATCH_SIZE,
+    workers: int = 1,
+) -> Dict[str, Any]:
+    """Streaming variant of :func:`build_faiss_index_from_corpus` for a JSONL file.
 
-    faiss_mod = _load_faiss()
-    index = faiss_mod.IndexIDMap(faiss_mod.IndexFlatL2(dim))
-    ids = np_mod.arange(len(docs), dtype="int64")
-    index.add_with_ids(vectors_np, ids)
+    The corpus is validated without retaining document text, then read back in
+    ``doc_id`` order one batch at a time. Returns the metadata header (every
+    key except ``rows``), including ``build_stats``.
+    """
 
+    offsets = scan_corpus_jsonl(corpus_path)
+    return _build_index_from_batches(
+        iter_corpus_batches(corpus_path, offsets, batch_size),
+        doc_count=len(offsets),
+        index_path=index_path,
+        meta_path=meta_path,
+        embedding_model=embedding_model,
+        index_profile=index_profile,
+        profile_overrides=profile_overrides,
+        recall_queries=recall_queries,
+        recall_k=recall_k,
+        min_recall=min_recall,
+        batch_size=batch_size,
+        workers=workers,
+    )
+
+
+def _metadata_row(idx: int, doc: Mapping[str, Any]) -> Dict[str, Any]:
+    row: Dict[str, Any] = {
+        "row_id": idx,
+        "doc_id": doc.get("doc_id"),
+        "section_id": doc.get("section_id") or str(doc.get("doc_id") or "").split("#", 1)[0],
+        "chunk_kind": doc.get("chunk_kind"),
+        "source_ref": doc.get("source_ref"),
+    }
+    if doc.get("title"):
+        row["title"] = doc.get("title")
+    # Text stays on the row: the corpus digest, BM25 postings and
+    # index.meta.json are all built from the collected rows after encoding.
+    if doc.get("text"):
+        row["text"] = doc.get("text")
+    return row
+
+
+def _build_index_from_batches(
+    batches: Iterable[List[Dict[str, Any]]],
+    *,
+    doc_count: int,
+    index_path: Path,
+    meta_path: Path,
+    embedding_model: str,
+    index_profile: str,
+    profile_overrides: Mapping[str, int | None] | None,
+    recall_queries: Sequence[str] | None,
+    recall_k: int,
+    min_recall: float | None,
+    batch_size: int,
+    workers: int,
+) -> Dict[str, Any]:
+    started = time.perf_counter()
+    stats = EmbeddingBuildStats(batch_size=max(1, int(batch_size)), workers=max(1, int(workers)))
+    np_mod = import_optional("numpy", ["numpy"])
     index_path = Path(index_path)
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-    faiss_mod.write_index(index, str(index_path))
+    meta_path = Path(meta_path)
+    if doc_count <= 0:
+        raise ValueError("No documents to index.")
+
+    queries = [str(q) for q in (recall_queries or []) if str(q or "").strip()]
+    model = _load_sentence_transformer(embedding_model) if stats.workers == 1 else None
 
+    # Raw vectors land in an on-disk buffer that becomes the embeddings sidecar.
+    sidecar_path = embedding_sidecar_path(index_path, meta_path)
+    sidecar_path.parent.mkdir(parents=True, exist_ok=True)
+    buffer_path = sidecar_path.with_name(sidecar_path.name + ".build.tmp")
+    vectors_np = None
     rows: List[Dict[str, Any]] = []
-    for idx, doc in enumerate(docs):
-        row: Dict[str, Any] = {
-            "row_id": idx,
-            "doc_id": doc.get("doc_id"),
-            "section_id": doc.get("section_id") or str(doc.get("doc_id") or "").split("#", 1)[0],
-            "chunk_kind": doc.get("chunk_kind"),
-            "source_ref": doc.get("source_ref"),
-        }
-        if doc.get("title"):
-            row["title"] = doc.get("title")
-        if doc.get("text"):
-            row["text"] = doc.get("text")
-        rows.append(row)
-
-    snapshot_ids = {str(v) for v in (doc.get("snapshot_id") for doc in docs) if isinstance(v, str) and v.strip()}
-    snapshot_sha256s = {str(v) for v in (doc.get("snapshot_sha256") for doc in docs) if isinstance(v, str) and v.strip()}
+    snapshot_ids: set[str] = set()
+    snapshot_sha256s: set[str] = set()
+    try:
+        try:
+            encode_started = time.perf_counter()
+            for docs, batch_vectors in encode_batches(
+                batches,
+                model_loader=_load_sentence_transformer,
+                model_name=embedding_model,
+                workers=stats.workers,
+                model=model,
+            ):
+                if batch_vectors.ndim != 2 or batch_vectors.shape[0] != len(docs):
+                    raise ValueError("Embedding model returned unexpected shape.")
+                if vectors_np is None:
+                    vectors_np = np_mod.lib.format.open_memmap(
+                        str(buffer_path),
+                        mode="w+",
+                        dtype="float32",
+                        shape=(doc_count, int(batch_vectors.shape[1])),
+                    )
+                start = len(rows)
+                if batch_vectors.shape[1] != vectors_np.shape[1] or start + len(docs) > doc_count:
+                    raise ValueError("Embedding model returned unexpected shape.")
+                vectors_np[start : start + len(docs)] = batch_vectors
+                for offset, doc in enumerate(docs):
+                    rows.append(_metadata_row(start + offset, doc))
+                    snapshot_id = doc.get("snapshot_id")
+                    snapshot_sha256 = doc.get("snapshot_sha256")
+                    if isinstance(snapshot_id, str) and snapshot_id.strip():
+                        snapshot_ids.add(snapshot_id)
+                    if isinstance(snapshot_sha256, str) and snapshot_sha256.strip():
+                        snapshot_sha256s.add(snapshot_sha256)
+                stats.batches += 1
+            stats.encode_seconds = time.perf_counter() - encode_started
+            stats.docs = len(rows)
+            if vectors_np is None or len(rows) != doc_count:
+                raise ValueError("Embedding model returned unexpected shape.")
+            vectors_np.flush()
+            dim = int(vectors_np.shape[1])
+
+            profile = resolve_index_profile(
+                index_profile,
+                doc_count=doc_count,
+                dim=dim,
+                overrides=profile_overrides,
+            )
+            faiss_mod = _load_faiss()
+            ids = np_mod.arange(doc_count, dtype="int64")
+            index = build_profiled_index(
+                faiss_mod, profile, vectors_np, ids, add_batch_size=stats.batch_size
+            )
+
+            faiss_index: Dict[str, Any] = profile.to_meta()
+            if profile.approximate and queries:
+                if model is None:
+                    model = _load_sentence_transformer(embedding_model)
+                query_vectors = np_mod.asarray(
+                    model.encode(queries, show_progress_bar=False)
+                ).astype("float32")
+                recall = measure_recall(faiss_mod, index, vectors_np, query_vectors, k=recall_k)
+                recall["min_recall"] = min_recall
+                faiss_index["recall"] = recall
+                if min_recall is not None and float(recall["recall_at_k"]) < float(min_recall):
+                    raise ValueError(
+                        f"FAISS profile '{profile.name}' recall@{recall['k']}="
+                        f"{recall['recall_at_k']} is below the required {min_recall}; "
+                        "raise nprobe/efSearch or use the flat profile."
+                    )
+
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            faiss_mod.write_index(index, str(index_path))
+            del index
+
+            corpus_digest = compute_corpus_digest(rows)
+        finally:
+            # Release the buffer's map before the file is moved or removed
+            # below: Windows refuses both while it is still mapped.
+            del vectors_np
+        embedding_sidecar = finalize_embedding_sidecar(
+            buffer_path,
+            sidecar_path,
+            np_mod=np_mod,
+            corpus_digest=corpus_digest,
+            embedding_model=embedding_model,
+        )
+    finally:
+        buffer_path.unlink(missing_ok=True)
+
+    bm25_index = write_bm25_index(
+        bm25_index_path(index_path, meta_path),
+        build_bm25_index(np_mod, rows),
+        np_mod=np_mod,
+        corpus_digest=corpus_digest,
+    )
+
     snapshot_obj = None
     if len(snapshot_ids) == 1 and len(snapshot_sha256s) == 1:
         snapshot_obj = {"snapshot_id": sorted(snapshot_ids)[0], "snapshot_sha256": sorted(snapshot_sha256s)[0]}
 
+    stats.finish(started)
     meta = {
         "schema_version": INDEX_META_VERSION,
         "build_timestamp_utc": _utc_now_iso(),
+        "build_stats": stats.to_meta(),
         "corpus_schema_version": SCHEMA_VERSION,
-        "corpus_digest": compute_corpus_digest(docs),
-        "doc_count": len(docs),
+        "corpus_digest": corpus_digest,
+        "doc_count": doc_count,
         "embedding_model": embedding_model,
+        "embedding_sidecar": embedding_sidecar,
+        "bm25_index": bm25_index,
+        "faiss_index": faiss_index,
         "snapshot": snapshot_obj,
         "rows": rows,
     }
-    meta_path = Path(meta_path)
     meta_path.parent.mkdir(parents=True, exist_ok=True)
     meta_path.write_text(
         json.dumps(meta, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
         encoding="utf-8",
     )
+    header = {k: v for k, v in meta.items() if k != "rows"}
+    write_metadata_table(
+        metadata_table_path(index_path, meta_path),
+        rows,
+        np_mod=np_mod,
+        meta_path=meta_path,
+        header=header,
+    )
+    return header
 
 
-__all__ = ["build_faiss_index_from_corpus", "INDEX_META_VERSION"]
+__all__ = [
+    "build_faiss_index_from_corpus",
+    "build_faiss_index_from_corpus_file",
+    "INDEX_META_VERSION",
+]
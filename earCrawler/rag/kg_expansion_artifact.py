@@ -0,0 +1,449 @@
+from __future__ import annotations
+
+"""Precomputed, section-indexed KG expansion artifact.
+
+The build walks the exported KG once with rdflib, using the same traversal as
+the Fuseki provider, and writes one binary file:
+
+- 8 bytes magic ``EARKGX01``
+- 8 bytes little-endian header length
+- UTF-8 JSON header (schema, KG digest, build limits, ``sections`` index of
+  ``section_id -> [offset, length]`` relative to the end of the header)
+- one compact ``KGExpansionSnippet.to_dict()`` JSON payload per section
+
+The data file is named after a digest of its content
+(``<stem>.<digest><suffix>``). The requested output path holds a small JSON
+pointer to it, so a rebuild swaps only the pointer and never replaces a file
+a running API still has mapped (Windows refuses that).
+
+At runtime the file is memory-mapped and only the payloads for requested
+sections are decoded, so expansion needs no Fuseki round trips.
+"""
+
+from dataclasses import dataclass
+import hashlib
+import itertools
+import json
+import mmap
+from pathlib import Path
+import struct
+from threading import RLock
+from typing import Iterable, Mapping, Sequence
+
+from earCrawler.kg.iri import canonical_section_id
+from earCrawler.kg.paths import KGExpansionSnippet
+from earCrawler.rag.kg_expansion_fuseki import (
+    NODE_BATCH_QUERY_ID,
+    _section_id_from_iri,
+    expand_sections_via_fuseki,
+)
+
+KG_EXPANSION_ARTIFACT_ENV = "EARCRAWLER_KG_EXPANSION_ARTIFACT"
+ARTIFACT_SCHEMA = "kg-expansion-artifact.v1"
+POINTER_SCHEMA = "kg-expansion-artifact-pointer.v1"
+ARTIFACT_SOURCE = "kg_artifact"
+DEFAULT_GRAPH_IRI = "urn:ear:default-graph"
+
+_MAGIC = b"EARKGX01"
+_HEADER_LEN = struct.Struct("<Q")
+_PREFIX_SIZE = len(_MAGIC) + _HEADER_LEN.size
+
+_RDF_TYPE = "http://www.w3.org/1999/02/22-rdf-syntax-ns#type"
+_RDFS_LABEL = "http://www.w3.org/2000/01/rdf-schema#label"
+_DCTERMS_DESCRIPTION = "http://purl.org/dc/terms/description"
+_DCTERMS_IDENTIFIER = "http://purl.org/dc/terms/identifier"
+
+_RDF_FORMATS = {
+    ".ttl": "turtle",
+    ".nt": "nt",
+    ".nq": "nquads",
+    ".trig": "trig",
+    ".jsonld": "json-ld",
+}
+
+
+class KGExpansionArtifactError(ValueError):
+    """Raised when an expansion artifact is missing, truncated or malformed."""
+
+
+class RdflibExpansionGateway:
+    """In-memory gateway answering ``kg_expand_by_section_id`` queries with rdflib.
+
+    Rows mirror ``earCrawler/sparql/kg_expand_by_section_id.rq``: one row per
+    IRI-valued, non-``rdf:type`` edge and per combination of the optional
+    label/description/identifier bindings, so the shared walk produces the same
+    paths and text as it does against Fuseki.
+    """
+
+    supports_node_batches = True
+
+    def __init__(self, dataset) -> None:
+        from rdflib import URIRef
+
+        self._uriref = URIRef
+        self._graphs = []
+        for graph in dataset.graphs():
+            if not len(graph):
+                continue
+            identifier = str(graph.identifier)
+            if identifier.startswith("urn:x-rdflib:"):
+                identifier = DEFAULT_GRAPH_IRI
+            self._graphs.append((identifier, graph))
+        self._graphs.sort(key=lambda item: item[0])
+
+    def section_ids(self) -> list[str]:
+        sections: set[str] = set()
+        for _graph_iri, graph in self._graphs:
+            for subject in graph.subjects(unique=True):
+                if isinstance(subject, self._uriref):
+                    section_id = _section_id_from_iri(str(subject))
+                    if section_id:
+                        sections.add(section_id)
+        return sorted(sections)
+
+    def select(self, query_id: str, params: Mapping[str, object]) -> list[dict[str, object]]:
+        if query_id == "kg_expand_by_section_id":
+            nodes = [str(params.get("section_iri") or "").strip()]
+        elif query_id == NODE_BATCH_QUERY_ID:
+            nodes = [str(node).strip() for node in params.get("node_iris") or []]
+        else:
+            raise KeyError(f"Unknown query template: {query_id}")
+        rows: list[dict[str, object]] = []
+        for node in sorted(node for node in nodes if node):
+            for graph_iri, graph in self._graphs:
+                rows.extend(self._edge_rows(graph_iri, graph, self._uriref(node)))
+        return rows
+
+    def _edge_rows(self, graph_iri: str, graph, source) -> Iterable[dict[str, object]]:
+        section_labels = self._literals(graph, source, _RDFS_LABEL)
+        section_comments = self._literals(graph, source, _DCTERMS_DESCRIPTION)
+        for predicate, target in sorted(
+            graph.predicate_objects(source), key=lambda pair: (str(pair[0]), str(pair[1]))
+        ):
+            if str(predicate) == _RDF_TYPE or not isinstance(target, self._uriref):
+                continue
+            for combo in itertools.product(
+                section_labels,
+                section_comments,
+                self._literals(graph, target, _RDFS_LABEL),
+                self._literals(graph, target, _DCTERMS_DESCRIPTION),
+                self._literals(graph, target, _DCTERMS_IDENTIFIER),
+            ):
+                row: dict[str, object] = {
+                    "graph": graph_iri,
+                    "source": str(source),
+                    "predicate": str(predicate),
+                    "target": str(target),
+                }
+                for key, value in zip(
+                    (
+                        "section_label",
+                        "section_comment",
+                        "target_label",
+                        "target_comment",
+                        "related_section",
+                    ),
+                    combo,
+                ):
+                    if value is not None:
+                        row[key] = value
+                yield row
+
+    def _literals(self, graph, subject, predicate: str) -> list[str | None]:
+        values = sorted(str(value) for value in graph.objects(subject, self._uriref(predicate)))
+        return values or [None]
+
+
+def load_kg_dataset(paths: Sequence[Path | str]):
+    """Parse exported KG files into one rdflib ``Dataset``."""
+
+    from rdflib import Dataset
+
+    dataset = Dataset()
+    for raw in paths:
+        path = Path(raw)
+        fmt = _RDF_FORMATS.get(path.suffix.lower(), "turtle")
+        if fmt in {"nquads", "trig"}:
+            dataset.parse(path, format=fmt)
+        else:
+            dataset.default_context.parse(path, format=fmt)
+    return dataset
+
+
+def kg_sources_digest(paths: Sequence[Path | str]) -> str:
+    digest = hashlib.sha256()
+    for raw in sorted(str(Path(path)) for path in paths):
+        digest.update(Path(raw).read_bytes())
+    return digest.hexdigest()
+
+
+def build_kg_expansion_artifact(
+    sources: Sequence[Path | str],
+    out_path: Path | str,
+    *,
+    max_hops: int = 2,
+    max_paths_per_section: int = 4,
+) -> dict[str, object]:
+    """Expand every section in ``sources`` once and write the artifact.
+
+    Returns the artifact header (without the offset index).
+    """
+
+    if not sources:
+        raise ValueError("at least one KG source file is required")
+    gateway = RdflibExpansionGateway(load_kg_dataset(sources))
+    snippets = expand_sections_via_fuseki(
+        gateway.section_ids(),
+        gateway,
+        max_paths_per_section=max_paths_per_section,
+        max_hops=max_hops,
+    )
+
+    payloads: list[bytes] = []
+    index: dict[str, list[int]] = {}
+    offset = 0
+    for snippet in sorted(snippets, key=lambda item: item.section_id):
+        data = snippet.to_dict()
+        data["source"] = ARTIFACT_SOURCE
+        raw = json.dumps(data, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        encoded = raw.encode("utf-8")
+        index[snippet.section_id] = [offset, len(encoded)]
+        payloads.append(encoded)
+        offset += len(encoded)
+
+    header: dict[str, object] = {
+        "schema": ARTIFACT_SCHEMA,
+        "kg_digest": kg_sources_digest(sources),
+        "sources": sorted(Path(path).name for path in sources),
+        "max_hops": int(max_hops),
+        "max_paths_per_section": int(max_paths_per_section),
+        "section_count": len(index),
+    }
+    header_bytes = json.dumps(
+        {**header, "sections": index}, separators=(",", ":"), sort_keys=True
+    ).encode("utf-8")
+
+    content = hashlib.sha256(header_bytes)
+    for payload in payloads:
+        content.update(payload)
+    out = Path(out_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    data_path = out.with_name(f"{out.stem}.{content.hexdigest()[:16]}{out.suffix}")
+    if not data_path.exists():
+        tmp = data_path.with_name(data_path.name + ".tmp")
+        with tmp.open("wb") as handle:
+            handle.write(_MAGIC)
+            handle.write(_HEADER_LEN.pack(len(header_bytes)))
+            handle.write(header_bytes)
+            for payload in payloads:
+                handle.write(payload)
+        tmp.replace(data_path)
+    pointer_tmp = out.with_name(out.name + ".tmp")
+    pointer_tmp.write_text(
+        json.dumps({"schema": POINTER_SCHEMA, "file": data_path.name}) + "\n",
+        encoding="utf-8",
+    )
+    pointer_tmp.replace(out)
+    _remove_superseded(out, keep=data_path)
+    return {**header, "file": data_path.name}
+
+
+def _remove_superseded(out: Path, *, keep: Path) -> None:
+    for candidate in out.parent.glob(f"{out.stem}.*{out.suffix}"):
+        if candidate == keep or candidate == out or candidate.name.endswith(".tmp"):
+            continue
+        try:
+            candidate.unlink()
+        except OSError:
+            # Still mapped by a running process (Windows); the next build retries.
+            pass
+
+
+def _resolve_data_path(path: Path) -> Path:
+    """Follow the pointer written by the build; plain data files map directly."""
+
+    try:
+        with path.open("rb") as handle:
+            prefix = handle.read(len(_MAGIC))
+    except OSError as exc:
+        raise KGExpansionArtifactError(f"{path}: artifact not found") from exc
+    if prefix == _MAGIC:
+        return path
+    try:
+        pointer = json.loads(path.read_text(encoding="utf-8"))
+    except (UnicodeDecodeError, ValueError):
+        pointer = None
+    if not isinstance(pointer, dict) or pointer.get("schema") != POINTER_SCHEMA:
+        raise KGExpansionArtifactError(f"{path}: not a KG expansion artifact")
+    name = str(pointer.get("file") or "")
+    if not name or Path(name).name != name:
+        raise KGExpansionArtifactError(f"{path}: invalid artifact pointer")
+    return path.parent / name
+
+
+@dataclass(frozen=True, slots=True)
+class _ArtifactHeader:
+    kg_digest: str
+    max_hops: int
+    max_paths_per_section: int
+    sections: dict[str, tuple[int, int]]
+    body_offset: int
+
+
+class KGExpansionArtifact:
+    """Read-only, memory-mapped view of a built expansion artifact.
+
+    ``path`` may be the pointer written by the build or a data file.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self.data_path = _resolve_data_path(self.path)
+        self._lock = RLock()
+        try:
+            with self.data_path.open("rb") as handle:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError as exc:
+            raise KGExpansionArtifactError(f"{self.data_path}: artifact not found") from exc
+        except ValueError as exc:  # empty file
+            raise KGExpansionArtifactError(f"{self.data_path}: empty artifact") from exc
+        try:
+            self._header = self._read_header()
+        except Exception:
+            self._mmap.close()
+            raise
+
+    def _read_header(self) -> _ArtifactHeader:
+        buf = self._mmap
+        if len(buf) < _PREFIX_SIZE or buf[: len(_MAGIC)] != _MAGIC:
+            raise KGExpansionArtifactError(f"{self.path}: not a KG expansion artifact")
+        (header_len,) = _HEADER_LEN.unpack_from(buf, len(_MAGIC))
+        body_offset = _PREFIX_SIZE + header_len
+        if body_offset > len(buf):
+            raise KGExpansionArtifactError(f"{self.path}: truncated header")
+        data = json.loads(bytes(buf[_PREFIX_SIZE:body_offset]).decode("utf-8"))
+        if data.get("schema") != ARTIFACT_SCHEMA:
+            raise KGExpansionArtifactError(
+                f"{self.path}: unsupported schema {data.get('schema')!r}"
+            )
+        sections = {
+            str(key): (int(value[0]), int(value[1]))
+            for key, value in (data.get("sections") or {}).items()
+        }
+        end = max((start + length for start, length in sections.values()), default=0)
+        if body_offset + end > len(buf):
+            raise KGExpansionArtifactError(f"{self.path}: truncated section payloads")
+        return _ArtifactHeader(
+            kg_digest=str(data.get("kg_digest") or ""),
+            max_hops=int(data.get("max_hops") or 0),
+            max_paths_per_section=int(data.get("max_paths_per_section") or 0),
+            sections=sections,
+            body_offset=body_offset,
+        )
+
+    @property
+    def kg_digest(self) -> str:
+        return self._header.kg_digest
+
+    @property
+    def max_hops(self) -> int:
+        return self._header.max_hops
+
+    @property
+    def max_paths_per_section(self) -> int:
+        return self._header.max_paths_per_section
+
+    def __len__(self) -> int:
+        return len(self._header.sections)
+
+    def __contains__(self, section_id: object) -> bool:
+        return canonical_section_id(section_id) in self._header.sections
+
+    def get(self, section_id: str) -> KGExpansionSnippet | None:
+        key = canonical_section_id(section_id)
+        span = self._header.sections.get(key) if key else None
+        if span is None:
+            return None
+        start = self._header.body_offset + span[0]
+        with self._lock:
+            if self._mmap.closed:
+                raise KGExpansionArtifactError(f"{self.data_path}: artifact was closed")
+            raw = self._mmap[start : start + span[1]]
+        return KGExpansionSnippet.from_dict(json.loads(raw.decode("utf-8")))
+
+    def expand(
+        self, section_ids: Iterable[str], *, max_paths_per_section: int | None = None
+    ) -> list[KGExpansionSnippet]:
+        """Return stored snippets for ``section_ids`` in canonical order."""
+
+        expansions: list[KGExpansionSnippet] = []
+        wanted = sorted({key for key in map(canonical_section_id, section_ids) if key})
+        for section_id in wanted:
+            snippet = self.get(section_id)
+            if snippet is None:
+                continue
+            if max_paths_per_section is not None and len(snippet.paths) > max_paths_per_section:
+                snippet = KGExpansionSnippet(
+                    section_id=snippet.section_id,
+                    text=snippet.text,
+                    source=snippet.source,
+                    paths=snippet.paths[:max_paths_per_section],
+                    related_sections=snippet.related_sections,
+                )
+            expansions.append(snippet)
+        return expansions
+
+    @property
+    def closed(self) -> bool:
+        return self._mmap.closed
+
+    def close(self) -> None:
+        with self._lock:
+            self._mmap.close()
+
+
+_artifact_lock = RLock()
+_open_artifacts: dict[str, tuple[tuple[int, int], KGExpansionArtifact]] = {}
+
+
+def open_kg_expansion_artifact(path: Path | str) -> KGExpansionArtifact:
+    """Return a shared mapping of ``path``, re-opening it only after a rebuild.
+
+    A rebuild rewrites the pointer at ``path``; the superseded mapping is
+    closed so its data file can be removed.
+    """
+
+    resolved = Path(path).resolve()
+    try:
+        stat = resolved.stat()
+    except OSError as exc:
+        raise KGExpansionArtifactError(f"{path}: artifact not found") from exc
+    token = (stat.st_mtime_ns, stat.st_size)
+    key = str(resolved)
+    with _artifact_lock:
+        cached = _open_artifacts.get(key)
+        if cached is not None and cached[0] == token:
+            return cached[1]
+        if cached is not None and cached[1].data_path == _resolve_data_path(resolved):
+            _open_artifacts[key] = (token, cached[1])
+            return cached[1]
+        artifact = KGExpansionArtifact(resolved)
+        _open_artifacts[key] = (token, artifact)
+        if cached is not None:
+            cached[1].close()
+        return artifact
+
+
+__all__ = [
+    "ARTIFACT_SCHEMA",
+    "ARTIFACT_SOURCE",
+    "KGExpansionArtifact",
+    "KGExpansionArtifactError",
+    "KG_EXPANSION_ARTIFACT_ENV",
+    "POINTER_SCHEMA",
+    "RdflibExpansionGateway",
+    "build_kg_expansion_artifact",
+    "kg_sources_digest",
+    "load_kg_dataset",
+    "open_kg_expansion_artifact",
+]
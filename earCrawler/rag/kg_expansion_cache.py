@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+"""Caches for KG expansion results and parsed json_stub mappings.
+
+Fuseki expansion is deterministic for a given graph, so results are kept in
+an LRU keyed on ``(KG digest, section, max_hops, max_paths)``. The KG digest
+is the SHA-256 of the KG export manifest (which lists a checksum for every
+exported file), so re-exporting the graph invalidates every entry.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from threading import RLock
+from typing import Mapping
+
+from earCrawler.kg.paths import KGExpansionSnippet
+
+KG_EXPANSION_CACHE_SIZE_ENV = "EARCRAWLER_KG_EXPANSION_CACHE_SIZE"
+KG_EXPANSION_MANIFEST_ENV = "EARCRAWLER_KG_EXPANSION_MANIFEST"
+DEFAULT_KG_EXPANSION_CACHE_SIZE = 1024
+DEFAULT_KG_EXPANSION_MANIFEST = Path("kg") / "ear_export_manifest.json"
+
+_FileToken = tuple[str, int, int]
+_file_cache_lock = RLock()
+_manifest_digests: dict[str, tuple[_FileToken, str]] = {}
+_json_stub_mappings: dict[str, tuple[_FileToken, dict[str, tuple[str, Mapping]]]] = {}
+
+
+def _file_token(path: Path) -> _FileToken | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return (str(path.resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+def kg_manifest_digest(path: Path | str) -> str | None:
+    """Return the SHA-256 of the KG export manifest, re-hashing only on change."""
+
+    path = Path(path)
+    token = _file_token(path)
+    if token is None:
+        return None
+    with _file_cache_lock:
+        cached = _manifest_digests.get(token[0])
+        if cached is not None and cached[0] == token:
+            return cached[1]
+    digest = hashlib.sha256(path.read_bytes()).hexdigest()
+    with _file_cache_lock:
+        _manifest_digests[token[0]] = (token, digest)
+    return digest
+
+
+def load_json_stub_mapping(
+    path: Path | str, normalize
+) -> dict[str, tuple[str, Mapping]]:
+    """Return ``{normalized section: (raw key, entry)}`` parsed once per file version."""
+
+    path = Path(path)
+    token = _file_token(path)
+    if token is not None:
+        with _file_cache_lock:
+            cached = _json_stub_mappings.get(token[0])
+            if cached is not None and cached[0] == token:
+                return cached[1]
+    data = json.loads(path.read_text(encoding="utf-8"))
+    mapping: dict[str, tuple[str, Mapping]] = {}
+    for raw_key, entry in data.items():
+        norm = normalize(raw_key)
+        if norm and norm not in mapping:
+            mapping[norm] = (str(raw_key), entry if isinstance(entry, Mapping) else {})
+    if token is not None:
+        with _file_cache_lock:
+            _json_stub_mappings[token[0]] = (token, mapping)
+    return mapping
+
+
+class KGExpansionCache:
+    """Thread-safe LRU of expansion results for one KG digest at a time.
+
+    ``None`` values record sections that produced no expansion, so misses on
+    sparse sections are cached too.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_KG_EXPANSION_CACHE_SIZE) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._lock = RLock()
+        self._entries: OrderedDict[tuple[str, int, int], KGExpansionSnippet | None] = (
+            OrderedDict()
+        )
+        self._kg_digest: str | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _bind(self, kg_digest: str) -> None:
+        if kg_digest != self._kg_digest:
+            if self._kg_digest is not None:
+                self.invalidations += 1
+            self._entries.clear()
+            self._kg_digest = kg_digest
+
+    def get_many(
+        self,
+        kg_digest: str,
+        section_ids: list[str],
+        *,
+        max_hops: int,
+        max_paths: int,
+    ) -> tuple[dict[str, KGExpansionSnippet | None], list[str]]:
+        """Return ``(cached results by section, sections still to expand)``."""
+
+        found: dict[str, KGExpansionSnippet | None] = {}
+        missing: list[str] = []
+        with self._lock:
+            self._bind(kg_digest)
+            for section_id in section_ids:
+                key = (section_id, int(max_hops), int(max_paths))
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[section_id] = self._entries[key]
+                    self.hits += 1
+                else:
+                    missing.append(section_id)
+                    self.misses += 1
+        return found, missing
+
+    def put_many(
+        self,
+        kg_digest: str,
+        results: Mapping[str, KGExpansionSnippet | None],
+        *,
+        max_hops: int,
+        max_paths: int,
+    ) -> None:
+        with self._lock:
+            self._bind(kg_digest)
+            for section_id, snippet in results.items():
+                key = (section_id, int(max_hops), int(max_paths))
+                self._entries[key] = snippet
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._kg_digest = None
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "kg_digest": self._kg_digest,
+            }
+
+
+__all__ = [
+    "DEFAULT_KG_EXPANSION_CACHE_SIZE",
+    "DEFAULT_KG_EXPANSION_MANIFEST",
+    "KGExpansionCache",
+    "KG_EXPANSION_CACHE_SIZE_ENV",
+    "KG_EXPANSION_MANIFEST_ENV",
+    "kg_manifest_digest",
+    "load_json_stub_mapping",
+]
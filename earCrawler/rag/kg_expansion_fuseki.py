@@ -15,6 +15,8 @@ from earCrawler.kg.sparql import SPARQLClient
 
 _TEMPLATE_PATH = Path(__file__).resolve().parent.parent / "sparql" / "kg_expand_by_section_id.rq"
 _SECTION_IRI_PREFIX = f"{RESOURCE_NS}ear/section/"
+NODE_BATCH_QUERY_ID = "kg_expand_by_node_iris"
+NODE_BATCH_SIZE = 64
 
 
 class FusekiGatewayLike(Protocol):
@@ -52,20 +54,37 @@ class SPARQLTemplateGateway:
         self._query_retries = max(0, int(query_retries))
         self._retry_backoff_ms = max(0, int(retry_backoff_ms))
 
+    # The template binds ``?source`` through ``VALUES``, so one query can
+    # expand any number of nodes.
+    supports_node_batches = True
+
     def select(self, query_id: str, params: Mapping[str, object]) -> list[dict[str, object]]:
-        if query_id != "kg_expand_by_section_id":
+        if query_id == "kg_expand_by_section_id":
+            section = _as_str(params.get("section_iri"))
+            if not section:
+                raise ValueError("section_iri is required")
+            nodes = [section]
+        elif query_id == NODE_BATCH_QUERY_ID:
+            raw_nodes = params.get("node_iris")
+            if isinstance(raw_nodes, str) or not isinstance(raw_nodes, Sequence):
+                raw_nodes = []
+            nodes = [node for node in (_as_str(item) for item in raw_nodes) if node]
+            if not nodes:
+                raise ValueError("node_iris must be a non-empty list of IRIs")
+        else:
             raise KeyError(f"Unknown query template: {query_id}")
-        section = _as_str(params.get("section_iri"))
-        if not section:
-            raise ValueError("section_iri is required")
-        query = self._template.replace("{{section_iri}}", f"<{section}>")
+        query = self._template.replace(
+            "{{section_iri}}", " ".join(f"<{node}>" for node in nodes)
+        )
 
         attempts = self._query_retries + 1
         last_exc: Exception | None = None
         for attempt in range(1, attempts + 1):
             try:
-                payload = self._client.select(query)
-                return _coerce_bindings(payload)
+                select_stream = getattr(self._client, "select_stream", None)
+                if select_stream is not None:
+                    return [_flatten_binding(binding) for binding in select_stream(query)]
+                return _coerce_bindings(self._client.select(query))
             except Exception as exc:
                 last_exc = exc
                 if attempt >= attempts:
@@ -77,6 +96,32 @@ class SPARQLTemplateGateway:
             raise last_exc
         return []
 
+    def close(self) -> None:
+        close = getattr(self._client, "close", None)
+        if callable(close):
+            close()
+
+
+class FusekiExpansionResult(list):
+    """Expansion snippets, plus how many Fuseki queries produced them."""
+
+    def __init__(self, snippets: Sequence[KGExpansionSnippet] = (), *, query_count: int = 0) -> None:
+        super().__init__(snippets)
+        self.query_count = query_count
+
+
+_Frontier = list[tuple[list[KGPathEdge], str, str | None, list[float]]]
+
+
+@dataclass(slots=True)
+class _SectionWalk:
+    section_id: str
+    start_iri: str
+    frontier: _Frontier
+    all_paths: list[tuple[list[KGPathEdge], str | None, list[float]]]
+    text_hints: set[str]
+    related_sections: set[str]
+
 
 def expand_sections_via_fuseki(
     section_ids: list[str],
@@ -84,9 +129,17 @@ def expand_sections_via_fuseki(
     *,
     max_paths_per_section: int,
     max_hops: int,
-) -> list[KGExpansionSnippet]:
+) -> FusekiExpansionResult:
+    """Expand sections hop by hop, sharing each hop's queries across sections.
+
+    Gateways that set ``supports_node_batches`` receive every frontier node of
+    a hop in ``NODE_BATCH_SIZE``-sized ``VALUES`` batches; others get one
+    ``kg_expand_by_section_id`` call per distinct node. Path ordering is the
+    same either way.
+    """
+
     if max_paths_per_section <= 0 or max_hops <= 0:
-        return []
+        return FusekiExpansionResult()
 
     normalized_sections = sorted(
         {
@@ -96,81 +149,118 @@ def expand_sections_via_fuseki(
         }
     )
 
-    expansions: list[KGExpansionSnippet] = []
+    walks: list[_SectionWalk] = []
     for section_id in normalized_sections:
-        snippet = _expand_one_section(
-            section_id,
-            gateway,
-            max_paths_per_section=max_paths_per_section,
-            max_hops=max_hops,
+        start_iri = section_iri(section_id)
+        walks.append(
+            _SectionWalk(
+                section_id=section_id,
+                start_iri=start_iri,
+                frontier=[([], start_iri, None, [])],
+                all_paths=[],
+                text_hints=set(),
+                related_sections=set(),
+            )
         )
+
+    query_count = 0
+    for _hop in range(1, max_hops + 1):
+        active = [walk for walk in walks if walk.frontier]
+        if not active:
+            break
+        nodes = sorted({node for walk in active for _, node, _, _ in walk.frontier})
+        start_sections = {walk.start_iri: walk.section_id for walk in active}
+        rows_by_node, issued = _select_node_rows(
+            gateway, nodes, max_hops=max_hops, start_sections=start_sections
+        )
+        query_count += issued
+        for walk in active:
+            _advance_walk(walk, rows_by_node, max_paths_per_section=max_paths_per_section)
+
+    expansions = FusekiExpansionResult(query_count=query_count)
+    for walk in walks:
+        snippet = _walk_snippet(walk, max_paths_per_section=max_paths_per_section)
         if snippet is not None:
             expansions.append(snippet)
     return expansions
 
 
-def _expand_one_section(
-    section_id: str,
+def _select_node_rows(
     gateway: FusekiGatewayLike,
+    nodes: list[str],
     *,
-    max_paths_per_section: int,
     max_hops: int,
-) -> KGExpansionSnippet | None:
-    start_iri = section_iri(section_id)
-    frontier: list[tuple[list[KGPathEdge], str, str | None, list[float]]] = [
-        ([], start_iri, None, [])
-    ]
-    all_paths: list[tuple[list[KGPathEdge], str | None, list[float]]] = []
-    text_hints: set[str] = set()
-    related_sections: set[str] = set()
-
-    for _hop in range(1, max_hops + 1):
-        next_frontier: list[tuple[list[KGPathEdge], str, str | None, list[float]]] = []
-        for edges, current_node, graph_iri, conf_values in frontier:
+    start_sections: Mapping[str, str],
+) -> tuple[dict[str, list[_EdgeRow]], int]:
+    raw_rows: list[tuple[str | None, Sequence[Mapping[str, object]]]] = []
+    if getattr(gateway, "supports_node_batches", False):
+        for start in range(0, len(nodes), NODE_BATCH_SIZE):
+            chunk = nodes[start : start + NODE_BATCH_SIZE]
             rows = gateway.select(
-                "kg_expand_by_section_id",
-                {
-                    "section_iri": current_node,
-                    "start_section_id": section_id,
-                    "max_hops": max_hops,
-                },
+                NODE_BATCH_QUERY_ID, {"node_iris": chunk, "max_hops": max_hops}
             )
-            parsed_rows = _parse_rows_for_source(rows, current_node)
-            seen_nodes = {start_iri}
-            seen_nodes.update(edge.target for edge in edges)
-            for parsed in parsed_rows:
-                if parsed.edge.target in seen_nodes:
-                    continue
-                new_edges = [*edges, parsed.edge]
-                new_graph = parsed.graph_iri or graph_iri
-                new_conf_values = list(conf_values)
-                if parsed.confidence is not None:
-                    new_conf_values.append(parsed.confidence)
-                all_paths.append((new_edges, new_graph, new_conf_values))
-                next_frontier.append(
-                    (new_edges, parsed.edge.target, new_graph, new_conf_values)
-                )
-
-                if parsed.related_section:
-                    related_sections.add(parsed.related_section)
-                target_section = _section_id_from_iri(parsed.edge.target)
-                if target_section:
-                    related_sections.add(target_section)
-                for hint in parsed.text_hints:
-                    if hint:
-                        text_hints.add(hint)
-
-        frontier = _sort_frontier(next_frontier)
-        if not frontier:
-            break
-        # Keep traversal deterministic and bounded.
-        frontier = frontier[: max_paths_per_section * 4]
+            raw_rows.append((None, rows))
+    else:
+        for node in nodes:
+            params: dict[str, object] = {"section_iri": node, "max_hops": max_hops}
+            if node in start_sections:
+                params["start_section_id"] = start_sections[node]
+            raw_rows.append((node, gateway.select("kg_expand_by_section_id", params)))
+
+    grouped: dict[str, list[Mapping[str, object]]] = {}
+    for node, rows in raw_rows:
+        for row in rows:
+            source = node or _as_str(_first(row, "source", "s"))
+            grouped.setdefault(source, []).append(row)
+    return (
+        {node: _parse_rows_for_source(grouped.get(node, []), node) for node in nodes},
+        len(raw_rows),
+    )
+
 
-    if not all_paths:
+def _advance_walk(
+    walk: _SectionWalk,
+    rows_by_node: Mapping[str, list[_EdgeRow]],
+    *,
+    max_paths_per_section: int,
+) -> None:
+    next_frontier: _Frontier = []
+    for edges, current_node, graph_iri, conf_values in walk.frontier:
+        seen_nodes = {walk.start_iri}
+        seen_nodes.update(edge.target for edge in edges)
+        for parsed in rows_by_node.get(current_node, []):
+            if parsed.edge.target in seen_nodes:
+                continue
+            new_edges = [*edges, parsed.edge]
+            new_graph = parsed.graph_iri or graph_iri
+            new_conf_values = list(conf_values)
+            if parsed.confidence is not None:
+                new_conf_values.append(parsed.confidence)
+            walk.all_paths.append((new_edges, new_graph, new_conf_values))
+            next_frontier.append((new_edges, parsed.edge.target, new_graph, new_conf_values))
+
+            if parsed.related_section:
+                walk.related_sections.add(parsed.related_section)
+            target_section = _section_id_from_iri(parsed.edge.target)
+            if target_section:
+                walk.related_sections.add(target_section)
+            for hint in parsed.text_hints:
+                if hint:
+                    walk.text_hints.add(hint)
+
+    # Keep traversal deterministic and bounded.
+    walk.frontier = _sort_frontier(next_frontier)[: max_paths_per_section * 4]
+
+
+def _walk_snippet(
+    walk: _SectionWalk, *, max_paths_per_section: int
+) -> KGExpansionSnippet | None:
+    if not walk.all_paths:
         return None
 
+    section_id = walk.section_id
     path_objs: list[KGPath] = []
-    for edges, graph_iri, conf_values in _sort_path_rows(all_paths)[:max_paths_per_section]:
+    for edges, graph_iri, conf_values in _sort_path_rows(walk.all_paths)[:max_paths_per_section]:
         confidence = min(conf_values) if conf_values else None
         path_id = stable_path_id(
             start_section_id=section_id,
@@ -187,7 +277,8 @@ def _expand_one_section(
             )
         )
 
-    snippet_text = _build_snippet_text(text_hints, path_objs)
+    snippet_text = _build_snippet_text(walk.text_hints, path_objs)
+    related_sections = set(walk.related_sections)
     related_sections.discard(section_id)
 
     return KGExpansionSnippet(
@@ -380,22 +471,28 @@ def _coerce_bindings(data: Mapping[str, object]) -> list[dict[str, object]]:
         return rows
 
     for binding in raw_bindings:
-        if not isinstance(binding, Mapping):
-            continue
-        row: dict[str, object] = {}
-        for key, raw_value in binding.items():
-            if not isinstance(key, str):
-                continue
-            if isinstance(raw_value, Mapping):
-                row[key] = raw_value.get("value")
-            else:
-                row[key] = raw_value
-        rows.append(row)
+        if isinstance(binding, Mapping):
+            rows.append(_flatten_binding(binding))
     return rows
 
 
+def _flatten_binding(binding: Mapping[str, object]) -> dict[str, object]:
+    row: dict[str, object] = {}
+    for key, raw_value in binding.items():
+        if not isinstance(key, str):
+            continue
+        if isinstance(raw_value, Mapping):
+            row[key] = raw_value.get("value")
+        else:
+            row[key] = raw_value
+    return row
+
+
 __all__ = [
+    "FusekiExpansionResult",
     "FusekiGatewayLike",
+    "NODE_BATCH_QUERY_ID",
+    "NODE_BATCH_SIZE",
     "SPARQLTemplateGateway",
     "expand_sections_via_fuseki",
 ]
@@ -0,0 +1,297 @@
+from __future__ import annotations
+
+"""Columnar, memory-mapped sidecar for index metadata rows.
+
+``index.meta.json`` stays the canonical, human-readable record. Next to it,
+index builds write ``<stem>.rows.npz`` (lookup columns, row offsets, tie-break
+ranks, and a copy of the header) plus ``<stem>.rows.<digest>.bin`` (one
+compact JSON payload per row). Loading maps the blob and only decodes rows that
+are actually returned, so load time no longer grows with corpus text size.
+
+Blob names carry a content digest and the header names the current one, so a
+rewrite never replaces a file another reader still has mapped (Windows refuses
+that). Superseded blobs are removed once nothing holds them open.
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Iterator, Mapping
+
+from earCrawler.rag.retriever_citation_policy import canonical_section_id
+from earCrawler.rag.retriever_ranking import (
+    materialize_metadata_rows,
+    result_doc_id,
+    tie_break_rank_array,
+)
+
+METADATA_TABLE_VERSION = "metadata-table.v1"
+METADATA_TABLE_SUFFIX = ".rows.npz"
+_STRING_COLUMNS = ("doc_id", "section_id", "chunk_kind")
+
+
+def metadata_table_path(index_path: Path, meta_path: Path | None = None) -> Path:
+    """Return the column file path for ``index_path`` (next to the metadata)."""
+
+    index_path = Path(index_path)
+    parent = Path(meta_path).parent if meta_path is not None else index_path.parent
+    return parent / f"{index_path.stem}{METADATA_TABLE_SUFFIX}"
+
+
+def _blob_stem(table_path: Path) -> str:
+    name = table_path.name
+    if name.endswith(METADATA_TABLE_SUFFIX):
+        name = name[: -len(METADATA_TABLE_SUFFIX)]
+    return name + ".rows"
+
+
+def _blob_path(table_path: Path, digest: str) -> Path:
+    return table_path.with_name(f"{_blob_stem(table_path)}.{digest}.bin")
+
+
+def _remove_stale_blobs(table_path: Path, keep: Path) -> None:
+    stem = _blob_stem(table_path)
+    candidates = [table_path.with_name(stem + ".bin")]
+    candidates.extend(table_path.parent.glob(f"{stem}.*.bin"))
+    for candidate in candidates:
+        if candidate.name == keep.name or not candidate.exists():
+            continue
+        try:
+            candidate.unlink()
+        except OSError:
+            # Still mapped by a reader (Windows); the next write retries.
+            pass
+
+
+def meta_fingerprint(meta_path: Path) -> dict[str, int]:
+    stat = Path(meta_path).stat()
+    return {"size": int(stat.st_size), "mtime_ns": int(stat.st_mtime_ns)}
+
+
+def _encode_strings(np_mod, values: list[str]):
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np_mod.zeros(len(encoded) + 1, dtype="int64")
+    if encoded:
+        offsets[1:] = np_mod.cumsum([len(item) for item in encoded])
+    blob = np_mod.frombuffer(b"".join(encoded), dtype="uint8")
+    return offsets, blob
+
+
+def _decode_strings(offsets, blob) -> list[str]:
+    raw = bytes(blob)
+    bounds = offsets.tolist()
+    return [raw[bounds[i] : bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)]
+
+
+def write_metadata_table(
+    path: Path,
+    rows: Sequence[Mapping[str, object]],
+    *,
+    np_mod,
+    meta_path: Path,
+    header: Mapping[str, object],
+) -> None:
+    """Persist ``rows`` in columnar form, bound to the current ``meta_path``.
+
+    Call after ``meta_path`` has been written: the stored fingerprint is how
+    readers detect a metadata file that changed underneath the table.
+    """
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    rows = materialize_metadata_rows([dict(row) for row in rows])
+    payloads = [
+        json.dumps(row, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        for row in rows
+    ]
+    row_offsets = np_mod.zeros(len(payloads) + 1, dtype="int64")
+    if payloads:
+        row_offsets[1:] = np_mod.cumsum([len(item) for item in payloads])
+
+    hasher = hashlib.sha256()
+    for payload in payloads:
+        hasher.update(payload)
+    blob_path = _blob_path(path, hasher.hexdigest()[:16])
+    if not blob_path.exists() or blob_path.stat().st_size != int(row_offsets[-1]):
+        tmp_blob = blob_path.with_name(blob_path.name + ".tmp")
+        with tmp_blob.open("wb") as fh:
+            for payload in payloads:
+                fh.write(payload)
+        os.replace(tmp_blob, blob_path)
+
+    columns: dict[str, object] = {}
+    for name in _STRING_COLUMNS:
+        if name == "section_id":
+            values = [canonical_section_id(row) or "" for row in rows]
+        elif name == "doc_id":
+            values = [result_doc_id(row) for row in rows]
+        else:
+            values = [str(row.get(name) or "") for row in rows]
+        columns[f"{name}_offsets"], columns[f"{name}_blob"] = _encode_strings(np_mod, values)
+    ordinals = []
+    for row in rows:
+        try:
+            ordinals.append(int(row["ordinal"]) if row.get("ordinal") is not None else -1)
+        except Exception:
+            ordinals.append(-1)
+    table_header = json.dumps(
+        {
+            "schema_version": METADATA_TABLE_VERSION,
+            "blob": blob_path.name,
+            "doc_count": len(rows),
+            "source": meta_fingerprint(meta_path),
+            "header": dict(header),
+        },
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        np_mod.savez(
+            fh,
+            header=np_mod.frombuffer(table_header.encode("utf-8"), dtype="uint8"),
+            row_offsets=row_offsets,
+            ordinals=np_mod.asarray(ordinals, dtype="int64"),
+            tie_ranks=tie_break_rank_array(np_mod, rows),
+            **columns,
+        )
+    os.replace(tmp_path, path)
+    _remove_stale_blobs(path, blob_path)
+
+
+class MetadataTable(Sequence):
+    """Read-only row sequence that decodes each row only when indexed.
+
+    Every access returns a fresh ``dict`` (with ``row_id``), so callers may
+    mutate results without affecting the shared table.
+    """
+
+    def __init__(self, *, blob, row_offsets, columns: Mapping[str, object], ordinals, tie_ranks) -> None:
+        self._blob = blob
+        self._row_offsets = row_offsets
+        self._columns = dict(columns)
+        self._decoded: dict[str, list[str]] = {}
+        self._doc_positions: dict[str, int] | None = None
+        self._section_positions: dict[str, list[int]] | None = None
+        self.ordinals = ordinals
+        self.tie_ranks = tie_ranks
+
+    def __len__(self) -> int:
+        return int(self._row_offsets.shape[0]) - 1
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[pos] for pos in range(*idx.indices(len(self)))]
+        pos = int(idx)
+        if pos < 0:
+            pos += len(self)
+        if pos < 0 or pos >= len(self):
+            raise IndexError(idx)
+        start = int(self._row_offsets[pos])
+        end = int(self._row_offsets[pos + 1])
+        row = json.loads(bytes(self._blob[start:end]).decode("utf-8"))
+        row.setdefault("row_id", pos)
+        return row
+
+    def __iter__(self) -> Iterator[dict]:
+        for pos in range(len(self)):
+            yield self[pos]
+
+    def column(self, name: str) -> list[str]:
+        """Decoded string column (``doc_id``, ``section_id`` or ``chunk_kind``)."""
+
+        values = self._decoded.get(name)
+        if values is None:
+            values = _decode_strings(
+                self._columns[f"{name}_offsets"], self._columns[f"{name}_blob"]
+            )
+            self._decoded[name] = values
+        return values
+
+    def doc_positions(self) -> dict[str, int]:
+        """``doc_id`` -> row position (last occurrence wins), built once."""
+
+        if self._doc_positions is None:
+            positions: dict[str, int] = {}
+            for pos, doc_id in enumerate(self.column("doc_id")):
+                if doc_id:
+                    positions[doc_id] = pos
+            self._doc_positions = positions
+        return self._doc_positions
+
+    def positions_for_section(self, section_id: str) -> list[int]:
+        """Row positions whose canonical section id equals ``section_id``."""
+
+        if self._section_positions is None:
+            grouped: dict[str, list[int]] = {}
+            for pos, sec in enumerate(self.column("section_id")):
+                if sec:
+                    grouped.setdefault(sec, []).append(pos)
+            self._section_positions = grouped
+        return list(self._section_positions.get(section_id, ()))
+
+
+def load_metadata_table(
+    path: Path,
+    *,
+    np_mod,
+    meta_path: Path,
+) -> tuple[MetadataTable, dict[str, object]] | None:
+    """Map the table and return ``(rows, header)``, or ``None`` when absent or stale."""
+
+    path = Path(path)
+    if not path.exists() or not Path(meta_path).exists():
+        return None
+    try:
+        with np_mod.load(str(path), allow_pickle=False) as payload:
+            table_header = json.loads(payload["header"].tobytes().decode("utf-8"))
+            arrays = {name: payload[name] for name in payload.files if name != "header"}
+    except Exception:
+        return None
+    if table_header.get("schema_version") != METADATA_TABLE_VERSION:
+        return None
+    if table_header.get("source") != meta_fingerprint(meta_path):
+        return None
+    blob_name = str(table_header.get("blob") or "")
+    blob_path = path.parent / blob_name
+    if not blob_name or Path(blob_name).name != blob_name or not blob_path.exists():
+        return None
+    row_offsets = arrays.get("row_offsets")
+    doc_count = int(table_header.get("doc_count") or 0)
+    if row_offsets is None or int(row_offsets.shape[0]) != doc_count + 1:
+        return None
+    if int(row_offsets[-1]) != blob_path.stat().st_size:
+        return None
+    blob = (
+        np_mod.memmap(str(blob_path), dtype="uint8", mode="r")
+        if doc_count and blob_path.stat().st_size
+        else np_mod.empty(0, dtype="uint8")
+    )
+    try:
+        table = MetadataTable(
+            blob=blob,
+            row_offsets=row_offsets,
+            columns={
+                key: arrays[key]
+                for name in _STRING_COLUMNS
+                for key in (f"{name}_offsets", f"{name}_blob")
+            },
+            ordinals=arrays["ordinals"],
+            tie_ranks=arrays["tie_ranks"],
+        )
+    except KeyError:
+        return None
+    header = table_header.get("header")
+    return table, dict(header) if isinstance(header, Mapping) else {}
+
+
+__all__ = [
+    "METADATA_TABLE_VERSION",
+    "MetadataTable",
+    "load_metadata_table",
+    "meta_fingerprint",
+    "metadata_table_path",
+    "write_metadata_table",
+]
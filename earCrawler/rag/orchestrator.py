@@ -96,6 +96,40 @@ def run_retrieval_sync(
     )
 
 
+def run_retrieval_batch_sync(
+    *,
+    queries: Sequence[str],
+    top_ks: Sequence[int],
+    retriever: object | None,
+    strict: bool,
+    effective_dates: Sequence[str | None],
+    ensure_retriever_fn=None,
+) -> list[RetrievalExecution]:
+    temporal_states: list[dict[str, object]] = [{} for _ in queries]
+    item_warnings: list[list[dict[str, object]]] = [[] for _ in queries]
+    retrieve_start = time.perf_counter()
+    batch_docs = retrieval_runtime.retrieve_regulation_context_batch(
+        queries,
+        top_k=top_ks,
+        retriever=retriever,
+        strict=strict,
+        effective_dates=effective_dates,
+        temporal_states=temporal_states,
+        item_warnings=item_warnings,
+        ensure_retriever_fn=ensure_retriever_fn,
+    )
+    t_retrieve_ms = _elapsed_ms(retrieve_start)
+    return [
+        RetrievalExecution(
+            docs=docs,
+            warnings=warnings,
+            temporal_state=temporal_state,
+            t_retrieve_ms=t_retrieve_ms,
+        )
+        for docs, warnings, temporal_state in zip(batch_docs, item_warnings, temporal_states)
+    ]
+
+
 def resolve_retriever_state(
     *,
     retriever: object | None,
@@ -392,5 +426,6 @@ __all__ = [
     "generation_status_code",
     "resolve_retrieval_empty_state",
     "resolve_retriever_state",
+    "run_retrieval_batch_sync",
     "run_retrieval_sync",
 ]
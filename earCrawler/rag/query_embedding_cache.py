@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+"""Bounded LRU cache of query embeddings keyed on model and normalized prompt.
+
+Repeated prompts (eval reruns, hot API queries, warmup) skip the encoder. The
+cache can optionally be snapshotted to an ``.npz`` file so a later process
+starts warm.
+"""
+
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock, RLock
+from typing import Sequence
+
+QUERY_EMBEDDING_CACHE_SIZE_ENV = "EARCRAWLER_QUERY_EMBEDDING_CACHE_SIZE"
+QUERY_EMBEDDING_CACHE_PATH_ENV = "EARCRAWLER_QUERY_EMBEDDING_CACHE_PATH"
+QUERY_EMBEDDING_CACHE_VERSION = "query-embedding-cache.v1"
+DEFAULT_QUERY_EMBEDDING_CACHE_SIZE = 2048
+DEFAULT_PERSIST_EVERY = 64
+
+
+def normalize_query_text(prompt: str) -> str:
+    """Collapse whitespace so formatting-only variants share one cache entry."""
+
+    return " ".join(str(prompt or "").split())
+
+
+class QueryEmbeddingCache:
+    """Thread-safe LRU mapping ``(model, normalized prompt)`` to float32 vectors."""
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_QUERY_EMBEDDING_CACHE_SIZE,
+        *,
+        np_mod,
+        path: Path | None = None,
+        persist_every: int = DEFAULT_PERSIST_EVERY,
+    ) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.path = Path(path) if path is not None else None
+        self.persist_every = max(1, int(persist_every))
+        self._np = np_mod
+        self._lock = RLock()
+        # Serialises whole saves: snapshots are written in the order taken and
+        # two savers never share the temp file.
+        self._save_lock = Lock()
+        self._entries: OrderedDict[tuple[str, str], object] = OrderedDict()
+        self._dirty = 0
+        self.hits = 0
+        self.misses = 0
+        self.loaded_entries = 0
+        if self.path is not None:
+            self.loaded_entries = self._load()
+
+    def get_many(self, model_name: str, prompts: Sequence[str]) -> list[object | None]:
+        """Return cached vectors (or ``None``) for ``prompts`` and count hits/misses."""
+
+        found: list[object | None] = []
+        with self._lock:
+            for prompt in prompts:
+                key = (model_name, normalize_query_text(prompt))
+                vector = self._entries.get(key)
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                found.append(vector)
+        return found
+
+    def put_many(self, model_name: str, prompts: Sequence[str], vectors) -> None:
+        """Store one row of ``vectors`` per prompt, evicting least-recently used."""
+
+        rows = self._np.asarray(vectors, dtype="float32")
+        with self._lock:
+            for prompt, row in zip(prompts, rows):
+                key = (model_name, normalize_query_text(prompt))
+                vector = self._np.array(row, dtype="float32")
+                vector.setflags(write=False)
+                self._entries[key] = vector
+                self._entries.move_to_end(key)
+                self._dirty += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            should_persist = self.path is not None and self._dirty >= self.persist_every
+        if should_persist:
+            self.save()
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "persist_path": str(self.path) if self.path is not None else None,
+                "loaded_entries": self.loaded_entries,
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._dirty = 0
+            self.hits = 0
+            self.misses = 0
+
+    def save(self) -> None:
+        """Atomically snapshot the cache to ``path`` (no-op without a path)."""
+
+        if self.path is None:
+            return
+        with self._save_lock:
+            self._save_locked()
+
+    def _save_locked(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            keys = [list(key) for key in self._entries]
+            vectors = list(self._entries.values())
+            self._dirty = 0
+        np = self._np
+        dims = np.asarray([int(v.shape[0]) for v in vectors], dtype="int32")
+        flat = (
+            np.concatenate(vectors).astype("float32")
+            if vectors
+            else np.empty(0, dtype="float32")
+        )
+        header = json.dumps(
+            {"schema_version": QUERY_EMBEDDING_CACHE_VERSION, "keys": keys},
+            ensure_ascii=False,
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with tmp_path.open("wb") as fh:
+            np.savez(
+                fh,
+                header=np.frombuffer(header.encode("utf-8"), dtype="uint8"),
+                dims=dims,
+                vectors=flat,
+            )
+        os.replace(tmp_path, self.path)
+
+    def _load(self) -> int:
+        if self.path is None or not self.path.exists():
+            return 0
+        try:
+            with self._np.load(str(self.path), allow_pickle=False) as payload:
+                header = json.loads(payload["header"].tobytes().decode("utf-8"))
+                dims = payload["dims"].astype("int64")
+                flat = payload["vectors"].astype("float32")
+        except Exception:
+            return 0
+        if header.get("schema_version") != QUERY_EMBEDDING_CACHE_VERSION:
+            return 0
+        keys = header.get("keys") or []
+        if len(keys) != int(dims.shape[0]) or int(dims.sum()) != int(flat.shape[0]):
+            return 0
+        offset = 0
+        with self._lock:
+            for (model_name, prompt), dim in zip(keys, dims.tolist()):
+                vector = flat[offset : offset + dim].copy()
+                offset += dim
+                vector.setflags(write=False)
+                self._entries[(str(model_name), str(prompt))] = vector
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            return len(self._entries)
+
+
+def query_embedding_cache_from_env(np_mod) -> QueryEmbeddingCache | None:
+    """Build the process cache from env; size ``0`` disables caching."""
+
+    raw_size = os.getenv(QUERY_EMBEDDING_CACHE_SIZE_ENV)
+    try:
+        size = int(raw_size) if raw_size not in (None, "") else DEFAULT_QUERY_EMBEDDING_CACHE_SIZE
+    except ValueError:
+        size = DEFAULT_QUERY_EMBEDDING_CACHE_SIZE
+    if size <= 0:
+        return None
+    raw_path = str(os.getenv(QUERY_EMBEDDING_CACHE_PATH_ENV) or "").strip()
+    return QueryEmbeddingCache(
+        size,
+        np_mod=np_mod,
+        path=Path(raw_path) if raw_path else None,
+    )
+
+
+__all__ = [
+    "DEFAULT_QUERY_EMBEDDING_CACHE_SIZE",
+    "QUERY_EMBEDDING_CACHE_PATH_ENV",
+    "QUERY_EMBEDDING_CACHE_SIZE_ENV",
+    "QUERY_EMBEDDING_CACHE_VERSION",
+    "QueryEmbeddingCache",
+    "normalize_query_text",
+    "query_embedding_cache_from_env",
+]
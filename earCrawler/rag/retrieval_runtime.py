@@ -2,7 +2,6 @@ from __future__ import annotations
 
 """Retrieval orchestration helpers for the RAG pipeline."""
 
-import json
 import os
 import re
 import time
@@ -15,8 +14,31 @@ import requests
 
 from api_clients.federalregister_client import FederalRegisterClient
 from api_clients.tradegov_client import TradeGovClient
+from earCrawler.kg.iri import canonical_section_id
 from earCrawler.kg.paths import KGExpansionSnippet, KGPath, KGPathEdge
+from earCrawler.rag.fuseki_gateway_pool import (
+    DEFAULT_BREAKER_COOLDOWN_SECONDS,
+    DEFAULT_BREAKER_THRESHOLD,
+    DEFAULT_PROBE_TTL_SECONDS,
+    FusekiGatewayPool,
+    GatewayConfig,
+)
+from earCrawler.rag.kg_expansion_artifact import (
+    KG_EXPANSION_ARTIFACT_ENV,
+    KGExpansionArtifactError,
+    open_kg_expansion_artifact,
+)
+from earCrawler.rag.kg_expansion_cache import (
+    DEFAULT_KG_EXPANSION_CACHE_SIZE,
+    DEFAULT_KG_EXPANSION_MANIFEST,
+    KG_EXPANSION_CACHE_SIZE_ENV,
+    KG_EXPANSION_MANIFEST_ENV,
+    KGExpansionCache,
+    kg_manifest_digest,
+    load_json_stub_mapping,
+)
 from earCrawler.rag.kg_expansion_fuseki import (
+    FusekiExpansionResult,
     FusekiGatewayLike,
     SPARQLTemplateGateway,
     expand_sections_via_fuseki,
@@ -185,46 +207,32 @@ def summarize_retrieved_doc(doc: Mapping[str, object], *, source: str = "retriev
     }
 
 
-def retrieve_regulation_context(
-    query: str,
-    top_k: int = 5,
-    *,
-    retriever: object | None = None,
-    strict: bool = True,
-    warnings: list[dict[str, object]] | None = None,
-    effective_date: str | None = None,
-    temporal_state: dict[str, object] | None = None,
-    ensure_retriever_fn=None,
-    logger: object | None = None,
-) -> list[dict]:
-    """Return top-k regulation snippets using the configured dense/hybrid retriever."""
-
-    log = _resolved_logger(logger)
-    warning_list = warnings if warnings is not None else []
-    temporal_request = resolve_temporal_request(query, effective_date=effective_date)
-    if temporal_request.refusal_reason:
-        if temporal_state is not None:
-            temporal_state.clear()
-            temporal_state.update(
-                select_temporal_documents([], request=temporal_request, top_k=top_k).to_dict()
-            )
-        return []
-
+def _retriever_error_type():
     try:
         from earCrawler.rag.retriever import RetrieverError
     except Exception:
-        RetrieverError = Exception  # type: ignore[assignment]
+        return Exception
+    return RetrieverError
 
+
+def _resolve_retriever_for_query(
+    retriever: object | None,
+    *,
+    strict: bool,
+    warning_list: list[dict[str, object]],
+    ensure_retriever_fn,
+    log,
+):
+    RetrieverError = _retriever_error_type()
     try:
         if ensure_retriever_fn is None:
-            r = ensure_retriever(
+            return ensure_retriever(
                 retriever,
                 strict=strict,
                 warnings=warning_list,
                 logger=log,
             )
-        else:
-            r = ensure_retriever_fn(retriever, strict=strict, warnings=warning_list)
+        return ensure_retriever_fn(retriever, strict=strict, warnings=warning_list)
     except RetrieverError as exc:
         log.error(
             "rag.retriever.unavailable",
@@ -233,41 +241,28 @@ def retrieve_regulation_context(
         if strict:
             raise
         warning_list.append(warn_from_exc(exc))
-        return []
+        return None
     except Exception as exc:  # pragma: no cover - defensive
         log.error("rag.retriever.unavailable", error=str(exc))
         if strict:
             raise
         warning_list.append(warn_from_exc(exc))
-        return []
+        return None
 
-    if r is None:
-        return []
-    try:
-        query_k = temporal_candidate_count(top_k) if temporal_request.requested else top_k
-        docs = r.query(query, k=query_k)
-    except RetrieverError as exc:
-        log.error(
-            "rag.retrieval.failed",
-            details={"retriever_error": warn_from_exc(exc)},
-        )
-        if strict:
-            raise
-        warning_list.append(warn_from_exc(exc))
-        return []
-    except Exception as exc:  # pragma: no cover - defensive
-        log.error("rag.retrieval.failed", error=str(exc))
-        if strict:
-            raise
-        warning_list.append(warn_from_exc(exc))
-        return []
+
+def _shape_retrieved_docs(
+    docs: Sequence[Mapping[str, object]],
+    *,
+    temporal_request,
+    top_k: int,
+    temporal_state: dict[str, object] | None,
+) -> list[dict]:
     selection = select_temporal_documents(docs, request=temporal_request, top_k=top_k)
     if temporal_state is not None:
         temporal_state.clear()
         temporal_state.update(selection.to_dict())
-    docs = list(selection.selected_docs)
     results: list[dict] = []
-    for doc in docs:
+    for doc in selection.selected_docs:
         text = extract_text(doc)
         if not text:
             continue
@@ -295,6 +290,175 @@ def retrieve_regulation_context(
     return results
 
 
+def retrieve_regulation_context(
+    query: str,
+    top_k: int = 5,
+    *,
+    retriever: object | None = None,
+    strict: bool = True,
+    warnings: list[dict[str, object]] | None = None,
+    effective_date: str | None = None,
+    temporal_state: dict[str, object] | None = None,
+    ensure_retriever_fn=None,
+    logger: object | None = None,
+) -> list[dict]:
+    """Return top-k regulation snippets using the configured dense/hybrid retriever."""
+
+    log = _resolved_logger(logger)
+    warning_list = warnings if warnings is not None else []
+    temporal_request = resolve_temporal_request(query, effective_date=effective_date)
+    if temporal_request.refusal_reason:
+        if temporal_state is not None:
+            temporal_state.clear()
+            temporal_state.update(
+                select_temporal_documents([], request=temporal_request, top_k=top_k).to_dict()
+            )
+        return []
+
+    RetrieverError = _retriever_error_type()
+    r = _resolve_retriever_for_query(
+        retriever,
+        strict=strict,
+        warning_list=warning_list,
+        ensure_retriever_fn=ensure_retriever_fn,
+        log=log,
+    )
+    if r is None:
+        return []
+    try:
+        query_k = temporal_candidate_count(top_k) if temporal_request.requested else top_k
+        docs = r.query(query, k=query_k)
+    except RetrieverError as exc:
+        log.error(
+            "rag.retrieval.failed",
+            details={"retriever_error": warn_from_exc(exc)},
+        )
+        if strict:
+            raise
+        warning_list.append(warn_from_exc(exc))
+        return []
+    except Exception as exc:  # pragma: no cover - defensive
+        log.error("rag.retrieval.failed", error=str(exc))
+        if strict:
+            raise
+        warning_list.append(warn_from_exc(exc))
+        return []
+    return _shape_retrieved_docs(
+        docs,
+        temporal_request=temporal_request,
+        top_k=top_k,
+        temporal_state=temporal_state,
+    )
+
+
+def retrieve_regulation_context_batch(
+    queries: Sequence[str],
+    top_k: int | Sequence[int] = 5,
+    *,
+    retriever: object | None = None,
+    strict: bool = True,
+    warnings: list[dict[str, object]] | None = None,
+    effective_dates: Sequence[str | None] | None = None,
+    temporal_states: Sequence[dict[str, object] | None] | None = None,
+    item_warnings: Sequence[list[dict[str, object]]] | None = None,
+    ensure_retriever_fn=None,
+    logger: object | None = None,
+) -> list[list[dict]]:
+    """Batched :func:`retrieve_regulation_context` for several queries.
+
+    Queries that share a candidate count are sent to ``retriever.query_many``
+    together, so the batch pays for one embedding pass and one index search
+    per group. Retrievers without ``query_many`` fall back to ``query``.
+    ``warnings`` collects every warning of the batch; ``item_warnings`` (one
+    list per query) receives only the warnings that affected that query.
+    """
+
+    log = _resolved_logger(logger)
+    warning_list = warnings if warnings is not None else []
+    count = len(queries)
+    top_ks = [int(top_k)] * count if isinstance(top_k, int) else [int(v) for v in top_k]
+    dates = list(effective_dates) if effective_dates is not None else [None] * count
+    states = list(temporal_states) if temporal_states is not None else [None] * count
+    per_item = list(item_warnings) if item_warnings is not None else [[] for _ in range(count)]
+    if not (len(top_ks) == len(dates) == len(states) == len(per_item) == count):
+        raise ValueError("Batch arguments must have one entry per query.")
+
+    def _warn(indices: Iterable[int], new_warnings: Sequence[dict[str, object]]) -> None:
+        for idx in indices:
+            per_item[idx].extend(dict(warning) for warning in new_warnings)
+
+    results: list[list[dict]] = [[] for _ in range(count)]
+    requests_by_idx = {}
+    groups: dict[int, list[int]] = {}
+    for idx, query in enumerate(queries):
+        temporal_request = resolve_temporal_request(query, effective_date=dates[idx])
+        if temporal_request.refusal_reason:
+            state = states[idx]
+            if state is not None:
+                state.clear()
+                state.update(
+                    select_temporal_documents(
+                        [], request=temporal_request, top_k=top_ks[idx]
+                    ).to_dict()
+                )
+            continue
+        requests_by_idx[idx] = temporal_request
+        query_k = (
+            temporal_candidate_count(top_ks[idx])
+            if temporal_request.requested
+            else top_ks[idx]
+        )
+        groups.setdefault(query_k, []).append(idx)
+    if not groups:
+        return results
+
+    RetrieverError = _retriever_error_type()
+    resolve_start = len(warning_list)
+    r = _resolve_retriever_for_query(
+        retriever,
+        strict=strict,
+        warning_list=warning_list,
+        ensure_retriever_fn=ensure_retriever_fn,
+        log=log,
+    )
+    _warn(requests_by_idx, warning_list[resolve_start:])
+    if r is None:
+        return results
+    query_many = getattr(r, "query_many", None)
+    for query_k, members in groups.items():
+        prompts = [queries[idx] for idx in members]
+        try:
+            if callable(query_many):
+                batch_docs = query_many(prompts, k=query_k)
+            else:
+                batch_docs = [r.query(prompt, k=query_k) for prompt in prompts]
+        except RetrieverError as exc:
+            log.error(
+                "rag.retrieval.failed",
+                details={"retriever_error": warn_from_exc(exc)},
+            )
+            if strict:
+                raise
+            warning_list.append(warn_from_exc(exc))
+            _warn(members, warning_list[-1:])
+            continue
+        except Exception as exc:  # pragma: no cover - defensive
+            log.error("rag.retrieval.failed", error=str(exc))
+            if strict:
+                raise
+            warning_list.append(warn_from_exc(exc))
+            _warn(members, warning_list[-1:])
+            continue
+        for idx, docs in zip(members, batch_docs):
+            results[idx] = _shape_retrieved_docs(
+                docs,
+                temporal_request=requests_by_idx[idx],
+                top_k=top_ks[idx],
+                temporal_state=states[idx],
+            )
+    return results
+
+
 def _env_truthy(name: str, *, default: bool = False) -> bool:
     raw = os.getenv(name)
     if raw is None:
@@ -409,6 +573,33 @@ def _probe_fuseki_endpoint(
     raise RuntimeError(f"Fuseki health check failed for {endpoint}: {last_exc}")
 
 
+_FUSEKI_GATEWAY_POOL = FusekiGatewayPool()
+
+
+def _build_fuseki_gateway(endpoint: str, config: GatewayConfig) -> FusekiGatewayLike:
+    return SPARQLTemplateGateway(
+        endpoint=endpoint,
+        timeout=config.timeout,
+        query_retries=config.retries,
+        retry_backoff_ms=config.retry_backoff_ms,
+    )
+
+
+def _probe_fuseki_gateway(endpoint: str, config: GatewayConfig) -> None:
+    _probe_fuseki_endpoint(
+        endpoint,
+        timeout=config.timeout,
+        retries=config.retries,
+        retry_backoff_ms=config.retry_backoff_ms,
+    )
+
+
+def fuseki_gateway_pool() -> FusekiGatewayPool:
+    """Return the process-wide pool behind :func:`create_fuseki_gateway`."""
+
+    return _FUSEKI_GATEWAY_POOL
+
+
 def create_fuseki_gateway() -> FusekiGatewayLike:
     endpoint = str(os.getenv("EARCRAWLER_FUSEKI_URL") or "").strip()
     if not endpoint:
@@ -427,19 +618,30 @@ def create_fuseki_gateway() -> FusekiGatewayLike:
         default=True,
     )
 
-    if healthcheck_enabled:
-        _probe_fuseki_endpoint(
-            endpoint,
+    return _FUSEKI_GATEWAY_POOL.get(
+        endpoint,
+        config=GatewayConfig(
             timeout=timeout,
             retries=retries,
             retry_backoff_ms=retry_backoff_ms,
-        )
-
-    return SPARQLTemplateGateway(
-        endpoint=endpoint,
-        timeout=timeout,
-        query_retries=retries,
-        retry_backoff_ms=retry_backoff_ms,
+        ),
+        factory=_build_fuseki_gateway,
+        probe=_probe_fuseki_gateway if healthcheck_enabled else None,
+        probe_ttl_seconds=_env_int(
+            "EARCRAWLER_KG_EXPANSION_FUSEKI_HEALTHCHECK_TTL_SECONDS",
+            default=DEFAULT_PROBE_TTL_SECONDS,
+            min_value=0,
+        ),
+        failure_threshold=_env_int(
+            "EARCRAWLER_KG_EXPANSION_FUSEKI_BREAKER_THRESHOLD",
+            default=DEFAULT_BREAKER_THRESHOLD,
+            min_value=1,
+        ),
+        cooldown_seconds=_env_int(
+            "EARCRAWLER_KG_EXPANSION_FUSEKI_BREAKER_COOLDOWN_SECONDS",
+            default=DEFAULT_BREAKER_COOLDOWN_SECONDS,
+            min_value=0,
+        ),
     )
 
 
@@ -451,17 +653,11 @@ def _expand_with_json_stub(
 ) -> list[KGExpansionSnippet]:
     log = _resolved_logger(logger)
     try:
-        data = json.loads(Path(mapping_path).read_text(encoding="utf-8"))
+        mapping = load_json_stub_mapping(mapping_path, normalize_section_id)
     except Exception as exc:  # pragma: no cover - defensive, optional path
         log.warning("rag.kg.expansion_failed", error=str(exc))
         return []
 
-    normalized: dict[str, str] = {}
-    for raw_key in data.keys():
-        norm = normalize_section_id(raw_key)
-        if norm:
-            normalized.setdefault(norm, str(raw_key))
-
     max_paths = _env_int(
         "EARCRAWLER_KG_EXPANSION_MAX_PATHS_PER_SECTION",
         default=4,
@@ -470,10 +666,9 @@ def _expand_with_json_stub(
     expansions: list[KGExpansionSnippet] = []
     for sec in sorted(set(section_ids)):
         key = normalize_section_id(sec)
-        if not key or key not in normalized:
+        if not key or key not in mapping:
             continue
-        raw_key = normalized[key]
-        entry = data.get(raw_key) or {}
+        entry = mapping[key][1]
         text = str(entry.get("text") or entry.get("comment") or "").strip()
         if not text:
             continue
@@ -520,10 +715,132 @@ def _expand_with_json_stub(
     return expansions
 
 
+_KG_EXPANSION_CACHE: KGExpansionCache | None = None
+_KG_EXPANSION_CACHE_READY = False
+
+
+def kg_expansion_cache() -> KGExpansionCache | None:
+    """Return the process-wide Fuseki expansion cache (``None`` when disabled)."""
+
+    global _KG_EXPANSION_CACHE, _KG_EXPANSION_CACHE_READY
+    if not _KG_EXPANSION_CACHE_READY:
+        size = _env_int(
+            KG_EXPANSION_CACHE_SIZE_ENV,
+            default=DEFAULT_KG_EXPANSION_CACHE_SIZE,
+            min_value=0,
+        )
+        _KG_EXPANSION_CACHE = KGExpansionCache(size) if size > 0 else None
+        _KG_EXPANSION_CACHE_READY = True
+    return _KG_EXPANSION_CACHE
+
+
+def _kg_snapshot_digest() -> str | None:
+    """Identify the configured Fuseki dataset by endpoint and KG export manifest."""
+
+    endpoint = str(os.getenv("EARCRAWLER_FUSEKI_URL") or "").strip()
+    if not endpoint:
+        return None
+    manifest = str(os.getenv(KG_EXPANSION_MANIFEST_ENV) or "").strip()
+    digest = kg_manifest_digest(manifest or DEFAULT_KG_EXPANSION_MANIFEST)
+    return f"{endpoint}#{digest}" if digest else None
+
+
+def _expand_via_fuseki_cached(
+    sections: list[str],
+    cache: KGExpansionCache,
+    kg_digest: str,
+    *,
+    gateway_builder,
+    max_paths: int,
+    max_hops: int,
+) -> tuple[FusekiExpansionResult, int]:
+    canonical = sorted({norm for norm in map(canonical_section_id, sections) if norm})
+    found, missing = cache.get_many(
+        kg_digest, canonical, max_hops=max_hops, max_paths=max_paths
+    )
+    query_count = 0
+    if missing:
+        fresh = expand_sections_via_fuseki(
+            missing,
+            gateway_builder(),
+            max_paths_per_section=max_paths,
+            max_hops=max_hops,
+        )
+        query_count = fresh.query_count
+        results: dict[str, KGExpansionSnippet | None] = dict.fromkeys(missing)
+        results.update({snippet.section_id: snippet for snippet in fresh})
+        cache.put_many(kg_digest, results, max_hops=max_hops, max_paths=max_paths)
+        found.update(results)
+    expansions = FusekiExpansionResult(
+        [found[section] for section in canonical if found.get(section) is not None],
+        query_count=query_count,
+    )
+    return expansions, len(canonical) - len(missing)
+
+
+def _expand_with_artifact(
+    sections: list[str],
+    artifact_path: str,
+    *,
+    max_paths: int,
+    max_hops: int,
+    failure_policy: str,
+    logger: object | None = None,
+) -> list[KGExpansionSnippet] | None:
+    """Serve expansion from the artifact; ``None`` means use the live provider.
+
+    Path selection, snippet text and related sections all depend on both
+    walk limits, so an artifact built with other limits cannot reproduce the
+    live result and is refused.
+    """
+
+    log = _resolved_logger(logger)
+    try:
+        if not artifact_path:
+            raise ValueError(
+                f"artifact provider selected but {KG_EXPANSION_ARTIFACT_ENV} is not configured"
+            )
+        artifact = open_kg_expansion_artifact(artifact_path)
+        if max_hops != artifact.max_hops or max_paths != artifact.max_paths_per_section:
+            log.warning(
+                "rag.kg_expansion.artifact_limits_mismatch",
+                artifact_max_hops=artifact.max_hops,
+                artifact_max_paths=artifact.max_paths_per_section,
+                max_hops=max_hops,
+                max_paths=max_paths,
+                fallback="fuseki",
+            )
+            return None
+        try:
+            expansions = artifact.expand(sections, max_paths_per_section=max_paths)
+        except KGExpansionArtifactError:
+            if not artifact.closed:
+                raise
+            # Superseded by a rebuild mid-request; reopen the current file.
+            artifact = open_kg_expansion_artifact(artifact_path)
+            expansions = artifact.expand(sections, max_paths_per_section=max_paths)
+    except Exception as exc:
+        if failure_policy == "disable":
+            log.warning(
+                "rag.kg.expansion_failed",
+                error=str(exc),
+                failure_policy=failure_policy,
+            )
+            return []
+        raise
+    log.info(
+        "rag.kg_expansion.artifact_hits",
+        section_count=len(set(sections)),
+        hit_count=len(expansions),
+        kg_digest=artifact.kg_digest,
+    )
+    return expansions
+
+
 def expand_with_kg(
     section_ids: Iterable[str],
     *,
-    provider: Literal["fuseki", "json_stub"] = "fuseki",
+    provider: Literal["fuseki", "json_stub", "artifact"] = "fuseki",
     gateway: FusekiGatewayLike | None = None,
     gateway_factory=None,
     logger: object | None = None,
@@ -537,15 +854,18 @@ def expand_with_kg(
 
     configured_provider = str(os.getenv("EARCRAWLER_KG_EXPANSION_PROVIDER") or "").strip().lower()
     mapping_path = str(os.getenv("EARCRAWLER_KG_EXPANSION_PATH") or "").strip()
+    artifact_path = str(os.getenv(KG_EXPANSION_ARTIFACT_ENV) or "").strip()
     enabled = _env_truthy("EARCRAWLER_ENABLE_KG_EXPANSION", default=False)
 
-    selected_provider: Literal["fuseki", "json_stub"] | None = None
+    selected_provider: Literal["fuseki", "json_stub", "artifact"] | None = None
     if configured_provider:
-        if configured_provider not in {"fuseki", "json_stub"}:
+        if configured_provider not in {"fuseki", "json_stub", "artifact"}:
             raise ValueError(
-                "EARCRAWLER_KG_EXPANSION_PROVIDER must be one of: fuseki, json_stub"
+                "EARCRAWLER_KG_EXPANSION_PROVIDER must be one of: fuseki, json_stub, artifact"
             )
         selected_provider = configured_provider  # type: ignore[assignment]
+    elif artifact_path:
+        selected_provider = "artifact"
     elif mapping_path:
         selected_provider = "json_stub"
     elif enabled or gateway is not None:
@@ -571,15 +891,47 @@ def expand_with_kg(
     )
     max_hops = _env_int("EARCRAWLER_KG_EXPANSION_MAX_HOPS", default=2, min_value=1)
     failure_policy = kg_failure_policy()
-    gateway_builder = gateway_factory or create_fuseki_gateway
-    try:
-        provider_gateway = gateway or gateway_builder()
-        return expand_sections_via_fuseki(
+
+    if selected_provider == "artifact":
+        artifact_expansions = _expand_with_artifact(
             sections,
-            provider_gateway,
-            max_paths_per_section=max_paths,
+            artifact_path,
+            max_paths=max_paths,
             max_hops=max_hops,
+            failure_policy=failure_policy,
+            logger=log,
+        )
+        if artifact_expansions is not None:
+            return artifact_expansions
+    gateway_builder = gateway_factory or create_fuseki_gateway
+    try:
+        cache = kg_expansion_cache()
+        # Injected gateways may not serve the configured dataset; never cache them.
+        kg_digest = _kg_snapshot_digest() if cache is not None and gateway is None else None
+        if cache is None or kg_digest is None:
+            expansions = expand_sections_via_fuseki(
+                sections,
+                gateway or gateway_builder(),
+                max_paths_per_section=max_paths,
+                max_hops=max_hops,
+            )
+            cache_hits = 0
+        else:
+            expansions, cache_hits = _expand_via_fuseki_cached(
+                sections,
+                cache,
+                kg_digest,
+                gateway_builder=gateway_builder,
+                max_paths=max_paths,
+                max_hops=max_hops,
+            )
+        log.info(
+            "rag.kg_expansion.fuseki_queries",
+            section_count=len(sections),
+            query_count=expansions.query_count,
+            cache_hits=cache_hits,
         )
+        return expansions
     except Exception as exc:
         if failure_policy == "disable":
             log.warning(
@@ -681,12 +1033,15 @@ __all__ = [
     "build_context_lines",
     "build_retrieval_context_bundle",
     "create_fuseki_gateway",
+    "kg_expansion_cache",
+    "fuseki_gateway_pool",
     "ensure_retriever",
     "expand_with_kg",
     "extract_text",
     "kg_expansion_mode",
     "normalize_section_id",
     "retrieve_regulation_context",
+    "retrieve_regulation_context_batch",
     "should_run_kg_expansion",
     "summarize_retrieved_doc",
     "warn_from_exc",
@@ -2,25 +2,34 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
 import os
 import sys
 import time
 from pathlib import Path
 from threading import RLock
-from typing import List, Mapping, MutableMapping, Optional
+from typing import List, Mapping, MutableMapping, Optional, Sequence
 
 from earCrawler.utils.import_guard import import_optional
 
 from api_clients.tradegov_client import TradeGovClient
 from api_clients.federalregister_client import FederalRegisterClient
+from earCrawler.rag.bm25_index import rank_bm25_index as _rank_bm25_index
 from earCrawler.rag.build_corpus import compute_corpus_digest
+from earCrawler.rag.embedding_sidecar import (
+    normalize_embedding_rows as _normalize_embedding_rows,
+)
+from earCrawler.rag.faiss_profiles import faiss_thread_count as _faiss_thread_count
+from earCrawler.rag.query_embedding_cache import (
+    QueryEmbeddingCache,
+    query_embedding_cache_from_env as _query_embedding_cache_from_env,
+)
 from earCrawler.rag.retriever_backend import (
     RETRIEVAL_BACKEND_ENV as _RETRIEVAL_BACKEND_ENV,
     RETRIEVAL_MODE_ENV as _RETRIEVAL_MODE_ENV,
     SUPPORTED_RETRIEVAL_BACKENDS as _SUPPORTED_RETRIEVAL_BACKENDS,
     SUPPORTED_RETRIEVAL_MODES as _SUPPORTED_RETRIEVAL_MODES,
-    is_windows_platform as _is_windows_platform,
     legacy_pickle_metadata_enabled as _legacy_pickle_metadata_enabled,
     resolve_backend_name as _resolve_backend_name_internal,
     resolve_retrieval_mode as _resolve_retrieval_mode_internal,
@@ -31,22 +40,29 @@ from earCrawler.rag.retriever_citation_policy import (
 )
 from earCrawler.rag.retriever_ranking import (
     HYBRID_RRF_K as _HYBRID_RRF_K,
+    document_text_for_embedding as _document_text_for_embedding,
+    faiss_top_k as _faiss_top_k,
     fuse_rankings as _fuse_rankings_internal,
     hybrid_candidate_count as _hybrid_candidate_count_internal,
-    metadata_tie_break_key as _metadata_tie_break_key,
     public_result_doc as _public_result_doc,
-    rank_bm25 as _rank_bm25,
-    score_bucket as _score_bucket,
+    select_top_k_indices as _select_top_k_indices,
 )
 from earCrawler.rag.retriever_store import RetrieverArtifactStore
+from earCrawler.rag.shared_artifacts import (
+    SharedArtifacts,
+    shared_artifacts_enabled as _shared_artifacts_enabled,
+)
 
 SentenceTransformer = None  # type: ignore[assignment]
 faiss = None  # type: ignore[assignment]
 _MODEL_CACHE: dict[str, object] = {}
 _INDEX_CACHE: dict[str, tuple[int, int, object]] = {}
-_META_CACHE: dict[str, tuple[int, int, list[dict]]] = {}
+_META_CACHE: dict[str, tuple[int, int, list[dict], dict[str, object]]] = {}
 _EMBEDDING_CACHE: dict[str, tuple[int, int, object]] = {}
 _BM25_CACHE: dict[str, tuple[int, int, dict[str, object]]] = {}
+_SHARED_CACHE: dict[str, tuple[int, int, SharedArtifacts | None]] = {}
+_QUERY_EMBEDDING_CACHE: QueryEmbeddingCache | None = None
+_QUERY_EMBEDDING_CACHE_READY = False
 _CACHE_LOCK = RLock()
 
 
@@ -114,6 +130,17 @@ class IndexBuildRequiredError(RetrieverError):
         )
 
 
+def _shared_query_embedding_cache(np_mod) -> QueryEmbeddingCache | None:
+    global _QUERY_EMBEDDING_CACHE, _QUERY_EMBEDDING_CACHE_READY
+    with _CACHE_LOCK:
+        if not _QUERY_EMBEDDING_CACHE_READY:
+            _QUERY_EMBEDDING_CACHE = _query_embedding_cache_from_env(np_mod)
+            _QUERY_EMBEDDING_CACHE_READY = True
+            if _QUERY_EMBEDDING_CACHE is not None and _QUERY_EMBEDDING_CACHE.path:
+                atexit.register(_QUERY_EMBEDDING_CACHE.save)
+        return _QUERY_EMBEDDING_CACHE
+
+
 def _resolve_backend_name(explicit_backend: str | None = None) -> tuple[str, str]:
     resolved, source = _resolve_backend_name_internal(explicit_backend)
     if resolved is not None:
@@ -218,6 +245,8 @@ class Retriever:
             raise RetrieverUnavailableError(
                 str(exc), metadata={"packages": ["numpy"]}
             ) from exc
+        self.query_embedding_cache = _shared_query_embedding_cache(self._np)
+        self.shared_artifacts = _shared_artifacts_enabled()
 
         self._artifact_store = RetrieverArtifactStore(
             index_path=self.index_path,
@@ -233,9 +262,11 @@ class Retriever:
             meta_cache=_META_CACHE,
             embedding_cache=_EMBEDDING_CACHE,
             bm25_cache=_BM25_CACHE,
+            shared_cache=_SHARED_CACHE,
             retriever_error_cls=RetrieverError,
             index_missing_error_cls=IndexMissingError,
             index_build_required_error_cls=IndexBuildRequiredError,
+            shared_artifacts=self.shared_artifacts,
         )
 
         # Status flags for external introspection/logging.
@@ -248,8 +279,9 @@ class Retriever:
             return
         omp_set_num_threads = getattr(self._faiss, "omp_set_num_threads", None)
         if callable(omp_set_num_threads):
-            omp_set_num_threads(1)
-            self.faiss_threads = 1
+            threads = _faiss_thread_count()
+            omp_set_num_threads(threads)
+            self.faiss_threads = threads
 
     def _load_model(self, model_name: str):
         with _CACHE_LOCK:
@@ -296,15 +328,22 @@ class Retriever:
         index,
         metadata: List[dict],
         corpus_digest: str | None = None,
+        embeddings=None,
     ) -> None:
         self._artifact_store.save_index(
             index=index,
             metadata=metadata,
             corpus_digest=corpus_digest,
+            embeddings=embeddings,
         )
 
-    def add_documents(self, docs: List[dict]) -> None:
-        """Add ``docs`` to the retrieval index."""
+    def add_documents(self, docs: List[dict], *, incremental: bool = False) -> None:
+        """Add ``docs`` to the retrieval index.
+
+        With ``incremental=True`` only new or content-changed docs are encoded
+        and written into the existing index and sidecars; the full rebuild is
+        used when there is nothing to append to.
+        """
         if not docs:
             self.logger.info("No documents provided for indexing")
             return
@@ -315,19 +354,14 @@ class Retriever:
             raise RetrieverError(str(exc), code="corpus_validation_failed") from exc
 
         existing = self._load_metadata(allow_create=True)
+        if incremental and len(existing):
+            require_valid_corpus(list(docs))
+            if self._append_documents(existing, docs):
+                return
         combined = list(existing) + list(docs)
         require_valid_corpus(combined)
         combined = sorted(combined, key=lambda d: str(d.get("doc_id") or ""))
-        texts = [
-            str(
-                d.get("text")
-                or d.get("body")
-                or d.get("summary")
-                or d.get("title")
-                or ""
-            )
-            for d in combined
-        ]
+        texts = [_document_text_for_embedding(d) for d in combined]
 
         vectors = self._retry(
             self.model.encode,
@@ -348,9 +382,94 @@ class Retriever:
         except Exception:
             digest = None
 
-        self._save_index(index, combined, corpus_digest=digest)
+        self._save_index(index, combined, corpus_digest=digest, embeddings=vectors)
         self.logger.info("Indexed %d documents", len(combined))
 
+    def _append_documents(self, existing: List[dict], docs: List[dict]) -> bool:
+        """Encode only new/changed ``docs`` into the current index; ``False`` to rebuild."""
+        rows = [dict(row) for row in existing]
+        positions = {str(row.get("doc_id") or ""): pos for pos, row in enumerate(rows)}
+        updates: dict[int, dict] = {}
+        added: dict[str, dict] = {}
+        for doc in docs:
+            doc_id = str(doc.get("doc_id") or "")
+            pos = positions.get(doc_id)
+            if pos is None:
+                added[doc_id] = dict(doc)
+            elif _doc_content_changed(rows[pos], doc):
+                updates[pos] = dict(doc)
+        if not updates and not added:
+            self.logger.info("rag.retriever.append_noop docs=%d", len(docs))
+            return True
+
+        matrix = self._artifact_store.load_embedding_matrix(existing, allow_encode=False)
+        if matrix is None:
+            self.logger.info(
+                "rag.retriever.append_fallback reason=embedding_sidecar_missing"
+            )
+            return False
+        changed_positions = sorted(updates)
+        pending = [updates[pos] for pos in changed_positions] + list(added.values())
+        vectors = self._np.asarray(
+            self._retry(
+                self.model.encode,
+                [_document_text_for_embedding(doc) for doc in pending],
+                show_progress_bar=False,
+            )
+        ).astype("float32")
+        if vectors.ndim != 2 or vectors.shape[0] != len(pending) or vectors.shape[1] != matrix.shape[1]:
+            self.logger.info("rag.retriever.append_fallback reason=embedding_shape_mismatch")
+            return False
+        ids = self._np.asarray(
+            changed_positions + list(range(len(rows), len(rows) + len(added))),
+            dtype="int64",
+        )
+
+        index = None
+        if self.backend == "faiss":
+            index = self._load_index(vectors.shape[1])
+            if index is None or int(getattr(index, "ntotal", len(rows))) != len(rows):
+                self.logger.info("rag.retriever.append_fallback reason=index_size_mismatch")
+                return False
+            try:
+                # The loaded index is the cached one live queries search:
+                # update a copy and only save it once every step succeeded.
+                index = self._faiss.clone_index(index)
+                if changed_positions:
+                    index.remove_ids(ids[: len(changed_positions)])
+                index.add_with_ids(vectors, ids)
+            except Exception as exc:
+                # e.g. HNSW indexes cannot remove ids; rebuild instead.
+                self.logger.info("rag.retriever.append_fallback reason=%s", exc)
+                return False
+
+        normalized = _normalize_embedding_rows(self._np, vectors)
+        # Work on an in-memory copy and release the mapped sidecar before it
+        # is rewritten below.
+        updated = self._np.array(matrix, dtype="float32")
+        del matrix
+        for row_idx, pos in enumerate(changed_positions):
+            updated[pos] = normalized[row_idx]
+            rows[pos] = {**updates[pos], "row_id": pos}
+        for doc in added.values():
+            rows.append({**doc, "row_id": len(rows)})
+        if added:
+            updated = self._np.vstack([updated, normalized[len(changed_positions) :]])
+
+        self._save_index(
+            index,
+            rows,
+            corpus_digest=compute_corpus_digest(rows),
+            embeddings=updated,
+        )
+        self.logger.info(
+            "rag.retriever.append docs_added=%d docs_changed=%d total=%d",
+            len(added),
+            len(changed_positions),
+            len(rows),
+        )
+        return True
+
     def _load_embedding_matrix(self, metadata: List[dict]):
         return self._artifact_store.load_embedding_matrix(metadata)
 
@@ -360,52 +479,55 @@ class Retriever:
     def _hybrid_candidate_count(self, *, k: int, total_docs: int) -> int:
         return _hybrid_candidate_count_internal(k=k, total_docs=total_docs)
 
-    def _query_dense(self, vector, metadata: List[dict], *, k: int) -> List[dict]:
+    def _query_dense_batch(self, vectors, metadata: List[dict], *, k: int) -> List[List[dict]]:
         if self.backend == "faiss":
-            return self._query_faiss(vector, metadata, k=k)
-        return self._query_bruteforce(vector, metadata, k=k)
+            return self._query_faiss_batch(vectors, metadata, k=k)
+        return self._query_bruteforce_batch(vectors, metadata, k=k)
 
-    def _query_bruteforce(self, vector, metadata: List[dict], *, k: int) -> List[dict]:
+    def _query_bruteforce_batch(
+        self, vectors, metadata: List[dict], *, k: int
+    ) -> List[List[dict]]:
         matrix = self._load_embedding_matrix(metadata)
-        query = self._np.asarray(vector).astype("float32")
-        if query.ndim != 2 or query.shape[0] != 1:
+        queries = self._np.asarray(vectors).astype("float32")
+        if queries.ndim != 2 or queries.shape[0] < 1:
             raise RetrieverError(
                 "Embedding model returned unexpected query vector shape",
                 code="embedding_shape_invalid",
             )
-        query_norms = self._np.linalg.norm(query, axis=1, keepdims=True)
-        zero_mask = query_norms == 0
-        if self._np.any(zero_mask):
-            query_norms = query_norms.copy()
-            query_norms[zero_mask] = 1.0
-        query = query / query_norms
-        scores = self._np.matmul(matrix, query[0]).astype("float32")
-
-        ranked: list[tuple[int, int, tuple[str, str, int]]] = []
-        for idx, score in enumerate(scores.tolist()):
-            ranked.append(
-                (
-                    idx,
-                    _score_bucket(score),
-                    _metadata_tie_break_key(metadata[idx], idx),
-                )
-            )
-
-        ranked.sort(key=lambda item: (-item[1], item[2]))
-
-        results: list[dict] = []
-        for idx, _bucket, _tie_key in ranked[: max(1, int(k))]:
-            doc = _public_result_doc(metadata[idx])
-            doc["score"] = float(scores[idx])
-            results.append(doc)
-        return results
+        queries = _normalize_embedding_rows(self._np, queries)
+        # One (rows x batch) matrix multiply scores every prompt at once.
+        scores = self._np.matmul(matrix, queries.T).astype("float32")
+        tie_ranks = self._artifact_store.load_tie_break_ranks(metadata)
+
+        batches: list[list[dict]] = []
+        for column in range(scores.shape[1]):
+            column_scores = scores[:, column]
+            results: list[dict] = []
+            for idx in _select_top_k_indices(
+                self._np, column_scores, tie_ranks, k=k
+            ).tolist():
+                doc = _public_result_doc(metadata[idx])
+                doc["score"] = float(column_scores[idx])
+                results.append(doc)
+            batches.append(results)
+        return batches
 
     def _query_bm25(self, prompt: str, metadata: List[dict], *, k: int) -> List[dict]:
         state = self._load_bm25_state(metadata)
-        return _rank_bm25(prompt, metadata, state=state, k=k)
+        tie_ranks = self._artifact_store.load_tie_break_ranks(metadata)
+        return _rank_bm25_index(
+            self._np,
+            prompt,
+            metadata,
+            state=state,
+            tie_ranks=tie_ranks,
+            k=k,
+        )
 
-    def _query_faiss(self, vector, metadata: List[dict], *, k: int) -> List[dict]:
-        index = self._load_index(vector.shape[1])
+    def _query_faiss_batch(
+        self, vectors, metadata: List[dict], *, k: int
+    ) -> List[List[dict]]:
+        index = self._load_index(vectors.shape[1])
         index_size_raw = getattr(index, "ntotal", None)
         try:
             index_size = int(index_size_raw) if index_size_raw is not None else None
@@ -416,31 +538,25 @@ class Retriever:
                 self.index_path, reason="index/meta size mismatch"
             )
 
-        search_k = len(metadata) if _is_windows_platform() else max(1, int(k))
-        distances, indices = index.search(vector, search_k)
-
-        ranked: list[tuple[int, int, tuple[str, str, int], float]] = []
-        for distance, idx in zip(distances[0], indices[0]):
-            if idx < 0 or idx >= len(metadata):
-                continue
-            score = float(1.0 / (1.0 + float(distance)))
-            ranked.append(
-                (
-                    int(idx),
-                    _score_bucket(score),
-                    _metadata_tie_break_key(metadata[int(idx)], int(idx)),
-                    score,
-                )
-            )
-
-        ranked.sort(key=lambda item: (-item[1], item[2]))
+        tie_ranks = self._artifact_store.load_tie_break_ranks(metadata)
+        hits = _faiss_top_k(
+            self._np,
+            index,
+            vectors,
+            tie_ranks,
+            k=k,
+            total=len(metadata),
+        )
 
-        results: list[dict] = []
-        for idx, _bucket, _tie_key, score in ranked[: max(1, int(k))]:
-            doc = _public_result_doc(metadata[idx])
-            doc["score"] = score
-            results.append(doc)
-        return results
+        batches: list[list[dict]] = []
+        for row_hits in hits:
+            results: list[dict] = []
+            for idx, score in row_hits:
+                doc = _public_result_doc(metadata[idx])
+                doc["score"] = score
+                results.append(doc)
+            batches.append(results)
+        return batches
 
     def _fuse_rankings(
         self,
@@ -458,8 +574,66 @@ class Retriever:
             rrf_k=self.hybrid_rrf_k,
         )
 
+    def _encode_queries(self, prompts: List[str]):
+        """Return a float32 ``(len(prompts), dim)`` matrix, encoding only cache misses."""
+        cache = self.query_embedding_cache
+        cached = (
+            cache.get_many(self.model_name, prompts)
+            if cache is not None
+            else [None] * len(prompts)
+        )
+        missing = [idx for idx, vector in enumerate(cached) if vector is None]
+        if missing:
+            embedding = self._retry(
+                self.model.encode,
+                [prompts[idx] for idx in missing],
+                show_progress_bar=False,
+            )
+            encoded = self._np.asarray(embedding).astype("float32")
+            if encoded.ndim != 2 or encoded.shape[0] != len(missing):
+                raise RetrieverError(
+                    "Embedding model returned unexpected query vector shape",
+                    code="embedding_shape_invalid",
+                    metadata={"prompt_count": len(missing)},
+                )
+            if cache is not None:
+                cache.put_many(self.model_name, [prompts[idx] for idx in missing], encoded)
+            for row, idx in enumerate(missing):
+                cached[idx] = encoded[row]
+        if len({int(vector.shape[0]) for vector in cached}) > 1:
+            raise RetrieverError(
+                "Cached query embeddings have inconsistent dimensions",
+                code="embedding_shape_invalid",
+                metadata={"prompt_count": len(prompts)},
+            )
+        return self._np.stack(cached).astype("float32")
+
+    def query_embedding_cache_stats(self) -> dict[str, object] | None:
+        cache = self.query_embedding_cache
+        return cache.stats() if cache is not None else None
+
+    def index_digest(self) -> str | None:
+        """Return the corpus digest recorded in the index metadata, if any."""
+        try:
+            digest = self._artifact_store.load_meta_header().get("corpus_digest")
+        except Exception:
+            return None
+        return str(digest) if digest else None
+
     def query(self, prompt: str, k: int = 5) -> List[dict]:
         """Return top ``k`` documents matching ``prompt``."""
+        return self.query_many([prompt], k=k)[0]
+
+    def query_many(self, prompts: Sequence[str], k: int = 5) -> List[List[dict]]:
+        """Return top ``k`` documents for each prompt, in input order.
+
+        Prompts missing from the query-embedding cache are encoded in a single
+        ``model.encode`` call and all prompts are scored with one FAISS
+        ``search`` (or one matrix multiply for bruteforce).
+        """
+        prompts = [str(prompt) for prompt in prompts]
+        if not prompts:
+            return []
         if self.backend == "faiss" and not self.index_path.exists():
             raise IndexMissingError(self.index_path)
         if not self.meta_path.exists() and not (
@@ -469,36 +643,31 @@ class Retriever:
                 self.index_path, reason="metadata file missing"
             )
 
-        embedding = self._retry(
-            self.model.encode,
-            [prompt],
-            show_progress_bar=False,
-        )
-        vector = self._np.asarray(embedding).astype("float32")
+        vectors = self._encode_queries(prompts)
         metadata = self._load_metadata()
         if self.retrieval_mode == "hybrid":
             candidate_k = self._hybrid_candidate_count(k=k, total_docs=len(metadata))
-            dense_results = self._query_dense(vector, metadata, k=candidate_k)
-            bm25_results = self._query_bm25(prompt, metadata, k=candidate_k)
-            results = self._fuse_rankings(
-                metadata=metadata,
-                dense_results=dense_results,
-                bm25_results=bm25_results,
-                k=k,
-            )
+            dense_batches = self._query_dense_batch(vectors, metadata, k=candidate_k)
+            batches = [
+                self._fuse_rankings(
+                    metadata=metadata,
+                    dense_results=dense_results,
+                    bm25_results=self._query_bm25(prompt, metadata, k=candidate_k),
+                    k=k,
+                )
+                for prompt, dense_results in zip(prompts, dense_batches)
+            ]
         else:
-            results = self._query_dense(vector, metadata, k=k)
+            batches = self._query_dense_batch(vectors, metadata, k=k)
 
-        return _apply_citation_boost(prompt, results=results, metadata=metadata, k=k)
+        return [
+            _apply_citation_boost(prompt, results=results, metadata=metadata, k=k)
+            for prompt, results in zip(prompts, batches)
+        ]
 
     def warm(self) -> None:
         """Pre-load embeddings and index metadata for faster first query."""
-        embedding = self._retry(
-            self.model.encode,
-            ["earcrawler warmup"],
-            show_progress_bar=False,
-        )
-        vector = self._np.asarray(embedding).astype("float32")
+        vector = self._encode_queries(["earcrawler warmup"])
         dim = vector.shape[1]
         if self.backend == "faiss" and self.index_path.exists():
             self._load_index(dim)
@@ -513,12 +682,22 @@ class Retriever:
             self._load_bm25_state(metadata)
 
 
+def _doc_content_changed(old: Mapping[str, object], new: Mapping[str, object]) -> bool:
+    """Compare corpus ``hash`` values when both sides have one, else the text."""
+    old_hash = str(old.get("hash") or "").strip()
+    new_hash = str(new.get("hash") or "").strip()
+    if old_hash and new_hash:
+        return old_hash != new_hash
+    return _document_text_for_embedding(old) != _document_text_for_embedding(new)
+
+
 def describe_retriever_config(obj: object) -> dict[str, object]:
     """Return a best-effort snapshot of retriever configuration for logging."""
 
     index_path = getattr(obj, "index_path", None)
     if isinstance(index_path, Path):
         index_path = str(index_path)
+    stats_fn = getattr(obj, "query_embedding_cache_stats", None)
     return {
         "index_path": index_path,
         "model_name": getattr(obj, "model_name", None),
@@ -528,9 +707,11 @@ def describe_retriever_config(obj: object) -> dict[str, object]:
         "backend_source": getattr(obj, "backend_source", None),
         "hybrid_rrf_k": getattr(obj, "hybrid_rrf_k", None),
         "faiss_threads": getattr(obj, "faiss_threads", None),
+        "shared_artifacts": bool(getattr(obj, "shared_artifacts", False)),
         "enabled": bool(getattr(obj, "enabled", True)),
         "ready": bool(getattr(obj, "ready", True)),
         "failure_type": getattr(obj, "failure_type", None),
+        "query_embedding_cache": stats_fn() if callable(stats_fn) else None,
     }
 
 
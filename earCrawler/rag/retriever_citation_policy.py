@@ -54,7 +54,12 @@ def _best_metadata_row_for_section(
     if not target:
         return None
 
-    for row in metadata:
+    positions_for_section = getattr(metadata, "positions_for_section", None)
+    if callable(positions_for_section):
+        candidates = [metadata[pos] for pos in positions_for_section(target)]
+    else:
+        candidates = metadata
+    for row in candidates:
         sec = canonical_section_id(row)
         if sec != target:
             continue
@@ -3,8 +3,6 @@ from __future__ import annotations
 """Metadata normalization, tokenization, and ranking helpers for retrieval."""
 
 import re
-from collections import Counter
-from math import log
 from typing import Mapping
 
 from earCrawler.rag.retriever_citation_policy import canonical_section_id
@@ -15,6 +13,7 @@ HYBRID_MIN_CANDIDATES = 20
 HYBRID_CANDIDATE_MULTIPLIER = 4
 BM25_K1 = 1.5
 BM25_B = 0.75
+FAISS_TIE_MARGIN = 8
 TOKEN_RE = re.compile(r"[A-Za-z0-9]+(?:\.[A-Za-z0-9]+)*(?:\([A-Za-z0-9]+\))*")
 
 
@@ -41,6 +40,90 @@ def score_bucket(score: object) -> int:
         return 0
 
 
+def tie_break_rank_array(np_mod, metadata: list[dict]):
+    """Return an int64 array giving each row's position in tie-break order.
+
+    Sorting by this array is equivalent to sorting by
+    :func:`metadata_tie_break_key`, but costs one integer compare per row.
+    """
+
+    keys = [metadata_tie_break_key(row, idx) for idx, row in enumerate(metadata)]
+    order = sorted(range(len(keys)), key=keys.__getitem__)
+    ranks = np_mod.empty(len(keys), dtype="int64")
+    ranks[order] = np_mod.arange(len(keys), dtype="int64")
+    return ranks
+
+
+def score_buckets(np_mod, scores):
+    """Vectorized :func:`score_bucket` for a 1-D score array."""
+
+    values = np_mod.asarray(scores, dtype="float64") / SCORE_TIE_EPSILON
+    return np_mod.rint(values).astype("int64")
+
+
+def select_top_k_indices(np_mod, scores, tie_ranks, *, k: int):
+    """Return the indices of the top ``k`` scores in deterministic order.
+
+    Only the ``argpartition`` candidate window plus rows tied with the k-th
+    score bucket are sorted, so the cost scales with ``k`` instead of the
+    corpus size while matching a full ``(-bucket, tie_break_key)`` sort.
+    """
+
+    scores = np_mod.asarray(scores)
+    total = int(scores.shape[0])
+    if total == 0:
+        return np_mod.empty(0, dtype="int64")
+    k = min(max(1, int(k)), total)
+    buckets = score_buckets(np_mod, scores)
+    if k < total:
+        window = np_mod.argpartition(-buckets, k - 1)[:k]
+        threshold = buckets[window].min()
+        candidates = np_mod.flatnonzero(buckets >= threshold)
+    else:
+        candidates = np_mod.arange(total, dtype="int64")
+    order = np_mod.lexsort((tie_ranks[candidates], -buckets[candidates]))
+    return candidates[order][:k]
+
+
+def faiss_top_k(np_mod, index, vectors, tie_ranks, *, k: int, total: int, margin: int = FAISS_TIE_MARGIN):
+    """Return ``[(row_idx, score), ...]`` per query in deterministic top-``k`` order.
+
+    FAISS is asked for ``k + margin`` neighbours and results are ordered by
+    ``(-score_bucket, tie_rank)``. Hits beyond the window can only score at or
+    below the last one returned, so a query is re-searched with a doubled
+    window only while its ``k``-th bucket still equals that last bucket. The
+    ranking therefore matches a full-corpus search without materializing it.
+    """
+
+    vectors = np_mod.asarray(vectors, dtype="float32")
+    query_count = int(vectors.shape[0])
+    if total <= 0:
+        return [[] for _ in range(query_count)]
+    k = min(max(1, int(k)), total)
+    window = min(total, k + max(0, int(margin)))
+    results: list[list[tuple[int, float]]] = [[] for _ in range(query_count)]
+    pending = list(range(query_count))
+    while pending:
+        batch = vectors if len(pending) == query_count else vectors[pending]
+        distances, indices = index.search(batch, window)
+        widen: list[int] = []
+        for row, row_distances, row_indices in zip(pending, distances, indices):
+            row_indices = np_mod.asarray(row_indices, dtype="int64")
+            valid = (row_indices >= 0) & (row_indices < total)
+            ids = row_indices[valid]
+            scores = 1.0 / (1.0 + np_mod.asarray(row_distances, dtype="float64")[valid])
+            buckets = score_buckets(np_mod, scores)
+            order = np_mod.lexsort((tie_ranks[ids], -buckets))
+            exhausted = window >= total or int(ids.shape[0]) < window
+            if not exhausted and buckets[order[k - 1]] <= buckets.min():
+                widen.append(row)
+                continue
+            results[row] = [(int(ids[pos]), float(scores[pos])) for pos in order[:k]]
+        pending = widen
+        window = min(total, window * 2)
+    return results
+
+
 def document_text_for_embedding(row: Mapping[str, object]) -> str:
     for key in ("text", "body", "content", "paragraph", "summary", "snippet", "title"):
         value = row.get(key)
@@ -106,77 +189,6 @@ def result_doc_id(row: Mapping[str, object]) -> str:
     return str(row.get("doc_id") or row.get("id") or "").strip()
 
 
-def build_bm25_state(metadata: list[dict]) -> dict[str, object]:
-    doc_terms: list[Counter[str]] = []
-    doc_lengths: list[int] = []
-    doc_freq: Counter[str] = Counter()
-    for row in metadata:
-        terms = Counter(tokenize_for_bm25(document_text_for_bm25(row)))
-        doc_terms.append(terms)
-        doc_lengths.append(int(sum(terms.values())))
-        doc_freq.update(terms.keys())
-
-    doc_count = max(1, len(metadata))
-    avg_doc_length = sum(doc_lengths) / doc_count if doc_lengths else 0.0
-    idf = {
-        term: float(log(1.0 + ((doc_count - freq + 0.5) / (freq + 0.5))))
-        for term, freq in doc_freq.items()
-    }
-    return {
-        "doc_terms": doc_terms,
-        "doc_lengths": doc_lengths,
-        "avg_doc_length": avg_doc_length,
-        "idf": idf,
-    }
-
-
-def rank_bm25(
-    prompt: str,
-    metadata: list[dict],
-    *,
-    state: dict[str, object],
-    k: int,
-) -> list[dict]:
-    query_terms = Counter(tokenize_for_bm25(prompt))
-    if not query_terms:
-        return []
-
-    doc_terms = state.get("doc_terms") or []
-    doc_lengths = state.get("doc_lengths") or []
-    avg_doc_length = float(state.get("avg_doc_length") or 0.0)
-    idf_map = state.get("idf") or {}
-    denom_floor = avg_doc_length if avg_doc_length > 0 else 1.0
-
-    ranked: list[tuple[int, float, tuple[str, str, int]]] = []
-    for idx, terms in enumerate(doc_terms):
-        if not isinstance(terms, Counter):
-            continue
-        doc_length = int(doc_lengths[idx]) if idx < len(doc_lengths) else 0
-        norm = 1.0 - BM25_B + (BM25_B * (doc_length / denom_floor))
-        score = 0.0
-        for term, _qtf in query_terms.items():
-            tf = int(terms.get(term, 0))
-            if tf <= 0:
-                continue
-            idf = float(idf_map.get(term) or 0.0)
-            if idf <= 0.0:
-                continue
-            score += idf * ((tf * (BM25_K1 + 1.0)) / (tf + (BM25_K1 * norm)))
-        if score <= 0.0:
-            continue
-        ranked.append((idx, float(score), metadata_tie_break_key(metadata[idx], idx)))
-
-    ranked.sort(key=lambda item: (-item[1], item[2]))
-
-    results: list[dict] = []
-    for idx, score, _tie_key in ranked[: max(1, int(k))]:
-        doc = public_result_doc(metadata[idx])
-        doc["score"] = float(score)
-        doc["bm25_score"] = float(score)
-        results.append(doc)
-    return results
-
-
 def hybrid_candidate_count(*, k: int, total_docs: int) -> int:
     requested = max(1, int(k))
     if total_docs <= 0:
@@ -187,6 +199,26 @@ def hybrid_candidate_count(*, k: int, total_docs: int) -> int:
     )
 
 
+class _LazyRowLookup:
+    """``doc_id -> (row, idx)`` view that decodes rows from ``metadata`` on demand."""
+
+    def __init__(self, metadata, positions: Mapping[str, int]) -> None:
+        self._metadata = metadata
+        self._positions = positions
+        self._rows: dict[str, tuple[dict, int]] = {}
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._positions
+
+    def __getitem__(self, doc_id: str) -> tuple[dict, int]:
+        cached = self._rows.get(doc_id)
+        if cached is None:
+            idx = self._positions[doc_id]
+            cached = (self._metadata[idx], idx)
+            self._rows[doc_id] = cached
+        return cached
+
+
 def fuse_rankings(
     *,
     metadata: list[dict],
@@ -195,11 +227,16 @@ def fuse_rankings(
     k: int,
     rrf_k: int = HYBRID_RRF_K,
 ) -> list[dict]:
-    metadata_lookup = {
-        result_doc_id(row): (row, idx)
-        for idx, row in enumerate(metadata)
-        if result_doc_id(row)
-    }
+    doc_positions = getattr(metadata, "doc_positions", None)
+    if callable(doc_positions):
+        # Columnar tables index doc ids once; only fused rows get decoded.
+        metadata_lookup = _LazyRowLookup(metadata, doc_positions())
+    else:
+        metadata_lookup = {
+            result_doc_id(row): (row, idx)
+            for idx, row in enumerate(metadata)
+            if result_doc_id(row)
+        }
     source_docs: dict[str, dict] = {}
     for row in list(dense_results) + list(bm25_results):
         doc_id = result_doc_id(row)
@@ -246,17 +283,22 @@ def fuse_rankings(
 
 
 __all__ = [
+    "BM25_B",
+    "BM25_K1",
+    "FAISS_TIE_MARGIN",
     "HYBRID_RRF_K",
-    "build_bm25_state",
     "document_text_for_bm25",
     "document_text_for_embedding",
+    "faiss_top_k",
     "fuse_rankings",
     "hybrid_candidate_count",
     "materialize_metadata_rows",
     "metadata_tie_break_key",
     "public_result_doc",
-    "rank_bm25",
     "result_doc_id",
     "score_bucket",
+    "score_buckets",
+    "select_top_k_indices",
+    "tie_break_rank_array",
     "tokenize_for_bm25",
 ]
@@ -7,11 +7,35 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable, MutableMapping
 
+from earCrawler.rag.bm25_index import (
+    bm25_index_path,
+    build_bm25_index,
+    load_bm25_index,
+    write_bm25_index,
+)
+from earCrawler.rag.embedding_sidecar import (
+    embedding_sidecar_path,
+    load_embedding_sidecar,
+    normalize_embedding_rows,
+    write_embedding_sidecar,
+)
+from earCrawler.rag.faiss_profiles import apply_search_params, search_params_from_meta
 from earCrawler.rag.index_builder import INDEX_META_VERSION
+from earCrawler.rag.metadata_table import (
+    MetadataTable,
+    load_metadata_table,
+    metadata_table_path,
+    write_metadata_table,
+)
 from earCrawler.rag.retriever_ranking import (
-    build_bm25_state,
     document_text_for_embedding,
     materialize_metadata_rows,
+    tie_break_rank_array,
+)
+from earCrawler.rag.shared_artifacts import (
+    SharedArtifacts,
+    ensure_shared_artifacts,
+    faiss_mmap_flags,
 )
 
 
@@ -35,16 +59,21 @@ class RetrieverArtifactStore:
         faiss_mod,
         cache_lock,
         index_cache: MutableMapping[str, tuple[int, int, object]],
-        meta_cache: MutableMapping[str, tuple[int, int, list[dict]]],
+        meta_cache: MutableMapping[str, tuple[int, int, list[dict], dict[str, object]]],
         embedding_cache: MutableMapping[str, tuple[int, int, object]],
         bm25_cache: MutableMapping[str, tuple[int, int, dict[str, object]]],
+        shared_cache: MutableMapping[str, tuple[int, int, SharedArtifacts | None]],
         retriever_error_cls,
         index_missing_error_cls,
         index_build_required_error_cls,
+        shared_artifacts: bool = False,
     ) -> None:
         self.index_path = Path(index_path)
         self.meta_path = self.index_path.with_suffix(".meta.json")
         self.legacy_meta_path = self.index_path.with_suffix(".pkl")
+        self.embedding_path = embedding_sidecar_path(self.index_path, self.meta_path)
+        self.bm25_path = bm25_index_path(self.index_path, self.meta_path)
+        self.table_path = metadata_table_path(self.index_path, self.meta_path)
         self.model_name = model_name
         self.allow_legacy_pickle_metadata = allow_legacy_pickle_metadata
         self.logger = logger
@@ -57,9 +86,11 @@ class RetrieverArtifactStore:
         self._meta_cache = meta_cache
         self._embedding_cache = embedding_cache
         self._bm25_cache = bm25_cache
+        self._shared_cache = shared_cache
         self._retriever_error_cls = retriever_error_cls
         self._index_missing_error_cls = index_missing_error_cls
         self._index_build_required_error_cls = index_build_required_error_cls
+        self.shared_artifacts = bool(shared_artifacts)
 
     def cache_token(self, path: Path) -> tuple[int, int]:
         stat = path.stat()
@@ -84,7 +115,12 @@ class RetrieverArtifactStore:
                 return cached[2]
             self.logger.info("rag.retriever.index_cache_miss index_path=%s", key)
             try:
-                index = self._faiss.read_index(str(self.index_path))
+                if self.shared_artifacts and faiss_mmap_flags(self._faiss):
+                    index = self._faiss.read_index(
+                        str(self.index_path), faiss_mmap_flags(self._faiss)
+                    )
+                else:
+                    index = self._faiss.read_index(str(self.index_path))
             except Exception as exc:
                 raise self._index_build_required_error_cls(
                     self.index_path, reason=f"unable to read index: {exc}"
@@ -92,6 +128,7 @@ class RetrieverArtifactStore:
             IndexIDMap = getattr(self._faiss, "IndexIDMap", None)
             if isinstance(IndexIDMap, type) and not isinstance(index, IndexIDMap):
                 index = IndexIDMap(index)
+            self._apply_search_params(index)
             with self._cache_lock:
                 self._index_cache[key] = (token[0], token[1], index)
             return index
@@ -99,6 +136,65 @@ class RetrieverArtifactStore:
             raise self._index_missing_error_cls(self.index_path)
         return self.create_index(dim)
 
+    def _apply_search_params(self, index) -> None:
+        header: dict[str, object] = {}
+        if self.meta_path.exists():
+            try:
+                header = self.load_meta_header()
+            except Exception:
+                header = {}
+        applied = apply_search_params(self._faiss, index, search_params_from_meta(header))
+        if applied:
+            self.logger.info(
+                "rag.retriever.faiss_search_params index_path=%s params=%s",
+                self.index_path,
+                applied,
+            )
+
+    def load_shared(self) -> SharedArtifacts | None:
+        """Attach to the read-only shared artifact set when shared mode is on.
+
+        Any failure to prepare or attach (legacy list metadata, a corrupt
+        file, a read-only directory) is logged and remembered for the current
+        metadata file; callers then load privately.
+        """
+
+        if not self.shared_artifacts or not self.meta_path.exists():
+            return None
+        key = str(self.meta_path.resolve())
+        token = self.cache_token(self.meta_path)
+        with self._cache_lock:
+            cached = self._shared_cache.get(key)
+        if cached is not None and cached[:2] == token:
+            return cached[2]
+        try:
+            shared = ensure_shared_artifacts(
+                self.index_path, np_mod=self._np, meta_path=self.meta_path
+            )
+        except Exception as exc:
+            self.logger.warning(
+                "rag.retriever.shared_artifacts_failed meta_path=%s error=%s",
+                self.meta_path,
+                exc,
+            )
+            shared = None
+        if shared is None:
+            self.logger.warning(
+                "rag.retriever.shared_artifacts_unavailable meta_path=%s",
+                self.meta_path,
+            )
+            with self._cache_lock:
+                self._shared_cache[key] = (token[0], token[1], None)
+            return None
+        self.logger.info(
+            "rag.retriever.shared_artifacts_attached dir=%s rows=%d",
+            shared.directory,
+            len(shared.rows),
+        )
+        with self._cache_lock:
+            self._shared_cache[key] = (token[0], token[1], shared)
+        return shared
+
     def load_metadata(self, *, allow_create: bool = False) -> list[dict]:
         if self.meta_path.exists():
             key = str(self.meta_path)
@@ -106,7 +202,33 @@ class RetrieverArtifactStore:
             with self._cache_lock:
                 cached = self._meta_cache.get(key)
             if cached is not None and cached[:2] == token:
+                if isinstance(cached[2], MetadataTable):
+                    # Rows decode lazily into fresh dicts; no per-call copy needed.
+                    return cached[2]
                 return materialize_metadata_rows(list(cached[2]))
+            table = load_metadata_table(
+                self.table_path, np_mod=self._np, meta_path=self.meta_path
+            )
+            if table is not None:
+                rows_table, header = table
+                self.logger.info(
+                    "rag.retriever.metadata_table_hit path=%s rows=%d",
+                    self.table_path,
+                    len(rows_table),
+                )
+                with self._cache_lock:
+                    self._meta_cache[key] = (token[0], token[1], rows_table, header)  # type: ignore[assignment]
+                return rows_table  # type: ignore[return-value]
+            shared = self.load_shared()
+            if shared is not None:
+                with self._cache_lock:
+                    self._meta_cache[key] = (
+                        token[0],
+                        token[1],
+                        shared.rows,  # type: ignore[assignment]
+                        dict(shared.header),
+                    )
+                return shared.rows  # type: ignore[return-value]
             try:
                 meta_obj = json.loads(self.meta_path.read_text(encoding="utf-8"))
             except Exception as exc:
@@ -116,13 +238,14 @@ class RetrieverArtifactStore:
             rows: list[dict]
             if isinstance(meta_obj, dict) and isinstance(meta_obj.get("rows"), list):
                 rows = materialize_metadata_rows(list(meta_obj["rows"]))
+                header = {k: v for k, v in meta_obj.items() if k != "rows"}
                 with self._cache_lock:
-                    self._meta_cache[key] = (token[0], token[1], list(rows))
+                    self._meta_cache[key] = (token[0], token[1], list(rows), header)
                 return rows
             if isinstance(meta_obj, list):
                 rows = materialize_metadata_rows(list(meta_obj))
                 with self._cache_lock:
-                    self._meta_cache[key] = (token[0], token[1], list(rows))
+                    self._meta_cache[key] = (token[0], token[1], list(rows), {})
                 return rows
             raise self._index_build_required_error_cls(
                 self.index_path, reason="metadata rows missing or invalid"
@@ -150,7 +273,7 @@ class RetrieverArtifactStore:
                 ) from exc
             rows = materialize_metadata_rows(list(rows))
             with self._cache_lock:
-                self._meta_cache[key] = (token[0], token[1], list(rows))
+                self._meta_cache[key] = (token[0], token[1], list(rows), {})
             return list(rows)
         if allow_create:
             return []
@@ -158,17 +281,61 @@ class RetrieverArtifactStore:
             self.index_path, reason="metadata file missing"
         )
 
+    def load_meta_header(self) -> dict[str, object]:
+        """Return the non-row fields of the metadata sidecar (cached with rows)."""
+
+        if self.meta_path.exists():
+            key = str(self.meta_path)
+        elif self.allow_legacy_pickle_metadata and self.legacy_meta_path.exists():
+            return {}
+        else:
+            raise self._index_build_required_error_cls(
+                self.index_path, reason="metadata file missing"
+            )
+        token = self.cache_token(self.meta_path)
+        with self._cache_lock:
+            cached = self._meta_cache.get(key)
+        if cached is None or cached[:2] != token:
+            self.load_metadata()
+            with self._cache_lock:
+                cached = self._meta_cache.get(key)
+        if cached is None:
+            return {}
+        return dict(cached[3])
+
     def save_index(
         self,
         index,
         metadata: list[dict],
         *,
         corpus_digest: str | None = None,
+        embeddings=None,
     ) -> None:
         metadata = materialize_metadata_rows(metadata)
+        # Drop cached maps of the files about to be replaced first: Windows
+        # refuses to replace a file that this process still has mapped.
+        self._evict_artifact_caches()
         if self._faiss is not None and index is not None:
             self._faiss.write_index(index, str(self.index_path))
 
+        embedding_sidecar = None
+        if embeddings is not None and corpus_digest:
+            embedding_sidecar = write_embedding_sidecar(
+                self.embedding_path,
+                embeddings,
+                np_mod=self._np,
+                corpus_digest=corpus_digest,
+                embedding_model=self.model_name,
+            )
+        bm25_index = None
+        if corpus_digest:
+            bm25_index = write_bm25_index(
+                self.bm25_path,
+                build_bm25_index(self._np, metadata),
+                np_mod=self._np,
+                corpus_digest=corpus_digest,
+            )
+
         meta_payload = {
             "schema_version": INDEX_META_VERSION,
             "build_timestamp_utc": _utc_now_iso(),
@@ -176,6 +343,8 @@ class RetrieverArtifactStore:
             "corpus_digest": corpus_digest,
             "doc_count": len(metadata),
             "embedding_model": self.model_name,
+            "embedding_sidecar": embedding_sidecar,
+            "bm25_index": bm25_index,
             "rows": metadata,
         }
         try:
@@ -187,6 +356,13 @@ class RetrieverArtifactStore:
             json.dumps(meta_payload, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
             encoding="utf-8",
         )
+        write_metadata_table(
+            self.table_path,
+            metadata,
+            np_mod=self._np,
+            meta_path=self.meta_path,
+            header={k: v for k, v in meta_payload.items() if k != "rows"},
+        )
         with self._cache_lock:
             if self.index_path.exists() and index is not None:
                 self._index_cache[str(self.index_path)] = (
@@ -198,15 +374,24 @@ class RetrieverArtifactStore:
             self._meta_cache[str(self.meta_path)] = (
                 *self.cache_token(self.meta_path),
                 list(metadata),
+                {k: v for k, v in meta_payload.items() if k != "rows"},
             )
+        self._evict_artifact_caches(keep_metadata=True)
+
+    def _evict_artifact_caches(self, *, keep_metadata: bool = False) -> None:
+        with self._cache_lock:
+            if not keep_metadata:
+                self._meta_cache.pop(str(self.meta_path), None)
             self._embedding_cache.pop(
                 f"{self.model_name}::{self.meta_path.resolve()}",
                 None,
             )
+            self._embedding_cache.pop(f"tie_break::{self.meta_path.resolve()}", None)
             self._bm25_cache.pop(f"bm25::{self.meta_path.resolve()}", None)
             self._bm25_cache.pop(f"bm25::{self.legacy_meta_path.resolve()}", None)
+            self._shared_cache.pop(str(self.meta_path.resolve()), None)
 
-    def load_embedding_matrix(self, metadata: list[dict]):
+    def load_embedding_matrix(self, metadata: list[dict], *, allow_encode: bool = True):
         if self.meta_path.exists():
             cache_path = self.meta_path
         elif self.allow_legacy_pickle_metadata and self.legacy_meta_path.exists():
@@ -222,6 +407,31 @@ class RetrieverArtifactStore:
         if cached is not None and cached[:2] == token:
             return cached[2]
 
+        if cache_path == self.meta_path:
+            header = self.load_meta_header()
+            mapped = load_embedding_sidecar(
+                self.meta_path,
+                header.get("embedding_sidecar"),  # type: ignore[arg-type]
+                np_mod=self._np,
+                corpus_digest=header.get("corpus_digest"),  # type: ignore[arg-type]
+                embedding_model=self.model_name,
+                row_count=len(metadata),
+            )
+            if mapped is not None:
+                self.logger.info(
+                    "rag.retriever.embedding_sidecar_hit path=%s rows=%d",
+                    self.embedding_path,
+                    len(metadata),
+                )
+                with self._cache_lock:
+                    self._embedding_cache[key] = (token[0], token[1], mapped)
+                return mapped
+            self.logger.info(
+                "rag.retriever.embedding_sidecar_miss meta_path=%s", self.meta_path
+            )
+        if not allow_encode:
+            return None
+
         texts = [document_text_for_embedding(row) for row in metadata]
         matrix = self._retry(
             self.model.encode,
@@ -235,16 +445,43 @@ class RetrieverArtifactStore:
                 code="embedding_shape_invalid",
                 metadata={"row_count": len(metadata)},
             )
-        norms = self._np.linalg.norm(matrix, axis=1, keepdims=True)
-        zero_mask = norms == 0
-        if self._np.any(zero_mask):
-            norms = norms.copy()
-            norms[zero_mask] = 1.0
-        matrix = matrix / norms
+        matrix = normalize_embedding_rows(self._np, matrix)
         with self._cache_lock:
             self._embedding_cache[key] = (token[0], token[1], matrix)
         return matrix
 
+    def load_tie_break_ranks(self, metadata: list[dict]):
+        """Return the cached tie-break rank array for ``metadata``.
+
+        Cached alongside the embedding matrix and keyed on the metadata file
+        so every query reuses one precomputed ordering.
+        """
+
+        if self.meta_path.exists():
+            cache_path = self.meta_path
+        elif self.allow_legacy_pickle_metadata and self.legacy_meta_path.exists():
+            cache_path = self.legacy_meta_path
+        else:
+            return tie_break_rank_array(self._np, metadata)
+        key = f"tie_break::{cache_path.resolve()}"
+        token = self.cache_token(cache_path)
+        with self._cache_lock:
+            cached = self._embedding_cache.get(key)
+        if cached is not None and cached[:2] == token and len(cached[2]) == len(metadata):
+            return cached[2]
+        if isinstance(metadata, MetadataTable):
+            with self._cache_lock:
+                self._embedding_cache[key] = (token[0], token[1], metadata.tie_ranks)
+            return metadata.tie_ranks
+        shared = self.load_shared() if cache_path == self.meta_path else None
+        if shared is not None and len(shared.tie_ranks) == len(metadata):
+            ranks = shared.tie_ranks
+        else:
+            ranks = tie_break_rank_array(self._np, metadata)
+        with self._cache_lock:
+            self._embedding_cache[key] = (token[0], token[1], ranks)
+        return ranks
+
     def load_bm25_state(self, metadata: list[dict]) -> dict[str, object]:
         if self.meta_path.exists():
             cache_path = self.meta_path
@@ -259,11 +496,28 @@ class RetrieverArtifactStore:
         with self._cache_lock:
             cached = self._bm25_cache.get(key)
         if cached is not None and cached[:2] == token:
-            return dict(cached[2])
+            return cached[2]
 
-        state = build_bm25_state(metadata)
+        state = None
+        shared = self.load_shared() if cache_path == self.meta_path else None
+        if shared is not None and len(shared.rows) == len(metadata):
+            state = shared.bm25_state
+        elif cache_path == self.meta_path:
+            header = self.load_meta_header()
+            state = load_bm25_index(
+                self.meta_path,
+                header.get("bm25_index"),  # type: ignore[arg-type]
+                np_mod=self._np,
+                corpus_digest=header.get("corpus_digest"),  # type: ignore[arg-type]
+                row_count=len(metadata),
+            )
+        if state is None:
+            self.logger.info(
+                "rag.retriever.bm25_index_miss meta_path=%s", cache_path
+            )
+            state = build_bm25_index(self._np, metadata)
         with self._cache_lock:
-            self._bm25_cache[key] = (token[0], token[1], dict(state))
+            self._bm25_cache[key] = (token[0], token[1], state)
         return state
 
 
@@ -0,0 +1,292 @@
+from __future__ import annotations
+
+"""Read-only, memory-mappable retriever artifacts shared by API workers.
+
+One preparer (``rag-index prepare-shared`` or the first worker to take the
+lock) writes the metadata rows as a columnar table (see
+:mod:`earCrawler.rag.metadata_table`) plus tie-break ranks and BM25 postings
+as raw ``.npy`` files under ``<index stem>.shared/``. Workers started with
+``EARCRAWLER_RETRIEVER_SHARED_ARTIFACTS=1`` map those files read-only, so
+the OS page cache holds one copy per host instead of one per process.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Mapping
+
+from earCrawler.rag.bm25_index import build_bm25_index, load_bm25_index
+from earCrawler.rag.metadata_table import (
+    MetadataTable,
+    load_metadata_table,
+    metadata_table_path,
+    write_metadata_table,
+)
+from earCrawler.rag.retriever_ranking import (
+    materialize_metadata_rows,
+    tie_break_rank_array,
+)
+
+SHARED_ARTIFACTS_ENV = "EARCRAWLER_RETRIEVER_SHARED_ARTIFACTS"
+SHARED_ARTIFACTS_VERSION = "retriever-shared.v2"
+SHARED_ARTIFACTS_SUFFIX = ".shared"
+SHARED_MANIFEST_NAME = "manifest.json"
+_LOCK_NAME = ".prepare.lock"
+# A lock is only treated as abandoned well after any waiter's budget, so a
+# slow but live preparer never has it taken away mid-write.
+STALE_LOCK_SECONDS = 600.0
+_BM25_ARRAYS = ("offsets", "docs", "tfs", "doc_lengths", "idf")
+
+
+def shared_artifacts_enabled() -> bool:
+    raw = str(os.getenv(SHARED_ARTIFACTS_ENV) or "").strip().lower()
+    return raw in {"1", "true", "yes", "on", "mmap"}
+
+
+def shared_artifacts_dir(index_path: Path, meta_path: Path | None = None) -> Path:
+    """Return the shared artifact directory for ``index_path``."""
+
+    index_path = Path(index_path)
+    parent = Path(meta_path).parent if meta_path is not None else index_path.parent
+    return parent / f"{index_path.stem}{SHARED_ARTIFACTS_SUFFIX}"
+
+
+def source_fingerprint(index_path: Path, meta_path: Path) -> dict[str, int]:
+    """Size and mtime of the source index/metadata the shared copy was cut from."""
+
+    fingerprint: dict[str, int] = {}
+    for label, path in (("index", Path(index_path)), ("meta", Path(meta_path))):
+        if path.exists():
+            stat = path.stat()
+            fingerprint[f"{label}_size"] = int(stat.st_size)
+            fingerprint[f"{label}_mtime_ns"] = int(stat.st_mtime_ns)
+    return fingerprint
+
+
+@dataclass(frozen=True)
+class SharedArtifacts:
+    directory: Path
+    manifest: Mapping[str, object]
+    rows: MetadataTable
+    header: Mapping[str, object]
+    tie_ranks: object
+    bm25_state: dict[str, object]
+
+
+def _save_array(np_mod, path: Path, array) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as fh:
+        np_mod.save(fh, np_mod.ascontiguousarray(array), allow_pickle=False)
+    os.replace(tmp_path, path)
+
+
+def _write_text(path: Path, text: str) -> None:
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(text, encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def prepare_shared_artifacts(
+    index_path: Path,
+    *,
+    np_mod,
+    meta_path: Path | None = None,
+) -> dict[str, object]:
+    """Write the shared artifact set for ``index_path`` and return its manifest.
+
+    The manifest is written last, so a reader never attaches to a partial set.
+    Files are swapped in with ``os.replace``; workers that already mapped an
+    older copy keep a consistent view until they reload.
+    """
+
+    index_path = Path(index_path)
+    meta_path = Path(meta_path) if meta_path is not None else index_path.with_suffix(".meta.json")
+    fingerprint = source_fingerprint(index_path, meta_path)
+    meta_obj = json.loads(meta_path.read_text(encoding="utf-8"))
+    if not isinstance(meta_obj, dict) or not isinstance(meta_obj.get("rows"), list):
+        raise ValueError(f"Index metadata at {meta_path} has no rows to share.")
+    rows = materialize_metadata_rows(list(meta_obj["rows"]))
+    header = {key: value for key, value in meta_obj.items() if key != "rows"}
+
+    bm25_state = load_bm25_index(
+        meta_path,
+        header.get("bm25_index"),  # type: ignore[arg-type]
+        np_mod=np_mod,
+        corpus_digest=header.get("corpus_digest"),  # type: ignore[arg-type]
+        row_count=len(rows),
+    ) or build_bm25_index(np_mod, rows)
+    terms_map = bm25_state["terms"]
+    assert isinstance(terms_map, Mapping)
+    vocab = sorted(terms_map, key=terms_map.__getitem__)
+
+    directory = shared_artifacts_dir(index_path, meta_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    write_metadata_table(
+        _rows_table_path(index_path, directory),
+        rows,
+        np_mod=np_mod,
+        meta_path=meta_path,
+        header=header,
+    )
+    _save_array(np_mod, directory / "tie_ranks.npy", tie_break_rank_array(np_mod, rows))
+    _save_array(
+        np_mod,
+        directory / "bm25_terms.npy",
+        np_mod.frombuffer("\n".join(vocab).encode("utf-8"), dtype="uint8"),
+    )
+    for name in _BM25_ARRAYS:
+        _save_array(np_mod, directory / f"bm25_{name}.npy", bm25_state[name])
+
+    manifest: dict[str, object] = {
+        "schema_version": SHARED_ARTIFACTS_VERSION,
+        "source": fingerprint,
+        "corpus_digest": header.get("corpus_digest"),
+        "doc_count": len(rows),
+        "bm25_avg_doc_length": float(bm25_state.get("avg_doc_length") or 0.0),
+        "header": header,
+    }
+    _write_text(
+        directory / SHARED_MANIFEST_NAME,
+        json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+    )
+    return manifest
+
+
+def _rows_table_path(index_path: Path, directory: Path) -> Path:
+    return metadata_table_path(index_path, directory / SHARED_MANIFEST_NAME)
+
+
+def load_shared_artifacts(
+    index_path: Path,
+    *,
+    np_mod,
+    meta_path: Path | None = None,
+) -> SharedArtifacts | None:
+    """Attach read-only to the shared set, or ``None`` when absent or stale."""
+
+    index_path = Path(index_path)
+    meta_path = Path(meta_path) if meta_path is not None else index_path.with_suffix(".meta.json")
+    directory = shared_artifacts_dir(index_path, meta_path)
+    manifest_path = directory / SHARED_MANIFEST_NAME
+    if not manifest_path.exists():
+        return None
+    try:
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except Exception:
+        return None
+    if not isinstance(manifest, dict) or manifest.get("schema_version") != SHARED_ARTIFACTS_VERSION:
+        return None
+    if manifest.get("source") != source_fingerprint(index_path, meta_path):
+        return None
+    table = load_metadata_table(
+        _rows_table_path(index_path, directory), np_mod=np_mod, meta_path=meta_path
+    )
+    if table is None:
+        return None
+    rows = table[0]
+    try:
+        tie_ranks = np_mod.load(str(directory / "tie_ranks.npy"), mmap_mode="r")
+        blob = np_mod.load(str(directory / "bm25_terms.npy")).tobytes().decode("utf-8")
+        arrays = {
+            name: np_mod.load(str(directory / f"bm25_{name}.npy"), mmap_mode="r")
+            for name in _BM25_ARRAYS
+        }
+    except Exception:
+        return None
+    doc_count = int(manifest.get("doc_count") or 0)
+    if len(rows) != doc_count or int(tie_ranks.shape[0]) != doc_count:
+        return None
+    terms = blob.split("\n") if blob else []
+    bm25_state: dict[str, object] = {
+        "terms": {term: idx for idx, term in enumerate(terms)},
+        "avg_doc_length": float(manifest.get("bm25_avg_doc_length") or 0.0),
+        **arrays,
+    }
+    header = manifest.get("header")
+    return SharedArtifacts(
+        directory=directory,
+        manifest=manifest,
+        rows=rows,
+        header=dict(header) if isinstance(header, Mapping) else {},
+        tie_ranks=tie_ranks,
+        bm25_state=bm25_state,
+    )
+
+
+def ensure_shared_artifacts(
+    index_path: Path,
+    *,
+    np_mod,
+    meta_path: Path | None = None,
+    timeout_s: float = 60.0,
+    stale_lock_s: float = STALE_LOCK_SECONDS,
+) -> SharedArtifacts | None:
+    """Attach to the shared set, preparing it under a lock file if needed.
+
+    Only the worker that creates the lock file writes; the others poll until
+    the manifest matches the current source files or ``timeout_s`` elapses.
+    A lock is removed as abandoned only once it is older than
+    ``stale_lock_s``, which is kept strictly above ``timeout_s``.
+    """
+
+    index_path = Path(index_path)
+    meta_path = Path(meta_path) if meta_path is not None else index_path.with_suffix(".meta.json")
+    shared = load_shared_artifacts(index_path, np_mod=np_mod, meta_path=meta_path)
+    if shared is not None or not meta_path.exists():
+        return shared
+    directory = shared_artifacts_dir(index_path, meta_path)
+    directory.mkdir(parents=True, exist_ok=True)
+    lock_path = directory / _LOCK_NAME
+    deadline = time.monotonic() + max(0.0, float(timeout_s))
+    stale_after = max(float(stale_lock_s), 2.0 * float(timeout_s))
+    while True:
+        try:
+            fd = os.open(str(lock_path), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if time.monotonic() >= deadline:
+                return None
+            try:
+                # A lock this old was left by a crashed preparer.
+                if time.time() - lock_path.stat().st_mtime > stale_after:
+                    lock_path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            time.sleep(0.05)
+            shared = load_shared_artifacts(index_path, np_mod=np_mod, meta_path=meta_path)
+            if shared is not None:
+                return shared
+            continue
+        try:
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            os.close(fd)
+            prepare_shared_artifacts(index_path, np_mod=np_mod, meta_path=meta_path)
+        finally:
+            lock_path.unlink(missing_ok=True)
+        return load_shared_artifacts(index_path, np_mod=np_mod, meta_path=meta_path)
+
+
+def faiss_mmap_flags(faiss_mod) -> int:
+    """``read_index`` flags that map the index read-only where FAISS supports it."""
+
+    flags = 0
+    for name in ("IO_FLAG_MMAP", "IO_FLAG_READ_ONLY"):
+        flags |= int(getattr(faiss_mod, name, 0) or 0)
+    return flags
+
+
+__all__ = [
+    "SHARED_ARTIFACTS_ENV",
+    "SHARED_ARTIFACTS_VERSION",
+    "STALE_LOCK_SECONDS",
+    "SharedArtifacts",
+    "ensure_shared_artifacts",
+    "faiss_mmap_flags",
+    "load_shared_artifacts",
+    "prepare_shared_artifacts",
+    "shared_artifacts_dir",
+    "shared_artifacts_enabled",
+    "source_fingerprint",
+]
@@ -48,6 +48,9 @@ class HTTPCache:
     ttl_seconds: float | None
         Optional time-to-live for cache files. When set, entries older than the
         TTL are treated as expired and are removed during maintenance.
+    content_types: Iterable[str]
+        Response ``Content-Type`` prefixes that are stored. Defaults to JSON
+        only; HTML clients pass ``("text/html",)``.
     """
 
     def __init__(
@@ -56,11 +59,13 @@ class HTTPCache:
         *,
         max_entries: int = 4096,
         ttl_seconds: float | None = None,
+        content_types: Iterable[str] = ("application/json",),
     ) -> None:
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(parents=True, exist_ok=True)
         self.max_entries = int(max_entries)
         self.ttl_seconds = float(ttl_seconds) if ttl_seconds is not None else None
+        self.content_types = tuple(str(item).lower() for item in content_types)
 
     def _key_path(
         self,
@@ -148,8 +153,8 @@ class HTTPCache:
             setattr(resp, "from_cache", True)
             setattr(resp, "cache_age_seconds", cache_age_seconds)
 
-        content_type = resp.headers.get("Content-Type", "")
-        if content_type.startswith("application/json"):
+        content_type = resp.headers.get("Content-Type", "").lower()
+        if resp.status_code == 200 and content_type.startswith(self.content_types):
             data = {
                 "etag": resp.headers.get("ETag"),
                 "last_modified": resp.headers.get("Last-Modified"),
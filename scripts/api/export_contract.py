@@ -120,6 +120,18 @@ def _build_postman_collection(base_url: str) -> Dict[str, Any]:
                 "include_lineage": True,
             },
         ),
+        _request(
+            "RAG Query Batch",
+            "POST",
+            "/v1/rag/query:batch",
+            description="Batched retrieval; one retriever pass for all cache misses",
+            body={
+                "queries": [
+                    {"query": "What changed in Part 734?", "top_k": 3},
+                    {"query": "{{search_query}}", "top_k": 3},
+                ],
+            },
+        ),
     ]
 
     return {
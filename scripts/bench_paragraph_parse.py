@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+"""
+Benchmark Federal Register paragraph extraction over the EAR fixtures.
+
+Parses every ``ear_*.json`` / ``ear_*.html`` fixture with the lxml fast path
+and with the BeautifulSoup fallback, reporting paragraphs per second for each
+and for the unchanged-document path (SHA-256 of the HTML only). The two
+parsers must yield identical paragraphs.
+"""
+
+import argparse
+import hashlib
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from earCrawler.core.html_paragraphs import LXML_AVAILABLE, iter_paragraph_texts
+
+
+def load_fixture_documents(fixtures_dir: Path) -> dict[str, str]:
+    documents: dict[str, str] = {}
+    for path in sorted(fixtures_dir.glob("ear_*.json")):
+        doc = json.loads(path.read_text(encoding="utf-8"))
+        documents[str(doc.get("document_number", path.stem))] = str(doc.get("html", ""))
+    for path in sorted(fixtures_dir.glob("ear_*.html")):
+        documents[path.stem.split("ear_", 1)[-1]] = path.read_text(encoding="utf-8")
+    return documents
+
+
+def _timed(fn, repeat: int) -> list[float]:
+    timings: list[float] = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmark(*, fixtures_dir: Path, repeat: int, scale: int) -> dict[str, object]:
+    documents = load_fixture_documents(fixtures_dir)
+    # Each pass parses every fixture ``scale`` times so small fixtures give stable timings.
+    bodies = list(documents.values()) * max(1, scale)
+
+    def _parse(parser: str) -> list[list[str]]:
+        return [list(iter_paragraph_texts(html, parser=parser)) for html in bodies]
+
+    def _hash_only() -> list[str]:
+        return [hashlib.sha256(html.encode("utf-8")).hexdigest() for html in bodies]
+
+    baseline = _parse("bs4")
+    paragraphs = sum(len(texts) for texts in baseline)
+    parsers = ["bs4"] + (["lxml"] if LXML_AVAILABLE else [])
+    report: dict[str, object] = {
+        "fixtures_dir": str(fixtures_dir),
+        "documents": len(documents),
+        "paragraphs_per_pass": paragraphs,
+        "repeat": repeat,
+        "scale": scale,
+        "lxml_available": LXML_AVAILABLE,
+        "identical_paragraphs": (not LXML_AVAILABLE) or _parse("lxml") == baseline,
+    }
+    for name, fn in [(parser, lambda p=parser: _parse(p)) for parser in parsers] + [
+        ("unchanged_skip", _hash_only)
+    ]:
+        median = statistics.median(_timed(fn, repeat))
+        report[name] = {
+            "median_ms": round(median * 1000.0, 3),
+            "paragraphs_per_s": round(paragraphs / median, 1) if median else None,
+        }
+    return report
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fixtures", type=Path, default=Path("tests") / "fixtures")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--scale", type=int, default=200)
+    parser.add_argument("--out", type=Path, default=None, help="Optional JSON report path.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(fixtures_dir=args.fixtures, repeat=args.repeat, scale=args.scale)
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0 if report["identical_paragraphs"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
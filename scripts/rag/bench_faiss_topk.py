@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+"""
+Benchmark bounded FAISS top-k search against a full-corpus search.
+
+Encodes the golden-set questions once, then ranks them with
+``faiss_top_k`` using the default tie margin and again with a window covering
+the whole corpus (the former Windows behaviour). Rankings must be identical;
+the report records both latencies and how often a query had to widen.
+"""
+
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from earCrawler.cli.rag_workflows import DEFAULT_RECALL_QUERIES_PATH, load_recall_queries
+from earCrawler.rag.faiss_profiles import apply_search_params, search_params_from_meta
+from earCrawler.rag.retriever_ranking import (
+    FAISS_TIE_MARGIN,
+    faiss_top_k,
+    materialize_metadata_rows,
+    tie_break_rank_array,
+)
+from earCrawler.utils.import_guard import import_optional
+
+
+class _CountingIndex:
+    def __init__(self, index) -> None:
+        self.index = index
+        self.searches = 0
+
+    def begin_query(self) -> None:
+        self.searches = 0
+
+    def search(self, batch, window):
+        self.searches += 1
+        return self.index.search(batch, window)
+
+
+def _count_widened_queries(index, vectors, tie_ranks, *, k: int, total: int) -> int:
+    """Return how many queries needed more than one ``search`` in one pass."""
+
+    counting = _CountingIndex(index)
+    widened = 0
+    for i in range(int(vectors.shape[0])):
+        counting.begin_query()
+        faiss_top_k(np, counting, vectors[i : i + 1], tie_ranks, k=k, total=total)
+        widened += int(counting.searches > 1)
+    return widened
+
+
+def _timed(fn, repeat: int) -> tuple[Any, list[float]]:
+    timings: list[float] = []
+    result = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(round((time.perf_counter() - start) * 1000.0, 3))
+    return result, timings
+
+
+def run_benchmark(
+    *,
+    index_path: Path,
+    meta_path: Path,
+    queries_path: Path,
+    k: int,
+    repeat: int,
+    model_name: str | None = None,
+) -> dict[str, Any]:
+    faiss = import_optional("faiss", ["faiss-cpu"])
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    rows = materialize_metadata_rows(list(meta.get("rows") or []))
+    header = {key: value for key, value in meta.items() if key != "rows"}
+    index = faiss.read_index(str(index_path))
+    apply_search_params(faiss, index, search_params_from_meta(header))
+    faiss.omp_set_num_threads(1)
+
+    st = import_optional("sentence_transformers", ["sentence-transformers"])
+    model = st.SentenceTransformer(model_name or str(header.get("embedding_model") or ""))
+    questions = load_recall_queries(queries_path)
+    vectors = np.asarray(model.encode(questions, show_progress_bar=False), dtype="float32")
+    tie_ranks = tie_break_rank_array(np, rows)
+    total = len(rows)
+
+    widened = _count_widened_queries(index, vectors, tie_ranks, k=k, total=total)
+    bounded, bounded_ms = _timed(
+        lambda: [
+            faiss_top_k(np, index, vectors[i : i + 1], tie_ranks, k=k, total=total)[0]
+            for i in range(len(questions))
+        ],
+        repeat,
+    )
+    full, full_ms = _timed(
+        lambda: [
+            faiss_top_k(np, index, vectors[i : i + 1], tie_ranks, k=k, total=total, margin=total)[0]
+            for i in range(len(questions))
+        ],
+        repeat,
+    )
+    mismatches = [
+        questions[i] for i, (left, right) in enumerate(zip(bounded, full)) if left != right
+    ]
+    return {
+        "index_path": str(index_path),
+        "queries_path": str(queries_path),
+        "doc_count": total,
+        "query_count": len(questions),
+        "k": k,
+        "tie_margin": FAISS_TIE_MARGIN,
+        "identical_rankings": not mismatches,
+        "mismatched_queries": mismatches,
+        "widened_queries_per_pass": widened,
+        "bounded_ms": {"median": statistics.median(bounded_ms), "runs": bounded_ms},
+        "full_ms": {"median": statistics.median(full_ms), "runs": full_ms},
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--index", type=Path, default=Path("data") / "faiss" / "index.faiss")
+    parser.add_argument("--meta", type=Path, default=None, help="Defaults to <index>.meta.json.")
+    parser.add_argument("--queries", type=Path, default=DEFAULT_RECALL_QUERIES_PATH)
+    parser.add_argument("--model", default=None, help="Defaults to the index's embedding_model.")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", type=Path, default=None, help="Optional JSON report path.")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(
+        index_path=args.index,
+        meta_path=args.meta or args.index.with_suffix(".meta.json"),
+        queries_path=args.queries,
+        k=args.k,
+        repeat=args.repeat,
+        model_name=args.model,
+    )
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0 if report["identical_rankings"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -134,6 +134,8 @@ def create_app(
     app.include_router(router)
 
     register_shutdown_close_hook(app, fuseki_client=fuseki_client)
+    app.add_event_handler("shutdown", runtime_state.retrieval_executor.shutdown)
+    app.add_event_handler("shutdown", runtime_state.rag_query_cache.close)
     register_docs_routes(app)
     register_exception_handlers(app)
 
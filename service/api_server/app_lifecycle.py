@@ -51,6 +51,7 @@ _EMBEDDED_FIXTURE = {
         }
     ],
 }
+_EMBEDDED_FIXTURE["lineage_by_ids"] = _EMBEDDED_FIXTURE["lineage_by_id"]
 
 
 def resolve_fuseki_client(
@@ -64,7 +65,9 @@ def resolve_fuseki_client(
     embedded = os.getenv("EARCRAWLER_API_EMBEDDED_FIXTURE") == "1"
     if settings.fuseki_url:
         return HttpFusekiClient(
-            endpoint=settings.fuseki_url, timeout=settings.request_timeout_seconds
+            endpoint=settings.fuseki_url,
+            timeout=settings.request_timeout_seconds,
+            max_connections=settings.fuseki_max_connections,
         )
     responses = _EMBEDDED_FIXTURE if embedded else {}
     return StubFusekiClient(responses=responses)
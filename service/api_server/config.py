@@ -28,7 +28,14 @@ class ApiSettings:
     port: int = 9001
     request_body_limit: int = 32 * 1024
     request_timeout_seconds: float = 5.0
+    fuseki_max_connections: int = 16
     concurrency_limit: int = 16
+    retrieval_workers: int = 4
+    retrieval_max_batch: int = 16
+    rag_cache_ttl_seconds: float = 30.0
+    rag_cache_max_entries: int = 256
+    rag_cache_max_bytes: int = 64 * 1024 * 1024
+    rag_cache_path: Optional[str] = None
     enable_search: bool = False
     declared_instance_count: int = 1
     allow_unsupported_multi_instance: bool = False
@@ -41,7 +48,16 @@ class ApiSettings:
         port = int(os.getenv("EARCRAWLER_API_PORT", "9001"))
         request_body_limit = int(os.getenv("EARCRAWLER_API_BODY_LIMIT", str(32 * 1024)))
         request_timeout_seconds = float(os.getenv("EARCRAWLER_API_TIMEOUT", "5"))
+        fuseki_max_connections = int(os.getenv("EARCRAWLER_API_FUSEKI_MAX_CONNECTIONS", "16"))
         concurrency_limit = int(os.getenv("EARCRAWLER_API_CONCURRENCY", "16"))
+        retrieval_workers = int(os.getenv("EARCRAWLER_API_RETRIEVAL_WORKERS", "4"))
+        retrieval_max_batch = int(os.getenv("EARCRAWLER_API_RETRIEVAL_MAX_BATCH", "16"))
+        rag_cache_ttl_seconds = float(os.getenv("EARCRAWLER_API_RAG_CACHE_TTL", "30"))
+        rag_cache_max_entries = int(os.getenv("EARCRAWLER_API_RAG_CACHE_MAX_ENTRIES", "256"))
+        rag_cache_max_bytes = int(
+            os.getenv("EARCRAWLER_API_RAG_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+        )
+        rag_cache_path = os.getenv("EARCRAWLER_API_RAG_CACHE_PATH") or None
         enable_search = os.getenv("EARCRAWLER_API_ENABLE_SEARCH", "0") == "1"
         declared_instance_count = int(os.getenv("EARCRAWLER_API_INSTANCE_COUNT", "1"))
         allow_unsupported_multi_instance = (
@@ -63,7 +79,14 @@ class ApiSettings:
             port=port,
             request_body_limit=request_body_limit,
             request_timeout_seconds=request_timeout_seconds,
+            fuseki_max_connections=fuseki_max_connections,
             concurrency_limit=concurrency_limit,
+            retrieval_workers=retrieval_workers,
+            retrieval_max_batch=retrieval_max_batch,
+            rag_cache_ttl_seconds=rag_cache_ttl_seconds,
+            rag_cache_max_entries=rag_cache_max_entries,
+            rag_cache_max_bytes=rag_cache_max_bytes,
+            rag_cache_path=rag_cache_path,
             enable_search=enable_search,
             declared_instance_count=declared_instance_count,
             allow_unsupported_multi_instance=allow_unsupported_multi_instance,
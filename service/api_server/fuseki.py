@@ -7,10 +7,7 @@ from dataclasses import dataclass, field
 import json
 from typing import Any, Dict, Iterable, List, Mapping, Protocol
 
-import httpx
-
-from .templates import TemplateRegistry
-
+from earCrawler.kg.sparql import DEFAULT_POOL_MAXSIZE, AsyncSPARQLClient
 
 from .templates import Template, TemplateRegistry
 
@@ -23,12 +20,17 @@ class FusekiClient(Protocol):
 class HttpFusekiClient:
     endpoint: str
     timeout: float
-    _client: httpx.AsyncClient | None = field(default=None, init=False, repr=False)
+    max_connections: int = DEFAULT_POOL_MAXSIZE
+    _client: AsyncSPARQLClient | None = field(default=None, init=False, repr=False)
 
-    async def _ensure_client(self) -> httpx.AsyncClient:
-        # Lazily create a pooled AsyncClient and reuse it for all queries.
+    def _ensure_client(self) -> AsyncSPARQLClient:
+        # Lazily create the shared pooled client and reuse it for all queries.
         if self._client is None:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._client = AsyncSPARQLClient(
+                self.endpoint,
+                timeout=self.timeout,
+                max_connections=self.max_connections,
+            )
         return self._client
 
     async def aclose(self) -> None:
@@ -40,14 +42,7 @@ class HttpFusekiClient:
                 self._client = None
 
     async def query(self, template: Template, query: str) -> Mapping[str, Any]:
-        client = await self._ensure_client()
-        response = await client.post(
-            self.endpoint,
-            content=query.encode("utf-8"),
-            headers={"Content-Type": "application/sparql-query"},
-        )
-        response.raise_for_status()
-        return response.json()
+        return await self._ensure_client().select(query)
 
 
 class FusekiGateway:
@@ -43,6 +43,9 @@ async def health(request: Request) -> Dict[str, Any]:
     live_sources = _check_live_sources()
     rate_limit_recommendation_inputs = _check_rate_limit_recommendation_inputs(request)
     rate_limit_recommendation = _check_rate_limit_recommendation(request)
+    retriever_cache = _check_retriever_cache(request)
+    retrieval_executor = _check_retrieval_executor(request)
+    rag_query_cache = _check_rag_query_cache(request)
 
     readiness_status = (
         "pass"
@@ -62,6 +65,9 @@ async def health(request: Request) -> Dict[str, Any]:
         },
         "rate_limit_recommendation_inputs": rate_limit_recommendation_inputs,
         "rate_limit_recommendation": rate_limit_recommendation,
+        "retriever_cache": retriever_cache,
+        "retrieval_executor": retrieval_executor,
+        "rag_query_cache": rag_query_cache,
         "live_sources": live_sources,
     }
 
@@ -135,6 +141,27 @@ def _check_disk(budgets: HealthBudgets) -> Dict[str, Any]:
     return {"status": status, "details": detail}
 
 
+def _check_retriever_cache(request: Request) -> Dict[str, Any]:
+    runtime_state = getattr(request.app.state, "runtime_state", None)
+    if runtime_state is None:
+        return {"status": "unknown", "reason": "runtime_state_missing"}
+    return runtime_state.retriever_runtime.cache_stats_payload()
+
+
+def _check_retrieval_executor(request: Request) -> Dict[str, Any]:
+    runtime_state = getattr(request.app.state, "runtime_state", None)
+    if runtime_state is None:
+        return {"status": "unknown", "reason": "runtime_state_missing"}
+    return runtime_state.retrieval_executor_payload()
+
+
+def _check_rag_query_cache(request: Request) -> Dict[str, Any]:
+    runtime_state = getattr(request.app.state, "runtime_state", None)
+    if runtime_state is None:
+        return {"status": "unknown", "reason": "runtime_state_missing"}
+    return runtime_state.rag_query_cache_payload()
+
+
 def _check_rate_limit_recommendation_inputs(request: Request) -> Dict[str, Any]:
     runtime_state = getattr(request.app.state, "runtime_state", None)
     if runtime_state is None:
@@ -0,0 +1,430 @@
+from __future__ import annotations
+
+"""LRU/TTL cache for RAG retrieval results, with an optional host-shared backend."""
+
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Protocol
+
+RAG_QUERY_CACHE_STORAGE_SCOPE = "process_local"
+RAG_QUERY_CACHE_SHARED_STORAGE_SCOPE = "host_shared"
+DEFAULT_RAG_CACHE_TTL_SECONDS = 30.0
+DEFAULT_RAG_CACHE_MAX_ENTRIES = 256
+DEFAULT_RAG_CACHE_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_RAG_CACHE_TOUCH_BATCH = 64
+
+logger = logging.getLogger(__name__)
+
+
+class RagCacheBackend(Protocol):
+    """Second-level store shared by every API worker on one host."""
+
+    name: str
+    storage_scope: str
+
+    def get(self, key: str, index_digest: str | None) -> tuple[str, float] | None: ...
+
+    def put(
+        self, key: str, index_digest: str | None, payload: str, expires_at: float
+    ) -> None: ...
+
+    def invalidate(self, index_digest: str | None) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class SqliteRagCacheBackend:
+    """SQLite (WAL) store so cached results survive restarts and span workers.
+
+    Hits only queue their access time; the queue is written in one batch on
+    the next ``put`` or once ``touch_batch`` hits are pending, so reads do not
+    take the write lock. Each thread gets its own connection; :meth:`close`
+    writes pending touches and closes all of them.
+    """
+
+    name = "sqlite"
+    storage_scope = RAG_QUERY_CACHE_SHARED_STORAGE_SCOPE
+
+    def __init__(
+        self,
+        path: Path | str,
+        *,
+        max_entries: int = 4 * DEFAULT_RAG_CACHE_MAX_ENTRIES,
+        touch_batch: int = DEFAULT_RAG_CACHE_TOUCH_BATCH,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self.touch_batch = max(1, int(touch_batch))
+        self._clock = clock
+        self._local = threading.local()
+        self._connections_lock = threading.Lock()
+        self._connections: list[sqlite3.Connection] = []
+        self._touch_lock = threading.Lock()
+        self._pending_touches: dict[str, float] = {}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rag_cache ("
+                " key TEXT PRIMARY KEY,"
+                " index_digest TEXT,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL,"
+                " payload TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS rag_cache_accessed ON rag_cache(accessed_at)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Used only by the opening thread; close() may run on another.
+            conn = sqlite3.connect(
+                self.path, timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def get(self, key: str, index_digest: str | None) -> tuple[str, float] | None:
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT payload, expires_at, index_digest FROM rag_cache WHERE key = ?",
+            (key,),
+        ).fetchone()
+        if row is None:
+            return None
+        payload, expires_at, stored_digest = row
+        now = self._clock()
+        if expires_at <= now or stored_digest != index_digest:
+            conn.execute("DELETE FROM rag_cache WHERE key = ?", (key,))
+            return None
+        with self._touch_lock:
+            self._pending_touches[key] = now
+            due = len(self._pending_touches) >= self.touch_batch
+        if due:
+            self._flush_touches(conn)
+        return payload, float(expires_at)
+
+    def _flush_touches(self, conn: sqlite3.Connection) -> None:
+        with self._touch_lock:
+            pending, self._pending_touches = self._pending_touches, {}
+        if pending:
+            conn.executemany(
+                "UPDATE rag_cache SET accessed_at = ? WHERE key = ?",
+                [(accessed_at, key) for key, accessed_at in pending.items()],
+            )
+
+    def put(
+        self, key: str, index_digest: str | None, payload: str, expires_at: float
+    ) -> None:
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO rag_cache"
+            " (key, index_digest, expires_at, accessed_at, payload)"
+            " VALUES (?, ?, ?, ?, ?)",
+            (key, index_digest, expires_at, self._clock(), payload),
+        )
+        self._flush_touches(conn)
+        conn.execute(
+            "DELETE FROM rag_cache WHERE key IN ("
+            " SELECT key FROM rag_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def invalidate(self, index_digest: str | None) -> None:
+        self._connect().execute(
+            "DELETE FROM rag_cache WHERE index_digest IS NOT ?", (index_digest,)
+        )
+
+    def clear(self) -> None:
+        self._connect().execute("DELETE FROM rag_cache")
+
+    def close(self) -> None:
+        """Write pending access times and close every thread's connection."""
+
+        try:
+            if self._pending_touches:
+                self._flush_touches(self._connect())
+        finally:
+            with self._connections_lock:
+                connections, self._connections = self._connections, []
+                self._local = threading.local()
+            for conn in connections:
+                conn.close()
+
+
+@dataclass(slots=True)
+class _RagCacheEntry:
+    expires_at: float
+    payload: list[dict]
+    size: int
+
+
+def _to_datetime(epoch: float) -> datetime:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc)
+
+
+class RagQueryCache:
+    """LRU cache with TTL and a byte budget for repeat RAG queries.
+
+    Lookups, inserts and evictions are O(1). Entries belong to the index
+    digest bound with :meth:`bind_index`; a different digest drops them, and
+    so does the first bind for entries stored while no digest was known. With
+    a ``backend`` the in-process LRU acts as a first level in front of a store
+    shared by all workers on the host. Backend failures are logged and count
+    as a miss or a skipped write; they never reach the caller. The ``a*``
+    variants run backend I/O on a worker thread for use from the event loop.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = DEFAULT_RAG_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_RAG_CACHE_MAX_ENTRIES,
+        *,
+        max_bytes: int | None = DEFAULT_RAG_CACHE_MAX_BYTES,
+        backend: RagCacheBackend | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._ttl = float(ttl_seconds)
+        self._max = max(1, int(max_entries))
+        self._max_bytes = int(max_bytes) if max_bytes else None
+        self._backend = backend
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _RagCacheEntry] = OrderedDict()
+        self._bytes = 0
+        self._index_digest: str | None = None
+        self._hits = 0
+        self._backend_hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+        self._backend_errors = 0
+
+    @property
+    def storage_scope(self) -> str:
+        if self._backend is not None:
+            return self._backend.storage_scope
+        return RAG_QUERY_CACHE_STORAGE_SCOPE
+
+    def bind_index(self, index_digest: str | None) -> bool:
+        """Tie entries to ``index_digest``; return ``True`` if that dropped them."""
+
+        dropped = self._bind_local(index_digest)
+        if dropped:
+            self._invalidate_backend(index_digest)
+        return dropped
+
+    async def abind_index(self, index_digest: str | None) -> bool:
+        dropped = self._bind_local(index_digest)
+        if dropped and self._backend is not None:
+            await asyncio.to_thread(self._invalidate_backend, index_digest)
+        return dropped
+
+    def get(self, key: str) -> list[dict] | None:
+        hit, payload, digest = self._get_local(key)
+        if hit:
+            return payload
+        return self._get_backend(key, digest)
+
+    async def aget(self, key: str) -> list[dict] | None:
+        hit, payload, digest = self._get_local(key)
+        if hit:
+            return payload
+        if self._backend is None:
+            return self._get_backend(key, digest)
+        return await asyncio.to_thread(self._get_backend, key, digest)
+
+    def put(self, key: str, payload: list[dict]) -> datetime:
+        raw, expires_at, digest = self._put_local(key, payload)
+        self._put_backend(key, digest, raw, expires_at)
+        return _to_datetime(expires_at)
+
+    async def aput(self, key: str, payload: list[dict]) -> datetime:
+        raw, expires_at, digest = self._put_local(key, payload)
+        if self._backend is not None:
+            await asyncio.to_thread(self._put_backend, key, digest, raw, expires_at)
+        return _to_datetime(expires_at)
+
+    def _bind_local(self, index_digest: str | None) -> bool:
+        if not index_digest:
+            return False
+        with self._lock:
+            if index_digest == self._index_digest:
+                return False
+            previous, self._index_digest = self._index_digest, index_digest
+            if previous is None and not self._entries:
+                return False
+            self._entries.clear()
+            self._bytes = 0
+            self._invalidations += 1
+        return True
+
+    def _get_local(self, key: str) -> tuple[bool, list[dict] | None, str | None]:
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return True, entry.payload, self._index_digest
+                self._drop_locked(key)
+                self._expirations += 1
+            return False, None, self._index_digest
+
+    def _get_backend(self, key: str, digest: str | None) -> list[dict] | None:
+        if self._backend is not None:
+            try:
+                shared = self._backend.get(key, digest)
+                payload = json.loads(shared[0]) if shared is not None else None
+            except Exception as exc:
+                self._backend_failed("get", exc)
+                shared = None
+            if shared is not None:
+                raw, expires_at = shared
+                with self._lock:
+                    self._store_locked(key, payload, expires_at, len(raw))
+                    self._hits += 1
+                    self._backend_hits += 1
+                return payload
+        with self._lock:
+            self._misses += 1
+        return None
+
+    def _put_local(self, key: str, payload: list[dict]) -> tuple[str, float, str | None]:
+        expires_at = self._clock() + self._ttl
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self._lock:
+            self._store_locked(key, payload, expires_at, len(raw))
+            return raw, expires_at, self._index_digest
+
+    def _put_backend(
+        self, key: str, digest: str | None, raw: str, expires_at: float
+    ) -> None:
+        if self._backend is None:
+            return
+        try:
+            self._backend.put(key, digest, raw, expires_at)
+        except Exception as exc:
+            self._backend_failed("put", exc)
+
+    def _invalidate_backend(self, index_digest: str | None) -> None:
+        if self._backend is None:
+            return
+        try:
+            self._backend.invalidate(index_digest)
+        except Exception as exc:
+            self._backend_failed("invalidate", exc)
+
+    def close(self) -> None:
+        """Release the backend's connections; called on app shutdown."""
+
+        close = getattr(self._backend, "close", None)
+        if not callable(close):
+            return
+        try:
+            close()
+        except Exception as exc:
+            self._backend_failed("close", exc)
+
+    def _backend_failed(self, operation: str, exc: Exception) -> None:
+        with self._lock:
+            self._backend_errors += 1
+        logger.warning(
+            "rag.cache.backend_error backend=%s operation=%s error=%s",
+            self._backend.name if self._backend is not None else "memory",
+            operation,
+            exc,
+        )
+
+    def expires_at(self, key: str) -> datetime | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at <= self._clock():
+                self._drop_locked(key)
+                self._expirations += 1
+                return None
+            return _to_datetime(entry.expires_at)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+        if self._backend is not None:
+            try:
+                self._backend.clear()
+            except Exception as exc:
+                self._backend_failed("clear", exc)
+
+    def stats(self) -> dict[str, object]:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "storage_scope": self.storage_scope,
+                "backend": self._backend.name if self._backend is not None else "memory",
+                "entries": len(self._entries),
+                "max_entries": self._max,
+                "bytes": self._bytes,
+                "max_bytes": self._max_bytes,
+                "ttl_seconds": self._ttl,
+                "hits": self._hits,
+                "backend_hits": self._backend_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+                "evictions": self._evictions,
+                "expirations": self._expirations,
+                "invalidations": self._invalidations,
+                "backend_errors": self._backend_errors,
+                "index_digest": self._index_digest,
+            }
+
+    def _drop_locked(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def _store_locked(
+        self, key: str, payload: list[dict], expires_at: float, size: int
+    ) -> None:
+        self._drop_locked(key)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+        while self._entries and (
+            len(self._entries) >= self._max
+            or (self._max_bytes is not None and self._bytes + size > self._max_bytes)
+        ):
+            _, victim = self._entries.popitem(last=False)
+            self._bytes -= victim.size
+            self._evictions += 1
+        self._entries[key] = _RagCacheEntry(expires_at=expires_at, payload=payload, size=size)
+        self._bytes += size
+
+
+__all__ = [
+    "DEFAULT_RAG_CACHE_MAX_BYTES",
+    "DEFAULT_RAG_CACHE_MAX_ENTRIES",
+    "DEFAULT_RAG_CACHE_TOUCH_BATCH",
+    "DEFAULT_RAG_CACHE_TTL_SECONDS",
+    "RAG_QUERY_CACHE_SHARED_STORAGE_SCOPE",
+    "RAG_QUERY_CACHE_STORAGE_SCOPE",
+    "RagCacheBackend",
+    "RagQueryCache",
+    "SqliteRagCacheBackend",
+]
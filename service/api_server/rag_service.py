@@ -6,7 +6,7 @@ import asyncio
 import math
 import os
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from datetime import datetime
 from typing import Awaitable, Callable, Mapping
 
@@ -14,6 +14,7 @@ from earCrawler.rag import llm_runtime, orchestrator, retrieval_runtime
 
 from .fuseki import FusekiGateway
 from .rag_support import RagQueryCache, RetrieverProtocol
+from .retrieval_executor import RetrievalExecutor
 from .schemas import (
     LineageEdge,
     RagAnswer,
@@ -25,6 +26,7 @@ from .schemas import (
 
 QueryRunner = Callable[[RetrieverProtocol, str, int], Awaitable[list[dict]]]
 GenerateRunner = orchestrator.GenerateRunner
+LINEAGE_BATCH_SIZE = 50
 
 
 @dataclass
@@ -46,6 +48,13 @@ class ApiRetrievalResult:
     model_name: str | None
 
 
+@dataclass
+class ApiQueryAnswers:
+    results: list[RagAnswer]
+    fuseki_round_trips: int = 0
+    t_lineage_ms: float = 0.0
+
+
 @dataclass
 class ApiAnswerExecution:
     status_code: int
@@ -65,6 +74,16 @@ def _elapsed_ms(start: float) -> float:
     return round((time.perf_counter() - start) * 1000.0, 3)
 
 
+def _retriever_index_digest(retriever: object) -> str | None:
+    digest_fn = getattr(retriever, "index_digest", None)
+    if not callable(digest_fn):
+        return None
+    try:
+        return digest_fn()
+    except Exception:
+        return None
+
+
 def _maybe_str(value: object) -> str | None:
     if isinstance(value, str) and value:
         return value
@@ -170,6 +189,7 @@ async def retrieve_documents(
     retriever: RetrieverProtocol,
     cache: RagQueryCache,
     run_query: QueryRunner,
+    executor: RetrievalExecutor | None = None,
 ) -> ApiRetrievalResult:
     temporal_state: dict[str, object] = {
         "requested": bool(effective_date),
@@ -185,16 +205,10 @@ async def retrieve_documents(
     retrieval_failure: Exception | None = None
 
     retriever_state = orchestrator.resolve_retriever_state(retriever=retriever)
-    rag_enabled = retriever_state.rag_enabled
-    retriever_ready = retriever_state.retriever_ready
-    failure_type = retriever_state.failure_type
-    disabled_reason = retriever_state.disabled_reason
-    index_path = retriever_state.index_path
-    model_name = retriever_state.model_name
-
-    if rag_enabled and retriever_ready:
+    if retriever_state.rag_enabled and retriever_state.retriever_ready:
         cache_start = time.perf_counter()
-        cached = cache.get(cache_key)
+        await cache.abind_index(_retriever_index_digest(retriever))
+        cached = await cache.aget(cache_key)
         cache_hit = cached is not None
         t_cache_ms += _elapsed_ms(cache_start)
         if cache_hit:
@@ -204,40 +218,66 @@ async def retrieve_documents(
             t_cache_ms += _elapsed_ms(cache_start)
         else:
             try:
-                retrieval_execution = await asyncio.to_thread(
-                    orchestrator.run_retrieval_sync,
-                    query=query,
-                    top_k=top_k,
-                    retriever=retriever,
-                    strict=True,
-                    effective_date=effective_date,
-                )
+                if executor is not None:
+                    retrieval_execution = await executor.retrieve(
+                        query=query,
+                        top_k=top_k,
+                        retriever=retriever,
+                        effective_date=effective_date,
+                    )
+                else:
+                    retrieval_execution = await asyncio.to_thread(
+                        orchestrator.run_retrieval_sync,
+                        query=query,
+                        top_k=top_k,
+                        retriever=retriever,
+                        strict=True,
+                        effective_date=effective_date,
+                    )
                 documents = retrieval_execution.docs
                 warnings = retrieval_execution.warnings
                 temporal_state = retrieval_execution.temporal_state
                 t_retrieve_ms += retrieval_execution.t_retrieve_ms
+            except Exception as exc:
+                retrieval_failure = exc
+            else:
                 if (not bool(temporal_state.get("requested"))) or documents:
                     cache_start = time.perf_counter()
-                    expires_at = cache.put(cache_key, documents)
+                    expires_at = await cache.aput(cache_key, documents)
                     t_cache_ms += _elapsed_ms(cache_start)
-            except Exception as exc:
-                retrieval_failure = exc
-                failure_type = getattr(exc, "code", failure_type or "retriever_error")
     else:
         retrieval_failure = getattr(retriever, "failure", RuntimeError("Retriever not ready"))
-        failure_type = failure_type or "retriever_not_ready"
 
+    return _finalize_retrieval(
+        retriever=retriever,
+        documents=documents,
+        warnings=warnings,
+        temporal_state=temporal_state,
+        retrieval_failure=retrieval_failure,
+        cache_hit=cache_hit,
+        expires_at=expires_at,
+        t_cache_ms=t_cache_ms,
+        t_retrieve_ms=t_retrieve_ms,
+    )
+
+
+def _finalize_retrieval(
+    *,
+    retriever: RetrieverProtocol,
+    documents: list[dict],
+    warnings: list[dict[str, object]],
+    temporal_state: dict[str, object],
+    retrieval_failure: Exception | None,
+    cache_hit: bool,
+    expires_at: datetime | None,
+    t_cache_ms: float,
+    t_retrieve_ms: float,
+) -> ApiRetrievalResult:
     retriever_state = orchestrator.resolve_retriever_state(
         retriever=retriever,
         warnings=warnings,
         retrieval_failure=retrieval_failure,
     )
-    rag_enabled = retriever_state.rag_enabled
-    retriever_ready = retriever_state.retriever_ready
-    failure_type = retriever_state.failure_type
-    disabled_reason = retriever_state.disabled_reason
-    index_path = retriever_state.index_path
-    model_name = retriever_state.model_name
     retrieval_empty, retrieval_empty_reason = orchestrator.resolve_retrieval_empty_state(
         docs=documents,
         temporal_state=temporal_state,
@@ -252,49 +292,165 @@ async def retrieve_documents(
         cache_hit=cache_hit,
         expires_at=expires_at,
         temporal_state=temporal_state,
-        rag_enabled=rag_enabled,
-        retriever_ready=retriever_ready,
-        failure_type=failure_type,
-        disabled_reason=disabled_reason,
+        rag_enabled=retriever_state.rag_enabled,
+        retriever_ready=retriever_state.retriever_ready,
+        failure_type=retriever_state.failure_type,
+        disabled_reason=retriever_state.disabled_reason,
         retrieval_failure=retrieval_failure,
         retrieval_empty=retrieval_empty,
         retrieval_empty_reason=retrieval_empty_reason,
         t_cache_ms=t_cache_ms,
         t_retrieve_ms=t_retrieve_ms,
-        index_path=index_path,
-        model_name=model_name,
+        index_path=retriever_state.index_path,
+        model_name=retriever_state.model_name,
     )
 
 
-async def _lineage_edges(gateway: FusekiGateway, entity_id: str) -> list[LineageEdge]:
-    rows = await gateway.select("lineage_by_id", {"id": entity_id})
-    edges: list[LineageEdge] = []
-    for row in rows:
-        source = _maybe_str(row.get("source")) or entity_id
-        target = _maybe_str(row.get("target"))
-        relation = _maybe_str(row.get("relation"))
-        timestamp = row.get("timestamp")
-        if isinstance(timestamp, dict) and "value" in timestamp:
-            timestamp = timestamp["value"]
-        if not (target and relation):
-            continue
-        edges.append(
-            LineageEdge(
-                source=source,
-                relation=relation,
-                target=target,
-                timestamp=_maybe_str(timestamp),
-            )
-        )
-    return edges
+@dataclass(frozen=True)
+class ApiRetrievalItem:
+    query: str
+    top_k: int
+    effective_date: str | None
+    cache_key: str
 
 
-async def _build_query_answer(
-    doc: dict,
+async def retrieve_documents_batch(
     *,
-    gateway: FusekiGateway,
-    include_lineage: bool,
-) -> RagAnswer:
+    items: list[ApiRetrievalItem],
+    retriever: RetrieverProtocol,
+    cache: RagQueryCache,
+    executor: RetrievalExecutor | None = None,
+) -> list[ApiRetrievalResult]:
+    """Resolve several retrieval requests with one retriever pass for cache misses."""
+
+    count = len(items)
+    documents: list[list[dict]] = [[] for _ in range(count)]
+    warnings: list[list[dict[str, object]]] = [[] for _ in range(count)]
+    temporal_states: list[dict[str, object]] = [
+        {"requested": bool(item.effective_date), "effective_date": item.effective_date}
+        for item in items
+    ]
+    cache_hits = [False] * count
+    expires: list[datetime | None] = [None] * count
+    t_cache = [0.0] * count
+    t_retrieve = [0.0] * count
+    failures: list[Exception | None] = [None] * count
+
+    retriever_state = orchestrator.resolve_retriever_state(retriever=retriever)
+    if retriever_state.rag_enabled and retriever_state.retriever_ready:
+        await cache.abind_index(_retriever_index_digest(retriever))
+        misses: list[int] = []
+        for idx, item in enumerate(items):
+            cache_start = time.perf_counter()
+            cached = await cache.aget(item.cache_key)
+            if cached is not None:
+                cache_hits[idx] = True
+                documents[idx] = cached or []
+                expires[idx] = cache.expires_at(item.cache_key)
+            else:
+                misses.append(idx)
+            t_cache[idx] += _elapsed_ms(cache_start)
+        if misses:
+            try:
+                if executor is not None:
+                    executions = await executor.retrieve_many(
+                        queries=[items[idx].query for idx in misses],
+                        top_ks=[items[idx].top_k for idx in misses],
+                        retriever=retriever,
+                        effective_dates=[items[idx].effective_date for idx in misses],
+                    )
+                else:
+                    executions = await asyncio.to_thread(
+                        orchestrator.run_retrieval_batch_sync,
+                        queries=[items[idx].query for idx in misses],
+                        top_ks=[items[idx].top_k for idx in misses],
+                        retriever=retriever,
+                        strict=True,
+                        effective_dates=[items[idx].effective_date for idx in misses],
+                    )
+            except Exception as exc:
+                for idx in misses:
+                    failures[idx] = exc
+            else:
+                for idx, execution in zip(misses, executions):
+                    documents[idx] = execution.docs
+                    warnings[idx] = execution.warnings
+                    temporal_states[idx] = execution.temporal_state
+                    t_retrieve[idx] += execution.t_retrieve_ms
+                    if (not bool(execution.temporal_state.get("requested"))) or execution.docs:
+                        cache_start = time.perf_counter()
+                        expires[idx] = await cache.aput(items[idx].cache_key, execution.docs)
+                        t_cache[idx] += _elapsed_ms(cache_start)
+    else:
+        failure = getattr(retriever, "failure", RuntimeError("Retriever not ready"))
+        failures = [failure] * count
+
+    return [
+        _finalize_retrieval(
+            retriever=retriever,
+            documents=documents[idx],
+            warnings=warnings[idx],
+            temporal_state=temporal_states[idx],
+            retrieval_failure=failures[idx],
+            cache_hit=cache_hits[idx],
+            expires_at=expires[idx],
+            t_cache_ms=t_cache[idx],
+            t_retrieve_ms=t_retrieve[idx],
+        )
+        for idx in range(count)
+    ]
+
+
+def _lineage_edge(row: Mapping[str, object], entity_id: str) -> LineageEdge | None:
+    source = _maybe_str(row.get("source")) or entity_id
+    target = _maybe_str(row.get("target"))
+    relation = _maybe_str(row.get("relation"))
+    timestamp = row.get("timestamp")
+    if isinstance(timestamp, dict) and "value" in timestamp:
+        timestamp = timestamp["value"]
+    if not (target and relation):
+        return None
+    return LineageEdge(
+        source=source,
+        relation=relation,
+        target=target,
+        timestamp=_maybe_str(timestamp),
+    )
+
+
+async def _lineage_edges_by_id(
+    gateway: FusekiGateway, entity_ids: list[str]
+) -> tuple[dict[str, list[LineageEdge]], int]:
+    """Fetch lineage for ``entity_ids`` with batched ``VALUES`` queries.
+
+    Returns the edges per id and the number of Fuseki round trips issued.
+    """
+
+    chunks = [
+        entity_ids[start : start + LINEAGE_BATCH_SIZE]
+        for start in range(0, len(entity_ids), LINEAGE_BATCH_SIZE)
+    ]
+    row_sets = await asyncio.gather(
+        *(gateway.select("lineage_by_ids", {"ids": chunk}) for chunk in chunks)
+    )
+    wanted = set(entity_ids)
+    edges: dict[str, list[LineageEdge]] = {}
+    for rows in row_sets:
+        for row in rows:
+            source = _maybe_str(row.get("source"))
+            if source not in wanted:
+                continue
+            edge = _lineage_edge(row, source)
+            if edge is not None:
+                edges.setdefault(source, []).append(edge)
+    return edges, len(chunks)
+
+
+def _lineage_id(doc: dict, source: RagSource) -> str | None:
+    return source.id or _maybe_str(doc.get("lineage_id"))
+
+
+def _query_answer(doc: dict) -> RagAnswer:
     content = retrieval_runtime.extract_text(doc)
     summary = retrieval_runtime.summarize_retrieved_doc(doc, source="retrieval")
     raw = doc.get("raw") if isinstance(doc.get("raw"), Mapping) else {}
@@ -307,14 +463,7 @@ async def _build_query_answer(
         section=_maybe_str(raw.get("section")) or _maybe_str(summary.get("section")),
         provider=_maybe_str(raw.get("provider")) or _maybe_str(doc.get("provider")),
     )
-    lineage: RagLineageReference | None = None
-    if include_lineage:
-        lineage_id = source.id or _maybe_str(doc.get("lineage_id"))
-        if lineage_id:
-            edges = await _lineage_edges(gateway, lineage_id)
-            if edges:
-                lineage = RagLineageReference(entity_id=lineage_id, edges=edges)
-    return RagAnswer(content=content, score=score, source=source, lineage=lineage)
+    return RagAnswer(content=content, score=score, source=source, lineage=None)
 
 
 async def build_query_answers(
@@ -322,17 +471,26 @@ async def build_query_answers(
     *,
     gateway: FusekiGateway,
     include_lineage: bool,
-) -> list[RagAnswer]:
-    results: list[RagAnswer] = []
-    for doc in documents:
-        results.append(
-            await _build_query_answer(
-                doc,
-                gateway=gateway,
-                include_lineage=include_lineage,
-            )
-        )
-    return results
+) -> ApiQueryAnswers:
+    answers = [_query_answer(doc) for doc in documents]
+    if not include_lineage:
+        return ApiQueryAnswers(results=answers)
+
+    lineage_ids = [_lineage_id(doc, answer.source) for doc, answer in zip(documents, answers)]
+    unique_ids = list(dict.fromkeys(entity_id for entity_id in lineage_ids if entity_id))
+    if not unique_ids:
+        return ApiQueryAnswers(results=answers)
+    lineage_start = time.perf_counter()
+    edges_by_id, round_trips = await _lineage_edges_by_id(gateway, unique_ids)
+    for answer, entity_id in zip(answers, lineage_ids):
+        edges = edges_by_id.get(entity_id or "")
+        if edges:
+            answer.lineage = RagLineageReference(entity_id=entity_id, edges=list(edges))
+    return ApiQueryAnswers(
+        results=answers,
+        fuseki_round_trips=round_trips,
+        t_lineage_ms=_elapsed_ms(lineage_start),
+    )
 
 
 def build_prompt_contexts(documents: list[dict]) -> list[str]:
@@ -429,12 +587,33 @@ async def execute_answer_generation(
     )
 
 
+def rebind_answer_execution(execution: ApiAnswerExecution, trace_id: str | None) -> ApiAnswerExecution:
+    """Copy a shared (coalesced) answer so it carries the caller's ``trace_id``."""
+
+    generation = execution.generation
+    decision = generation.egress_decision
+    return ApiAnswerExecution(
+        status_code=execution.status_code,
+        contexts=list(execution.contexts),
+        generation=replace(
+            generation,
+            egress_decision=(
+                replace(decision, trace_id=trace_id) if decision is not None else None
+            ),
+        ),
+    )
+
+
 __all__ = [
     "ApiAnswerExecution",
+    "ApiQueryAnswers",
+    "ApiRetrievalItem",
     "ApiRetrievalResult",
     "build_prompt_contexts",
     "build_query_answers",
     "execute_answer_generation",
+    "rebind_answer_execution",
     "retrieve_documents",
+    "retrieve_documents_batch",
     "to_retrieved_document",
 ]
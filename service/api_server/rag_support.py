@@ -3,7 +3,6 @@ from __future__ import annotations
 """Helpers for the RAG endpoint (cache + retriever loader)."""
 
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import logging
 import os
@@ -13,9 +12,10 @@ import time
 
 from earCrawler.utils.log_json import JsonLogger
 
+from .rag_cache import RAG_QUERY_CACHE_STORAGE_SCOPE, RagQueryCache
+
 logger = logging.getLogger(__name__)
 _warm_logger = JsonLogger("rag-support")
-RAG_QUERY_CACHE_STORAGE_SCOPE = "process_local"
 RETRIEVER_CACHE_STORAGE_SCOPE = "process_local"
 RETRIEVER_WARM_STATE_STORAGE_SCOPE = "process_local"
 
@@ -248,47 +248,6 @@ def warm_retriever_if_enabled(
     )
 
 
-@dataclass
-class RagCacheEntry:
-    expires_at: datetime
-    payload: list[dict]
-
-
-class RagQueryCache:
-    """Tiny in-memory TTL cache for repeat RAG queries."""
-
-    def __init__(self, ttl_seconds: float = 30.0, max_entries: int = 64) -> None:
-        self._ttl = ttl_seconds
-        self._max = max_entries
-        self._entries: dict[str, RagCacheEntry] = {}
-
-    def get(self, key: str) -> list[dict] | None:
-        entry = self._entries.get(key)
-        if not entry:
-            return None
-        if entry.expires_at <= datetime.now(timezone.utc):
-            self._entries.pop(key, None)
-            return None
-        return entry.payload
-
-    def put(self, key: str, payload: list[dict]) -> datetime:
-        if len(self._entries) >= self._max:
-            victim = min(self._entries.items(), key=lambda item: item[1].expires_at)
-            self._entries.pop(victim[0], None)
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self._ttl)
-        self._entries[key] = RagCacheEntry(expires_at=expires_at, payload=payload)
-        return expires_at
-
-    def expires_at(self, key: str) -> datetime | None:
-        entry = self._entries.get(key)
-        if not entry:
-            return None
-        if entry.expires_at <= datetime.now(timezone.utc):
-            self._entries.pop(key, None)
-            return None
-        return entry.expires_at
-
-
 __all__ = [
     "RetrieverProtocol",
     "RagQueryCache",
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+"""Dedicated, micro-batching executor for RAG retrieval work."""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Sequence
+
+from earCrawler.rag import orchestrator
+
+RETRIEVAL_EXECUTOR_STORAGE_SCOPE = "process_local"
+
+
+@dataclass(slots=True)
+class _PendingRetrieval:
+    query: str
+    top_k: int
+    effective_date: str | None
+    retriever: object
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future
+    enqueued_at: float
+
+
+def _settle(future: asyncio.Future, result: object, exc: BaseException | None) -> None:
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
+
+
+class RetrievalExecutor:
+    """Bounded retrieval pool that coalesces queued queries into batch calls.
+
+    A query is dispatched as soon as a worker is idle. Queries that arrive
+    while every worker is busy wait in the queue and leave together, up to
+    ``max_batch`` per call, through ``run_retrieval_batch_sync`` so the
+    encoder and index see one batched call instead of many contending ones.
+    """
+
+    def __init__(self, *, workers: int = 4, max_batch: int = 16) -> None:
+        self.workers = max(1, int(workers))
+        self.max_batch = max(1, int(max_batch))
+        self._lock = threading.Lock()
+        self._pool: ThreadPoolExecutor | None = None
+        self._queue: deque[_PendingRetrieval] = deque()
+        self._busy = 0
+        self._max_queue_depth = 0
+        self._batch_count = 0
+        self._query_count = 0
+        self._max_batch_size = 0
+        self._queued_count = 0
+        self._queue_wait_ms = 0.0
+
+    def _executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="rag-retrieval"
+                )
+            return self._pool
+
+    async def retrieve(
+        self,
+        *,
+        query: str,
+        top_k: int,
+        retriever: object,
+        effective_date: str | None,
+    ) -> orchestrator.RetrievalExecution:
+        """Run one strict retrieval, batched with whatever else is queued."""
+
+        loop = asyncio.get_running_loop()
+        item = _PendingRetrieval(
+            query=query,
+            top_k=top_k,
+            effective_date=effective_date,
+            retriever=retriever,
+            loop=loop,
+            future=loop.create_future(),
+            enqueued_at=time.perf_counter(),
+        )
+        with self._lock:
+            self._queue.append(item)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            batch = self._take_batch_locked()
+        if batch:
+            self._executor().submit(self._run_batch, batch)
+        return await item.future
+
+    async def retrieve_many(
+        self,
+        *,
+        queries: Sequence[str],
+        top_ks: Sequence[int],
+        retriever: object,
+        effective_dates: Sequence[str | None],
+    ) -> list[orchestrator.RetrievalExecution]:
+        """Run an explicit batch request on the retrieval pool."""
+
+        with self._lock:
+            self._busy += 1
+            self._record_batch_locked(len(queries))
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self._executor(),
+                lambda: orchestrator.run_retrieval_batch_sync(
+                    queries=list(queries),
+                    top_ks=list(top_ks),
+                    retriever=retriever,
+                    strict=True,
+                    effective_dates=list(effective_dates),
+                ),
+            )
+        finally:
+            self._release_worker()
+
+    def _record_batch_locked(self, size: int) -> None:
+        self._batch_count += 1
+        self._query_count += size
+        self._max_batch_size = max(self._max_batch_size, size)
+
+    def _take_batch_locked(self) -> list[_PendingRetrieval] | None:
+        if self._busy >= self.workers or not self._queue:
+            return None
+        first = self._queue.popleft()
+        batch = [first]
+        skipped: list[_PendingRetrieval] = []
+        while self._queue and len(batch) < self.max_batch:
+            item = self._queue.popleft()
+            (batch if item.retriever is first.retriever else skipped).append(item)
+        self._queue.extendleft(reversed(skipped))
+        self._busy += 1
+        self._record_batch_locked(len(batch))
+        now = time.perf_counter()
+        self._queued_count += len(batch)
+        self._queue_wait_ms += sum((now - item.enqueued_at) * 1000.0 for item in batch)
+        return batch
+
+    def _release_worker(self) -> None:
+        with self._lock:
+            self._busy = max(0, self._busy - 1)
+            batch = self._take_batch_locked()
+        if batch:
+            self._executor().submit(self._run_batch, batch)
+
+    def _run_batch(self, batch: list[_PendingRetrieval]) -> None:
+        try:
+            outcomes = self._execute(batch)
+        finally:
+            # Free the worker before waking callers so snapshots taken after
+            # the last result never report it busy.
+            self._release_worker()
+        for item, (result, exc) in zip(batch, outcomes):
+            try:
+                item.loop.call_soon_threadsafe(_settle, item.future, result, exc)
+            except RuntimeError:  # pragma: no cover - caller's loop already closed
+                pass
+
+    def _execute(
+        self, batch: list[_PendingRetrieval]
+    ) -> list[tuple[orchestrator.RetrievalExecution | None, BaseException | None]]:
+        if len(batch) > 1:
+            try:
+                executions = orchestrator.run_retrieval_batch_sync(
+                    queries=[item.query for item in batch],
+                    top_ks=[item.top_k for item in batch],
+                    retriever=batch[0].retriever,
+                    strict=True,
+                    effective_dates=[item.effective_date for item in batch],
+                )
+                return [(execution, None) for execution in executions]
+            except Exception:
+                # Re-run individually so one failing query cannot fail its neighbours.
+                pass
+        outcomes: list[tuple[orchestrator.RetrievalExecution | None, BaseException | None]] = []
+        for item in batch:
+            try:
+                outcomes.append(
+                    (
+                        orchestrator.run_retrieval_sync(
+                            query=item.query,
+                            top_k=item.top_k,
+                            retriever=item.retriever,
+                            strict=True,
+                            effective_date=item.effective_date,
+                        ),
+                        None,
+                    )
+                )
+            except Exception as exc:
+                outcomes.append((None, exc))
+        return outcomes
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            batches = self._batch_count
+            queries = self._query_count
+            queued = self._queued_count
+            return {
+                "storage_scope": RETRIEVAL_EXECUTOR_STORAGE_SCOPE,
+                "workers": self.workers,
+                "max_batch": self.max_batch,
+                "busy_workers": self._busy,
+                "queue_depth": len(self._queue),
+                "max_queue_depth": self._max_queue_depth,
+                "batch_count": batches,
+                "query_count": queries,
+                "max_batch_size": self._max_batch_size,
+                "avg_batch_size": round(queries / batches, 3) if batches else 0.0,
+                "avg_queue_wait_ms": round(self._queue_wait_ms / queued, 3) if queued else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+__all__ = [
+    "RETRIEVAL_EXECUTOR_STORAGE_SCOPE",
+    "RetrievalExecutor",
+]
@@ -5,7 +5,9 @@ from fastapi import Depends, Request
 from ..fuseki import FusekiGateway
 from ..limits import RateLimiter, enforce_rate_limits
 from ..rag_support import RagQueryCache, RetrieverProtocol
+from ..retrieval_executor import RetrievalExecutor
 from ..runtime_state import ApiRuntimeState
+from ..single_flight import SingleFlight
 
 
 def get_gateway(request: Request) -> FusekiGateway:
@@ -40,3 +42,11 @@ def get_rag_cache(request: Request) -> RagQueryCache:
 
 def get_retriever(request: Request) -> RetrieverProtocol:
     return get_runtime_state(request).retriever_runtime.retriever
+
+
+def get_retrieval_executor(request: Request) -> RetrievalExecutor:
+    return get_runtime_state(request).retrieval_executor
+
+
+def get_single_flight(request: Request) -> SingleFlight:
+    return get_runtime_state(request).rag_single_flight
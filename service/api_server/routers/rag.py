@@ -11,17 +11,32 @@ from fastapi.responses import JSONResponse
 
 from ..fuseki import FusekiGateway
 from ..rag_service import (
+    ApiRetrievalItem,
     build_query_answers,
     execute_answer_generation,
+    rebind_answer_execution,
     retrieve_documents,
+    retrieve_documents_batch,
     to_retrieved_document,
 )
 from ..rag_support import RagQueryCache, RetrieverProtocol
-from ..schemas import CacheState, ProblemDetails, RagGeneratedResponse, RagQueryRequest, RagResponse
+from ..retrieval_executor import RetrievalExecutor
+from ..single_flight import FlightInfo, SingleFlight
+from ..schemas import (
+    CacheState,
+    ProblemDetails,
+    RagBatchQueryRequest,
+    RagBatchResponse,
+    RagGeneratedResponse,
+    RagQueryRequest,
+    RagResponse,
+)
 from .dependencies import (
     get_gateway,
     get_rag_cache,
+    get_retrieval_executor,
     get_retriever,
+    get_single_flight,
     rate_limit,
 )
 
@@ -43,6 +58,17 @@ def _elapsed_ms(start: float) -> float:
     return round((time.perf_counter() - start) * 1000.0, 3)
 
 
+def _retrieval_flight_key(cache_key: str) -> str:
+    return f"retrieve::{cache_key}"
+
+
+def _flight_details(*flights: FlightInfo) -> dict[str, object]:
+    return {
+        "coalesced": any(flight.coalesced for flight in flights),
+        "coalesced_waiters": sum(flight.waiters for flight in flights),
+    }
+
+
 async def _run_retriever_query(
     retriever: RetrieverProtocol, query: str, top_k: int
 ) -> list[dict]:
@@ -71,18 +97,24 @@ async def rag_query(
     gateway: FusekiGateway = Depends(get_gateway),
     retriever: RetrieverProtocol = Depends(get_retriever),
     cache: RagQueryCache = Depends(get_rag_cache),
+    executor: RetrievalExecutor = Depends(get_retrieval_executor),
+    single_flight: SingleFlight = Depends(get_single_flight),
     _: None = Depends(rate_limit("rag")),
 ) -> RagResponse:
     start_total = time.perf_counter()
     trace_id = getattr(request.state, "trace_id", "")
-    retrieval = await retrieve_documents(
-        query=payload.query,
-        top_k=payload.top_k,
-        effective_date=payload.effective_date,
-        cache_key=payload.cache_key(),
-        retriever=retriever,
-        cache=cache,
-        run_query=_run_retriever_query,
+    retrieval, flight = await single_flight.run(
+        _retrieval_flight_key(payload.cache_key()),
+        lambda: retrieve_documents(
+            query=payload.query,
+            top_k=payload.top_k,
+            effective_date=payload.effective_date,
+            cache_key=payload.cache_key(),
+            retriever=retriever,
+            cache=cache,
+            run_query=_run_retriever_query,
+            executor=executor,
+        ),
     )
 
     if not retrieval.rag_enabled:
@@ -122,6 +154,7 @@ async def rag_query(
             retrieved_count=0,
             retrieval_empty=True,
             retrieval_empty_reason=retrieval.retrieval_empty_reason,
+            **_flight_details(flight),
         )
         return JSONResponse(status_code=503, content=problem.model_dump(exclude_none=True))
 
@@ -162,10 +195,11 @@ async def rag_query(
             retrieved_count=0,
             retrieval_empty=True,
             retrieval_empty_reason=retrieval.retrieval_empty_reason,
+            **_flight_details(flight),
         )
         return JSONResponse(status_code=503, content=problem.model_dump(exclude_none=True))
 
-    results = await build_query_answers(
+    answers = await build_query_answers(
         retrieval.documents,
         gateway=gateway,
         include_lineage=payload.include_lineage,
@@ -201,18 +235,138 @@ async def rag_query(
         retrieved_count=len(retrieval.documents),
         retrieval_empty=retrieval.retrieval_empty,
         retrieval_empty_reason=retrieval.retrieval_empty_reason,
+        t_lineage_ms=answers.t_lineage_ms,
+        fuseki_round_trips=answers.fuseki_round_trips,
+        **_flight_details(flight),
     )
     return RagResponse(
         trace_id=trace_id,
         latency_ms=latency_ms,
         query=payload.query,
         cache=cache_state,
-        results=results,
+        results=answers.results,
         retrieval_empty=retrieval.retrieval_empty,
         retrieval_empty_reason=retrieval.retrieval_empty_reason,
     )
 
 
+@router.post(
+    "/rag/query:batch",
+    response_model=RagBatchResponse,
+    responses={429: {"model": ProblemDetails}, 503: {"model": ProblemDetails}},
+)
+async def rag_query_batch(
+    payload: RagBatchQueryRequest,
+    request: Request,
+    gateway: FusekiGateway = Depends(get_gateway),
+    retriever: RetrieverProtocol = Depends(get_retriever),
+    cache: RagQueryCache = Depends(get_rag_cache),
+    executor: RetrievalExecutor = Depends(get_retrieval_executor),
+    _: None = Depends(rate_limit("rag")),
+) -> RagBatchResponse:
+    start_total = time.perf_counter()
+    trace_id = getattr(request.state, "trace_id", "")
+    retrievals = await retrieve_documents_batch(
+        items=[
+            ApiRetrievalItem(
+                query=item.query,
+                top_k=item.top_k,
+                effective_date=item.effective_date,
+                cache_key=item.cache_key(),
+            )
+            for item in payload.queries
+        ],
+        retriever=retriever,
+        cache=cache,
+        executor=executor,
+    )
+    failed = next(
+        (
+            retrieval
+            for retrieval in retrievals
+            if not retrieval.rag_enabled or retrieval.retrieval_failure is not None
+        ),
+        None,
+    )
+    t_retrieve_ms = max((retrieval.t_retrieve_ms for retrieval in retrievals), default=0.0)
+    t_cache_ms = round(sum(retrieval.t_cache_ms for retrieval in retrievals), 3)
+    cache_hits = sum(1 for retrieval in retrievals if retrieval.cache_hit)
+
+    if failed is not None:
+        disabled = not failed.rag_enabled
+        problem = ProblemDetails(
+            type="https://earcrawler.gov/problems/retrieval",
+            title="Retriever disabled" if disabled else "Retriever unavailable",
+            status=503,
+            detail=failed.disabled_reason if disabled else str(failed.retrieval_failure),
+            instance=str(request.url),
+            trace_id=trace_id,
+        )
+        _log_retrieval(
+            request,
+            "rag.query.batch.disabled" if disabled else "rag.query.batch.failed",
+            trace_id,
+            batch_size=len(retrievals),
+            rag_enabled=failed.rag_enabled,
+            retriever_ready=failed.retriever_ready,
+            failure_type=failed.failure_type,
+            index_path=failed.index_path,
+            model_name=failed.model_name,
+        )
+        _log_retrieval(
+            request,
+            "rag.query.batch.latency",
+            trace_id,
+            t_total_ms=_elapsed_ms(start_total),
+            t_retrieve_ms=t_retrieve_ms,
+            t_cache_ms=t_cache_ms,
+            batch_size=len(retrievals),
+            cache_hits=cache_hits,
+            retrieved_count=0,
+        )
+        return JSONResponse(status_code=503, content=problem.model_dump(exclude_none=True))
+
+    responses: list[RagResponse] = []
+    fuseki_round_trips = 0
+    t_lineage_ms = 0.0
+    for item, retrieval in zip(payload.queries, retrievals):
+        answers = await build_query_answers(
+            retrieval.documents,
+            gateway=gateway,
+            include_lineage=item.include_lineage,
+        )
+        fuseki_round_trips += answers.fuseki_round_trips
+        t_lineage_ms += answers.t_lineage_ms
+        responses.append(
+            RagResponse(
+                trace_id=trace_id,
+                latency_ms=round(retrieval.t_retrieve_ms + retrieval.t_cache_ms, 3),
+                query=item.query,
+                cache=CacheState(hit=retrieval.cache_hit, expires_at=retrieval.expires_at),
+                results=answers.results,
+                retrieval_empty=retrieval.retrieval_empty,
+                retrieval_empty_reason=retrieval.retrieval_empty_reason,
+            )
+        )
+
+    latency_ms = _elapsed_ms(start_total)
+    _log_retrieval(
+        request,
+        "rag.query.batch.latency",
+        trace_id,
+        t_total_ms=latency_ms,
+        t_retrieve_ms=t_retrieve_ms,
+        t_cache_ms=t_cache_ms,
+        batch_size=len(retrievals),
+        cache_hits=cache_hits,
+        retrieved_count=sum(len(retrieval.documents) for retrieval in retrievals),
+        retrieval_empty_count=sum(1 for retrieval in retrievals if retrieval.retrieval_empty),
+        t_lineage_ms=round(t_lineage_ms, 3),
+        fuseki_round_trips=fuseki_round_trips,
+    )
+    return RagBatchResponse(trace_id=trace_id, latency_ms=latency_ms, results=responses)
+
+
 @router.post(
     "/rag/answer",
     response_model=RagGeneratedResponse,
@@ -231,20 +385,27 @@ async def rag_answer(
     ),
     retriever: RetrieverProtocol = Depends(get_retriever),
     cache: RagQueryCache = Depends(get_rag_cache),
+    executor: RetrievalExecutor = Depends(get_retrieval_executor),
+    single_flight: SingleFlight = Depends(get_single_flight),
     _: None = Depends(rate_limit("rag")),
 ) -> JSONResponse:
     start_total = time.perf_counter()
     trace_id = getattr(request.state, "trace_id", "")
     generate_enabled = payload.generate if generate is None else bool(generate)
-    retrieval = await retrieve_documents(
-        query=payload.query,
-        top_k=payload.top_k,
-        effective_date=payload.effective_date,
-        cache_key=payload.cache_key(),
-        retriever=retriever,
-        cache=cache,
-        run_query=_run_retriever_query,
+    retrieval, retrieval_flight = await single_flight.run(
+        _retrieval_flight_key(payload.cache_key()),
+        lambda: retrieve_documents(
+            query=payload.query,
+            top_k=payload.top_k,
+            effective_date=payload.effective_date,
+            cache_key=payload.cache_key(),
+            retriever=retriever,
+            cache=cache,
+            run_query=_run_retriever_query,
+            executor=executor,
+        ),
     )
+    flights = [retrieval_flight]
 
     contexts: list[str] = []
     if retrieval.retrieval_failure is not None:
@@ -274,14 +435,20 @@ async def rag_answer(
         }
         status_code = 503
     else:
-        answer_execution = await execute_answer_generation(
-            query=payload.query,
-            documents=retrieval.documents,
-            temporal_state=retrieval.temporal_state,
-            generate_enabled=generate_enabled,
-            trace_id=trace_id,
-            run_generate=_run_generate_chat,
+        answer_execution, answer_flight = await single_flight.run(
+            f"answer::{int(generate_enabled)}::{payload.cache_key()}",
+            lambda: execute_answer_generation(
+                query=payload.query,
+                documents=retrieval.documents,
+                temporal_state=retrieval.temporal_state,
+                generate_enabled=generate_enabled,
+                trace_id=trace_id,
+                run_generate=_run_generate_chat,
+            ),
         )
+        if answer_flight.coalesced:
+            answer_execution = rebind_answer_execution(answer_execution, trace_id)
+        flights.append(answer_flight)
         generation = answer_execution.generation
         contexts = answer_execution.contexts
         status_code = answer_execution.status_code
@@ -324,6 +491,7 @@ async def rag_answer(
         "retrieved_count": len(retrieval.documents),
         "retrieval_empty": retrieval.retrieval_empty,
         "retrieval_empty_reason": retrieval.retrieval_empty_reason,
+        **_flight_details(*flights),
     }
     if generation.llm_attempted:
         latency_event["provider"] = generation.provider_label
@@ -11,8 +11,10 @@ import time
 from .config import ApiSettings, SUPPORTED_RUNTIME_TOPOLOGY
 from .limits import RATE_LIMITER_STORAGE_SCOPE, RateLimiter
 from .middleware import ConcurrencyGate, REQUEST_CONCURRENCY_STORAGE_SCOPE
+from .retrieval_executor import RETRIEVAL_EXECUTOR_STORAGE_SCOPE, RetrievalExecutor
+from .single_flight import SINGLE_FLIGHT_STORAGE_SCOPE, SingleFlight
+from .rag_cache import SqliteRagCacheBackend
 from .rag_support import (
-    RAG_QUERY_CACHE_STORAGE_SCOPE,
     RETRIEVER_CACHE_STORAGE_SCOPE,
     RETRIEVER_WARM_STATE_STORAGE_SCOPE,
     NullRetriever,
@@ -444,6 +446,18 @@ class RetrieverRuntimeState:
         self.startup_warmup_status = outcome.status
         self.startup_warmup_reason = outcome.reason
 
+    def cache_stats_payload(self) -> dict[str, object]:
+        stats_fn = getattr(self.retriever, "query_embedding_cache_stats", None)
+        stats = stats_fn() if callable(stats_fn) else None
+        return {
+            "storage_scope": RETRIEVER_CACHE_STORAGE_SCOPE,
+            "query_embedding_cache": (
+                {"status": "enabled", **stats}
+                if stats is not None
+                else {"status": "unavailable"}
+            ),
+        }
+
     def contract_payload(self) -> dict[str, object]:
         return {
             "cache_storage_scope": RETRIEVER_CACHE_STORAGE_SCOPE,
@@ -469,6 +483,8 @@ class ApiRuntimeState:
     retriever_runtime: RetrieverRuntimeState
     rate_limit_recommendation_inputs: RateLimitRecommendationInputs
     recommendation_context: RateLimitRecommendationContext
+    retrieval_executor: RetrievalExecutor = field(default_factory=RetrievalExecutor)
+    rag_single_flight: SingleFlight = field(default_factory=SingleFlight)
     backend: str = PROCESS_LOCAL_RUNTIME_STATE_BACKEND
 
     def process_local_state(self) -> dict[str, str]:
@@ -482,6 +498,16 @@ class ApiRuntimeState:
         payload["concurrency_gate"] = self.concurrency_gate.saturation_snapshot()
         return payload
 
+    def rag_query_cache_payload(self) -> dict[str, object]:
+        return {"status": "pass", **self.rag_query_cache.stats()}
+
+    def retrieval_executor_payload(self) -> dict[str, object]:
+        return {
+            "status": "pass",
+            **self.retrieval_executor.snapshot(),
+            "single_flight": self.rag_single_flight.snapshot(),
+        }
+
     def rate_limit_recommendation_payload(self) -> dict[str, object]:
         return build_rate_limit_recommendation(
             recommendation_inputs=self.recommendation_inputs_payload(),
@@ -514,7 +540,15 @@ class ApiRuntimeState:
                 owner="runtime_state",
             ),
             "rag_query_cache": RuntimeStateComponent(
-                storage_scope=RAG_QUERY_CACHE_STORAGE_SCOPE,
+                storage_scope=self.rag_query_cache.storage_scope,
+                owner="runtime_state",
+            ),
+            "retrieval_executor": RuntimeStateComponent(
+                storage_scope=RETRIEVAL_EXECUTOR_STORAGE_SCOPE,
+                owner="runtime_state",
+            ),
+            "rag_single_flight": RuntimeStateComponent(
+                storage_scope=SINGLE_FLIGHT_STORAGE_SCOPE,
                 owner="runtime_state",
             ),
             "rate_limit_recommendation_inputs": RuntimeStateComponent(
@@ -532,6 +566,21 @@ class ApiRuntimeState:
         }
 
 
+def _build_rag_query_cache(settings: ApiSettings) -> RagQueryCache:
+    backend = None
+    if settings.rag_cache_path:
+        backend = SqliteRagCacheBackend(
+            settings.rag_cache_path,
+            max_entries=4 * settings.rag_cache_max_entries,
+        )
+    return RagQueryCache(
+        ttl_seconds=settings.rag_cache_ttl_seconds,
+        max_entries=settings.rag_cache_max_entries,
+        max_bytes=settings.rag_cache_max_bytes,
+        backend=backend,
+    )
+
+
 def build_process_local_runtime_state(
     settings: ApiSettings,
     *,
@@ -541,7 +590,7 @@ def build_process_local_runtime_state(
     return ApiRuntimeState(
         rate_limiter=RateLimiter(settings.rate_limits),
         concurrency_gate=ConcurrencyGate(settings.concurrency_limit),
-        rag_query_cache=rag_query_cache or RagQueryCache(),
+        rag_query_cache=rag_query_cache or _build_rag_query_cache(settings),
         retriever_runtime=RetrieverRuntimeState.from_retriever(retriever),
         rate_limit_recommendation_inputs=RateLimitRecommendationInputs(),
         recommendation_context=RateLimitRecommendationContext(
@@ -550,6 +599,10 @@ def build_process_local_runtime_state(
             request_timeout_seconds=settings.request_timeout_seconds,
             concurrency_limit=settings.concurrency_limit,
         ),
+        retrieval_executor=RetrievalExecutor(
+            workers=settings.retrieval_workers,
+            max_batch=settings.retrieval_max_batch,
+        ),
     )
 
 
@@ -6,6 +6,8 @@ from .sparql import SparqlProxyRequest, SparqlProxyResponse
 from .rag import (
     RagQueryRequest,
     RagResponse,
+    RagBatchQueryRequest,
+    RagBatchResponse,
     RagAnswer,
     RagSource,
     RagLineageReference,
@@ -30,6 +32,8 @@ __all__ = [
     "SparqlProxyResponse",
     "RagQueryRequest",
     "RagResponse",
+    "RagBatchQueryRequest",
+    "RagBatchResponse",
     "RagAnswer",
     "RagSource",
     "RagLineageReference",
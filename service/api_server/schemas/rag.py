@@ -146,6 +146,23 @@ class RagResponse(BaseModel):
     )
 
 
+class RagBatchQueryRequest(BaseModel):
+    queries: List[RagQueryRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=32,
+        description="Retrieval requests resolved together in one retriever pass",
+    )
+
+
+class RagBatchResponse(BaseModel):
+    trace_id: str = Field(..., description="Trace identifier for correlating logs")
+    latency_ms: float = Field(..., description="Measured latency for the whole batch")
+    results: List[RagResponse] = Field(
+        ..., description="Per-query responses in request order"
+    )
+
+
 class RetrievedDocument(BaseModel):
     id: Optional[str] = Field(default=None, description="Source identifier")
     score: Optional[float] = Field(default=None, description="Retriever score")
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+"""Single-flight coalescing for identical concurrent RAG requests."""
+
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+SINGLE_FLIGHT_STORAGE_SCOPE = "process_local"
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class FlightInfo:
+    """How a call was served: ``coalesced`` callers awaited another's work."""
+
+    coalesced: bool
+    waiters: int = 0
+
+
+@dataclass(slots=True)
+class _Flight:
+    future: asyncio.Future
+    waiters: int = 0
+    loop: asyncio.AbstractEventLoop | None = None
+
+
+class SingleFlight:
+    """Run at most one in-flight call per key; concurrent duplicates share it.
+
+    The first caller for a key (the leader) runs the work; callers arriving
+    before it finishes await the leader's result or exception. The key is
+    released as soon as the leader settles, so later callers start fresh and
+    nothing is cached here. If the leader is cancelled, waiters retry.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._leader_count = 0
+        self._coalesced_count = 0
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, FlightInfo]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None and flight.loop is loop:
+                flight.waiters += 1
+                self._coalesced_count += 1
+                leader = False
+            else:
+                flight = _Flight(future=loop.create_future(), loop=loop)
+                self._flights[key] = flight
+                self._leader_count += 1
+                leader = True
+
+        if not leader:
+            try:
+                return await asyncio.shield(flight.future), FlightInfo(coalesced=True)
+            except asyncio.CancelledError:
+                if flight.future.cancelled():
+                    return await self.run(key, fn)
+                raise
+
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.future.cancel()
+            raise
+        except BaseException as exc:
+            flight.future.set_exception(exc)
+            flight.future.exception()  # waiters re-raise it; mark it retrieved
+            raise
+        else:
+            flight.future.set_result(result)
+        finally:
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+        return result, FlightInfo(coalesced=False, waiters=flight.waiters)
+
+    def snapshot(self) -> dict[str, object]:
+        with self._lock:
+            return {
+                "storage_scope": SINGLE_FLIGHT_STORAGE_SCOPE,
+                "in_flight": len(self._flights),
+                "leader_count": self._leader_count,
+                "coalesced_count": self._coalesced_count,
+            }
+
+
+__all__ = [
+    "FlightInfo",
+    "SINGLE_FLIGHT_STORAGE_SCOPE",
+    "SingleFlight",
+]
@@ -102,6 +102,10 @@ def _sanitize(value: Any, kind: str) -> str:
         if not _IRI_RE.match(value):
             raise ValueError(f"Invalid IRI value: {value}")
         return f"<{value}>"
+    if kind == "iri_list":
+        if isinstance(value, str) or not isinstance(value, (list, tuple)) or not value:
+            raise TypeError("IRI list values must be a non-empty list of strings")
+        return " ".join(_sanitize(item, "iri") for item in value)
     if kind == "string":
         if not isinstance(value, str):
             raise TypeError("String parameters must be str")
@@ -56,6 +56,7 @@ def app() -> TestClient:
             }
         ],
     }
+    responses["lineage_by_ids"] = responses["lineage_by_id"]
 
     class FixtureFusekiClient(StubFusekiClient):
         async def query(self, template, query):  # type: ignore[override]
@@ -173,3 +173,29 @@ def test_create_app_rejects_conflicting_runtime_state_and_retriever() -> None:
             runtime_state=runtime_state,
             retriever=object(),  # type: ignore[arg-type]
         )
+
+
+def test_health_reports_query_embedding_cache_stats() -> None:
+    class _CachedRetriever:
+        enabled = True
+        ready = True
+
+        def query(self, prompt: str, k: int = 5) -> list[dict]:
+            return []
+
+        def query_embedding_cache_stats(self) -> dict[str, object]:
+            return {"entries": 3, "max_entries": 8, "hits": 5, "misses": 3}
+
+    app = create_app(
+        settings=ApiSettings(fuseki_url=None),
+        fuseki_client=StubFusekiClient({}),
+        retriever=_CachedRetriever(),
+    )
+
+    with TestClient(app) as client:
+        payload = client.get("/health").json()
+
+    cache = payload["retriever_cache"]["query_embedding_cache"]
+    assert cache["status"] == "enabled"
+    assert cache["hits"] == 5
+    assert payload["retriever_cache"]["storage_scope"] == "process_local"
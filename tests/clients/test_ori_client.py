@@ -127,3 +127,39 @@ def test_get_listing_html_falls_back_to_content_case_summary() -> None:
     status = client.get_last_status("get_listing_html")
     assert status is not None
     assert status.state == "ok"
+
+
+def test_shared_retry_budget_caps_retries_across_calls(monkeypatch) -> None:
+    from earCrawler.core.rate_limit import RetryBudget
+
+    sleeps: list[float] = []
+    monkeypatch.setattr("api_clients.ori_client.time.sleep", sleeps.append)
+    budget = RetryBudget(3)
+    client = ORIClient(session=_AlwaysFailSession(), retry_budget=budget)
+    for url in ("https://ori.hhs.gov/case/A", "https://ori.hhs.gov/case/B"):
+        with pytest.raises(ORIClientError) as exc:
+            client.get_case_html(url)
+        assert exc.value.state == "retry_exhausted"
+
+    # Two retries for A, then one left for B instead of a full ladder each.
+    assert sleeps == [1, 2, 1]
+    assert budget.remaining == 0
+
+
+def test_case_pages_are_cached_and_revalidated(tmp_path, requests_mock) -> None:
+    url = "https://ori.hhs.gov/case/A"
+    requests_mock.get(
+        url,
+        [
+            {
+                "text": "<p>case body</p>",
+                "headers": {"Content-Type": "text/html; charset=utf-8", "ETag": '"v1"'},
+            },
+            {"status_code": 304, "headers": {"ETag": '"v1"'}},
+        ],
+    )
+    client = ORIClient(cache_dir=tmp_path)
+
+    assert client.get_case_html(url) == "<p>case body</p>"
+    assert client.get_case_html(url) == "<p>case body</p>"
+    assert requests_mock.request_history[1].headers["If-None-Match"] == '"v1"'
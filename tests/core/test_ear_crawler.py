@@ -69,3 +69,127 @@ def test_run_does_not_scan_hash_index_values_for_version_lookup(
     records = crawler.run("export administration regulations", delay=0.0)
     assert len(records) == 2
     assert all(record.version == 1 for record in records)
+
+
+class _ManyDocClient(FederalRegisterClient):
+    BASE_URL = "https://api.federalregister.test/v1"
+
+    def search_documents(self, query: str, per_page: int = 100):
+        return [{"document_number": f"DOC-{i}"} for i in range(8)]
+
+    def get_document(self, doc_number: str):
+        return {"html_url": f"https://www.federalregister.test/{doc_number}"}
+
+
+def test_concurrent_run_keeps_search_order_and_dedup(tmp_path: Path, monkeypatch) -> None:
+    import threading
+    import time
+
+    crawler = EARCrawler(_ManyDocClient(), tmp_path, max_workers=4)
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def _download(url: str, timeout: float = 15.0) -> str:
+        number = int(url.rsplit("-", 1)[-1])
+        with lock:
+            active["now"] += 1
+            active["peak"] = max(active["peak"], active["now"])
+        time.sleep(0.02 * (8 - number))  # early documents finish last
+        with lock:
+            active["now"] -= 1
+        return f"<p>Shared paragraph.</p><p>Body of document {number}.</p>"
+
+    monkeypatch.setattr(crawler, "_download_html", _download)
+    records = crawler.run("ear", delay=0.0)
+
+    assert active["peak"] > 1
+    assert [r.document_number for r in records] == ["DOC-0"] + [f"DOC-{i}" for i in range(8)]
+    assert records[0].text == "Shared paragraph."
+    assert [r.paragraph_index for r in records[1:]] == [1] * 8
+
+
+def test_token_bucket_spaces_requests_per_host() -> None:
+    from earCrawler.core.rate_limit import HostRateLimiter
+
+    now = [0.0]
+    waits: list[float] = []
+
+    def _sleep(seconds: float) -> None:
+        waits.append(seconds)
+        now[0] += seconds
+
+    limiter = HostRateLimiter(2.0, burst=1, clock=lambda: now[0], sleep=_sleep)
+    for _ in range(3):
+        limiter.acquire("https://www.federalregister.gov/a")
+    limiter.acquire("https://api.federalregister.gov/v1/documents/x")
+
+    assert waits == [0.5, 0.5]
+    assert limiter.snapshot() == {"api.federalregister.gov": 0.0, "www.federalregister.gov": 1.0}
+    assert HostRateLimiter(None).acquire("https://x.test") == 0.0
+
+
+def test_hash_index_persists_incrementally_across_runs(tmp_path: Path, monkeypatch) -> None:
+    html = {"body": "<p>Stable paragraph.</p><p>Original text.</p>"}
+    crawler = EARCrawler(_SingleDocClient(), tmp_path)
+    monkeypatch.setattr(crawler, "_download_html", lambda _url, timeout=15.0: html["body"])
+    assert len(crawler.run("ear", delay=0.0)) == 2
+
+    html["body"] = "<p>Stable paragraph.</p><p>Amended text.</p>"
+    reopened = EARCrawler(_SingleDocClient(), tmp_path)
+    monkeypatch.setattr(reopened, "_download_html", lambda _url, timeout=15.0: html["body"])
+    records = reopened.run("ear", delay=0.0)
+
+    assert [(r.paragraph_index, r.text, r.version) for r in records] == [
+        (1, "Amended text.", 2)
+    ]
+    assert len(reopened.hash_index) == 3
+    assert reopened.hash_index.latest_version("DOC-123", 1) == 2
+    assert not (tmp_path / "hash_index.json").exists()
+
+
+def test_legacy_json_hash_index_is_migrated_once(tmp_path: Path) -> None:
+    import json
+
+    text = "Already crawled."
+    sha = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    legacy = {
+        sha: {
+            "document_number": "DOC-123",
+            "paragraph_index": 0,
+            "text": text,
+            "sha256": sha,
+            "citations": [],
+            "scraped_at": "2024-01-01T00:00:00.000Z",
+            "version": 3,
+        }
+    }
+    (tmp_path / "hash_index.json").write_text(json.dumps(legacy), encoding="utf-8")
+
+    crawler = EARCrawler(_DummyClient(), tmp_path)
+
+    assert sha in crawler.hash_index
+    assert crawler.hash_index[sha].version == 3
+    assert crawler._position_versions.get(("DOC-123", 0), 0) == 3
+    assert not (tmp_path / "hash_index.json").exists()
+    assert (tmp_path / "hash_index.json.migrated").exists()
+
+
+def test_unchanged_html_is_not_parsed_again(tmp_path: Path, monkeypatch) -> None:
+    html = "<p>Paragraph one.</p><p>Paragraph two.</p>"
+    first = EARCrawler(_SingleDocClient(), tmp_path)
+    monkeypatch.setattr(first, "_download_html", lambda _url, timeout=15.0: html)
+    assert len(first.run("ear", delay=0.0)) == 2
+
+    second = EARCrawler(_SingleDocClient(), tmp_path)
+    monkeypatch.setattr(second, "_download_html", lambda _url, timeout=15.0: html)
+    parsed: list[str] = []
+    original = second._parse_paragraphs
+    monkeypatch.setattr(
+        second, "_parse_paragraphs", lambda body: parsed.append(body) or original(body)
+    )
+    assert second.run("ear", delay=0.0) == []
+    assert parsed == []
+
+    second.skip_unchanged_html = False
+    assert second.run("ear", delay=0.0) == []
+    assert parsed == [html]
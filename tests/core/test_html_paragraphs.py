@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from earCrawler.core import html_paragraphs
+from earCrawler.core.html_paragraphs import iter_paragraph_texts
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures"
+
+_HTML = (
+    "<html><body><div><p>First <b>bold</b>tail <!-- note -->end.</p><p> </p>"
+    "<table><tr><td><p>See 80&nbsp;FR 3000 &amp; more.</p></td></tr></table>"
+    "<p>a<script>skip()</script>b</p></div></body></html>"
+)
+
+
+@pytest.mark.skipif(not html_paragraphs.LXML_AVAILABLE, reason="lxml not installed")
+@pytest.mark.parametrize(
+    "html",
+    [_HTML, "lead text<p>only this</p>", "no paragraphs"]
+    + [
+        json.loads(p.read_text(encoding="utf-8")).get("html", "")
+        for p in sorted(FIXTURES.glob("ear_*.json"))
+    ],
+)
+def test_lxml_fast_path_matches_bs4(html: str) -> None:
+    assert list(iter_paragraph_texts(html, parser="lxml")) == list(
+        iter_paragraph_texts(html, parser="bs4")
+    )
+
+
+def test_auto_keeps_empty_paragraph_positions_and_falls_back(monkeypatch) -> None:
+    expected = ["First bold tail end.", "", "See 80 FR 3000 & more.", "a b"]
+    assert list(iter_paragraph_texts(_HTML)) == expected
+    assert list(iter_paragraph_texts("")) == []
+
+    monkeypatch.setattr(html_paragraphs, "LXML_AVAILABLE", False)
+    assert list(iter_paragraph_texts(_HTML)) == expected
+    with pytest.raises(RuntimeError):
+        list(iter_paragraph_texts(_HTML, parser="lxml"))
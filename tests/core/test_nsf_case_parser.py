@@ -35,7 +35,7 @@ def test_run_live_uses_typed_results_and_skips_degraded_case(monkeypatch) -> Non
     class _StubORIClient:
         BASE_URL = "https://ori.hhs.gov"
 
-        def __init__(self) -> None:
+        def __init__(self, **_kwargs) -> None:
             self._snapshot = {
                 "get_listing_html": {
                     "source": "ori",
@@ -96,6 +96,9 @@ def test_run_live_returns_empty_when_listing_is_degraded(monkeypatch) -> None:
     class _StubORIClient:
         BASE_URL = "https://ori.hhs.gov"
 
+        def __init__(self, **_kwargs) -> None:
+            pass
+
         def get_listing_html_result(self):
             return _StubResult(
                 "",
@@ -153,3 +156,53 @@ def test_parse_from_html_derives_case_number_from_url_when_title_lacks_case_numb
     """
     case = parser.parse_from_html(html, "https://ori.hhs.gov/content/case-summary-alpha")
     assert case["case_number"] == "ORI-CASE-SUMMARY-ALPHA"
+
+
+def test_run_live_fetches_concurrently_and_parses_in_process_pool(
+    monkeypatch, tmp_path: Path
+) -> None:
+    import threading
+    import time
+
+    active = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    class _StubORIClient:
+        BASE_URL = "https://ori.hhs.gov"
+
+        def __init__(self, **kwargs) -> None:
+            self.kwargs = kwargs
+
+        def get_listing_html(self):
+            return "".join(f'<a href="/case/{i}"></a>' for i in range(10))
+
+        def get_case_html(self, url: str) -> str:
+            number = int(url.rsplit("/", 1)[-1])
+            with lock:
+                active["now"] += 1
+                active["peak"] = max(active["peak"], active["now"])
+            time.sleep(0.01 * (10 - number))  # early cases finish last
+            with lock:
+                active["now"] -= 1
+            return (
+                f"<h1>Case Number ORI-{number}</h1>"
+                f"<p>Case {number} paragraph long enough to be kept by the parser.</p>"
+            )
+
+        def get_status_snapshot(self):
+            return {}
+
+    monkeypatch.setattr("earCrawler.core.nsf_case_parser.ORIClient", _StubORIClient)
+    parser = NSFCaseParser(
+        max_workers=4, parse_workers=2, requests_per_second=None, cache_dir=tmp_path
+    )
+    cases = parser.run(FIXTURES, live=True)
+
+    assert active["peak"] > 1
+    assert [case["case_number"] for case in cases] == [f"ORI-{i}" for i in range(10)]
+    assert cases == [
+        NSFCaseParser().parse_from_html(
+            _StubORIClient().get_case_html(case["url"]), case["url"]
+        )
+        for case in cases
+    ]
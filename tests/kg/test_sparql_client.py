@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 
 from earCrawler.kg.sparql import SPARQLClient
@@ -49,3 +51,71 @@ def test_update_posts_to_update_endpoint(client, requests_mock):
     sent = requests_mock.last_request
     assert sent.headers["Content-Type"] == "application/x-www-form-urlencoded"
     assert "update=INSERT+DATA" in sent.text
+
+
+def test_long_queries_are_posted_as_sparql_query(requests_mock):
+    client = SPARQLClient("http://localhost:3030/ds/sparql", max_get_length=64)
+    requests_mock.post(
+        "http://localhost:3030/ds/sparql",
+        json={"head": {"vars": []}, "results": {"bindings": []}},
+        status_code=200,
+    )
+    query = "SELECT * WHERE { VALUES ?s { " + " ".join(f"<urn:n{i}>" for i in range(20)) + " } }"
+    client.select(query)
+    sent = requests_mock.last_request
+    assert sent.headers["Content-Type"] == "application/sparql-query"
+    assert sent.headers["Accept"] == "application/sparql-results+json"
+    assert "gzip" in sent.headers["Accept-Encoding"]
+    assert sent.body.decode("utf-8") == query
+
+
+def test_select_stream_parses_bindings_across_chunk_boundaries(client, requests_mock):
+    from earCrawler.kg.sparql import iter_sparql_bindings
+
+    rows = [{"s": {"type": "literal", "value": f"row {i} ] , {{"}} for i in range(50)]
+    doc = json.dumps({"head": {"vars": ["bindings"]}, "results": {"bindings": rows}})
+    chunks = [doc[i : i + 7] for i in range(0, len(doc), 7)]
+    assert list(iter_sparql_bindings(chunks)) == rows
+    with pytest.raises(RuntimeError):
+        list(iter_sparql_bindings([doc[: len(doc) // 2]]))
+
+    requests_mock.get("http://localhost:3030/ds/sparql", text=doc, status_code=200)
+    assert list(client.select_stream("SELECT * WHERE { ?s ?p ?o }")) == rows
+
+
+def test_async_client_shares_request_shape(monkeypatch):
+    import asyncio
+
+    import httpx
+    from pytest_socket import disable_socket, enable_socket
+
+    from earCrawler.kg.sparql import AsyncSPARQLClient
+
+    seen: list[httpx.Request] = []
+    rows = [{"s": {"type": "uri", "value": "urn:a"}}]
+
+    def _handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"head": {"vars": ["s"]}, "results": {"bindings": rows}})
+
+    async def _run():
+        client = AsyncSPARQLClient(
+            "http://localhost:3030/ds/sparql",
+            max_get_length=64,
+            client=httpx.AsyncClient(transport=httpx.MockTransport(_handler)),
+        )
+        try:
+            short = await client.select("ASK {}")
+            streamed = [row async for row in client.select_stream("SELECT * {" + " " * 80 + "}")]
+        finally:
+            await client.aclose()
+        return short, streamed
+
+    enable_socket()  # asyncio event loops need a local socketpair.
+    try:
+        short, streamed = asyncio.run(_run())
+    finally:
+        disable_socket()
+    assert short["results"]["bindings"] == rows and streamed == rows
+    assert [request.method for request in seen] == ["GET", "POST"]
+    assert seen[1].headers["Content-Type"] == "application/sparql-query"
@@ -53,7 +53,9 @@ def test_fr_loader_records_anchors_and_delta(tmp_path: Path) -> None:
         entity_names={"acme": "ACME Corp"},
     )
     assert "734" in parts
-    assert len(jena.queries) >= 3
+    # Part, anchor and mention updates share one batched request.
+    assert len(jena.queries) == 1
+    assert "ear:Part" in jena.queries[0] and "ear:hasAnchor" in jena.queries[0]
     assert anchors_path.exists()
 
     data = json.loads(anchors_path.read_text(encoding="utf-8"))
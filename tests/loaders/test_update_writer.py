@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import pytest
+from rdflib import Dataset
+
+from earCrawler.kg.anchors import Anchor
+from earCrawler.loaders.ear_parts_loader import (
+    link_entity_to_part,
+    upsert_part,
+    upsert_part_anchor,
+)
+from earCrawler.loaders.update_writer import BatchedUpdateWriter
+
+
+class _RecordingJena:
+    def __init__(self) -> None:
+        self.updates: list[str] = []
+        self.ntriples: list[str] = []
+        self.calls: list[str] = []
+
+    def update(self, query: str) -> None:
+        self.updates.append(query)
+        self.calls.append("update")
+
+    def load_ntriples(self, data: str) -> None:
+        self.ntriples.append(data)
+        self.calls.append("gsp")
+
+
+def _write_fixture(client) -> None:
+    anchor = Anchor(
+        document_id="2024-1",
+        title='Rule "A"',
+        source_url="https://fr.example/1",
+        snippet="Part 734 text",
+    )
+    upsert_part(client, "734")
+    upsert_part(client, "736")
+    upsert_part_anchor(client, "734", anchor)
+    link_entity_to_part(client, "acme", "734", strength=0.75)
+    upsert_part(client, "740")
+
+
+def _triples(dataset: Dataset) -> set:
+    return {quad[:3] for quad in dataset}
+
+
+def _apply(updates: list[str]) -> set:
+    dataset = Dataset()
+    for update in updates:
+        dataset.update(update)
+    return _triples(dataset)
+
+
+def test_writer_batches_into_equivalent_multi_operation_request() -> None:
+    direct = _RecordingJena()
+    _write_fixture(direct)
+    batched = _RecordingJena()
+    with BatchedUpdateWriter(batched) as writer:
+        _write_fixture(writer)
+
+    assert len(direct.updates) == 5
+    assert len(batched.updates) == 1
+    assert batched.updates[0].count("INSERT DATA") == 2
+    assert _apply(batched.updates) == _apply(direct.updates)
+    assert writer.stats.operations == 5
+    assert writer.stats.merged_inserts == 1
+    assert writer.stats.batches == writer.stats.requests == 1
+
+
+def test_writer_honours_operation_bound() -> None:
+    jena = _RecordingJena()
+    with BatchedUpdateWriter(jena, max_operations=2) as writer:
+        _write_fixture(writer)
+
+    # 5 statements -> 4 operations after merging the first two INSERT DATA.
+    assert len(jena.updates) == 2
+    assert writer.stats.batches == 2
+    assert len(writer.stats.batch_seconds) == 2
+
+
+def test_writer_discards_pending_operations_when_body_raises() -> None:
+    jena = _RecordingJena()
+    with pytest.raises(RuntimeError):
+        with BatchedUpdateWriter(jena, max_operations=3) as writer:
+            _write_fixture(writer)
+            raise RuntimeError("loader failed")
+
+    # The full batch of 3 went out before the error; the 4th operation is dropped.
+    assert len(jena.updates) == 1
+    assert writer.stats.batches == 1
+    assert writer.stats.discarded_operations == 1
+    writer.flush()
+    assert len(jena.updates) == 1
+
+
+def test_writer_posts_insert_data_through_graph_store_in_order() -> None:
+    direct = _RecordingJena()
+    _write_fixture(direct)
+    jena = _RecordingJena()
+    with BatchedUpdateWriter(jena, graph_store=True) as writer:
+        _write_fixture(writer)
+
+    assert jena.calls == ["gsp", "update", "gsp"]
+    dataset = Dataset()
+    dataset.default_context.parse(data=jena.ntriples[0], format="nt")
+    dataset.update(jena.updates[0])
+    dataset.default_context.parse(data=jena.ntriples[1], format="nt")
+    assert _triples(dataset) == _apply(direct.updates)
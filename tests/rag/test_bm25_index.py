@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from collections import Counter
+from math import log
+
+import pytest
+
+from earCrawler.rag import bm25_index
+from earCrawler.rag.retriever_ranking import (
+    BM25_B,
+    BM25_K1,
+    document_text_for_bm25,
+    metadata_tie_break_key,
+    tie_break_rank_array,
+    tokenize_for_bm25,
+)
+
+np = pytest.importorskip("numpy")
+
+
+def _rows() -> list[dict]:
+    return [
+        {"doc_id": "EAR-736.2", "section_id": "EAR-736.2", "text": "General prohibitions apply to exports."},
+        {"doc_id": "EAR-740.1", "section_id": "EAR-740.1", "text": "License exceptions authorize some exports."},
+        {"doc_id": "EAR-740.9", "section_id": "EAR-740.9", "text": "License exception TMP temporary exports."},
+        {"doc_id": "EAR-744.1", "section_id": "EAR-744.1", "text": "End-use controls for license requirements."},
+        {"doc_id": "EAR-740.2", "section_id": "EAR-740.2", "text": "License exceptions authorize some exports."},
+    ]
+
+
+def _reference_scores(prompt: str, rows: list[dict]) -> list[tuple[int, float]]:
+    doc_terms = [Counter(tokenize_for_bm25(document_text_for_bm25(row))) for row in rows]
+    doc_freq: Counter[str] = Counter()
+    for terms in doc_terms:
+        doc_freq.update(terms.keys())
+    avg = sum(sum(t.values()) for t in doc_terms) / len(rows)
+    ranked = []
+    for idx, terms in enumerate(doc_terms):
+        norm = 1.0 - BM25_B + (BM25_B * (sum(terms.values()) / avg))
+        score = 0.0
+        for term in Counter(tokenize_for_bm25(prompt)):
+            tf = terms.get(term, 0)
+            if tf <= 0:
+                continue
+            idf = log(1.0 + ((len(rows) - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5)))
+            score += idf * ((tf * (BM25_K1 + 1.0)) / (tf + (BM25_K1 * norm)))
+        if score > 0.0:
+            ranked.append((idx, score))
+    ranked.sort(key=lambda item: (-item[1], metadata_tie_break_key(rows[item[0]], item[0])))
+    return ranked
+
+
+@pytest.mark.parametrize("prompt", ["license exception exports", "general prohibition", "unrelated"])
+def test_inverted_index_matches_scalar_bm25(prompt: str) -> None:
+    rows = _rows()
+    state = bm25_index.build_bm25_index(np, rows)
+    tie_ranks = tie_break_rank_array(np, rows)
+
+    results = bm25_index.rank_bm25_index(np, prompt, rows, state=state, tie_ranks=tie_ranks, k=3)
+
+    expected = _reference_scores(prompt, rows)[:3]
+    assert [row["doc_id"] for row in results] == [rows[idx]["doc_id"] for idx, _ in expected]
+    assert [row["bm25_score"] for row in results] == [score for _, score in expected]
+
+
+def test_persisted_index_round_trips(tmp_path) -> None:
+    rows = _rows()
+    state = bm25_index.build_bm25_index(np, rows)
+    meta_path = tmp_path / "index.meta.json"
+    descriptor = bm25_index.write_bm25_index(
+        bm25_index.bm25_index_path(tmp_path / "index.faiss", meta_path),
+        state,
+        np_mod=np,
+        corpus_digest="d" * 64,
+    )
+    assert descriptor["file"] == "index.bm25.npz"
+
+    loaded = bm25_index.load_bm25_index(
+        meta_path, descriptor, np_mod=np, corpus_digest="d" * 64, row_count=len(rows)
+    )
+    assert loaded is not None
+    assert loaded["terms"] == state["terms"]
+    assert loaded["idf"].tolist() == state["idf"].tolist()
+    assert bm25_index.load_bm25_index(
+        meta_path, descriptor, np_mod=np, corpus_digest="e" * 64, row_count=len(rows)
+    ) is None
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import pytest
+
+np = pytest.importorskip("numpy")
+faiss = pytest.importorskip("faiss")
+
+from earCrawler.rag.faiss_profiles import (  # noqa: E402
+    FaissIndexProfile,
+    apply_search_params,
+    build_profiled_index,
+    measure_recall,
+    recall_at_k,
+    resolve_index_profile,
+    search_params_from_meta,
+)
+
+
+def _vectors(count: int = 512, dim: int = 16):
+    rng = np.random.default_rng(7)
+    return rng.standard_normal((count, dim)).astype("float32")
+
+
+def test_resolve_profile_sizes_defaults_to_corpus() -> None:
+    ivf = resolve_index_profile("ivf_pq", doc_count=400, dim=24)
+    assert ivf.nlist == 80
+    assert ivf.nprobe == 10
+    assert 24 % ivf.pq_m == 0
+    assert ivf.pq_nbits == 8
+    assert resolve_index_profile("ivf_flat", doc_count=400, dim=24, overrides={"nprobe": 3}).nprobe == 3
+    assert resolve_index_profile("flat", doc_count=10, dim=4).to_meta() == {"name": "flat"}
+    with pytest.raises(ValueError, match="Unsupported FAISS index profile"):
+        resolve_index_profile("lsh", doc_count=10, dim=4)
+
+
+@pytest.mark.parametrize("name", ["ivf_flat", "hnsw"])
+def test_approximate_profiles_keep_high_recall(name: str, tmp_path) -> None:
+    vectors = _vectors()
+    ids = np.arange(vectors.shape[0], dtype="int64")
+    profile = resolve_index_profile(
+        name,
+        doc_count=vectors.shape[0],
+        dim=vectors.shape[1],
+        overrides={"nprobe": 32, "nlist": 32},
+    )
+    index = build_profiled_index(faiss, profile, vectors, ids)
+
+    recall = measure_recall(faiss, index, vectors, vectors[:20], k=5)
+    assert recall["query_count"] == 20
+    assert recall["recall_at_k"] >= 0.9
+
+    # Search params are not serialized with every index type; they are re-applied on load.
+    path = tmp_path / "index.faiss"
+    faiss.write_index(index, str(path))
+    reloaded = faiss.read_index(str(path))
+    applied = apply_search_params(faiss, reloaded, profile)
+    assert applied == ({"nprobe": 32} if name == "ivf_flat" else {"efSearch": 64})
+
+
+def test_search_params_from_meta_honours_env(monkeypatch) -> None:
+    header = {"faiss_index": {"name": "ivf_flat", "nlist": 16, "nprobe": 4}}
+    assert search_params_from_meta(header).nprobe == 4
+    monkeypatch.setenv("EARCRAWLER_FAISS_NPROBE", "9")
+    assert search_params_from_meta(header).nprobe == 9
+    monkeypatch.delenv("EARCRAWLER_FAISS_NPROBE")
+    assert search_params_from_meta({"faiss_index": FaissIndexProfile().to_meta()}) is None
+
+
+def test_recall_at_k_counts_overlap() -> None:
+    assert recall_at_k([[1, 2], [3, 4]], [[2, 9], [3, 4]], k=2) == 0.75
@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import pytest
+import requests
+
+from earCrawler.kg.sparql import SPARQLHTTPError
+from earCrawler.rag import retrieval_runtime
+from earCrawler.rag.fuseki_gateway_pool import (
+    FusekiCircuitOpenError,
+    FusekiGatewayPool,
+    GatewayConfig,
+)
+
+_ENDPOINT = "http://localhost:3030/ear/sparql"
+_CONFIG = GatewayConfig(timeout=5, retries=0, retry_backoff_ms=0)
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _Gateway:
+    supports_node_batches = True
+
+    def __init__(self) -> None:
+        self.fail = False
+        self.calls = 0
+        self.closed = False
+        self.on_select = None
+
+    def select(self, query_id, params):
+        self.calls += 1
+        if self.on_select is not None:
+            self.on_select()
+        if self.fail:
+            raise requests.ConnectionError("fuseki down")
+        return []
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_pool_reuses_gateway_and_caches_probe_for_ttl() -> None:
+    clock = _Clock()
+    pool = FusekiGatewayPool(clock=clock)
+    built: list[_Gateway] = []
+    probes: list[str] = []
+
+    def _factory(endpoint, config):
+        built.append(_Gateway())
+        return built[-1]
+
+    def _get():
+        return pool.get(
+            _ENDPOINT,
+            config=_CONFIG,
+            factory=_factory,
+            probe=lambda endpoint, config: probes.append(endpoint),
+            probe_ttl_seconds=30,
+        )
+
+    first = _get()
+    second = _get()
+    assert len(built) == 1 and len(probes) == 1
+    assert first.supports_node_batches is True
+    first.select("q", {})
+    second.select("q", {})
+    assert built[0].calls == 2
+
+    clock.now += 31
+    _get()
+    assert len(probes) == 2
+    assert pool.snapshot()["probe_count"] == 2
+
+
+def test_circuit_opens_after_failures_and_recovers_after_cooldown() -> None:
+    clock = _Clock()
+    pool = FusekiGatewayPool(clock=clock)
+    inner = _Gateway()
+    inner.fail = True
+    gateway = pool.get(
+        _ENDPOINT,
+        config=_CONFIG,
+        factory=lambda endpoint, config: inner,
+        failure_threshold=2,
+        cooldown_seconds=10,
+    )
+
+    for _ in range(2):
+        with pytest.raises(requests.ConnectionError, match="fuseki down"):
+            gateway.select("q", {})
+    with pytest.raises(FusekiCircuitOpenError):
+        gateway.select("q", {})
+    assert inner.calls == 2
+    assert pool.snapshot()["endpoints"][_ENDPOINT]["circuit"] == "open"
+
+    # A failed trial after the cooldown re-opens the circuit at once.
+    clock.now += 11
+    with pytest.raises(requests.ConnectionError, match="fuseki down"):
+        gateway.select("q", {})
+    with pytest.raises(FusekiCircuitOpenError):
+        gateway.select("q", {})
+
+    clock.now += 11
+    inner.fail = False
+    assert gateway.select("q", {}) == []
+    snapshot = pool.snapshot()
+    assert snapshot["endpoints"][_ENDPOINT]["circuit"] == "closed"
+    assert snapshot["fast_failures"] == 2
+
+
+def test_caller_errors_do_not_open_the_circuit() -> None:
+    pool = FusekiGatewayPool(clock=_Clock())
+    errors = iter(
+        [ValueError("section_iri is required"), KeyError("q"), SPARQLHTTPError("SELECT", 400)]
+    )
+
+    class _BadRequestGateway(_Gateway):
+        def select(self, query_id, params):
+            self.calls += 1
+            raise next(errors)
+
+    inner = _BadRequestGateway()
+    gateway = pool.get(
+        _ENDPOINT,
+        config=_CONFIG,
+        factory=lambda endpoint, config: inner,
+        failure_threshold=2,
+    )
+
+    for expected in (ValueError, KeyError, SPARQLHTTPError):
+        with pytest.raises(expected):
+            gateway.select("q", {})
+    endpoint = pool.snapshot()["endpoints"][_ENDPOINT]
+    assert endpoint["circuit"] == "closed"
+    assert endpoint["consecutive_failures"] == 0
+
+
+def test_half_open_circuit_admits_a_single_trial() -> None:
+    clock = _Clock()
+    pool = FusekiGatewayPool(clock=clock)
+    inner = _Gateway()
+    inner.fail = True
+    gateway = pool.get(
+        _ENDPOINT,
+        config=_CONFIG,
+        factory=lambda endpoint, config: inner,
+        failure_threshold=1,
+        cooldown_seconds=10,
+    )
+    with pytest.raises(requests.ConnectionError):
+        gateway.select("q", {})
+
+    clock.now += 11
+    inner.fail = False
+    concurrent: list[type[BaseException]] = []
+
+    def _second_caller() -> None:
+        inner.on_select = None
+        try:
+            gateway.select("q", {})
+        except FusekiCircuitOpenError as exc:
+            concurrent.append(type(exc))
+
+    # While the trial is still running, a second caller fails fast.
+    inner.on_select = _second_caller
+    assert gateway.select("q", {}) == []
+    assert concurrent == [FusekiCircuitOpenError]
+    assert inner.calls == 2
+    assert pool.snapshot()["endpoints"][_ENDPOINT]["circuit"] == "closed"
+
+
+def test_config_change_closes_the_replaced_gateway() -> None:
+    pool = FusekiGatewayPool(clock=_Clock())
+    built: list[_Gateway] = []
+
+    def _factory(endpoint, config):
+        built.append(_Gateway())
+        return built[-1]
+
+    pool.get(_ENDPOINT, config=_CONFIG, factory=_factory)
+    pool.get(
+        _ENDPOINT,
+        config=GatewayConfig(timeout=10, retries=0, retry_backoff_ms=0),
+        factory=_factory,
+    )
+
+    assert [gateway.closed for gateway in built] == [True, False]
+    pool.reset()
+    assert built[1].closed is True
+
+
+def test_create_fuseki_gateway_probes_once_per_ttl(monkeypatch) -> None:
+    probes: list[str] = []
+    monkeypatch.setattr(retrieval_runtime, "_FUSEKI_GATEWAY_POOL", FusekiGatewayPool())
+    monkeypatch.setattr(
+        retrieval_runtime,
+        "_probe_fuseki_endpoint",
+        lambda endpoint, **_kwargs: probes.append(endpoint),
+    )
+    monkeypatch.setenv("EARCRAWLER_FUSEKI_URL", _ENDPOINT)
+
+    retrieval_runtime.create_fuseki_gateway()
+    retrieval_runtime.create_fuseki_gateway()
+
+    assert probes == [_ENDPOINT]
+    assert list(retrieval_runtime.fuseki_gateway_pool().snapshot()["endpoints"]) == [_ENDPOINT]
@@ -204,3 +204,219 @@ def test_index_builder_meta_changes_when_model_changes(monkeypatch, tmp_path: Pa
     assert payload_a["embedding_model"] == "stub-model-a"
     assert payload_b["embedding_model"] == "stub-model-b"
     assert payload_a["embedding_model"] != payload_b["embedding_model"]
+
+
+def test_index_builder_writes_embedding_sidecar(monkeypatch, tmp_path: Path) -> None:
+    _install_stubs(monkeypatch)
+    index_path = tmp_path / "index.faiss"
+    meta_path = tmp_path / "index.meta.json"
+    corpus_docs = _corpus()
+
+    build_faiss_index_from_corpus(
+        corpus_docs,
+        index_path=index_path,
+        meta_path=meta_path,
+        embedding_model="stub-model",
+    )
+
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    sidecar = meta["embedding_sidecar"]
+    assert sidecar["file"] == "index.embeddings.npy"
+    assert sidecar["corpus_digest"] == meta["corpus_digest"]
+    assert sidecar["embedding_model"] == "stub-model"
+    assert sidecar["shape"] == [len(corpus_docs), 4]
+    matrix = np.load(tmp_path / sidecar["file"])
+    assert matrix.dtype == np.float32
+    assert np.allclose(np.linalg.norm(matrix, axis=1), 1.0)
+
+
+def test_bruteforce_retriever_maps_embedding_sidecar(monkeypatch, tmp_path: Path) -> None:
+    _, st_mod = _install_stubs(monkeypatch)
+    index_path = tmp_path / "index.faiss"
+    meta_path = tmp_path / "index.meta.json"
+    build_faiss_index_from_corpus(
+        _corpus(),
+        index_path=index_path,
+        meta_path=meta_path,
+        embedding_model="stub-model",
+    )
+
+    import importlib
+    import earCrawler.rag.retriever as retriever_mod
+
+    importlib.reload(retriever_mod)
+    model = DummyModel("stub-model")
+    monkeypatch.setattr(retriever_mod, "faiss", None)
+    monkeypatch.setattr(retriever_mod, "SentenceTransformer", lambda name: model)
+    r = retriever_mod.Retriever(
+        SimpleNamespace(),
+        SimpleNamespace(),
+        model_name="stub-model",
+        index_path=index_path,
+        backend="bruteforce",
+    )
+    results = r.query("hi", k=2)
+
+    assert [res["doc_id"] for res in results] == ["EAR-736.2", "EAR-736.2(a)"]
+    # Only the prompt is encoded; corpus vectors come from the mapped sidecar.
+    assert model.calls == [["hi"]]
+    matrix = r._load_embedding_matrix(r._load_metadata())
+    assert isinstance(matrix, np.memmap)
+    assert not matrix.flags.writeable
+
+
+def test_bruteforce_retriever_ignores_sidecar_for_other_model(monkeypatch, tmp_path: Path) -> None:
+    _install_stubs(monkeypatch)
+    index_path = tmp_path / "index.faiss"
+    meta_path = tmp_path / "index.meta.json"
+    corpus_docs = _corpus()
+    build_faiss_index_from_corpus(
+        corpus_docs,
+        index_path=index_path,
+        meta_path=meta_path,
+        embedding_model="stub-model-a",
+    )
+
+    import importlib
+    import earCrawler.rag.retriever as retriever_mod
+
+    importlib.reload(retriever_mod)
+    model = DummyModel("stub-model-b")
+    monkeypatch.setattr(retriever_mod, "faiss", None)
+    monkeypatch.setattr(retriever_mod, "SentenceTransformer", lambda name: model)
+    r = retriever_mod.Retriever(
+        SimpleNamespace(),
+        SimpleNamespace(),
+        model_name="stub-model-b",
+        index_path=index_path,
+        backend="bruteforce",
+    )
+    r.query("hi", k=1)
+
+    assert len(model.calls) == 2
+    assert len(model.calls[1]) == len(corpus_docs)
+
+
+class _SpreadModel:
+    def __init__(self, _name: str) -> None:
+        self.calls: list[list[str]] = []
+
+    def encode(self, texts, show_progress_bar=False):
+        self.calls.append(list(texts))
+        rows = []
+        for text in texts:
+            rng = np.random.default_rng(sum(ord(ch) for ch in str(text)))
+            rows.append(rng.standard_normal(8))
+        return np.asarray(rows, dtype="float32")
+
+
+def test_index_builder_records_profile_and_gates_recall(monkeypatch, tmp_path: Path) -> None:
+    real_faiss = pytest.importorskip("faiss")
+    monkeypatch.setattr("earCrawler.rag.index_builder._load_faiss", lambda: real_faiss)
+    monkeypatch.setitem(
+        sys.modules,
+        "sentence_transformers",
+        SimpleNamespace(SentenceTransformer=_SpreadModel),
+    )
+    index_path = tmp_path / "index.faiss"
+    meta_path = tmp_path / "index.meta.json"
+
+    descriptor = build_faiss_index_from_corpus(
+        _corpus(),
+        index_path=index_path,
+        meta_path=meta_path,
+        embedding_model="stub-model",
+        index_profile="hnsw",
+        recall_queries=["license exceptions", "general prohibitions"],
+        recall_k=2,
+        min_recall=0.5,
+    )
+
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    assert meta["faiss_index"] == descriptor
+    assert descriptor["name"] == "hnsw"
+    assert descriptor["ef_search"] == 64
+    assert descriptor["recall"]["k"] == 2
+    assert descriptor["recall"]["recall_at_k"] >= 0.5
+
+    with pytest.raises(ValueError, match="recall@2"):
+        build_faiss_index_from_corpus(
+            _corpus(),
+            index_path=tmp_path / "gated.faiss",
+            meta_path=tmp_path / "gated.meta.json",
+            embedding_model="stub-model",
+            index_profile="hnsw",
+            recall_queries=["license exceptions"],
+            recall_k=2,
+            min_recall=1.01,
+        )
+
+
+def test_streaming_build_batches_encoding_and_matches_workers(monkeypatch, tmp_path: Path) -> None:
+    import multiprocessing
+
+    from earCrawler.rag.index_builder import build_faiss_index_from_corpus_file
+
+    real_faiss = pytest.importorskip("faiss")
+    monkeypatch.setattr("earCrawler.rag.index_builder._load_faiss", lambda: real_faiss)
+    models: list[_SpreadModel] = []
+
+    def _loader(name: str) -> _SpreadModel:
+        models.append(_SpreadModel(name))
+        return models[-1]
+
+    monkeypatch.setattr("earCrawler.rag.index_builder._load_sentence_transformer", _loader)
+    corpus_path = tmp_path / "corpus.jsonl"
+    corpus_path.write_text(
+        "\n".join(json.dumps(doc) for doc in reversed(_corpus())) + "\n\n",
+        encoding="utf-8",
+    )
+
+    header = build_faiss_index_from_corpus_file(
+        corpus_path,
+        index_path=tmp_path / "serial" / "index.faiss",
+        meta_path=tmp_path / "serial" / "index.meta.json",
+        embedding_model="stub-model",
+        batch_size=2,
+    )
+
+    assert [len(call) for call in models[0].calls] == [2, 1]
+    stats = header["build_stats"]
+    assert stats["docs"] == 3 and stats["batches"] == 2 and stats["workers"] == 1
+    assert stats["docs_per_s"] > 0
+    assert "peak_rss_mb" in stats
+    meta = json.loads((tmp_path / "serial" / "index.meta.json").read_text(encoding="utf-8"))
+    assert [row["doc_id"] for row in meta["rows"]] == sorted(doc["doc_id"] for doc in _corpus())
+    assert meta["corpus_digest"] == compute_corpus_digest(_corpus())
+    serial = np.load(tmp_path / "serial" / "index.embeddings.npy")
+    assert np.allclose(np.linalg.norm(serial, axis=1), 1.0)
+    assert not list((tmp_path / "serial").glob("*.tmp"))
+
+    if multiprocessing.get_start_method() != "fork":
+        return
+    build_faiss_index_from_corpus_file(
+        corpus_path,
+        index_path=tmp_path / "pooled" / "index.faiss",
+        meta_path=tmp_path / "pooled" / "index.meta.json",
+        embedding_model="stub-model",
+        batch_size=1,
+        workers=2,
+    )
+    pooled = np.load(tmp_path / "pooled" / "index.embeddings.npy")
+    assert np.array_equal(serial, pooled)
+
+
+def test_streaming_build_rejects_duplicate_doc_ids(tmp_path: Path) -> None:
+    from earCrawler.rag.index_builder import build_faiss_index_from_corpus_file
+
+    corpus_path = tmp_path / "corpus.jsonl"
+    doc = _corpus()[0]
+    corpus_path.write_text(json.dumps(doc) + "\n" + json.dumps(doc) + "\n", encoding="utf-8")
+
+    with pytest.raises(ValueError, match="retrieval corpus invalid"):
+        build_faiss_index_from_corpus_file(
+            corpus_path,
+            index_path=tmp_path / "index.faiss",
+            meta_path=tmp_path / "index.meta.json",
+            embedding_model="stub-model",
+        )
@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from earCrawler.kg.iri import section_iri
+from earCrawler.rag import retrieval_runtime
+from earCrawler.rag.kg_expansion_artifact import (
+    KGExpansionArtifact,
+    KGExpansionArtifactError,
+    RdflibExpansionGateway,
+    build_kg_expansion_artifact,
+    load_kg_dataset,
+    open_kg_expansion_artifact,
+)
+from earCrawler.rag.kg_expansion_fuseki import _TEMPLATE_PATH, expand_sections_via_fuseki
+
+_TTL = f"""
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix dcterms: <http://purl.org/dc/terms/> .
+@prefix ex: <https://ear.example.org/schema#> .
+
+<{section_iri("EAR-736.2(b)")}> a ex:Section ;
+    rdfs:label "General prohibitions" ;
+    ex:mentions <{section_iri("EAR-740.1")}> , <https://ear.example.org/entity/acme> .
+<{section_iri("EAR-740.1")}> rdfs:label "License exceptions" ;
+    dcterms:identifier "EAR-740.1" ;
+    ex:cites <{section_iri("EAR-742.4")}> .
+<https://ear.example.org/entity/acme> rdfs:label "ACME Corp" .
+<{section_iri("EAR-742.4")}> dcterms:description "National security controls" .
+"""
+
+
+class _RdflibTemplateGateway:
+    """Runs the production SPARQL template against rdflib, one node per query."""
+
+    def __init__(self, dataset) -> None:
+        self._dataset = dataset
+        self._template = _TEMPLATE_PATH.read_text(encoding="utf-8")
+
+    def select(self, query_id: str, params: dict[str, object]) -> list[dict[str, object]]:
+        query = self._template.replace("{{section_iri}}", f"<{params['section_iri']}>")
+        rows = []
+        for binding in self._dataset.query(query).bindings:
+            rows.append({str(key): str(value) for key, value in binding.items()})
+        return rows
+
+
+@pytest.fixture()
+def kg_ttl(tmp_path: Path) -> Path:
+    path = tmp_path / "ear.ttl"
+    path.write_text(_TTL, encoding="utf-8")
+    return path
+
+
+def test_artifact_round_trips_every_section_in_the_kg(kg_ttl: Path, tmp_path: Path) -> None:
+    out = tmp_path / "kg_expansion.kgx"
+    header = build_kg_expansion_artifact([kg_ttl], out, max_hops=2, max_paths_per_section=4)
+
+    assert header["section_count"] == 2
+    artifact = KGExpansionArtifact(out)
+    assert artifact.kg_digest == header["kg_digest"]
+    assert "EAR-736.2(b)" in artifact and "EAR-742.4" not in artifact
+
+    snippet = artifact.get("15 CFR 736.2(b)")
+    assert snippet is not None and snippet.source == "kg_artifact"
+    assert snippet.related_sections == ["EAR-740.1", "EAR-742.4"]
+    assert [len(path.edges) for path in snippet.paths] == [1, 1, 2]
+    assert len(artifact.expand(["EAR-736.2(b)"], max_paths_per_section=1)[0].paths) == 1
+
+    out.write_bytes(b"not an artifact")
+    with pytest.raises(KGExpansionArtifactError):
+        KGExpansionArtifact(out)
+
+
+def test_rdflib_gateway_matches_the_sparql_template(kg_ttl: Path) -> None:
+    dataset = load_kg_dataset([kg_ttl])
+    sections = RdflibExpansionGateway(dataset).section_ids()
+
+    def _expand(gateway):
+        return [
+            snippet.to_dict()
+            for snippet in expand_sections_via_fuseki(
+                sections, gateway, max_paths_per_section=4, max_hops=2
+            )
+        ]
+
+    assert _expand(RdflibExpansionGateway(dataset)) == _expand(_RdflibTemplateGateway(dataset))
+
+
+def test_artifact_provider_serves_expansion_without_fuseki(
+    monkeypatch, kg_ttl: Path, tmp_path: Path
+) -> None:
+    out = tmp_path / "kg_expansion.kgx"
+    build_kg_expansion_artifact([kg_ttl], out)
+    monkeypatch.delenv("EARCRAWLER_KG_EXPANSION_PROVIDER", raising=False)
+    monkeypatch.delenv("EARCRAWLER_KG_EXPANSION_PATH", raising=False)
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_ARTIFACT", str(out))
+
+    def _no_fuseki():
+        raise AssertionError("artifact provider must not build a Fuseki gateway")
+
+    expansions = retrieval_runtime.expand_with_kg(
+        ["EAR-740.1", "EAR-999.9"], gateway_factory=_no_fuseki
+    )
+    assert [snippet.section_id for snippet in expansions] == ["EAR-740.1"]
+    assert expansions[0].text == "License exceptions | National security controls"
+
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_ARTIFACT", str(tmp_path / "missing.kgx"))
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_FAILURE_POLICY", "disable")
+    assert retrieval_runtime.expand_with_kg(["EAR-740.1"]) == []
+
+
+def test_rebuild_swaps_pointer_and_closes_the_superseded_mapping(kg_ttl: Path, tmp_path: Path) -> None:
+    out = tmp_path / "kg_expansion.kgx"
+    first = build_kg_expansion_artifact([kg_ttl], out, max_hops=2)
+    mapped = open_kg_expansion_artifact(out)
+    assert mapped.data_path.name == first["file"]
+
+    second = build_kg_expansion_artifact([kg_ttl], out, max_hops=1)
+    reopened = open_kg_expansion_artifact(out)
+
+    assert second["file"] != first["file"]
+    assert reopened.data_path.name == second["file"] and reopened.max_hops == 1
+    assert mapped.closed
+    assert not (tmp_path / first["file"]).exists()
+
+
+def test_artifact_with_other_limits_falls_back_to_live_provider(
+    monkeypatch, kg_ttl: Path, tmp_path: Path
+) -> None:
+    out = tmp_path / "kg_expansion.kgx"
+    build_kg_expansion_artifact([kg_ttl], out, max_hops=2, max_paths_per_section=4)
+    monkeypatch.delenv("EARCRAWLER_KG_EXPANSION_PROVIDER", raising=False)
+    monkeypatch.delenv("EARCRAWLER_KG_EXPANSION_PATH", raising=False)
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_ARTIFACT", str(out))
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_MAX_HOPS", "1")
+    dataset = load_kg_dataset([kg_ttl])
+
+    expansions = retrieval_runtime.expand_with_kg(
+        ["EAR-736.2(b)"], gateway=RdflibExpansionGateway(dataset)
+    )
+    live = expand_sections_via_fuseki(
+        ["EAR-736.2(b)"], RdflibExpansionGateway(dataset), max_paths_per_section=4, max_hops=1
+    )
+
+    assert [snippet.to_dict() for snippet in expansions] == [snippet.to_dict() for snippet in live]
+    assert all(len(path.edges) == 1 for path in expansions[0].paths)
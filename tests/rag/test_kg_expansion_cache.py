@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from earCrawler.kg.iri import section_iri
+from earCrawler.rag import retrieval_runtime
+from earCrawler.rag.kg_expansion_cache import KGExpansionCache, load_json_stub_mapping
+
+
+class _CountingGateway:
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+
+    def select(self, query_id: str, params: dict[str, object]) -> list[dict[str, object]]:
+        source = str(params.get("section_iri") or "")
+        self.calls.append(source)
+        if source == section_iri("EAR-736.2(b)"):
+            return [
+                {
+                    "source": source,
+                    "predicate": "https://ear.example.org/schema#mentions",
+                    "target": section_iri("EAR-740.1"),
+                    "graph_iri": "https://ear.example.org/graph/kg/test",
+                }
+            ]
+        return []
+
+
+def _configure(monkeypatch, tmp_path: Path) -> tuple[Path, _CountingGateway]:
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"files": {"ear.ttl": {"sha256": "a"}}}), encoding="utf-8")
+    gateway = _CountingGateway()
+    monkeypatch.setattr(retrieval_runtime, "_KG_EXPANSION_CACHE", KGExpansionCache(16))
+    monkeypatch.setattr(retrieval_runtime, "_KG_EXPANSION_CACHE_READY", True)
+    monkeypatch.setenv("EARCRAWLER_FUSEKI_URL", "http://localhost:3030/ear/sparql")
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_MANIFEST", str(manifest))
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_PROVIDER", "fuseki")
+    monkeypatch.setenv("EARCRAWLER_KG_EXPANSION_MAX_HOPS", "1")
+    return manifest, gateway
+
+
+def test_fuseki_expansion_is_cached_until_kg_manifest_changes(monkeypatch, tmp_path) -> None:
+    manifest, gateway = _configure(monkeypatch, tmp_path)
+
+    def _expand(sections):
+        return retrieval_runtime.expand_with_kg(sections, gateway_factory=lambda: gateway)
+
+    first = _expand(["EAR-736.2(b)", "EAR-999.9"])
+    assert len(gateway.calls) == 2
+    second = _expand(["EAR-999.9", "EAR-736.2(b)"])
+    assert len(gateway.calls) == 2
+    assert [s.to_dict() for s in second] == [s.to_dict() for s in first]
+    assert second.query_count == 0
+
+    manifest.write_text(json.dumps({"files": {"ear.ttl": {"sha256": "b"}}}), encoding="utf-8")
+    _expand(["EAR-736.2(b)"])
+    assert len(gateway.calls) == 3
+    stats = retrieval_runtime.kg_expansion_cache().stats()
+    assert stats["hits"] == 2
+    assert stats["invalidations"] == 1
+
+
+def test_injected_gateway_bypasses_expansion_cache(monkeypatch, tmp_path) -> None:
+    _, gateway = _configure(monkeypatch, tmp_path)
+
+    retrieval_runtime.expand_with_kg(["EAR-736.2(b)"], gateway=gateway)
+    retrieval_runtime.expand_with_kg(["EAR-736.2(b)"], gateway=gateway)
+
+    assert len(gateway.calls) == 2
+    assert retrieval_runtime.kg_expansion_cache().stats()["entries"] == 0
+
+
+def test_json_stub_mapping_is_parsed_once_per_file_version(monkeypatch, tmp_path) -> None:
+    mapping_path = tmp_path / "kg.json"
+    mapping_path.write_text(json.dumps({"740.1": {"text": "first"}}), encoding="utf-8")
+    loads: list[str] = []
+    real_loads = json.loads
+    monkeypatch.setattr(
+        "earCrawler.rag.kg_expansion_cache.json.loads",
+        lambda raw: loads.append(raw) or real_loads(raw),
+    )
+
+    first = load_json_stub_mapping(mapping_path, retrieval_runtime.normalize_section_id)
+    again = load_json_stub_mapping(mapping_path, retrieval_runtime.normalize_section_id)
+    assert again is first and len(loads) == 1
+    assert first["EAR-740.1"][1]["text"] == "first"
+
+    mapping_path.write_text(json.dumps({"740.1": {"text": "second, longer"}}), encoding="utf-8")
+    updated = load_json_stub_mapping(mapping_path, retrieval_runtime.normalize_section_id)
+    assert updated["EAR-740.1"][1]["text"] == "second, longer"
+    assert len(loads) == 2
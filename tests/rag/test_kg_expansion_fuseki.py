@@ -4,6 +4,7 @@ from pathlib import Path
 
 from earCrawler.kg.iri import section_iri
 from earCrawler.rag.kg_expansion_fuseki import (
+    NODE_BATCH_QUERY_ID,
     SPARQLTemplateGateway,
     expand_sections_via_fuseki,
 )
@@ -20,6 +21,18 @@ class _FakeGateway:
         return list(self.rows_by_source.get(source, []))
 
 
+class _BatchGateway(_FakeGateway):
+    supports_node_batches = True
+
+    def select(self, query_id: str, params: dict[str, object]) -> list[dict[str, object]]:
+        assert query_id == NODE_BATCH_QUERY_ID
+        self.calls.append((query_id, dict(params)))
+        rows: list[dict[str, object]] = []
+        for node in params["node_iris"]:  # type: ignore[union-attr]
+            rows.extend(self.rows_by_source.get(str(node), []))
+        return rows
+
+
 def _rows_fixture() -> dict[str, list[dict[str, object]]]:
     s736 = section_iri("EAR-736.2(b)")
     s740 = section_iri("EAR-740.1")
@@ -136,3 +149,61 @@ def test_sparql_template_gateway_retries_query_failures(tmp_path: Path) -> None:
 
     assert rows == []
     assert client.calls == 2
+
+
+def test_expand_sections_via_fuseki_batches_each_hop_across_sections() -> None:
+    rows = _rows_fixture()
+    s740 = section_iri("EAR-740.1")
+    rows[s740] = [
+        {
+            "source": s740,
+            "predicate": "https://ear.example.org/schema#relD",
+            "target": section_iri("EAR-744.6(b)(3)"),
+            "graph_iri": "https://ear.example.org/graph/kg/test",
+        }
+    ]
+    sections = ["EAR-736.2(b)", "EAR-740.1"]
+
+    per_node = _FakeGateway(rows)
+    expected = expand_sections_via_fuseki(sections, per_node, max_paths_per_section=3, max_hops=2)
+    batched_gateway = _BatchGateway(rows)
+    batched = expand_sections_via_fuseki(
+        sections, batched_gateway, max_paths_per_section=3, max_hops=2
+    )
+
+    assert [snippet.to_dict() for snippet in batched] == [
+        snippet.to_dict() for snippet in expected
+    ]
+    assert batched.query_count == len(batched_gateway.calls) == 2
+    assert expected.query_count == len(per_node.calls) > batched.query_count
+    first_hop = batched_gateway.calls[0][1]["node_iris"]
+    assert first_hop == sorted([section_iri("EAR-736.2(b)"), s740])
+
+
+def test_sparql_template_gateway_renders_node_batches_into_values(tmp_path: Path) -> None:
+    query_template = tmp_path / "kg_expand.rq"
+    query_template.write_text(
+        "SELECT * WHERE { VALUES ?source { {{section_iri}} } }",
+        encoding="utf-8",
+    )
+
+    class _RecordingClient:
+        def __init__(self) -> None:
+            self.queries: list[str] = []
+
+        def select(self, query: str) -> dict[str, object]:
+            self.queries.append(query)
+            return {"results": {"bindings": []}}
+
+    client = _RecordingClient()
+    gateway = SPARQLTemplateGateway(
+        endpoint="http://localhost:3030/ear/sparql",
+        template_path=query_template,
+        client=client,  # type: ignore[arg-type]
+    )
+    nodes = [section_iri("EAR-736.2(b)"), section_iri("EAR-740.1")]
+    gateway.select(NODE_BATCH_QUERY_ID, {"node_iris": nodes})
+
+    assert client.queries == [
+        "SELECT * WHERE { VALUES ?source { " + " ".join(f"<{node}>" for node in nodes) + " } }"
+    ]
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from earCrawler.rag.retriever_citation_policy import apply_citation_boost  # noqa: E402
+from earCrawler.rag.retriever_ranking import (  # noqa: E402
+    fuse_rankings,
+    tie_break_rank_array,
+)
+from earCrawler.rag.metadata_table import (  # noqa: E402
+    MetadataTable,
+    load_metadata_table,
+    metadata_table_path,
+    write_metadata_table,
+)
+
+
+def _rows() -> list[dict]:
+    return [
+        {"row_id": 0, "doc_id": "EAR-740.1", "section_id": "EAR-740.1", "chunk_kind": "section", "text": "License exceptions § 740.1"},
+        {"row_id": 1, "doc_id": "EAR-736.2#p0001", "section_id": "EAR-736.2", "chunk_kind": "paragraph", "ordinal": 1, "text": "General prohibitions."},
+        {"row_id": 2, "doc_id": "EAR-736.2", "section_id": "EAR-736.2", "chunk_kind": "section", "text": "General prohibitions apply."},
+    ]
+
+
+def _write(tmp_path: Path) -> tuple[Path, Path]:
+    index_path = tmp_path / "index.faiss"
+    meta_path = tmp_path / "index.meta.json"
+    header = {"corpus_digest": "abc", "doc_count": 3}
+    meta_path.write_text(json.dumps({**header, "rows": _rows()}, indent=2) + "\n", encoding="utf-8")
+    table_path = metadata_table_path(index_path, meta_path)
+    write_metadata_table(table_path, _rows(), np_mod=np, meta_path=meta_path, header=header)
+    return table_path, meta_path
+
+
+def test_table_round_trips_rows_lazily(tmp_path: Path) -> None:
+    table_path, meta_path = _write(tmp_path)
+
+    loaded = load_metadata_table(table_path, np_mod=np, meta_path=meta_path)
+
+    assert loaded is not None
+    table, header = loaded
+    assert isinstance(table, MetadataTable)
+    assert header == {"corpus_digest": "abc", "doc_count": 3}
+    assert len(table) == 3
+    assert table[1] == _rows()[1]
+    assert list(table) == _rows()
+    assert table.column("section_id") == ["EAR-740.1", "EAR-736.2", "EAR-736.2"]
+    assert table.tie_ranks.tolist() == tie_break_rank_array(np, _rows()).tolist()
+
+    # Each access is a fresh dict, so mutating a result never leaks into the table.
+    table[0]["text"] = "mutated"
+    assert table[0]["text"] == _rows()[0]["text"]
+
+
+def test_table_is_ignored_once_metadata_changes(tmp_path: Path) -> None:
+    table_path, meta_path = _write(tmp_path)
+    meta_path.write_text(json.dumps({"rows": []}) + "\n", encoding="utf-8")
+
+    assert load_metadata_table(table_path, np_mod=np, meta_path=meta_path) is None
+
+
+def test_fusion_and_citation_boost_match_list_metadata(tmp_path: Path) -> None:
+    table_path, meta_path = _write(tmp_path)
+    table, _header = load_metadata_table(table_path, np_mod=np, meta_path=meta_path)
+    dense = [{"doc_id": "EAR-736.2", "score": 0.9}, {"doc_id": "EAR-740.1", "score": 0.8}]
+    bm25 = [{"doc_id": "EAR-740.1", "score": 2.0}, {"doc_id": "EAR-736.2#p0001", "score": 1.0}]
+
+    assert fuse_rankings(metadata=table, dense_results=dense, bm25_results=bm25, k=3) == fuse_rankings(
+        metadata=_rows(), dense_results=dense, bm25_results=bm25, k=3
+    )
+    assert apply_citation_boost(
+        "What does 15 CFR 736.2 prohibit?", results=[], metadata=table, k=2
+    ) == apply_citation_boost(
+        "What does 15 CFR 736.2 prohibit?", results=[], metadata=_rows(), k=2
+    )
+
+
+def test_rewrite_uses_new_blob_while_old_table_is_mapped(tmp_path: Path) -> None:
+    table_path, meta_path = _write(tmp_path)
+    old_table, _header = load_metadata_table(table_path, np_mod=np, meta_path=meta_path)
+    old_blobs = sorted(path.name for path in tmp_path.glob("index.rows.*.bin"))
+
+    rows = _rows() + [{"row_id": 3, "doc_id": "EAR-744.1", "section_id": "EAR-744.1", "text": "Scope."}]
+    meta_path.write_text(json.dumps({"rows": rows}) + "\n", encoding="utf-8")
+    write_metadata_table(table_path, rows, np_mod=np, meta_path=meta_path, header={})
+
+    new_table, _header = load_metadata_table(table_path, np_mod=np, meta_path=meta_path)
+    assert len(old_blobs) == 1
+    assert sorted(path.name for path in tmp_path.glob("index.rows.*.bin")) != old_blobs
+    assert old_table[1] == _rows()[1]
+    assert len(new_table) == 4
+    assert new_table[3]["doc_id"] == "EAR-744.1"
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from earCrawler.rag.query_embedding_cache import (  # noqa: E402
+    QueryEmbeddingCache,
+    normalize_query_text,
+    query_embedding_cache_from_env,
+)
+
+
+def test_cache_normalizes_prompts_and_evicts_lru() -> None:
+    cache = QueryEmbeddingCache(2, np_mod=np)
+    cache.put_many("m", ["a  b", "c"], np.eye(2, dtype="float32"))
+
+    first, missing = cache.get_many("m", [" a b\n", "zzz"])
+    assert missing is None
+    assert first.tolist() == [1.0, 0.0]
+    assert cache.get_many("other-model", ["a b"]) == [None]
+
+    cache.put_many("m", ["d"], np.ones((1, 2), dtype="float32"))
+    # "c" was least recently used once "a b" was read back.
+    assert cache.get_many("m", ["c"]) == [None]
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 3
+    assert normalize_query_text("  x \t y ") == "x y"
+
+
+def test_cache_persists_snapshot(tmp_path) -> None:
+    path = tmp_path / "qcache.npz"
+    cache = QueryEmbeddingCache(8, np_mod=np, path=path, persist_every=2)
+    cache.put_many("m", ["alpha", "beta"], np.asarray([[1, 2], [3, 4]], dtype="float32"))
+    assert path.exists()
+
+    reloaded = QueryEmbeddingCache(8, np_mod=np, path=path)
+    assert reloaded.stats()["loaded_entries"] == 2
+    vector = reloaded.get_many("m", ["beta"])[0]
+    assert vector.tolist() == [3.0, 4.0]
+
+
+def test_concurrent_saves_do_not_share_the_temp_file(tmp_path) -> None:
+    active: list[int] = []
+    overlaps: list[int] = []
+
+    def _savez(fh, **arrays):
+        active.append(1)
+        overlaps.append(len(active))
+        time.sleep(0.02)
+        np.savez(fh, **arrays)
+        active.pop()
+
+    passthrough = ("asarray", "array", "concatenate", "empty", "frombuffer", "load")
+    np_mod = SimpleNamespace(**{name: getattr(np, name) for name in passthrough}, savez=_savez)
+    path = tmp_path / "qcache.npz"
+    cache = QueryEmbeddingCache(64, np_mod=np_mod, path=path, persist_every=1)
+
+    def _put(label: str) -> None:
+        cache.put_many("m", [label], np.ones((1, 2), dtype="float32"))
+        cache.save()
+
+    threads = [threading.Thread(target=_put, args=(f"q{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(overlaps) == 1
+    assert QueryEmbeddingCache(64, np_mod=np, path=path).stats()["loaded_entries"] == 4
+
+
+def test_cache_disabled_by_zero_size(monkeypatch) -> None:
+    monkeypatch.setenv("EARCRAWLER_QUERY_EMBEDDING_CACHE_SIZE", "0")
+    assert query_embedding_cache_from_env(np) is None
@@ -49,3 +49,37 @@ def test_build_retrieval_context_bundle_keeps_retrieval_and_kg_separate() -> Non
     assert bundle.retrieved_docs[1]["source"] == "kg"
     assert bundle.kg_expansions_payload[0]["section_id"] == "EAR-740.1"
     assert bundle.kg_paths_payload[0]["path_id"] == "path:1"
+
+
+class _GroupFailingRetriever:
+    enabled = True
+    ready = True
+    failure_type = None
+
+    def query_many(self, prompts: list[str], k: int = 5) -> list[list[dict]]:
+        from earCrawler.rag.retriever import RetrieverError
+
+        if k == 3:
+            raise RetrieverError("index unavailable", code="index_missing")
+        return [
+            [{"section_id": "EAR-740.1", "text": prompt, "score": 0.9}]
+            for prompt in prompts
+        ]
+
+
+def test_batch_retrieval_warnings_stay_with_the_failed_items() -> None:
+    from earCrawler.rag.orchestrator import run_retrieval_batch_sync
+
+    executions = run_retrieval_batch_sync(
+        queries=["first", "second", "third"],
+        top_ks=[5, 3, 5],
+        retriever=_GroupFailingRetriever(),
+        strict=False,
+        effective_dates=[None, None, None],
+    )
+
+    assert [len(execution.docs) for execution in executions] == [1, 0, 1]
+    assert executions[0].warnings == []
+    assert executions[2].warnings == []
+    assert [w["code"] for w in executions[1].warnings] == ["index_missing"]
+    assert executions[0].warnings is not executions[2].warnings
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 import json
 import pickle
@@ -67,6 +68,8 @@ class StubIndex:
         )
 
     def add_with_ids(self, vecs, ids):
+        if getattr(self, "fail_add", False):
+            raise RuntimeError("add_with_ids not supported")
         self.added.append(np.array(vecs))
         self.ids.append(np.array(ids))
         self.ntotal = len(ids)
@@ -74,6 +77,10 @@ class StubIndex:
     def search(self, vec, k):
         return self.returns
 
+    def remove_ids(self, ids):
+        self.removed = getattr(self, "removed", []) + [np.array(ids)]
+        self.ntotal -= len(ids)
+
 
 class IndexIDMapStub(StubIndex):
     """Simple stand-in for faiss.IndexIDMap."""
@@ -104,6 +111,11 @@ class StubFaiss(SimpleNamespace):
     def read_index(self, path):  # noqa: N802
         return self.index
 
+    def clone_index(self, index):  # noqa: N802
+        clone = object.__new__(type(index))
+        clone.__dict__.update(copy.deepcopy(index.__dict__))
+        return clone
+
     def write_index(self, index, path):  # noqa: N802
         self.write_args = (index, path)
         Path(path).touch()
@@ -488,3 +500,278 @@ def test_invalid_retrieval_mode_raises(monkeypatch, tmp_path):
             backend="bruteforce",
             retrieval_mode="invalid",
         )
+
+
+def test_add_documents_writes_embedding_sidecar(monkeypatch, tmp_path):
+    r, _model, _index, _faiss_mod, _retriever = _load_retriever(monkeypatch, tmp_path)
+    r.add_documents([_doc("EAR-736.2", "a"), _doc("EAR-736.3", "b")])
+
+    meta = json.loads(r.meta_path.read_text(encoding="utf-8"))
+    sidecar = meta["embedding_sidecar"]
+    assert sidecar["corpus_digest"] == meta["corpus_digest"]
+    assert sidecar["shape"] == [2, 3]
+    assert (tmp_path / sidecar["file"]).exists()
+
+
+def test_query_many_encodes_once_and_matches_query(monkeypatch, tmp_path):
+    tg_mod = SimpleNamespace(TradeGovClient=object)
+    fr_mod = SimpleNamespace(FederalRegisterClient=object)
+    pkg_mod = SimpleNamespace(
+        TradeGovClient=object,
+        TradeGovError=Exception,
+        FederalRegisterClient=object,
+        FederalRegisterError=Exception,
+    )
+    monkeypatch.setitem(sys.modules, "api_clients.tradegov_client", tg_mod)
+    monkeypatch.setitem(sys.modules, "api_clients.federalregister_client", fr_mod)
+    monkeypatch.setitem(sys.modules, "api_clients", pkg_mod)
+
+    import earCrawler.rag.retriever as retriever_mod
+
+    importlib.reload(retriever_mod)
+    model = KeywordModel("stub-model")
+    monkeypatch.setattr(retriever_mod, "SentenceTransformer", lambda name: model)
+    monkeypatch.setattr(retriever_mod, "faiss", None)
+
+    rows = [
+        _doc("EAR-736.2", "General prohibition ten applies to exports."),
+        _doc("EAR-740.1", "License exceptions can authorize some exports."),
+        _doc("EAR-734.3", "Items subject to the EAR."),
+    ]
+    meta_path = tmp_path / "batch.meta.json"
+    meta_path.write_text(
+        json.dumps({"rows": rows}, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    r = retriever_mod.Retriever(
+        SimpleNamespace(),
+        SimpleNamespace(),
+        model_name="stub-model",
+        index_path=tmp_path / "batch.faiss",
+        backend="bruteforce",
+        retrieval_mode="hybrid",
+    )
+    prompts = ["license exception", "general prohibition", "subject items"]
+
+    batched = r.query_many(prompts, k=2)
+    # One corpus encode (no sidecar) plus a single encode for all prompts.
+    assert len(model.calls) == 2 and prompts in model.calls
+    model.calls.clear()
+    singles = [r.query(prompt, k=2) for prompt in prompts]
+
+    assert batched == singles
+    assert [row["doc_id"] for row in batched[0]][0] == "EAR-740.1"
+    assert [row["doc_id"] for row in batched[1]][0] == "EAR-736.2"
+    assert r.query_many([], k=2) == []
+
+
+def test_query_embedding_cache_skips_encoder_for_repeated_prompts(monkeypatch, tmp_path):
+    r, model, _index, _faiss_mod, retriever_mod = _load_retriever(monkeypatch, tmp_path)
+    r.add_documents([_doc("EAR-736.2", "a"), _doc("EAR-736.3", "b")])
+    model.calls.clear()
+
+    first = r.query("export  controls", k=2)
+    second = r.query("export controls", k=2)
+
+    assert first == second
+    assert model.calls == [["export  controls"]]
+    stats = retriever_mod.describe_retriever_config(r)["query_embedding_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_shared_artifact_mode_attaches_prepared_sidecars(monkeypatch, tmp_path):
+    tg_mod = SimpleNamespace(TradeGovClient=object)
+    fr_mod = SimpleNamespace(FederalRegisterClient=object)
+    pkg_mod = SimpleNamespace(
+        TradeGovClient=object,
+        TradeGovError=Exception,
+        FederalRegisterClient=object,
+        FederalRegisterError=Exception,
+    )
+    monkeypatch.setitem(sys.modules, "api_clients.tradegov_client", tg_mod)
+    monkeypatch.setitem(sys.modules, "api_clients.federalregister_client", fr_mod)
+    monkeypatch.setitem(sys.modules, "api_clients", pkg_mod)
+
+    import earCrawler.rag.retriever as retriever_mod
+
+    importlib.reload(retriever_mod)
+    monkeypatch.setattr(retriever_mod, "SentenceTransformer", lambda name: FlatModel(name))
+    monkeypatch.setattr(retriever_mod, "faiss", None)
+
+    rows = [
+        _doc("EAR-736.2", "General prohibitions apply to exports."),
+        _doc("EAR-740.1", "License exceptions can authorize some exports."),
+    ]
+    (tmp_path / "shared.meta.json").write_text(
+        json.dumps({"rows": rows}, ensure_ascii=False, indent=2) + "\n",
+        encoding="utf-8",
+    )
+
+    def _build():
+        return retriever_mod.Retriever(
+            SimpleNamespace(),
+            SimpleNamespace(),
+            model_name="stub-model",
+            index_path=tmp_path / "shared.faiss",
+            backend="bruteforce",
+            retrieval_mode="hybrid",
+        )
+
+    private_results = _build().query("license exception", k=2)
+    retriever_mod._META_CACHE.clear()
+    retriever_mod._BM25_CACHE.clear()
+    retriever_mod._SHARED_CACHE.clear()
+    retriever_mod._EMBEDDING_CACHE.clear()
+    monkeypatch.setenv("EARCRAWLER_RETRIEVER_SHARED_ARTIFACTS", "1")
+    shared = _build()
+    shared_results = shared.query("license exception", k=2)
+
+    assert (tmp_path / "shared.shared" / "manifest.json").exists()
+    assert retriever_mod.describe_retriever_config(shared)["shared_artifacts"] is True
+    assert [row["doc_id"] for row in shared_results] == [
+        row["doc_id"] for row in private_results
+    ]
+    assert shared_results[0]["bm25_rank"] == private_results[0]["bm25_rank"]
+
+
+def test_shared_artifact_mode_falls_back_when_preparation_fails(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, "api_clients.tradegov_client", SimpleNamespace(TradeGovClient=object))
+    monkeypatch.setitem(
+        sys.modules, "api_clients.federalregister_client", SimpleNamespace(FederalRegisterClient=object)
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "api_clients",
+        SimpleNamespace(
+            TradeGovClient=object,
+            TradeGovError=Exception,
+            FederalRegisterClient=object,
+            FederalRegisterError=Exception,
+        ),
+    )
+
+    import earCrawler.rag.retriever as retriever_mod
+
+    importlib.reload(retriever_mod)
+    monkeypatch.setattr(retriever_mod, "SentenceTransformer", lambda name: FlatModel(name))
+    monkeypatch.setattr(retriever_mod, "faiss", None)
+    monkeypatch.setenv("EARCRAWLER_RETRIEVER_SHARED_ARTIFACTS", "1")
+
+    rows = [
+        _doc("EAR-736.2", "General prohibitions apply to exports."),
+        _doc("EAR-740.1", "License exceptions can authorize some exports."),
+    ]
+    # Legacy list-form metadata cannot be shared; preparation raises ValueError.
+    (tmp_path / "legacy.meta.json").write_text(json.dumps(rows) + "\n", encoding="utf-8")
+    retriever = retriever_mod.Retriever(
+        SimpleNamespace(),
+        SimpleNamespace(),
+        model_name="stub-model",
+        index_path=tmp_path / "legacy.faiss",
+        backend="bruteforce",
+        retrieval_mode="hybrid",
+    )
+
+    results = retriever.query("license exception", k=2)
+
+    assert {row["doc_id"] for row in results} == {"EAR-736.2", "EAR-740.1"}
+    assert not (tmp_path / "legacy.shared" / "manifest.json").exists()
+
+
+def test_query_reads_rows_from_columnar_metadata_table(monkeypatch, tmp_path):
+    r, _model, _index, _faiss_mod, retriever_mod = _load_retriever(monkeypatch, tmp_path)
+    docs = [_doc("EAR-736.2", "a"), _doc("EAR-736.3", "b")]
+    r.add_documents(docs)
+    retriever_mod._META_CACHE.clear()
+    retriever_mod._EMBEDDING_CACHE.clear()
+
+    from earCrawler.rag.metadata_table import MetadataTable
+
+    metadata = r._load_metadata()
+    result = r.query("hi", k=2)
+
+    assert isinstance(metadata, MetadataTable)
+    assert r._load_metadata() is metadata
+    assert (tmp_path / "idx.rows.npz").exists()
+    assert result == [
+        {**docs[0], "score": 1.0},
+        {**docs[1], "score": 1.0},
+    ]
+
+
+def test_incremental_add_encodes_only_new_and_changed_docs(monkeypatch, tmp_path):
+    r, model, index, _faiss_mod, _retriever_mod = _load_retriever(monkeypatch, tmp_path)
+    r.add_documents([_doc("EAR-736.2", "a"), _doc("EAR-736.3", "b")])
+    model.calls.clear()
+
+    r.add_documents(
+        [_doc("EAR-736.2", "a2"), _doc("EAR-736.3", "b"), _doc("EAR-740.1", "c")],
+        incremental=True,
+    )
+
+    from earCrawler.rag.build_corpus import compute_corpus_digest
+
+    meta = json.loads(r.meta_path.read_text(encoding="utf-8"))
+    written = _faiss_mod.write_args[0]
+    assert model.calls == [["a2", "c"]]
+    assert written is not index
+    assert written.removed[-1].tolist() == [0]
+    assert written.ids[-1].tolist() == [0, 2]
+    assert not hasattr(index, "removed")
+    assert [row["doc_id"] for row in meta["rows"]] == ["EAR-736.2", "EAR-736.3", "EAR-740.1"]
+    assert [row["row_id"] for row in meta["rows"]] == [0, 1, 2]
+    assert meta["rows"][0]["text"] == "a2"
+    assert meta["corpus_digest"] == compute_corpus_digest(meta["rows"])
+    assert meta["embedding_sidecar"]["shape"] == [3, 3]
+
+    model.calls.clear()
+    r.add_documents([_doc("EAR-740.1", "c")], incremental=True)
+    assert model.calls == []
+
+
+def test_incremental_add_leaves_the_live_index_untouched_on_failure(monkeypatch, tmp_path):
+    r, _model, index, _faiss_mod, _retriever_mod = _load_retriever(monkeypatch, tmp_path)
+    r.add_documents([_doc("EAR-736.2", "a"), _doc("EAR-736.3", "b")])
+    existing = r._load_metadata()
+    docs = [_doc("EAR-736.2", "a2"), _doc("EAR-740.1", "c")]
+
+    # add_with_ids fails after remove_ids succeeded (e.g. IVF): rebuild instead.
+    index.fail_add = True
+    assert r._append_documents(existing, docs) is False
+    index.fail_add = False
+    assert not hasattr(index, "removed")
+    assert index.ntotal == 2
+
+    def _failing_save(*_args, **_kwargs):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(r, "_save_index", _failing_save)
+    with pytest.raises(OSError, match="disk full"):
+        r._append_documents(existing, docs)
+    assert not hasattr(index, "removed")
+    assert index.ntotal == 2
+    assert len(index.ids) == 1
+
+
+def test_incremental_add_releases_mapped_sidecars_before_rewrite(monkeypatch, tmp_path):
+    r, _model, _index, _faiss_mod, retriever_mod = _load_retriever(monkeypatch, tmp_path)
+    r.add_documents([_doc("EAR-736.2", "a"), _doc("EAR-736.3", "b")])
+    mapped = r._load_embedding_matrix(r._load_metadata())
+    assert isinstance(mapped, np.memmap)
+    del mapped
+
+    import earCrawler.rag.retriever_store as store_mod
+
+    real_write = store_mod.write_embedding_sidecar
+    cached_at_write: list[object] = []
+
+    def _write(*args, **kwargs):
+        cached_at_write.extend(entry[2] for entry in retriever_mod._EMBEDDING_CACHE.values())
+        return real_write(*args, **kwargs)
+
+    monkeypatch.setattr(store_mod, "write_embedding_sidecar", _write)
+    r.add_documents([_doc("EAR-740.1", "c")], incremental=True)
+
+    assert not any(isinstance(value, np.memmap) for value in cached_at_write)
+    assert json.loads(r.meta_path.read_text(encoding="utf-8"))["embedding_sidecar"]["shape"] == [3, 3]
@@ -38,3 +38,64 @@ def test_fusion_prefers_metadata_tie_break_on_equal_scores() -> None:
         k=2,
     )
     assert [row["doc_id"] for row in fused] == ["EAR-736.2", "EAR-736.3"]
+
+
+def test_top_k_selection_matches_full_sort_with_ties() -> None:
+    import numpy as np
+
+    metadata = [
+        {"doc_id": f"EAR-7{idx % 7:02d}.{idx}", "section_id": f"EAR-7{idx % 7:02d}.{idx}"}
+        for idx in range(200)
+    ]
+    rng = np.random.default_rng(7)
+    scores = rng.choice(np.array([0.1, 0.5, 0.5000001, 0.9], dtype="float32"), size=200)
+    tie_ranks = retriever_ranking.tie_break_rank_array(np, metadata)
+
+    for k in (1, 5, 37, 200, 500):
+        expected = sorted(
+            range(len(metadata)),
+            key=lambda idx: (
+                -retriever_ranking.score_bucket(scores[idx]),
+                retriever_ranking.metadata_tie_break_key(metadata[idx], idx),
+            ),
+        )[:k]
+        selected = retriever_ranking.select_top_k_indices(np, scores, tie_ranks, k=k)
+        assert selected.tolist() == expected
+
+
+def test_faiss_top_k_widens_on_ties_and_matches_full_search() -> None:
+    import numpy as np
+    import pytest
+
+    faiss = pytest.importorskip("faiss")
+    metadata = [
+        {"doc_id": f"EAR-7{idx % 7:02d}.{idx}", "section_id": f"EAR-7{idx % 7:02d}.{idx}"}
+        for idx in range(300)
+    ]
+    rng = np.random.default_rng(11)
+    # Few distinct vectors, so long runs of identical distances straddle the window.
+    vectors = rng.standard_normal((6, 8)).astype("float32")[rng.integers(0, 6, size=300)]
+    index = faiss.IndexIDMap(faiss.IndexFlatL2(8))
+    index.add_with_ids(vectors, np.arange(300, dtype="int64"))
+    tie_ranks = retriever_ranking.tie_break_rank_array(np, metadata)
+    queries = np.concatenate([vectors[:3], rng.standard_normal((3, 8)).astype("float32")])
+
+    class CountingIndex:
+        def __init__(self) -> None:
+            self.windows: list[int] = []
+
+        def search(self, batch, window):
+            self.windows.append(window)
+            return index.search(batch, window)
+
+    for k in (1, 5, 40):
+        counting = CountingIndex()
+        bounded = retriever_ranking.faiss_top_k(
+            np, counting, queries, tie_ranks, k=k, total=300
+        )
+        full = retriever_ranking.faiss_top_k(
+            np, index, queries, tie_ranks, k=k, total=300, margin=300
+        )
+        assert bounded == full
+        assert counting.windows[0] == k + retriever_ranking.FAISS_TIE_MARGIN
+        assert len(counting.windows) > 1
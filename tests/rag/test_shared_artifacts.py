@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from earCrawler.rag.bm25_index import build_bm25_index, score_bm25_index  # noqa: E402
+from earCrawler.rag.retriever_ranking import tie_break_rank_array  # noqa: E402
+from earCrawler.rag.shared_artifacts import (  # noqa: E402
+    ensure_shared_artifacts,
+    load_shared_artifacts,
+    prepare_shared_artifacts,
+    shared_artifacts_dir,
+)
+
+
+def _write_index(tmp_path: Path) -> tuple[Path, Path, list[dict]]:
+    rows = [
+        {"doc_id": "EAR-740.1", "section_id": "EAR-740.1", "text": "License exceptions authorize exports.", "row_id": 0},
+        {"doc_id": "EAR-736.2", "section_id": "EAR-736.2", "text": "General prohibitions apply to exports.", "row_id": 1},
+        {"doc_id": "EAR-744.1", "section_id": "EAR-744.1", "text": "End-use controls.", "row_id": 2},
+    ]
+    index_path = tmp_path / "index.faiss"
+    index_path.write_bytes(b"stub-index")
+    meta_path = tmp_path / "index.meta.json"
+    meta_path.write_text(
+        json.dumps({"corpus_digest": "abc", "rows": rows}, indent=2) + "\n",
+        encoding="utf-8",
+    )
+    return index_path, meta_path, rows
+
+
+def test_prepared_artifacts_attach_read_only_and_match_private_state(tmp_path: Path) -> None:
+    index_path, meta_path, rows = _write_index(tmp_path)
+
+    manifest = prepare_shared_artifacts(index_path, np_mod=np)
+    shared = load_shared_artifacts(index_path, np_mod=np)
+
+    assert manifest["doc_count"] == 3
+    assert shared is not None
+    assert list(shared.rows) == rows
+    assert shared.header["corpus_digest"] == "abc"
+    assert isinstance(shared.tie_ranks, np.memmap)
+    assert not shared.tie_ranks.flags.writeable
+    assert shared.tie_ranks.tolist() == tie_break_rank_array(np, rows).tolist()
+
+    private = build_bm25_index(np, rows)
+    shared_docs, shared_scores = score_bm25_index(np, "license exports", shared.bm25_state)
+    private_docs, private_scores = score_bm25_index(np, "license exports", private)
+    assert shared_docs.tolist() == private_docs.tolist()
+    assert np.allclose(shared_scores, private_scores)
+
+
+def test_shared_artifacts_go_stale_when_metadata_changes(tmp_path: Path) -> None:
+    index_path, meta_path, _rows = _write_index(tmp_path)
+    prepare_shared_artifacts(index_path, np_mod=np)
+    meta_path.write_text(json.dumps({"rows": []}) + "\n", encoding="utf-8")
+
+    assert load_shared_artifacts(index_path, np_mod=np) is None
+
+
+def test_ensure_prepares_once_and_waits_on_foreign_lock(tmp_path: Path) -> None:
+    index_path, _meta_path, rows = _write_index(tmp_path)
+    lock_path = shared_artifacts_dir(index_path) / ".prepare.lock"
+    lock_path.parent.mkdir(parents=True)
+    lock_path.write_text("12345", encoding="utf-8")
+
+    # Another worker holds the lock and never finishes: give up and load privately.
+    assert ensure_shared_artifacts(index_path, np_mod=np, timeout_s=0.1) is None
+
+    os.utime(lock_path, (0, 0))  # stale lock from a crashed preparer
+    shared = ensure_shared_artifacts(index_path, np_mod=np, timeout_s=5.0)
+    assert shared is not None
+    assert list(shared.rows) == rows
+    assert not lock_path.exists()
+
+
+def test_live_lock_older_than_timeout_is_not_taken_over(tmp_path: Path) -> None:
+    index_path, _meta_path, _rows = _write_index(tmp_path)
+    lock_path = shared_artifacts_dir(index_path) / ".prepare.lock"
+    lock_path.parent.mkdir(parents=True)
+    lock_path.write_text("12345", encoding="utf-8")
+    age = 30.0
+    os.utime(lock_path, (time.time() - age, time.time() - age))
+
+    # Older than the waiter's budget but not stale: the preparer keeps its lock.
+    assert ensure_shared_artifacts(index_path, np_mod=np, timeout_s=0.2, stale_lock_s=age + 60) is None
+    assert lock_path.exists()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+from pytest_socket import disable_socket, enable_socket
+
+from service.api_server.rag_cache import RagQueryCache, SqliteRagCacheBackend
+
+
+@pytest.fixture
+def _allow_socket():
+    # asyncio event loops need a local socketpair.
+    enable_socket()
+    yield
+    disable_socket()
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _docs(label: str, size: int = 1) -> list[dict]:
+    return [{"id": f"urn:{label}", "text": "x" * size}]
+
+
+def test_lru_evicts_least_recently_used_and_respects_byte_budget() -> None:
+    cache = RagQueryCache(ttl_seconds=60, max_entries=2, max_bytes=None)
+    cache.put("a", _docs("a"))
+    cache.put("b", _docs("b"))
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", _docs("c"))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+    budget = RagQueryCache(ttl_seconds=60, max_entries=10, max_bytes=150)
+    budget.put("a", _docs("a", 40))
+    budget.put("b", _docs("b", 40))
+    budget.put("big", _docs("big", 500))  # larger than the whole budget
+    assert budget.get("big") is None
+    budget.put("c", _docs("c", 40))
+    assert budget.get("a") is None
+    stats = budget.stats()
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= 150
+    assert stats["evictions"] == 1
+
+
+def test_ttl_expiry_and_counters() -> None:
+    clock = _Clock()
+    cache = RagQueryCache(ttl_seconds=30, max_entries=4, clock=clock)
+    expires_at = cache.put("a", _docs("a"))
+    assert cache.expires_at("a") == expires_at
+    assert cache.get("a") == _docs("a")
+    clock.now += 31
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["expirations"] == 1
+    assert stats["hit_rate"] == 0.5
+
+
+def test_index_digest_change_invalidates_entries() -> None:
+    cache = RagQueryCache(ttl_seconds=60, max_entries=4)
+    assert cache.bind_index("digest-a") is False
+    cache.put("a", _docs("a"))
+    assert cache.bind_index("digest-a") is False
+    assert cache.get("a") is not None
+    assert cache.bind_index("digest-b") is True
+    assert cache.get("a") is None
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_first_bind_drops_entries_stored_without_a_digest() -> None:
+    cache = RagQueryCache(ttl_seconds=60, max_entries=4)
+    cache.put("a", _docs("a"))
+    assert cache.bind_index("digest-a") is True
+    assert cache.get("a") is None
+
+
+def test_sqlite_backend_shares_entries_between_caches(tmp_path) -> None:
+    path = tmp_path / "rag_cache.sqlite"
+    first = RagQueryCache(ttl_seconds=60, backend=SqliteRagCacheBackend(path))
+    second = RagQueryCache(ttl_seconds=60, backend=SqliteRagCacheBackend(path))
+    first.bind_index("digest-a")
+    second.bind_index("digest-a")
+
+    first.put("q", _docs("q"))
+    assert second.get("q") == _docs("q")
+    assert second.expires_at("q") is not None
+    assert second.stats()["backend_hits"] == 1
+    assert second.storage_scope == "host_shared"
+
+    # Entries written for another index are never served.
+    third = RagQueryCache(ttl_seconds=60, backend=SqliteRagCacheBackend(path))
+    third.bind_index("digest-b")
+    assert third.get("q") is None
+
+
+class _FailingBackend:
+    name = "sqlite"
+    storage_scope = "host_shared"
+
+    def get(self, key, index_digest):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, key, index_digest, payload, expires_at):
+        raise sqlite3.OperationalError("database is locked")
+
+    def invalidate(self, index_digest):
+        raise sqlite3.OperationalError("database is locked")
+
+    def clear(self):
+        raise sqlite3.OperationalError("database is locked")
+
+
+@pytest.mark.usefixtures("_allow_socket")
+def test_backend_errors_degrade_to_miss_and_skipped_write() -> None:
+    cache = RagQueryCache(ttl_seconds=60, backend=_FailingBackend())
+    cache.bind_index("digest-a")
+    assert cache.bind_index("digest-b") is True
+
+    assert cache.get("q") is None
+    cache.put("q", _docs("q"))
+    assert cache.get("q") == _docs("q")
+    assert asyncio.run(cache.aget("missing")) is None
+    asyncio.run(cache.aput("r", _docs("r")))
+    cache.clear()
+
+    stats = cache.stats()
+    assert stats["backend_errors"] == 6
+    assert stats["misses"] == 2
+
+
+def test_sqlite_backend_batches_access_time_updates(tmp_path) -> None:
+    clock = _Clock()
+    backend = SqliteRagCacheBackend(tmp_path / "rag_cache.sqlite", touch_batch=2, clock=clock)
+    backend.put("a", "digest", "[]", clock.now + 60)
+    backend.put("b", "digest", "[]", clock.now + 60)
+    conn = sqlite3.connect(backend.path)
+
+    def accessed(key: str) -> float:
+        return conn.execute("SELECT accessed_at FROM rag_cache WHERE key = ?", (key,)).fetchone()[0]
+
+    clock.now += 5
+    assert backend.get("a", "digest") == ("[]", 1_060.0)
+    assert accessed("a") == 1_000.0
+    clock.now += 5
+    backend.get("b", "digest")
+    assert (accessed("a"), accessed("b")) == (1_005.0, 1_010.0)
+
+
+def test_sqlite_backend_close_releases_every_thread_connection(tmp_path) -> None:
+    backend = SqliteRagCacheBackend(tmp_path / "rag_cache.sqlite")
+    backend.put("a", "digest", "[]", 2e9)
+    worker = threading.Thread(target=backend.get, args=("a", "digest"))
+    worker.start()
+    worker.join()
+    connections = list(backend._connections)
+    assert len(connections) == 2
+
+    cache = RagQueryCache(ttl_seconds=60, backend=backend)
+    cache.close()
+
+    for conn in connections:
+        with pytest.raises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+    assert backend._connections == []
+    assert backend.get("a", "digest") == ("[]", 2e9)
+    backend.close()
+
+
+@pytest.mark.usefixtures("_allow_socket")
+def test_async_lookups_share_the_backend(tmp_path) -> None:
+    path = tmp_path / "rag_cache.sqlite"
+    first = RagQueryCache(ttl_seconds=60, backend=SqliteRagCacheBackend(path))
+    second = RagQueryCache(ttl_seconds=60, backend=SqliteRagCacheBackend(path))
+
+    async def _run() -> list[dict] | None:
+        await first.abind_index("digest-a")
+        await second.abind_index("digest-a")
+        await first.aput("q", _docs("q"))
+        return await second.aget("q")
+
+    assert asyncio.run(_run()) == _docs("q")
+    assert second.stats()["backend_hits"] == 1
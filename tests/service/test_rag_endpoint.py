@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import sqlite3
 
 import pytest
 from fastapi.testclient import TestClient
@@ -46,6 +47,7 @@ def _app(stub_retriever: _StubRetriever) -> TestClient:
             }
         ]
     }
+    responses["lineage_by_ids"] = responses["lineage_by_id"]
     settings = ApiSettings(fuseki_url=None)
     app = create_app(
         settings,
@@ -86,6 +88,59 @@ def test_rag_endpoint_returns_hits_and_lineage():
     assert retriever.calls == [("export controls", 2)]
 
 
+def test_rag_query_fetches_lineage_in_one_batched_query():
+    class _MultiDocRetriever(_StubRetriever):
+        def query(self, prompt: str, k: int = 5) -> list[dict]:
+            self.calls.append((prompt, k))
+            return [
+                {"id": f"urn:entity:{idx}", "text": f"Passage {idx}.", "score": 0.5}
+                for idx in range(1, 5)
+            ]
+
+    class _RecordingClient(StubFusekiClient):
+        def __init__(self, responses) -> None:
+            super().__init__(responses)
+            self.queries: list[tuple[str, str]] = []
+
+        async def query(self, template, query):
+            self.queries.append((template.name, query))
+            return await super().query(template, query)
+
+    fuseki = _RecordingClient(
+        {
+            "lineage_by_ids": [
+                {
+                    "source": f"urn:entity:{idx}",
+                    "relation": "http://www.w3.org/ns/prov#wasDerivedFrom",
+                    "target": f"urn:artifact:{idx}",
+                }
+                for idx in (1, 3)
+            ]
+        }
+    )
+    app = create_app(
+        ApiSettings(fuseki_url=None),
+        fuseki_client=fuseki,
+        retriever=_MultiDocRetriever(),
+        rag_cache=RagQueryCache(ttl_seconds=60, max_entries=4),
+    )
+    client = TestClient(app)
+
+    resp = client.post(
+        "/v1/rag/query", json={"query": "export controls", "include_lineage": True, "top_k": 4}
+    )
+    assert resp.status_code == 200
+    assert [name for name, _ in fuseki.queries] == ["lineage_by_ids"]
+    assert "<urn:entity:1> <urn:entity:2> <urn:entity:3> <urn:entity:4>" in fuseki.queries[0][1]
+    lineage = [item["lineage"] for item in resp.json()["results"]]
+    assert [ref and ref["edges"][0]["target"] for ref in lineage] == [
+        "urn:artifact:1",
+        None,
+        "urn:artifact:3",
+        None,
+    ]
+
+
 def test_rag_endpoint_without_lineage():
     retriever = _StubRetriever()
     client = _app(retriever)
@@ -97,26 +152,86 @@ def test_rag_endpoint_without_lineage():
     assert data["retrieval_empty"] is False
 
 
-def test_rag_query_offloads_retriever_to_thread(monkeypatch):
+def test_rag_query_runs_retrieval_on_executor():
+    import threading
+
     retriever = _StubRetriever()
+    threads: list[str] = []
+    original_query = retriever.query
+
+    def _query(prompt: str, k: int = 5) -> list[dict]:
+        threads.append(threading.current_thread().name)
+        return original_query(prompt, k)
+
+    retriever.query = _query
     client = _app(retriever)
 
-    import service.api_server.routers.rag as rag_router
+    resp = client.post("/v1/rag/query", json={"query": "export controls", "top_k": 2})
+    assert resp.status_code == 200
+    assert threads and all(name.startswith("rag-retrieval") for name in threads)
+    executor = client.get("/health").json()["retrieval_executor"]
+    assert executor["query_count"] == 1
+    assert executor["queue_depth"] == 0
+    assert executor["busy_workers"] == 0
 
-    offload_calls: list[tuple[object, tuple[object, ...], dict[str, object]]] = []
 
-    async def _fake_to_thread(func, *args, **kwargs):
-        offload_calls.append((func, args, kwargs))
-        return func(*args, **kwargs)
+def test_rag_query_cache_drops_entries_when_index_digest_changes():
+    retriever = _StubRetriever()
+    retriever.digest = "digest-a"
+    retriever.index_digest = lambda: retriever.digest
+    client = _app(retriever)
 
-    monkeypatch.setattr(rag_router.asyncio, "to_thread", _fake_to_thread)
+    body = {"query": "export controls", "top_k": 2}
+    assert client.post("/v1/rag/query", json=body).json()["cache"]["hit"] is False
+    assert client.post("/v1/rag/query", json=body).json()["cache"]["hit"] is True
+    retriever.digest = "digest-b"
+    assert client.post("/v1/rag/query", json=body).json()["cache"]["hit"] is False
+    assert len(retriever.calls) == 2
 
-    resp = client.post("/v1/rag/query", json={"query": "export controls", "top_k": 2})
-    assert resp.status_code == 200
-    assert any(
-        getattr(func, "__name__", "") in {"query", "run_retrieval_sync"}
-        for func, _, _ in offload_calls
+    stats = client.get("/health").json()["rag_query_cache"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["invalidations"] == 1
+    assert stats["index_digest"] == "digest-b"
+    assert stats["storage_scope"] == "process_local"
+
+
+class _LockedBackend:
+    name = "sqlite"
+    storage_scope = "host_shared"
+
+    def get(self, key, index_digest):
+        raise sqlite3.OperationalError("database is locked")
+
+    def put(self, key, index_digest, payload, expires_at):
+        raise sqlite3.OperationalError("database is locked")
+
+    def invalidate(self, index_digest):
+        raise sqlite3.OperationalError("database is locked")
+
+    def clear(self):
+        raise sqlite3.OperationalError("database is locked")
+
+
+def test_rag_query_survives_shared_cache_backend_errors():
+    retriever = _StubRetriever()
+    app = create_app(
+        ApiSettings(fuseki_url=None),
+        fuseki_client=StubFusekiClient({}),
+        retriever=retriever,
+        rag_cache=RagQueryCache(ttl_seconds=60, max_entries=4, backend=_LockedBackend()),
     )
+    client = TestClient(app)
+
+    body = {"query": "export controls", "top_k": 2}
+    first = client.post("/v1/rag/query", json=body)
+    second = client.post("/v1/rag/query", json=body)
+
+    assert first.status_code == 200
+    assert first.json()["results"][0]["source"]["url"] == "https://example.org/doc/1"
+    assert second.status_code == 200
+    assert second.json()["cache"]["hit"] is True
+    assert client.get("/health").json()["rag_query_cache"]["backend_errors"] == 2
 
 
 def test_llm_endpoint_disabled_returns_stub(monkeypatch):
@@ -177,10 +292,8 @@ def test_llm_endpoint_offloads_generate_to_thread(monkeypatch):
 
     resp = client.post("/v1/rag/answer", json={"query": "export controls", "top_k": 2})
     assert resp.status_code == 200
-    assert any(
-        getattr(func, "__name__", "") in {"query", "run_retrieval_sync"}
-        for func, _, _ in offload_calls
-    )
+    assert retriever.calls
+    assert client.app.state.runtime_state.retrieval_executor.snapshot()["query_count"] == 1
     assert any(func is _stub_generate for func, _, _ in offload_calls)
 
 
@@ -491,6 +604,54 @@ def test_warmup_skips_when_retriever_unavailable(monkeypatch):
     assert "rag.warmup.skipped" in events
 
 
+def test_rag_query_batch_uses_one_retriever_pass_and_cache():
+    class _BatchRetriever(_StubRetriever):
+        def __init__(self) -> None:
+            super().__init__()
+            self.batches: list[tuple[list[str], int]] = []
+
+        def query_many(self, prompts, k: int = 5) -> list[list[dict]]:
+            self.batches.append((list(prompts), k))
+            return [self.query(prompt, k=k) for prompt in prompts]
+
+    retriever = _BatchRetriever()
+    client = _app(retriever)
+    client.post("/v1/rag/query", json={"query": "cached question", "top_k": 2})
+    retriever.batches.clear()
+
+    resp = client.post(
+        "/v1/rag/query:batch",
+        json={
+            "queries": [
+                {"query": "cached question", "top_k": 2},
+                {"query": "export controls", "top_k": 2, "include_lineage": True},
+                {"query": "license exceptions", "top_k": 2},
+            ]
+        },
+    )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["trace_id"]
+    assert [item["query"] for item in data["results"]] == [
+        "cached question",
+        "export controls",
+        "license exceptions",
+    ]
+    assert [item["cache"]["hit"] for item in data["results"]] == [True, False, False]
+    assert data["results"][0]["results"][0]["lineage"] is None
+    assert data["results"][1]["results"][0]["lineage"]["entity_id"] == "urn:entity:1"
+    assert retriever.batches == [(["export controls", "license exceptions"], 2)]
+
+
+def test_rag_query_batch_returns_503_when_disabled():
+    client = _app(NullRetriever())
+    resp = client.post(
+        "/v1/rag/query:batch", json={"queries": [{"query": "export controls"}]}
+    )
+    assert resp.status_code == 503
+    assert resp.json()["title"] == "Retriever disabled"
+
+
 def test_rag_query_returns_503_when_disabled():
     client = _app(NullRetriever())
     resp = client.post("/v1/rag/query", json={"query": "export controls"})
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+from pytest_socket import disable_socket, enable_socket
+
+from service.api_server.retrieval_executor import RetrievalExecutor
+
+
+@pytest.fixture(autouse=True)
+def _allow_socket():
+    # asyncio event loops need a local socketpair.
+    enable_socket()
+    yield
+    disable_socket()
+
+
+class _BatchingRetriever:
+    def __init__(self) -> None:
+        self.enabled = True
+        self.ready = True
+        self.release = threading.Event()
+        self.single_calls: list[str] = []
+        self.batch_sizes: list[int] = []
+
+    def _doc(self, prompt: str) -> dict:
+        return {"id": f"urn:{prompt}", "text": f"text for {prompt}", "score": 0.5}
+
+    def query(self, prompt: str, k: int = 5) -> list[dict]:
+        self.release.wait(timeout=5)
+        if prompt == "bad":
+            raise ValueError("bad query")
+        self.single_calls.append(prompt)
+        return [self._doc(prompt)]
+
+    def query_many(self, prompts: list[str], k: int = 5) -> list[list[dict]]:
+        if "bad" in prompts:
+            raise ValueError("bad query in batch")
+        self.batch_sizes.append(len(prompts))
+        return [[self._doc(prompt)] for prompt in prompts]
+
+
+async def _wait_for_queue(executor: RetrievalExecutor, depth: int) -> None:
+    for _ in range(500):
+        if executor.snapshot()["queue_depth"] >= depth:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("queries never queued")
+
+
+def test_queued_queries_are_coalesced_into_one_batch() -> None:
+    retriever = _BatchingRetriever()
+    executor = RetrievalExecutor(workers=1, max_batch=8)
+
+    async def _run():
+        first = asyncio.create_task(
+            executor.retrieve(query="q0", top_k=2, retriever=retriever, effective_date=None)
+        )
+        await asyncio.sleep(0.05)
+        rest = [
+            asyncio.create_task(
+                executor.retrieve(query=f"q{i}", top_k=2, retriever=retriever, effective_date=None)
+            )
+            for i in range(1, 4)
+        ]
+        await _wait_for_queue(executor, 3)
+        retriever.release.set()
+        return await first, await asyncio.gather(*rest)
+
+    try:
+        first, rest = asyncio.run(_run())
+    finally:
+        executor.shutdown()
+
+    assert retriever.single_calls == ["q0"]
+    assert retriever.batch_sizes == [3]
+    assert [r.docs[0]["text"] for r in rest] == ["text for q1", "text for q2", "text for q3"]
+    assert first.docs[0]["text"] == "text for q0"
+    stats = executor.snapshot()
+    assert stats["batch_count"] == 2
+    assert stats["query_count"] == 4
+    assert stats["max_batch_size"] == 3
+    assert stats["max_queue_depth"] >= 3
+    assert stats["queue_depth"] == 0 and stats["busy_workers"] == 0
+
+
+def test_failing_query_does_not_fail_its_batch() -> None:
+    retriever = _BatchingRetriever()
+    executor = RetrievalExecutor(workers=1, max_batch=8)
+
+    async def _run():
+        # The first query holds the only worker so the next two queue together.
+        first = asyncio.create_task(
+            executor.retrieve(query="slow", top_k=2, retriever=retriever, effective_date=None)
+        )
+        await asyncio.sleep(0.05)
+        tasks = [
+            asyncio.create_task(
+                executor.retrieve(query=q, top_k=2, retriever=retriever, effective_date=None)
+            )
+            for q in ("good", "bad")
+        ]
+        await _wait_for_queue(executor, 2)
+        retriever.release.set()
+        await first
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        good, bad = asyncio.run(_run())
+    finally:
+        executor.shutdown()
+
+    assert good.docs[0]["text"] == "text for good"
+    assert isinstance(bad, ValueError)
+    assert executor.snapshot()["max_batch_size"] == 2
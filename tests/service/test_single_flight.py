@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from pytest_socket import disable_socket, enable_socket
+
+from service.api_server.single_flight import SingleFlight
+
+
+@pytest.fixture(autouse=True)
+def _allow_socket():
+    # asyncio event loops need a local socketpair.
+    enable_socket()
+    yield
+    disable_socket()
+
+
+def test_concurrent_duplicates_share_one_call() -> None:
+    flight = SingleFlight()
+    calls: list[str] = []
+
+    async def _work(key: str) -> str:
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return f"result:{key}"
+
+    async def _run():
+        return await asyncio.gather(
+            *(flight.run("same", lambda: _work("same")) for _ in range(4)),
+            flight.run("other", lambda: _work("other")),
+        )
+
+    outcomes = asyncio.run(_run())
+
+    assert sorted(calls) == ["other", "same"]
+    same = outcomes[:4]
+    assert [result for result, _ in same] == ["result:same"] * 4
+    leaders = [info for _, info in same if not info.coalesced]
+    assert len(leaders) == 1 and leaders[0].waiters == 3
+    assert outcomes[4][1].coalesced is False
+    snapshot = flight.snapshot()
+    assert snapshot["in_flight"] == 0
+    assert snapshot["leader_count"] == 2
+    assert snapshot["coalesced_count"] == 3
+
+
+def test_exceptions_reach_waiters_and_release_the_key() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def _fail() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.02)
+        raise RuntimeError("boom")
+
+    async def _run():
+        return await asyncio.gather(
+            flight.run("k", _fail), flight.run("k", _fail), return_exceptions=True
+        )
+
+    outcomes = asyncio.run(_run())
+    assert calls == 1
+    assert all(isinstance(item, RuntimeError) for item in outcomes)
+
+    async def _ok() -> str:
+        return "fresh"
+
+    result, info = asyncio.run(flight.run("k", _ok))
+    assert result == "fresh" and info.coalesced is False